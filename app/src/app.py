@@ -5,19 +5,33 @@ Main entry point for the trading application
 Requirements: 1.1, 1.3, 20.2, 20.5
 """
 
+from app.src.common.startup_timer import StartupTimer  # first: starts the boot clock
+
 import asyncio
 import gc
 import os
 import signal
 from aiohttp import web
-from app.src.common.loguru_logger import logger
+from app.src.common.loguru_logger import get_log_stats, logger
 from app.src.common.logging_utils import log_operation, log_error_with_context
+from app.src.common.loop_watchdog import LoopWatchdog
+from app.src.common.compute_executor import ComputeExecutor
+from app.src.common.debug_endpoints import register_debug_routes
+from app.src.config.constants import MEMORY_TRACKING_AT_BOOT
 from app.src.common.memory_monitor import MemoryMonitor
-from app.src.services.trading.trading_service import TradingServiceCoordinator
-from app.src.services.threshold_adjustment.threshold_adjustment_service import (
-    ThresholdAdjustmentService,
+from app.src.common.metrics import Metrics
+from app.src.common.alpaca_request_scheduler import AlpacaRequestScheduler
+from app.src.services.market_data.market_data_hub import MarketDataHub
+from app.src.services.trading.market_regime_service import MarketRegimeService
+from app.src.services.webhook.webhook_dispatcher import (
+    close_webhook_dispatcher,
+    start_webhook_dispatcher,
 )
-from app.src.services.technical_analysis.technical_analysis_lib import TechnicalAnalysisLib
+
+# The trading stack (indicator modules, pandas, TA-Lib, aioboto3) is imported
+# in main() after the health server has bound $PORT
+
+StartupTimer.mark("import")
 
 
 # Minimal health check server for Heroku
@@ -27,15 +41,53 @@ async def health_check(request):
     return web.json_response({
         "status": "ok",
         "memory_mb": round(mem, 1),
+        "alpaca_scheduler": AlpacaRequestScheduler.get_stats(),
+        "logging": get_log_stats(),
+        "market_data_hub": MarketDataHub.get_stats(),
+        "market_regime": MarketRegimeService.get_stats(),
+        "event_loop": LoopWatchdog.get_stats(),
+        "compute_executor": ComputeExecutor.get_stats(),
+        "state_snapshot": _state_snapshot_stats(),
+        "startup": StartupTimer.get_stats(),
     })
 
 
+def _state_snapshot_stats():
+    """Snapshot stats once the trading stack has been loaded (None before)"""
+    if not StartupTimer.reached("services_loaded"):
+        return None
+    from app.src.services.trading.state_snapshot import StateSnapshot
+
+    return StateSnapshot.get_stats()
+
+
+async def metrics_endpoint(request):
+    """Prometheus scrape endpoint (per-stage latency, API counters, gauges)."""
+    Metrics.set_gauge("process_memory_mb", MemoryMonitor.get_current_memory_mb())
+    for lane, stats in AlpacaRequestScheduler.get_stats()["lanes"].items():
+        Metrics.set_gauge("api_queue_depth", stats["queue_depth"], api="alpaca", lane=lane)
+    regime_age = MarketRegimeService.get_stats()["age_seconds"]
+    if regime_age is not None:
+        Metrics.set_gauge("market_regime_age_seconds", regime_age)
+    LoopWatchdog.publish_metrics()
+    writer_stats = get_log_stats().get("writer") or {}
+    for key in ("queue_depth", "dropped"):
+        if key in writer_stats:
+            Metrics.set_gauge(f"log_writer_{key}", writer_stats[key])
+    return web.Response(
+        text=Metrics.render_prometheus(),
+        headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+    )
+
+
 async def start_health_server():
     """Start minimal HTTP server for Heroku health checks."""
     port = int(os.getenv("PORT", "8080"))
     app = web.Application()
     app.router.add_get("/", health_check)
     app.router.add_get("/health", health_check)
+    app.router.add_get("/metrics", metrics_endpoint)
+    register_debug_routes(app)
     
     runner = web.AppRunner(app)
     await runner.setup()
@@ -76,6 +128,8 @@ async def memory_management_task():
     Background task to monitor and manage memory usage.
     Periodically cleans up caches and runs garbage collection.
     """
+    from app.src.services.technical_analysis.technical_analysis_lib import TechnicalAnalysisLib
+
     logger.info(f"🧹 Memory management task started (interval: {MEMORY_CLEANUP_INTERVAL_SECONDS}s)")
     
     while not _shutdown_event.is_set():
@@ -159,9 +213,12 @@ async def main():
 
     # Start health check server FIRST (Heroku requires response within 60s)
     health_runner = await start_health_server()
+    StartupTimer.mark("health_server")
 
-    # Start memory monitoring
-    MemoryMonitor.start_tracking()
+    # tracemalloc is expensive for the whole process lifetime; /debug/heap
+    # starts it on demand instead
+    if MEMORY_TRACKING_AT_BOOT:
+        MemoryMonitor.start_tracking()
     memory_config = MemoryMonitor.get_memory_config()
     MemoryMonitor.log_memory_usage("Application Startup", level="INFO")
     logger.info(
@@ -177,8 +234,20 @@ async def main():
         status="started",
     )
 
+    # Load the trading stack now that the health server is up. Only enabled
+    # indicators are imported (by the coordinator's configure()).
+    from app.src.common.asset_directory import AssetDirectory
+    from app.src.services.trading.trading_service import TradingServiceCoordinator
+    from app.src.services.trading.position_state_cache import PositionStateCache
+    from app.src.services.trading.state_snapshot import StateSnapshot
+    from app.src.services.threshold_adjustment.threshold_adjustment_service import (
+        ThresholdAdjustmentService,
+    )
+    StartupTimer.mark("services_loaded")
+
     # Configure Trading Service Coordinator with all indicators
     TradingServiceCoordinator.configure()
+    StartupTimer.mark("configure")
 
     log_operation(
         operation_type="service_configuration",
@@ -199,6 +268,22 @@ async def main():
         logger.info("  - Trading Service Coordinator")
         logger.info("  - Memory Management Task")
 
+        # Market regime refreshes in the background; entry checks read its snapshot
+        if MarketRegimeService.start():
+            logger.info("  - Market Regime Service")
+
+        # Asset list (shortability, security type) loads off the trading cycles
+        if AssetDirectory.start():
+            logger.info("  - Asset Directory")
+
+        # Redeliver webhook signals left in the outbox by the previous process
+        if start_webhook_dispatcher():
+            logger.info("  - Webhook Outbox Worker")
+
+        # Loop lag and blocking call sites (/health "event_loop", /metrics)
+        if LoopWatchdog.start():
+            logger.info("  - Event Loop Watchdog")
+
         # Create service tasks
         tasks = [
             asyncio.create_task(
@@ -269,9 +354,53 @@ async def main():
         logger.info("Stopping Threshold Adjustment Service...")
         ThresholdAdjustmentService.stop()
 
+        logger.info("Stopping Market Regime Service...")
+        await MarketRegimeService.stop()
+
+        await LoopWatchdog.stop()
+
+        await AssetDirectory.stop()
+
+        # Snapshot in-memory state first: Heroku sends SIGKILL 30s after SIGTERM
+        try:
+            await StateSnapshot.save(reason="shutdown")
+        except Exception as e:
+            logger.warning(f"Failed to write state snapshot: {e}")
+
         # Give services a moment to clean up
         await asyncio.sleep(1)
 
+        # Stop indicator/validation workers (queued jobs are dropped)
+        ComputeExecutor.shutdown()
+
+        # Persist any coalesced trailing-stop updates not yet written
+        try:
+            await PositionStateCache.flush_all()
+        except Exception as e:
+            logger.warning(f"Failed to flush position state cache: {e}")
+
+        # Close pooled webhook connections (undelivered outbox rows persist)
+        try:
+            await close_webhook_dispatcher()
+        except Exception as e:
+            logger.warning(f"Failed to close webhook dispatcher: {e}")
+
+        # Close the pooled Unusual Whales session
+        try:
+            from app.src.services.unusual_whales.uw_client import close_unusual_whales_client
+
+            await close_unusual_whales_client()
+        except Exception as e:
+            logger.warning(f"Failed to close Unusual Whales client: {e}")
+
+        # Close the pooled Bedrock runtime client
+        try:
+            from app.src.services.bedrock.bedrock_client import close_bedrock_client
+
+            await close_bedrock_client()
+        except Exception as e:
+            logger.warning(f"Failed to close Bedrock client: {e}")
+
         # Stop health check server
         if health_runner:
             await health_runner.cleanup()
@@ -0,0 +1,101 @@
+"""
+Adaptive concurrency limit for bulk writes against throttled backends.
+Grows the number of in-flight operations while they succeed and halves it
+when the backend throttles (additive increase, multiplicative decrease).
+"""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+from app.src.common.loguru_logger import logger
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD concurrency limiter.
+
+    Use as an async context manager around each operation and report the
+    outcome with on_success() / on_throttle().
+
+    Attributes:
+        limit: Current number of operations allowed in flight
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        increase_after: int = 20,
+        decrease_interval_seconds: float = 0.5,
+    ):
+        """
+        Initialize the limiter at max_limit.
+
+        Args:
+            max_limit: Upper bound (and starting value) of the limit
+            min_limit: Lower bound of the limit
+            increase_after: Consecutive successes before the limit grows by one
+            decrease_interval_seconds: Throttles within this interval of the last
+                decrease count as one (a burst of in-flight failures halves once)
+        """
+        if max_limit <= 0 or min_limit <= 0 or min_limit > max_limit:
+            raise ValueError("limits must satisfy 0 < min_limit <= max_limit")
+
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = max_limit
+        self.increase_after = increase_after
+        self.decrease_interval_seconds = decrease_interval_seconds
+        self.in_flight = 0
+        self.throttle_events = 0
+        self._successes = 0
+        self._last_decrease = float("-inf")
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        """Wait until fewer than limit operations are in flight"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    async def __aenter__(self) -> "AdaptiveConcurrency":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc) -> bool:
+        await self.release()
+        return False
+
+    def on_success(self):
+        """Record a successful operation; grows the limit by one every increase_after"""
+        self._successes += 1
+        if self._successes >= self.increase_after and self.limit < self.max_limit:
+            self.limit += 1
+            self._successes = 0
+
+    def on_throttle(self):
+        """Record a throttled operation; halves the limit (at most once per interval)"""
+        self.throttle_events += 1
+        self._successes = 0
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_interval_seconds:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(self.min_limit, self.limit // 2)
+        if self.limit != previous:
+            logger.info(f"Throttled: concurrency limit {previous} -> {self.limit}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "throttle_events": self.throttle_events,
+        }
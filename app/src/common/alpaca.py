@@ -9,6 +9,8 @@ from datetime import datetime, timezone, timedelta, date
 import pytz  # type: ignore
 import aiohttp
 from app.src.common.loguru_logger import logger
+from app.src.common.alpaca_request_scheduler import AlpacaRequestScheduler, RequestLane
+from app.src.common.metrics import Metrics
 from app.src.config.constants import DEBUG_DAY_TRADING
 
 
@@ -89,7 +91,10 @@ class AlpacaClient:
         return cache_age < cls._clock_cache_ttl_seconds
 
     @classmethod
-    async def quote(cls, ticker: str) -> Optional[Dict[str, Any]]:
+    @Metrics.timed("quote_fetch")
+    async def quote(
+        cls, ticker: str, lane: RequestLane = RequestLane.ENTRY_QUOTE
+    ) -> Optional[Dict[str, Any]]:
         """
         Get latest quote for a ticker from Alpaca API.
 
@@ -97,6 +102,7 @@ class AlpacaClient:
 
         Args:
             ticker: Stock ticker symbol (e.g., "AAPL")
+            lane: Scheduler lane (promoted to EXIT when called from an exit cycle)
 
         Returns:
             Dict with transformed quote data matching expected format:
@@ -126,8 +132,10 @@ class AlpacaClient:
         for attempt in range(max_retries):
             try:
                 # Use shared session for connection pooling
+                await AlpacaRequestScheduler.acquire(lane, retry=attempt > 0)
                 session = await cls._get_session()
                 async with session.get(url, headers=headers) as response:
+                    AlpacaRequestScheduler.observe_response(response.status, response.headers, endpoint="quote")
                     if response.status == 200:
                         data = await response.json()
 
@@ -158,6 +166,10 @@ class AlpacaClient:
                             f"Alpaca API error for {ticker}: HTTP {response.status} - {error_text[:200]}"
                         )
 
+                        # Rate limited: the scheduler pauses until the window resets
+                        if response.status == 429 and attempt < max_retries - 1:
+                            continue
+
                         # Retry on server errors (5xx)
                         if response.status >= 500 and attempt < max_retries - 1:
                             logger.info(
@@ -206,6 +218,7 @@ class AlpacaClient:
         return None
 
     @classmethod
+    @Metrics.timed("market_data_fetch")
     async def get_market_data(
         cls, ticker: str, limit: int = 50
     ) -> Optional[Dict[str, Any]]:
@@ -320,10 +333,14 @@ class AlpacaClient:
                 for attempt in range(max_retries):
                     try:
                         # Use shared session for connection pooling
+                        await AlpacaRequestScheduler.acquire(RequestLane.BARS, retry=attempt > 0)
                         session = await cls._get_session()
                         async with session.get(
                             url, headers=headers, params=params
                         ) as response:
+                            AlpacaRequestScheduler.observe_response(
+                                response.status, response.headers, endpoint="bars"
+                            )
                             if response.status == 200:
                                 data = await response.json()
 
@@ -407,6 +424,10 @@ class AlpacaClient:
                                 f"Alpaca API error for {ticker} bars: HTTP {response.status} - {error_text[:200]}"
                             )
 
+                            # Rate limited: the scheduler pauses until the window resets
+                            if response.status == 429 and attempt < max_retries - 1:
+                                continue
+
                             # Retry on server errors (5xx)
                             if response.status >= 500 and attempt < max_retries - 1:
                                 logger.info(
@@ -631,8 +652,10 @@ class AlpacaClient:
             for attempt in range(max_retries):
                 try:
                     # Use shared session for connection pooling
+                    await AlpacaRequestScheduler.acquire(RequestLane.ENTRY_QUOTE, retry=attempt > 0)
                     session = await cls._get_session()
                     async with session.get(url, headers=headers) as response:
+                        AlpacaRequestScheduler.observe_response(response.status, response.headers, endpoint="clock")
                         if response.status == 200:
                             data = await response.json()
 
@@ -647,10 +670,10 @@ class AlpacaClient:
                         # Handle 429 rate limit with retry
                         if response.status == 429:
                             if attempt < max_retries - 1:
+                                # The scheduler holds the next request until the window resets
                                 logger.debug(
-                                    f"Alpaca clock API rate limited (429). Retrying in {retry_delay}s... (attempt {attempt + 1}/{max_retries})"
+                                    f"Alpaca clock API rate limited (429). Retrying... (attempt {attempt + 1}/{max_retries})"
                                 )
-                                await asyncio.sleep(retry_delay)
                                 continue
                             else:
                                 logger.error(
@@ -683,6 +706,145 @@ class AlpacaClient:
                             f"Error fetching market clock: {str(e)}"
                         ) from e
 
+    @classmethod
+    async def calendar(cls, start: date, end: date) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the trading calendar (sessions with open/close times) for a date range.
+
+        Args:
+            start: First date (inclusive)
+            end: Last date (inclusive)
+
+        Returns:
+            List of {"date": "YYYY-MM-DD", "open": "HH:MM", "close": "HH:MM", ...}
+            in exchange (ET) local time, or None on failure
+        """
+        if not cls.API_KEY_ID or not cls.API_SECRET_KEY:
+            logger.warning("Alpaca API credentials not configured, cannot load calendar")
+            return None
+
+        # Calendar endpoint is on Trading API, not Data API
+        url = "https://api.alpaca.markets/v2/calendar"
+        headers = {
+            "accept": "application/json",
+            "APCA-API-KEY-ID": cls.API_KEY_ID,
+            "APCA-API-SECRET-KEY": cls.API_SECRET_KEY,
+        }
+        params = {"start": start.isoformat(), "end": end.isoformat()}
+
+        max_retries = 3
+        retry_delay = 2  # seconds
+
+        for attempt in range(max_retries):
+            try:
+                await AlpacaRequestScheduler.acquire(RequestLane.ASSETS, retry=attempt > 0)
+                session = await cls._get_session()
+                async with session.get(url, headers=headers, params=params) as response:
+                    AlpacaRequestScheduler.observe_response(response.status, response.headers, endpoint="calendar")
+                    if response.status == 200:
+                        return await response.json()
+
+                    error_text = await response.text()
+                    logger.warning(
+                        f"Alpaca calendar API error: HTTP {response.status} - {error_text[:200]}"
+                    )
+                    # Rate limited: the scheduler pauses until the window resets
+                    if response.status == 429 and attempt < max_retries - 1:
+                        continue
+                    if response.status >= 500 and attempt < max_retries - 1:
+                        await asyncio.sleep(retry_delay)
+                        continue
+                    return None
+
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                if attempt < max_retries - 1:
+                    logger.debug(
+                        f"Error fetching Alpaca calendar: {e} "
+                        f"(attempt {attempt + 1}/{max_retries}), retrying..."
+                    )
+                    await asyncio.sleep(retry_delay)
+                    continue
+                logger.warning(f"Error fetching Alpaca calendar after {max_retries} attempts: {e}")
+                return None
+
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning(f"Unexpected error fetching Alpaca calendar: {e}")
+                return None
+
+        return None
+
+    @classmethod
+    async def list_assets(
+        cls, status: str = "active", asset_class: str = "us_equity"
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Bulk-download the asset list (one request for every symbol).
+
+        Args:
+            status: Asset status filter ("active" or "inactive")
+            asset_class: Asset class filter
+
+        Returns:
+            List of asset dicts (symbol, name, exchange, class, tradable,
+            shortable, easy_to_borrow, fractionable, ...) or None on failure
+        """
+        if not cls.API_KEY_ID or not cls.API_SECRET_KEY:
+            logger.warning("Alpaca API credentials not configured, cannot load assets")
+            return None
+
+        # Assets endpoint is on Trading API, not Data API
+        url = "https://api.alpaca.markets/v2/assets"
+        headers = {
+            "accept": "application/json",
+            "APCA-API-KEY-ID": cls.API_KEY_ID,
+            "APCA-API-SECRET-KEY": cls.API_SECRET_KEY,
+        }
+        params = {"status": status, "asset_class": asset_class}
+
+        max_retries = 3
+        retry_delay = 2  # seconds
+
+        for attempt in range(max_retries):
+            try:
+                await AlpacaRequestScheduler.acquire(RequestLane.ASSETS, retry=attempt > 0)
+                session = await cls._get_session()
+                # The full list is several MB; allow more than the session's 5s default
+                async with session.get(
+                    url, headers=headers, params=params, timeout=aiohttp.ClientTimeout(total=30)
+                ) as response:
+                    AlpacaRequestScheduler.observe_response(response.status, response.headers, endpoint="assets")
+                    if response.status == 200:
+                        return await response.json()
+
+                    error_text = await response.text()
+                    logger.warning(
+                        f"Alpaca assets list API error: HTTP {response.status} - {error_text[:200]}"
+                    )
+                    # Rate limited: the scheduler pauses until the window resets
+                    if response.status == 429 and attempt < max_retries - 1:
+                        continue
+                    if response.status >= 500 and attempt < max_retries - 1:
+                        await asyncio.sleep(retry_delay)
+                        continue
+                    return None
+
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                if attempt < max_retries - 1:
+                    logger.debug(
+                        f"Error fetching Alpaca assets list: {e} "
+                        f"(attempt {attempt + 1}/{max_retries}), retrying..."
+                    )
+                    await asyncio.sleep(retry_delay)
+                    continue
+                logger.warning(f"Error fetching Alpaca assets list after {max_retries} attempts: {e}")
+                return None
+
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning(f"Unexpected error fetching Alpaca assets list: {e}")
+                return None
+
+        return None
+
     @classmethod
     async def is_market_open(cls) -> bool:
         """
@@ -731,8 +893,10 @@ class AlpacaClient:
         for attempt in range(max_retries):
             try:
                 # Use shared session for connection pooling
+                await AlpacaRequestScheduler.acquire(RequestLane.ASSETS, retry=attempt > 0)
                 session = await cls._get_session()
                 async with session.get(url, headers=headers) as response:
+                    AlpacaRequestScheduler.observe_response(response.status, response.headers, endpoint="assets")
                     if response.status == 200:
                         data = await response.json()
                         shortable = data.get("shortable", False)
@@ -753,6 +917,10 @@ class AlpacaClient:
                             f"Alpaca assets API error for {ticker}: HTTP {response.status} - {error_text[:200]}"
                         )
 
+                        # Rate limited: the scheduler pauses until the window resets
+                        if response.status == 429 and attempt < max_retries - 1:
+                            continue
+
                         # Retry on server errors (5xx)
                         if response.status >= 500 and attempt < max_retries - 1:
                             logger.info(
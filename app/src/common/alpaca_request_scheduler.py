@@ -0,0 +1,301 @@
+"""
+Alpaca Request Scheduler
+Shared token-bucket rate limiter with priority lanes for all Alpaca API calls
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from app.src.common.loguru_logger import logger
+from app.src.common.metrics import Metrics
+from app.src.config.constants import (
+    ALPACA_EXIT_RESERVE_TOKENS,
+    ALPACA_RATE_LIMIT_BURST,
+    ALPACA_RATE_LIMIT_PER_MINUTE,
+)
+
+
+class RequestLane(IntEnum):
+    """Priority lanes (lower value is served first)"""
+
+    EXIT = 0
+    ENTRY_QUOTE = 1
+    BARS = 2
+    SCREENER = 3
+    ASSETS = 4
+
+
+# Set for the duration of an exit cycle so every Alpaca call it makes
+# (quotes, bars, ...) is served from the exit lane
+_exit_context: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "alpaca_exit_context", default=False
+)
+
+# Upper bound on server-requested pauses (Alpaca windows are one minute)
+_MAX_PAUSE_SECONDS = 60.0
+
+
+class AlpacaRequestScheduler:
+    """
+    Account-wide token bucket shared by every AlpacaClient request.
+
+    Requests wait in per-lane priority order; exit requests are always
+    served first and may use a small reserve of tokens that lower lanes
+    cannot touch, so exit latency stays bounded while entry scans saturate
+    the budget. Server rate-limit headers (X-RateLimit-*, Retry-After)
+    are fed back into the bucket.
+    """
+
+    requests_per_minute: int = ALPACA_RATE_LIMIT_PER_MINUTE
+    burst: int = ALPACA_RATE_LIMIT_BURST
+    exit_reserve: int = ALPACA_EXIT_RESERVE_TOKENS
+
+    _tokens: float = float(ALPACA_RATE_LIMIT_BURST)
+    _last_refill: float = 0.0
+    _paused_until: float = 0.0
+    _waiters: List[Tuple[int, int, asyncio.Future]] = []
+    _seq: Iterator[int] = itertools.count()
+    _timer: Optional[asyncio.TimerHandle] = None
+    _timer_loop: Optional[asyncio.AbstractEventLoop] = None
+    _timer_when: float = 0.0
+
+    _queue_depth: Dict[RequestLane, int] = {lane: 0 for lane in RequestLane}
+    _granted: Dict[RequestLane, int] = {lane: 0 for lane in RequestLane}
+    _wait_seconds: Dict[RequestLane, float] = {lane: 0.0 for lane in RequestLane}
+    _max_wait_seconds: Dict[RequestLane, float] = {lane: 0.0 for lane in RequestLane}
+    _throttled_responses: int = 0
+
+    @classmethod
+    def configure(
+        cls,
+        requests_per_minute: Optional[int] = None,
+        burst: Optional[int] = None,
+        exit_reserve: Optional[int] = None,
+    ):
+        """
+        Configure limits and reset the bucket.
+
+        Args:
+            requests_per_minute: Sustained request budget (refill rate)
+            burst: Bucket capacity
+            exit_reserve: Tokens reserved for the exit lane
+        """
+        if cls._timer is not None:
+            cls._timer.cancel()
+        cls.requests_per_minute = max(1, requests_per_minute or ALPACA_RATE_LIMIT_PER_MINUTE)
+        cls.burst = max(1, burst or ALPACA_RATE_LIMIT_BURST)
+        reserve = ALPACA_EXIT_RESERVE_TOKENS if exit_reserve is None else exit_reserve
+        cls.exit_reserve = max(0, min(reserve, cls.burst - 1))
+        cls._tokens = float(cls.burst)
+        cls._last_refill = time.monotonic()
+        cls._paused_until = 0.0
+        cls._waiters = []
+        cls._timer = None
+        cls._timer_when = 0.0
+        cls._queue_depth = {lane: 0 for lane in RequestLane}
+        cls._granted = {lane: 0 for lane in RequestLane}
+        cls._wait_seconds = {lane: 0.0 for lane in RequestLane}
+        cls._max_wait_seconds = {lane: 0.0 for lane in RequestLane}
+        cls._throttled_responses = 0
+
+    @classmethod
+    @contextlib.contextmanager
+    def exit_priority(cls):
+        """Serve every Alpaca request made inside this context from the exit lane"""
+        token = _exit_context.set(True)
+        try:
+            yield
+        finally:
+            _exit_context.reset(token)
+
+    @classmethod
+    def resolve_lane(cls, lane: RequestLane) -> RequestLane:
+        """Promote a request to the exit lane when made from an exit cycle"""
+        return RequestLane.EXIT if _exit_context.get() else lane
+
+    @classmethod
+    def _refill_rate(cls) -> float:
+        return cls.requests_per_minute / 60.0
+
+    @classmethod
+    def _refill(cls, now: float) -> None:
+        if cls._last_refill == 0.0:
+            cls._last_refill = now
+        elapsed = now - cls._last_refill
+        if elapsed > 0:
+            cls._tokens = min(float(cls.burst), cls._tokens + elapsed * cls._refill_rate())
+            cls._last_refill = now
+
+    @classmethod
+    def _tokens_needed(cls, lane: int) -> float:
+        return 1.0 if lane == RequestLane.EXIT else 1.0 + cls.exit_reserve
+
+    @classmethod
+    def _schedule_wakeup(cls, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        when = loop.time() + max(0.0, delay)
+        if (
+            cls._timer is not None
+            and cls._timer_loop is loop
+            and not cls._timer.cancelled()
+            and cls._timer_when <= when
+        ):
+            return
+        if cls._timer is not None:
+            cls._timer.cancel()
+        cls._timer = loop.call_at(when, cls._on_timer)
+        cls._timer_loop = loop
+        cls._timer_when = when
+
+    @classmethod
+    def _on_timer(cls) -> None:
+        cls._timer = None
+        cls._dispatch()
+
+    @classmethod
+    def _dispatch(cls) -> None:
+        """Grant tokens to queued requests in lane order"""
+        now = time.monotonic()
+        cls._refill(now)
+        if now < cls._paused_until:
+            if cls._waiters:
+                cls._schedule_wakeup(cls._paused_until - now)
+            return
+
+        while cls._waiters:
+            lane, _, future = cls._waiters[0]
+            if future.done() or future.get_loop().is_closed():
+                # Cancelled while waiting (or left over from a closed loop)
+                heapq.heappop(cls._waiters)
+                cls._queue_depth[RequestLane(lane)] -= 1
+                continue
+            needed = cls._tokens_needed(lane)
+            if cls._tokens < needed:
+                cls._schedule_wakeup((needed - cls._tokens) / cls._refill_rate())
+                return
+            heapq.heappop(cls._waiters)
+            cls._queue_depth[RequestLane(lane)] -= 1
+            cls._tokens -= 1.0
+            future.set_result(None)
+
+    @classmethod
+    async def acquire(cls, lane: RequestLane, retry: bool = False) -> None:
+        """
+        Wait for a request token.
+
+        Args:
+            lane: Lane of the request (promoted to EXIT inside exit_priority())
+            retry: True when re-sending a request that already failed once
+        """
+        lane = cls.resolve_lane(lane)
+        if retry:
+            Metrics.inc("api_retries_total", api="alpaca", lane=lane.name.lower())
+        now = time.monotonic()
+        cls._refill(now)
+
+        # Fast path: nothing queued ahead and budget available
+        if (
+            not cls._waiters
+            and now >= cls._paused_until
+            and cls._tokens >= cls._tokens_needed(lane)
+        ):
+            cls._tokens -= 1.0
+            cls._granted[lane] += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(cls._waiters, (int(lane), next(cls._seq), future))
+        cls._queue_depth[lane] += 1
+        cls._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            cls._dispatch()
+            raise
+
+        waited = time.monotonic() - now
+        Metrics.observe("api_queue_wait_seconds", waited, api="alpaca", lane=lane.name.lower())
+        cls._granted[lane] += 1
+        cls._wait_seconds[lane] += waited
+        if waited > cls._max_wait_seconds[lane]:
+            cls._max_wait_seconds[lane] = waited
+
+    @staticmethod
+    def _header_float(headers: Mapping[str, Any], name: str) -> Optional[float]:
+        try:
+            value = headers.get(name)
+            return float(value) if value is not None else None
+        except (TypeError, ValueError, AttributeError):
+            return None
+
+    @classmethod
+    def observe_response(
+        cls, status: int, headers: Mapping[str, Any], endpoint: str = "other"
+    ) -> None:
+        """
+        Feed Alpaca rate-limit feedback back into the bucket.
+
+        Args:
+            status: HTTP status code
+            headers: Response headers (X-RateLimit-Limit/Remaining/Reset, Retry-After)
+            endpoint: Short endpoint name for request metrics (e.g. "bars")
+        """
+        Metrics.inc("api_requests_total", api="alpaca", endpoint=endpoint, status=f"{status // 100}xx")
+        limit = cls._header_float(headers, "X-RateLimit-Limit")
+        remaining = cls._header_float(headers, "X-RateLimit-Remaining")
+        reset_at = cls._header_float(headers, "X-RateLimit-Reset")
+        retry_after = cls._header_float(headers, "Retry-After")
+
+        if limit and int(limit) != cls.requests_per_minute:
+            logger.info(
+                f"Alpaca rate limit is {int(limit)}/min (was {cls.requests_per_minute}/min), adjusting scheduler"
+            )
+            cls.requests_per_minute = int(limit)
+
+        if remaining is not None:
+            cls._tokens = min(cls._tokens, max(0.0, remaining))
+
+        pause = 0.0
+        if status == 429:
+            cls._throttled_responses += 1
+            Metrics.inc("api_rate_limited_total", api="alpaca", endpoint=endpoint)
+            cls._tokens = 0.0
+            if retry_after is not None:
+                pause = retry_after
+            elif reset_at is not None:
+                pause = reset_at - time.time()
+            else:
+                pause = 1.0
+            logger.warning(f"Alpaca rate limited (429), pausing requests for {pause:.1f}s")
+        elif remaining is not None and remaining <= 0 and reset_at is not None:
+            pause = reset_at - time.time()
+
+        if pause > 0:
+            pause = min(pause, _MAX_PAUSE_SECONDS)
+            cls._paused_until = max(cls._paused_until, time.monotonic() + pause)
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """Queue depth and wait-time metrics per lane"""
+        lanes = {}
+        for lane in RequestLane:
+            granted = cls._granted[lane]
+            lanes[lane.name.lower()] = {
+                "queue_depth": cls._queue_depth[lane],
+                "granted": granted,
+                "avg_wait_ms": round(cls._wait_seconds[lane] / granted * 1000, 2) if granted else 0.0,
+                "max_wait_ms": round(cls._max_wait_seconds[lane] * 1000, 2),
+            }
+        return {
+            "requests_per_minute": cls.requests_per_minute,
+            "tokens": round(cls._tokens, 2),
+            "paused_for_seconds": round(max(0.0, cls._paused_until - time.monotonic()), 2),
+            "throttled_responses": cls._throttled_responses,
+            "lanes": lanes,
+        }
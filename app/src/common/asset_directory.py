@@ -0,0 +1,417 @@
+"""
+Asset Directory
+In-memory index of the Alpaca asset list (replaces per-ticker /v2/assets lookups)
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from app.src.common.alpaca import AlpacaClient
+from app.src.common.loguru_logger import logger
+from app.src.common.market_session import EST_TZ
+from app.src.config.constants import (
+    ASSET_DIRECTORY_ENABLED,
+    ASSET_DIRECTORY_REFRESH_SECONDS,
+    ASSET_DIRECTORY_SNAPSHOT_PATH,
+)
+
+# Warrants, units and rights are identified by the security descriptor at the end
+# of the asset name ("XYZ Acquisition Corp - Warrants", "XYZ Corp - Rights",
+# "... Units, each consisting of ..."). A bare word match would also catch ordinary
+# equities such as "Unit Corporation Common Stock" or MLP "Common Units".
+_SPECIAL_NAME_PATTERN = re.compile(
+    r"\b(warrants?|units?|rights?)\s*(?:\(.*\))?\s*(?:,\s*each\b.*)?$", re.IGNORECASE
+)
+# Equity descriptors that contain the word "units" (MLPs, royalty trusts)
+_EQUITY_UNITS_PATTERN = re.compile(r"\bcommon units?\b|\bunits? of beneficial interest\b", re.IGNORECASE)
+_SPECIAL_SYMBOL_SUFFIXES = (".WS", ".WT", ".U", ".RT", ".W", ".R")
+
+# Snapshot row flag bits
+_TRADABLE = 1
+_SHORTABLE = 2
+_EASY_TO_BORROW = 4
+_FRACTIONABLE = 8
+
+
+@dataclass(frozen=True)
+class AssetInfo:
+    """Attributes of one asset used by entry filters"""
+
+    symbol: str
+    name: str
+    exchange: str
+    asset_class: str
+    tradable: bool
+    shortable: bool
+    easy_to_borrow: bool
+    fractionable: bool
+
+    @property
+    def security_type(self) -> str:
+        """Security type: warrant, unit, right or common (from the symbol and name)"""
+        if self.symbol.endswith(_SPECIAL_SYMBOL_SUFFIXES):
+            suffix = self.symbol.rsplit(".", 1)[-1]
+            return {"U": "unit", "RT": "right", "R": "right"}.get(suffix, "warrant")
+        if _EQUITY_UNITS_PATTERN.search(self.name):
+            return "common"
+        match = _SPECIAL_NAME_PATTERN.search(self.name.strip())
+        if not match:
+            return "common"
+        return match.group(1).lower().rstrip("s")
+
+    @property
+    def is_special_security(self) -> bool:
+        return self.security_type != "common"
+
+    @classmethod
+    def from_api(cls, asset: Dict[str, Any]) -> "AssetInfo":
+        return cls(
+            symbol=str(asset.get("symbol", "")).upper(),
+            name=asset.get("name") or "",
+            exchange=asset.get("exchange") or "",
+            asset_class=asset.get("class") or "",
+            tradable=bool(asset.get("tradable", False)),
+            shortable=bool(asset.get("shortable", False)),
+            easy_to_borrow=bool(asset.get("easy_to_borrow", False)),
+            fractionable=bool(asset.get("fractionable", False)),
+        )
+
+    def to_row(self) -> List[Any]:
+        flags = (
+            (_TRADABLE if self.tradable else 0)
+            | (_SHORTABLE if self.shortable else 0)
+            | (_EASY_TO_BORROW if self.easy_to_borrow else 0)
+            | (_FRACTIONABLE if self.fractionable else 0)
+        )
+        return [self.symbol, flags, self.exchange, self.asset_class, self.name]
+
+    @classmethod
+    def from_row(cls, row: List[Any]) -> "AssetInfo":
+        symbol, flags, exchange, asset_class, name = row
+        return cls(
+            symbol=symbol,
+            name=name,
+            exchange=exchange,
+            asset_class=asset_class,
+            tradable=bool(flags & _TRADABLE),
+            shortable=bool(flags & _SHORTABLE),
+            easy_to_borrow=bool(flags & _EASY_TO_BORROW),
+            fractionable=bool(flags & _FRACTIONABLE),
+        )
+
+
+class AssetDirectory:
+    """
+    Active US equity assets, downloaded in one request and indexed in memory.
+
+    The list is fully loaded once per trading day (from the local snapshot
+    when it was written today, otherwise from Alpaca) and re-downloaded every
+    ASSET_DIRECTORY_REFRESH_SECONDS. Alpaca has no delta endpoint, so an
+    intraday refresh diffs the new list against the index and only touches
+    (and persists) symbols whose attributes changed.
+
+    Lookups are synchronous set/dict membership tests and return None for
+    symbols the directory does not know, so callers can fall back to their
+    per-ticker path.
+    """
+
+    enabled: bool = ASSET_DIRECTORY_ENABLED
+    snapshot_path: str = ASSET_DIRECTORY_SNAPSHOT_PATH
+    refresh_seconds: float = ASSET_DIRECTORY_REFRESH_SECONDS
+    # Retry interval after a failed download
+    retry_seconds: float = 60.0
+
+    _assets: Dict[str, AssetInfo] = {}
+    _tradable: Set[str] = set()
+    _shortable: Set[str] = set()
+    _easy_to_borrow: Set[str] = set()
+    _special: Set[str] = set()
+    _session_date: Optional[str] = None
+    _refreshed_at: float = 0.0
+    _next_attempt_at: float = 0.0
+    _load_lock: Optional[asyncio.Lock] = None
+    _lock_loop: Optional[asyncio.AbstractEventLoop] = None
+    _task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def reset(cls):
+        """Drop the index (next ensure_loaded reloads it)"""
+        cls._assets = {}
+        cls._tradable = set()
+        cls._shortable = set()
+        cls._easy_to_borrow = set()
+        cls._special = set()
+        cls._session_date = None
+        cls._refreshed_at = 0.0
+        cls._next_attempt_at = 0.0
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(EST_TZ).date().isoformat()
+
+    @classmethod
+    def is_loaded(cls) -> bool:
+        return bool(cls._assets)
+
+    # ------------------------------------------------------------------
+    # Lookups (O(1), no I/O)
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def get(cls, ticker: str) -> Optional[AssetInfo]:
+        """Asset attributes, or None when the symbol is unknown"""
+        return cls._assets.get(ticker.upper())
+
+    @classmethod
+    def is_shortable(cls, ticker: str) -> Optional[bool]:
+        """True/False for known symbols (must also be tradable), None if unknown"""
+        symbol = ticker.upper()
+        if symbol not in cls._assets:
+            return None
+        return symbol in cls._shortable and symbol in cls._tradable
+
+    @classmethod
+    def is_easy_to_borrow(cls, ticker: str) -> Optional[bool]:
+        symbol = ticker.upper()
+        if symbol not in cls._assets:
+            return None
+        return symbol in cls._easy_to_borrow
+
+    @classmethod
+    def is_tradable(cls, ticker: str) -> Optional[bool]:
+        symbol = ticker.upper()
+        if symbol not in cls._assets:
+            return None
+        return symbol in cls._tradable
+
+    @classmethod
+    def is_special_security(cls, ticker: str) -> Optional[bool]:
+        """True for warrants, units and rights; None if the symbol is unknown"""
+        symbol = ticker.upper()
+        if symbol not in cls._assets:
+            return None
+        return symbol in cls._special
+
+    @classmethod
+    async def check_shortable(cls, ticker: str) -> bool:
+        """
+        Shortability for entry decisions.
+
+        Answered from the directory when it knows the symbol; otherwise
+        (including before the background load has finished) falls back to
+        the per-ticker AlpacaClient.is_shortable request.
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            True if the ticker can be shorted
+        """
+        known = cls.is_shortable(ticker)
+        if known is not None:
+            return known
+        return await AlpacaClient.is_shortable(ticker)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def is_running(cls) -> bool:
+        return cls._task is not None and not cls._task.done()
+
+    @classmethod
+    def start(cls) -> bool:
+        """
+        Load and refresh the directory in a background task.
+
+        The first load downloads a multi-MB list, so it must not run inside
+        an entry or exit cycle; lookups fall back to per-ticker paths until
+        it completes.
+
+        Returns:
+            True if the task was started (False when disabled or running)
+        """
+        if not cls.enabled or cls.is_running():
+            return False
+        cls._task = asyncio.get_running_loop().create_task(cls.run(), name="AssetDirectory")
+        return True
+
+    @classmethod
+    async def stop(cls):
+        """Cancel the background refresh task"""
+        task = cls._task
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        cls._task = None
+
+    @classmethod
+    async def run(cls):
+        """Load now, then re-check every retry_seconds (refreshes when due)"""
+        while True:
+            await cls.ensure_loaded()
+            await asyncio.sleep(cls.retry_seconds)
+
+    @classmethod
+    def _get_lock(cls) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if cls._load_lock is None or cls._lock_loop is not loop:
+            cls._load_lock = asyncio.Lock()
+            cls._lock_loop = loop
+        return cls._load_lock
+
+    @classmethod
+    def _needs_refresh(cls) -> bool:
+        now = time.time()
+        if now < cls._next_attempt_at:
+            return False
+        if not cls._assets or cls._session_date != cls._today():
+            return True
+        return now - cls._refreshed_at >= cls.refresh_seconds
+
+    @classmethod
+    async def ensure_loaded(cls) -> bool:
+        """
+        Load or refresh the directory if needed (cheap when fresh).
+
+        Never raises; on failure the previous index (if any) stays in use and
+        the download is retried after retry_seconds.
+
+        Returns:
+            True if the directory has data
+        """
+        if not cls.enabled:
+            return False
+        if not cls._needs_refresh():
+            return cls.is_loaded()
+
+        async with cls._get_lock():
+            if not cls._needs_refresh():
+                return cls.is_loaded()
+            try:
+                if not cls._assets:
+                    await cls._load_snapshot()
+                    if not cls._needs_refresh():
+                        return True
+                await cls.refresh()
+            except Exception as e:
+                logger.warning(f"Asset directory load failed: {e}")
+                cls._next_attempt_at = time.time() + cls.retry_seconds
+        return cls.is_loaded()
+
+    @classmethod
+    async def refresh(cls) -> int:
+        """
+        Download the asset list and apply changed symbols to the index.
+
+        Returns:
+            Number of symbols added, changed or removed (-1 on failure)
+        """
+        assets = await AlpacaClient.list_assets()
+        if assets is None:
+            cls._next_attempt_at = time.time() + cls.retry_seconds
+            return -1
+
+        changed = cls._apply(AssetInfo.from_api(asset) for asset in assets if asset.get("symbol"))
+        new_day = cls._session_date != cls._today()
+        cls._session_date = cls._today()
+        cls._refreshed_at = time.time()
+        cls._next_attempt_at = 0.0
+        logger.info(f"Asset directory refreshed: {len(cls._assets)} assets, {changed} changed")
+        if changed or new_day:
+            await cls._save_snapshot()
+        return changed
+
+    @classmethod
+    def _apply(cls, infos: Iterable[AssetInfo]) -> int:
+        """Diff against the index and update only symbols whose attributes changed"""
+        incoming = {info.symbol: info for info in infos}
+        changed = 0
+        for symbol in [s for s in cls._assets if s not in incoming]:
+            cls._remove(symbol)
+            changed += 1
+        for symbol, info in incoming.items():
+            if cls._assets.get(symbol) != info:
+                cls._index(info)
+                changed += 1
+        return changed
+
+    @classmethod
+    def _index(cls, info: AssetInfo):
+        symbol = info.symbol
+        cls._assets[symbol] = info
+        for members, flag in (
+            (cls._tradable, info.tradable),
+            (cls._shortable, info.shortable),
+            (cls._easy_to_borrow, info.easy_to_borrow),
+            (cls._special, info.is_special_security),
+        ):
+            if flag:
+                members.add(symbol)
+            else:
+                members.discard(symbol)
+
+    @classmethod
+    def _remove(cls, symbol: str):
+        cls._assets.pop(symbol, None)
+        for members in (cls._tradable, cls._shortable, cls._easy_to_borrow, cls._special):
+            members.discard(symbol)
+
+    # ------------------------------------------------------------------
+    # Local snapshot (restarts within a session skip the download)
+    # ------------------------------------------------------------------
+
+    @classmethod
+    async def _load_snapshot(cls) -> bool:
+        if not cls.snapshot_path or not os.path.exists(cls.snapshot_path):
+            return False
+        try:
+            data = await asyncio.to_thread(cls._read_snapshot, cls.snapshot_path)
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable asset snapshot {cls.snapshot_path}: {e}")
+            return False
+
+        cls._apply(AssetInfo.from_row(row) for row in data.get("assets", []))
+        cls._session_date = data.get("session_date")
+        cls._refreshed_at = float(data.get("refreshed_at", 0.0))
+        logger.info(
+            f"Loaded {len(cls._assets)} assets from snapshot "
+            f"(session {cls._session_date})"
+        )
+        return True
+
+    @staticmethod
+    def _read_snapshot(path: str) -> Dict[str, Any]:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @classmethod
+    async def _save_snapshot(cls):
+        if not cls.snapshot_path:
+            return
+        data = {
+            "session_date": cls._session_date,
+            "refreshed_at": cls._refreshed_at,
+            "assets": [info.to_row() for info in cls._assets.values()],
+        }
+        try:
+            await asyncio.to_thread(cls._write_snapshot, cls.snapshot_path, data)
+        except OSError as e:
+            logger.warning(f"Failed to write asset snapshot {cls.snapshot_path}: {e}")
+
+    @staticmethod
+    def _write_snapshot(path: str, data: Dict[str, Any]):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
@@ -0,0 +1,208 @@
+"""
+Compute Executor
+Runs indicator and validation math off the event loop
+
+Indicator computation (pandas cleaning, TA-Lib) and the penny-stock
+validation math used to run inline on the single asyncio loop, so the CPU
+work for one ticker delayed quote fetches and exit checks for every other
+ticker. Jobs submitted here run in a small worker pool and hand an asyncio
+future back to the caller:
+
+- "thread": numpy/TA-Lib release the GIL, and pure-Python jobs still let
+  the loop run between GIL switch intervals instead of for the whole job
+- "process": pure-Python jobs in parallel; functions and arguments must
+  be picklable (module-level functions or classmethods, plain data)
+- "sync": jobs run inline on the loop and return a completed future
+  (tests, or COMPUTE_EXECUTOR_WORKERS=0)
+
+Per-ticker jobs can be grouped with submit_batch() so one worker call
+covers several tickers.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.src.common.loguru_logger import logger
+from app.src.common.metrics import Metrics
+from app.src.config.constants import (
+    COMPUTE_EXECUTOR_BATCH_SIZE,
+    COMPUTE_EXECUTOR_MODE,
+    COMPUTE_EXECUTOR_WORKERS,
+)
+
+MODES = ("thread", "process", "sync")
+
+
+def _run_batch(func: Callable[..., Any], jobs: Sequence[Tuple[Any, ...]]) -> List[Any]:
+    """Run func over each argument tuple; a failing job yields its exception"""
+    results: List[Any] = []
+    for args in jobs:
+        try:
+            results.append(func(*args))
+        except Exception as e:  # pylint: disable=broad-except
+            results.append(e)
+    return results
+
+
+class ComputeExecutor:
+    """
+    Shared worker pool for CPU-bound per-ticker work.
+
+    - run(): await one job
+    - submit(): start one job now, await the future later
+    - submit_batch(): start one worker call covering several jobs
+    - map(): batched jobs over an iterable of argument tuples
+    """
+
+    mode: str = COMPUTE_EXECUTOR_MODE if COMPUTE_EXECUTOR_MODE in MODES else "thread"
+    workers: int = COMPUTE_EXECUTOR_WORKERS
+    batch_size: int = COMPUTE_EXECUTOR_BATCH_SIZE
+
+    _executor: Optional[Executor] = None
+    _inflight: int = 0
+    _stats: Dict[str, int] = {"jobs": 0, "batches": 0, "failed": 0}
+
+    @classmethod
+    def configure(
+        cls,
+        mode: Optional[str] = None,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ):
+        """
+        Set the execution mode and pool size (shuts down an existing pool).
+
+        Args:
+            mode: "thread", "process" or "sync"
+            workers: Pool size (0 runs jobs inline, like "sync")
+            batch_size: Default number of jobs per worker call in map()
+        """
+        if mode is not None and mode not in MODES:
+            raise ValueError(f"compute executor mode must be one of {MODES}, got {mode!r}")
+        cls.shutdown()
+        if mode is not None:
+            cls.mode = mode
+        if workers is not None:
+            cls.workers = workers
+        if batch_size is not None:
+            cls.batch_size = batch_size
+        cls._inflight = 0
+        cls._stats = {key: 0 for key in cls._stats}
+
+    @classmethod
+    def is_inline(cls) -> bool:
+        return cls.mode == "sync" or cls.workers <= 0
+
+    @classmethod
+    def _get_executor(cls) -> Executor:
+        if cls._executor is None:
+            if cls.mode == "process":
+                # spawn: forking a process that runs threads and an event loop is unsafe
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=cls.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                cls._executor = ThreadPoolExecutor(max_workers=cls.workers, thread_name_prefix="compute")
+            logger.info(f"Compute executor started ({cls.mode}, {cls.workers} workers)")
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the worker pool (queued jobs are cancelled)"""
+        executor, cls._executor = cls._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def submit(cls, func: Callable[..., Any], *args: Any) -> "asyncio.Future[Any]":
+        """
+        Start func(*args) off the loop.
+
+        Returns:
+            asyncio future for the result (already completed in sync mode)
+        """
+        return cls._dispatch(func, args, job_name=getattr(func, "__name__", "job"), count=1)
+
+    @classmethod
+    async def run(cls, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func(*args) off the loop and return its result"""
+        return await cls.submit(func, *args)
+
+    @classmethod
+    def submit_batch(cls, func: Callable[..., Any], jobs: Sequence[Tuple[Any, ...]]) -> "asyncio.Future[List[Any]]":
+        """
+        Start one worker call running func over several argument tuples.
+
+        Returns:
+            asyncio future for the results in job order; a job that raised
+            contributes its exception instead of a result
+        """
+        jobs = list(jobs)
+        return cls._dispatch(
+            _run_batch, (func, jobs), job_name=getattr(func, "__name__", "job"), count=len(jobs)
+        )
+
+    @classmethod
+    async def map(
+        cls,
+        func: Callable[..., Any],
+        jobs: Iterable[Tuple[Any, ...]],
+        batch_size: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Run func over argument tuples in batches of batch_size.
+
+        Returns:
+            Results in job order (exceptions in place of failed jobs)
+        """
+        jobs = list(jobs)
+        size = max(1, batch_size or cls.batch_size)
+        batches = [cls.submit_batch(func, jobs[i : i + size]) for i in range(0, len(jobs), size)]
+        results: List[Any] = []
+        for batch in await asyncio.gather(*batches):
+            results.extend(batch)
+        return results
+
+    @classmethod
+    def _dispatch(cls, func: Callable[..., Any], args: Tuple[Any, ...], job_name: str, count: int) -> "asyncio.Future[Any]":
+        loop = asyncio.get_running_loop()
+        cls._stats["jobs"] += count
+        cls._stats["batches"] += 1
+        Metrics.inc("compute_jobs_total", count, job=job_name, mode=cls.mode)
+        started = time.perf_counter()
+
+        if cls.is_inline():
+            future = loop.create_future()
+            try:
+                future.set_result(func(*args))
+            except Exception as e:  # pylint: disable=broad-except
+                cls._stats["failed"] += 1
+                future.set_exception(e)
+            Metrics.observe("compute_job_seconds", time.perf_counter() - started, job=job_name, mode=cls.mode)
+            return future
+
+        cls._inflight += 1
+        future = loop.run_in_executor(cls._get_executor(), func, *args)
+
+        def done(fut: "asyncio.Future[Any]"):
+            cls._inflight -= 1
+            if fut.cancelled() or fut.exception() is not None:
+                cls._stats["failed"] += 1
+            Metrics.observe("compute_job_seconds", time.perf_counter() - started, job=job_name, mode=cls.mode)
+
+        future.add_done_callback(done)
+        return future
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """Mode, pool size, jobs submitted and failed worker calls"""
+        return {
+            "mode": "sync" if cls.is_inline() else cls.mode,
+            "workers": cls.workers,
+            "batch_size": cls.batch_size,
+            "inflight": cls._inflight,
+            **cls._stats,
+        }
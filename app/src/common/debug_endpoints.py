@@ -0,0 +1,236 @@
+"""
+Debug Endpoints
+On-demand CPU profiling, heap diffs and asyncio task dumps for a live process
+
+Routes are registered on the health server only when DEBUG_ENDPOINTS_TOKEN is
+set, and every request must present it (Authorization: Bearer <token> or
+X-Debug-Token). Nothing here runs unless a route is called.
+"""
+
+import asyncio
+import hmac
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+from app.src.common.loguru_logger import logger
+from app.src.common.loop_watchdog import frame_label
+from app.src.common.memory_monitor import MemoryMonitor
+from app.src.config.constants import DEBUG_ENDPOINTS_TOKEN, DEBUG_PROFILE_MAX_SECONDS
+
+
+class DebugProfiler:
+    """Sampling profiler, heap differ and task dumper"""
+
+    _profile_lock: asyncio.Lock = asyncio.Lock()
+    _heap_lock: asyncio.Lock = asyncio.Lock()
+
+    @classmethod
+    def _collapse(cls, frame) -> str:
+        stack = []
+        while frame is not None:
+            stack.append(frame_label(frame, current_line=False))
+            frame = frame.f_back
+        return ";".join(reversed(stack))
+
+    @classmethod
+    def sample_thread(
+        cls, thread_id: int, seconds: float, interval_seconds: float, stop: threading.Event
+    ) -> Counter:
+        """
+        Sample the stack of `thread_id` every `interval_seconds` (runs on a
+        separate thread so the sampled thread keeps running normally).
+
+        Returns:
+            Counter of collapsed stacks ("outer;...;inner") -> samples
+        """
+        stacks: Counter = Counter()
+        deadline = time.monotonic() + seconds
+        while not stop.is_set() and time.monotonic() < deadline:
+            frame = sys._current_frames().get(thread_id)  # pylint: disable=protected-access
+            if frame is not None:
+                stacks[cls._collapse(frame)] += 1
+            del frame
+            stop.wait(interval_seconds)
+        return stacks
+
+    @classmethod
+    async def profile(cls, seconds: float, interval_seconds: float = 0.005) -> Counter:
+        """
+        Sample the event loop thread for `seconds` without stopping it.
+
+        Time spent idle in the selector shows up under select/poll frames,
+        so the flamegraph also shows how busy the loop was.
+        """
+        loop_thread_id = threading.get_ident()
+        stop = threading.Event()
+        try:
+            return await asyncio.to_thread(
+                cls.sample_thread, loop_thread_id, seconds, interval_seconds, stop
+            )
+        finally:
+            stop.set()
+
+    @staticmethod
+    def collapsed_text(stacks: Counter) -> str:
+        """Brendan Gregg collapsed-stack format (flamegraph.pl / speedscope)"""
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    @classmethod
+    async def heap_diff(cls, seconds: float, top_n: int = 25) -> Dict[str, Any]:
+        """
+        Snapshot the heap, wait, snapshot again and diff by allocation site.
+
+        tracemalloc is started only for the duration of the call (unless it
+        was already tracing) because it slows down every allocation.
+        """
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start(10)
+        try:
+            before = tracemalloc.take_snapshot()
+            await asyncio.sleep(seconds)
+            after = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started_here:
+                tracemalloc.stop()
+
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ]
+        diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+        top = after.filter_traces(filters).statistics("lineno")
+        return {
+            "rss_mb": round(MemoryMonitor.get_current_memory_mb(), 1),
+            "traced_current_mb": round(current / 1024 / 1024, 2),
+            "traced_peak_mb": round(peak / 1024 / 1024, 2),
+            "window_seconds": seconds,
+            "growth": [
+                {
+                    "site": str(stat.traceback[0]),
+                    "size_diff_kb": round(stat.size_diff / 1024, 1),
+                    "count_diff": stat.count_diff,
+                }
+                for stat in diff[:top_n]
+            ],
+            "top": [
+                {"site": str(stat.traceback[0]), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+                for stat in top[:top_n]
+            ],
+        }
+
+    @staticmethod
+    def dump_tasks(stack_limit: int = 20) -> List[Dict[str, Any]]:
+        """All asyncio tasks with the frames they are currently suspended in"""
+        current = asyncio.current_task()
+        tasks = []
+        for task in asyncio.all_tasks():
+            coro = task.get_coro()
+            stack = [
+                f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+                for frame in task.get_stack(limit=stack_limit)
+            ]
+            tasks.append(
+                {
+                    "name": task.get_name(),
+                    "coro": getattr(coro, "__qualname__", repr(coro)),
+                    "done": task.done(),
+                    "cancelled": task.cancelled(),
+                    "current": task is current,
+                    "stack": stack,
+                }
+            )
+        tasks.sort(key=lambda t: t["name"])
+        return tasks
+
+
+def _authorized(request: web.Request, token: str) -> bool:
+    supplied = request.headers.get("X-Debug-Token", "")
+    auth = request.headers.get("Authorization", "")
+    if auth.startswith("Bearer "):
+        supplied = auth[len("Bearer "):]
+    return bool(supplied) and hmac.compare_digest(supplied.encode(), token.encode())
+
+
+def _seconds_param(request: web.Request, default: float) -> float:
+    try:
+        seconds = float(request.query.get("seconds", default))
+    except ValueError as e:
+        raise web.HTTPBadRequest(text="seconds must be a number") from e
+    if not 0 < seconds <= DEBUG_PROFILE_MAX_SECONDS:
+        raise web.HTTPBadRequest(text=f"seconds must be in (0, {DEBUG_PROFILE_MAX_SECONDS:g}]")
+    return seconds
+
+
+def _require_token(token: str):
+    @web.middleware
+    async def middleware(request: web.Request, handler):
+        if request.path.startswith("/debug/") and not _authorized(request, token):
+            raise web.HTTPUnauthorized(text="missing or invalid debug token")
+        return await handler(request)
+
+    return middleware
+
+
+async def profile_handler(request: web.Request) -> web.Response:
+    """GET /debug/profile?seconds=N -> collapsed stacks for flamegraph.pl/speedscope"""
+    seconds = _seconds_param(request, 10)
+    if DebugProfiler._profile_lock.locked():  # pylint: disable=protected-access
+        raise web.HTTPConflict(text="a profile is already running")
+    async with DebugProfiler._profile_lock:  # pylint: disable=protected-access
+        logger.info(f"Debug CPU profile started for {seconds:g}s")
+        stacks = await DebugProfiler.profile(seconds)
+    return web.Response(
+        text=DebugProfiler.collapsed_text(stacks),
+        headers={"Content-Disposition": 'attachment; filename="profile.collapsed"'},
+    )
+
+
+async def heap_handler(request: web.Request) -> web.Response:
+    """GET /debug/heap?seconds=N&top=K -> allocation growth over the window"""
+    seconds = _seconds_param(request, 5)
+    try:
+        top_n = int(request.query.get("top", 25))
+    except ValueError as e:
+        raise web.HTTPBadRequest(text="top must be an integer") from e
+    if DebugProfiler._heap_lock.locked():  # pylint: disable=protected-access
+        raise web.HTTPConflict(text="a heap diff is already running")
+    async with DebugProfiler._heap_lock:  # pylint: disable=protected-access
+        logger.info(f"Debug heap diff started for {seconds:g}s")
+        result = await DebugProfiler.heap_diff(seconds, top_n=top_n)
+    return web.json_response(result)
+
+
+async def tasks_handler(request: web.Request) -> web.Response:
+    """GET /debug/tasks -> asyncio tasks with their current stacks"""
+    tasks = DebugProfiler.dump_tasks()
+    return web.json_response({"count": len(tasks), "tasks": tasks})
+
+
+def register_debug_routes(app: web.Application, token: Optional[str] = None) -> bool:
+    """
+    Add /debug/profile, /debug/heap and /debug/tasks to the health server.
+
+    Args:
+        app: aiohttp application (before it is started)
+        token: Shared secret (defaults to DEBUG_ENDPOINTS_TOKEN)
+
+    Returns:
+        True if the routes were registered (a token is configured)
+    """
+    token = token if token is not None else DEBUG_ENDPOINTS_TOKEN
+    if not token:
+        return False
+    app.middlewares.append(_require_token(token))
+    app.router.add_get("/debug/profile", profile_handler)
+    app.router.add_get("/debug/heap", heap_handler)
+    app.router.add_get("/debug/tasks", tasks_handler)
+    logger.info("Debug endpoints enabled: /debug/profile, /debug/heap, /debug/tasks")
+    return True
@@ -7,6 +7,7 @@ Implements requirements 16.1, 16.2, 16.3, 16.4, 16.5
 
 from typing import Dict, Any, Optional
 from loguru import logger
+from app.src.common.loguru_logger import is_level_enabled
 
 
 def log_signal(
@@ -36,6 +37,12 @@ def log_signal(
         profit_loss: Profit/loss amount (for exit signals)
         **extra_fields: Additional fields to include in log
     """
+    # Skip building the payload when INFO is filtered out; the message (and
+    # the indicator summary) is formatted lazily, and log_data is serialized
+    # on the background log writer thread
+    if not is_level_enabled("INFO"):
+        return
+
     log_data = {
         "signal_type": signal_type,
         "ticker": ticker,
@@ -52,21 +59,28 @@ def log_signal(
     # Add any extra fields
     log_data.update(extra_fields)
     
-    # Format technical indicators for readability
-    tech_summary = _format_technical_indicators(technical_indicators)
-    
+    # Format technical indicators for readability; the whole message is built
+    # only if a sink takes the record
     if signal_type == "ENTRY":
-        logger.info(
-            f"📈 {signal_type} SIGNAL: {ticker} | {action} @ ${price:.2f} | "
-            f"Indicator: {indicator_name} | Reason: {reason} | Tech: {tech_summary}",
-            extra=log_data
+        logger.opt(lazy=True).info(
+            "{}",
+            lambda: (
+                f"📈 {signal_type} SIGNAL: {ticker} | {action} @ ${price:.2f} | "
+                f"Indicator: {indicator_name} | Reason: {reason} | "
+                f"Tech: {_format_technical_indicators(technical_indicators)}"
+            ),
+            extra=lambda: log_data
         )
     else:  # EXIT
         pl_str = f"P/L: ${profit_loss:.2f}" if profit_loss is not None else ""
-        logger.info(
-            f"📉 {signal_type} SIGNAL: {ticker} | {action} @ ${price:.2f} | "
-            f"{pl_str} | Indicator: {indicator_name} | Reason: {reason} | Tech: {tech_summary}",
-            extra=log_data
+        logger.opt(lazy=True).info(
+            "{}",
+            lambda: (
+                f"📉 {signal_type} SIGNAL: {ticker} | {action} @ ${price:.2f} | "
+                f"{pl_str} | Indicator: {indicator_name} | Reason: {reason} | "
+                f"Tech: {_format_technical_indicators(technical_indicators)}"
+            ),
+            extra=lambda: log_data
         )
 
 
@@ -7,13 +7,25 @@ timezone handling, and environment-based log levels.
 Supports two output modes:
 - Development: Human-readable pipe-delimited format with colors
 - Production: JSON format for Datadog parsing and facets
+
+Records are handed to a background writer thread (bounded queue, batched
+stdout writes) so serialization and I/O never run on the event loop; in JSON
+mode the record's fields are copied to a plain dict first, since the live
+record (and its `extra`) can change after the call returns. Use
+lazy arguments (`logger.debug("... {}", value)` or `logger.opt(lazy=True)`)
+and `sampled()` for per-ticker debug lines in hot loops.
 """
 
+import atexit
 import json
 import logging
 import os
+import queue
 import sys
+import threading
+import time
 from datetime import timezone
+from typing import Any, Callable, Dict, Optional
 
 from loguru import logger
 
@@ -32,14 +44,21 @@ is_production = os.getenv("DYNO") or os.getenv("ENVIRONMENT", "development").low
 is_development = not is_production
 
 
-def json_serializer(record):
+def _plain(value: Any) -> Any:
+    """Copy of nested dicts/lists/sets so later mutation by the caller can't leak in"""
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def record_fields(record) -> Dict[str, Any]:
     """
-    Serialize log record to JSON format for Datadog.
-    
-    This enables:
-    - Automatic facet creation in Datadog
-    - Easy filtering by any field
-    - Full structured data visibility
+    Snapshot a loguru record into the plain dict json_serializer emits.
+
+    Cheap enough for the logging thread; the json.dumps is left to the
+    background writer.
     """
     subset = {
         "timestamp": record["time"].strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
@@ -58,17 +77,34 @@ def json_serializer(record):
         for key, value in record["extra"].items():
             # Avoid overwriting core fields
             if key not in subset:
-                subset[key] = value
+                subset[key] = _plain(value)
     
     # Add exception info if present
     if record["exception"]:
         subset["exception"] = {
             "type": record["exception"].type.__name__ if record["exception"].type else None,
             "value": str(record["exception"].value) if record["exception"].value else None,
-            "traceback": record["exception"].traceback,
+            "traceback": str(record["exception"].traceback) if record["exception"].traceback else None,
         }
     
-    return json.dumps(subset, default=str)
+    return subset
+
+
+def serialize_fields(fields: Dict[str, Any]) -> str:
+    """JSON line for a record_fields() snapshot"""
+    return json.dumps(fields, default=str)
+
+
+def json_serializer(record):
+    """
+    Serialize log record to JSON format for Datadog.
+    
+    This enables:
+    - Automatic facet creation in Datadog
+    - Easy filtering by any field
+    - Full structured data visibility
+    """
+    return serialize_fields(record_fields(record))
 
 
 def json_sink(message):
@@ -77,10 +113,151 @@ def json_sink(message):
     print(json_serializer(record), flush=True)
 
 
+# Background writer configuration
+LOG_ASYNC_WRITER = os.getenv("LOG_ASYNC_WRITER", "true").lower() == "true"
+LOG_QUEUE_MAX_SIZE = int(os.getenv("LOG_QUEUE_MAX_SIZE", "10000"))
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "256"))
+LOG_FLUSH_INTERVAL_SECONDS = float(os.getenv("LOG_FLUSH_INTERVAL_SECONDS", "0.25"))
+LOG_SAMPLE_INTERVAL_SECONDS = float(os.getenv("LOG_SAMPLE_INTERVAL_SECONDS", "30"))
+
+
+class BackgroundLogWriter:
+    """
+    Bounded queue drained by a daemon thread that writes batches to a stream.
+
+    Items are either preformatted strings or record_fields() snapshots that
+    still need serializing (JSON mode), so json.dumps also runs off the event
+    loop.
+    When the queue is full new lines are dropped and counted rather than
+    blocking the caller.
+    """
+
+    def __init__(
+        self,
+        stream=None,
+        serializer: Optional[Callable[[Dict[str, Any]], str]] = None,
+        max_size: int = LOG_QUEUE_MAX_SIZE,
+        batch_size: int = LOG_BATCH_SIZE,
+        flush_interval_seconds: float = LOG_FLUSH_INTERVAL_SECONDS,
+    ):
+        self._stream = stream
+        self._serializer = serializer
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_size)
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval_seconds
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.total_dropped = 0
+        self.written = 0
+        self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+        self._thread.start()
+
+    @property
+    def stream(self):
+        # Resolved lazily so redirected/captured stdout is honoured
+        return self._stream if self._stream is not None else sys.stdout
+
+    def record_sink(self, message) -> None:
+        """
+        Loguru sink that defers serialization to the writer thread.
+
+        The record is snapshotted here, on the logging thread: the live
+        record and its `extra` dict may be mutated once the call returns.
+        """
+        self._put(record_fields(message.record))
+
+    def text_sink(self, message) -> None:
+        """Loguru sink for already-formatted messages"""
+        self._put(str(message))
+
+    def _put(self, item: Any) -> None:
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _render(self, item: Any) -> str:
+        if isinstance(item, str):
+            return item
+        try:
+            return self._serializer(item) + "\n"
+        except Exception as e:  # pylint: disable=broad-except
+            return json.dumps({"level": "ERROR", "message": f"Log serialization failed: {e}"}) + "\n"
+
+    def _write_batch(self, batch) -> None:
+        if not batch:
+            return
+        dropped = 0
+        with self._lock:
+            if self.dropped:
+                dropped, self.dropped = self.dropped, 0
+                self.total_dropped += dropped
+        lines = [self._render(item) for item in batch]
+        if dropped:
+            notice = f"Log queue full: dropped {dropped} log lines"
+            if self._serializer is not None:
+                notice = json.dumps({"level": "WARNING", "message": notice})
+            lines.append(notice + "\n")
+        try:
+            stream = self.stream
+            stream.write("".join(lines))
+            stream.flush()
+        except Exception:  # pylint: disable=broad-except
+            pass
+        self.written += len(batch)
+
+    def _drain(self, first=None) -> None:
+        batch = [] if first is None else [first]
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._write_batch(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                item = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                continue
+            self._drain(item)
+        while not self._queue.empty():
+            self._drain()
+
+    def flush(self, timeout: float = 2.0) -> None:
+        """Wait (bounded) until queued lines are written"""
+        deadline = time.monotonic() + timeout
+        while not self._queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Stop the writer thread after draining the queue"""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Queue depth and write/drop counters"""
+        return {
+            "queue_depth": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped + self.total_dropped,
+        }
+
+
+log_writer: Optional[BackgroundLogWriter] = None
+
 if is_production:
     # Production: JSON output for Datadog
+    if LOG_ASYNC_WRITER:
+        log_writer = BackgroundLogWriter(serializer=serialize_fields)
+        sink = log_writer.record_sink
+    else:
+        sink = json_sink
     logger.add(
-        json_sink,
+        sink,
         level=LOG_LEVEL,
         enqueue=False,
         backtrace=True,
@@ -88,8 +265,10 @@ if is_production:
     )
 else:
     # Development: Human-readable output with colors
+    if LOG_ASYNC_WRITER:
+        log_writer = BackgroundLogWriter()
     logger.add(
-        sys.stdout,
+        log_writer.text_sink if log_writer else sys.stdout,
         level=LOG_LEVEL,
         format=LOG_FORMAT,
         colorize=True,
@@ -98,6 +277,65 @@ else:
         diagnose=False,
     )
 
+if log_writer is not None:
+    atexit.register(log_writer.close)
+
+
+_LEVEL_CACHE: Dict[str, bool] = {}
+
+
+def is_level_enabled(level: str) -> bool:
+    """
+    Cheap guard for log calls whose arguments are expensive to build.
+
+    Args:
+        level: Level name (e.g. "DEBUG")
+
+    Returns:
+        True if a record at this level would be emitted
+    """
+    enabled = _LEVEL_CACHE.get(level)
+    if enabled is None:
+        enabled = logger.level(level).no >= logger.level(LOG_LEVEL).no
+        _LEVEL_CACHE[level] = enabled
+    return enabled
+
+
+_sample_lock = threading.Lock()
+_sample_last: Dict[str, float] = {}
+_sample_suppressed: Dict[str, int] = {}
+
+
+def sampled(site: str, interval_seconds: float = LOG_SAMPLE_INTERVAL_SECONDS) -> bool:
+    """
+    Per-call-site rate limit for noisy (e.g. per-ticker) log lines.
+
+    Args:
+        site: Stable call-site key (e.g. "momentum.calculate_momentum")
+        interval_seconds: Minimum time between emitted lines for the site
+
+    Returns:
+        True if the caller should log now; otherwise the call is counted as suppressed
+    """
+    now = time.monotonic()
+    with _sample_lock:
+        last = _sample_last.get(site)
+        if last is None or now - last >= interval_seconds:
+            _sample_last[site] = now
+            return True
+        _sample_suppressed[site] = _sample_suppressed.get(site, 0) + 1
+        return False
+
+
+def get_log_stats() -> Dict[str, Any]:
+    """Writer queue/drop counters and per-site suppressed line counts"""
+    with _sample_lock:
+        suppressed = dict(_sample_suppressed)
+    return {
+        "writer": log_writer.get_stats() if log_writer else None,
+        "sampled_suppressed": suppressed,
+    }
+
 # Suppress noisy third-party library logs
 logging.getLogger("httpx").setLevel(logging.WARNING)
 logging.getLogger("httpcore").setLevel(logging.WARNING)
@@ -105,4 +343,4 @@ logging.getLogger("botocore").setLevel(logging.WARNING)
 logging.getLogger("boto3").setLevel(logging.WARNING)
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-__all__ = ["logger"]
+__all__ = ["logger", "is_level_enabled", "sampled", "get_log_stats"]
@@ -0,0 +1,299 @@
+"""
+Loop Watchdog
+Continuous event-loop lag measurement and blocking-call attribution
+
+Everything runs on one asyncio loop, so synchronous work (pandas cleaning,
+TA-Lib, gc.collect(), log formatting, Decimal conversion) delays every
+other task, including the 1-second penny exit cycle. A watchdog task sleeps
+for a fixed interval and records how late it wakes up. A helper thread
+watches the task's heartbeat; when the loop has not come back within the
+threshold, it grabs the loop thread's current frame with
+sys._current_frames() and records the innermost application frame as the
+blocking call site. The stall is attributed to that site once the loop
+resumes and the real lag is known.
+
+Lag percentiles and per-site stall counters are exported on /metrics; the
+top sites with their stacks are on /health.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.src.common.loguru_logger import logger
+from app.src.common.metrics import Metrics
+from app.src.config.constants import (
+    LOOP_WATCHDOG_ENABLED,
+    LOOP_WATCHDOG_INTERVAL_SECONDS,
+    LOOP_WATCHDOG_THRESHOLD_SECONDS,
+    LOOP_WATCHDOG_TOP_N,
+    LOOP_WATCHDOG_WINDOW_SIZE,
+)
+
+LAG_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+_PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+_APP_MARKER = "/app/src/"
+
+
+def frame_label(frame, current_line: bool = True) -> str:
+    """
+    "function (path:line)" label for a stack frame; app paths are shortened
+    to app/src/..., anything else to its file name.
+
+    Args:
+        frame: Python frame object
+        current_line: Use the executing line (False: the function's first
+            line, so samples from one function aggregate together)
+    """
+    code = frame.f_code
+    filename = code.co_filename
+    if _APP_MARKER in filename:
+        filename = "app/src/" + filename.split(_APP_MARKER, 1)[1]
+    else:
+        filename = filename.rsplit("/", 1)[-1]
+    line = frame.f_lineno if current_line else code.co_firstlineno
+    return f"{code.co_name} ({filename}:{line})"
+
+
+class LoopWatchdog:
+    """
+    Event-loop lag watchdog.
+
+    - start(): launch the measuring task and the stack-capturing thread
+    - lag_percentiles(): p50/p95/p99/max over the recent window
+    - get_stats(): lag percentiles and the worst blocking call sites
+    """
+
+    enabled: bool = LOOP_WATCHDOG_ENABLED
+    interval_seconds: float = LOOP_WATCHDOG_INTERVAL_SECONDS
+    threshold_seconds: float = LOOP_WATCHDOG_THRESHOLD_SECONDS
+    window_size: int = LOOP_WATCHDOG_WINDOW_SIZE
+    top_n: int = LOOP_WATCHDOG_TOP_N
+    # Distinct site labels exported before the rest are folded into "other"
+    max_sites: int = 50
+    # Repeated stalls at one site are logged at most this often
+    log_interval_seconds: float = 60.0
+    stack_depth: int = 12
+
+    _task: Optional[asyncio.Task] = None
+    _thread: Optional[threading.Thread] = None
+    _stop_event: Optional[threading.Event] = None
+    _lock = threading.Lock()
+    _heartbeat: float = 0.0
+    # (heartbeat the stall started from, call site, stack) set by the helper thread
+    _pending: Optional[Tuple[float, str, List[str]]] = None
+    _samples: Deque[float] = deque(maxlen=LOOP_WATCHDOG_WINDOW_SIZE)
+    _sites: Dict[str, Dict[str, Any]] = {}
+    _last_logged: Dict[str, float] = {}
+    _stats: Dict[str, int] = {"samples": 0, "stalls": 0, "unattributed": 0}
+
+    @classmethod
+    def reset(cls):
+        """Drop samples, call sites and counters (tests)"""
+        with cls._lock:
+            cls._pending = None
+        cls._task = None
+        cls._thread = None
+        cls._stop_event = None
+        cls._samples = deque(maxlen=cls.window_size)
+        cls._sites = {}
+        cls._last_logged = {}
+        cls._stats = {key: 0 for key in cls._stats}
+
+    @classmethod
+    def is_running(cls) -> bool:
+        return cls._task is not None and not cls._task.done()
+
+    @classmethod
+    def start(cls) -> bool:
+        """Start the watchdog on the running loop (no-op when disabled or already running)"""
+        if not cls.enabled or cls.is_running():
+            return False
+        loop = asyncio.get_running_loop()
+        cls._heartbeat = time.monotonic()
+        cls._stop_event = threading.Event()
+        cls._thread = threading.Thread(
+            target=cls._watch,
+            args=(threading.get_ident(), cls._stop_event),
+            name="LoopWatchdog",
+            daemon=True,
+        )
+        cls._thread.start()
+        cls._task = loop.create_task(cls.run(), name="LoopWatchdog")
+        logger.info(
+            f"Loop watchdog started (interval: {cls.interval_seconds}s, "
+            f"threshold: {cls.threshold_seconds}s)"
+        )
+        return True
+
+    @classmethod
+    async def stop(cls):
+        """Cancel the measuring task and join the helper thread"""
+        if cls._stop_event is not None:
+            cls._stop_event.set()
+        task = cls._task
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        thread = cls._thread
+        if thread is not None and thread.is_alive():
+            await asyncio.to_thread(thread.join, 1.0)
+        cls._task = None
+        cls._thread = None
+
+    # ------------------------------------------------------------------
+    # Measurement (event loop)
+    # ------------------------------------------------------------------
+
+    @classmethod
+    async def run(cls):
+        """Sleep for interval_seconds and record how late each wake-up is"""
+        try:
+            while True:
+                started_from = cls._heartbeat
+                expected = time.monotonic() + cls.interval_seconds
+                await asyncio.sleep(cls.interval_seconds)
+                now = time.monotonic()
+                cls._heartbeat = now
+                cls._record_lag(max(0.0, now - expected), started_from)
+        except asyncio.CancelledError:
+            pass
+
+    @classmethod
+    def _record_lag(cls, lag: float, started_from: Optional[float] = None):
+        """Record one lag sample; stalls over the threshold are attributed to a call site"""
+        cls._samples.append(lag)
+        cls._stats["samples"] += 1
+        Metrics.observe("event_loop_lag_seconds", lag, buckets=LAG_BUCKETS)
+        if lag < cls.threshold_seconds:
+            return
+
+        with cls._lock:
+            pending, cls._pending = cls._pending, None
+        if pending is not None and pending[0] == started_from:
+            _, site, stack = pending
+        else:
+            site, stack = "unknown", []
+            cls._stats["unattributed"] += 1
+        cls._stats["stalls"] += 1
+
+        entry = cls._sites.get(site)
+        if entry is None:
+            if len(cls._sites) >= cls.max_sites:
+                site = "other"
+                entry = cls._sites.get(site)
+            if entry is None:
+                entry = cls._sites[site] = {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "stack": stack}
+        entry["count"] += 1
+        entry["total_seconds"] += lag
+        if lag > entry["max_seconds"]:
+            entry["max_seconds"] = lag
+            entry["stack"] = stack
+
+        Metrics.inc("event_loop_blocked_total", site=site)
+        Metrics.inc("event_loop_blocked_seconds_total", lag, site=site)
+
+        now = time.monotonic()
+        if now - cls._last_logged.get(site, float("-inf")) >= cls.log_interval_seconds:
+            cls._last_logged[site] = now
+            logger.warning(
+                f"🐢 Event loop blocked for {lag * 1000:.0f}ms in {site} "
+                f"({entry['count']} stalls at this site)"
+            )
+
+    # ------------------------------------------------------------------
+    # Stack capture (helper thread)
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _watch(cls, loop_thread_id: int, stop_event: threading.Event):
+        """Capture the loop thread's frame once per stall that passes the threshold"""
+        poll = min(cls.interval_seconds, cls.threshold_seconds) / 2
+        captured_for = None
+        while not stop_event.wait(poll):
+            heartbeat = cls._heartbeat
+            if heartbeat == captured_for:
+                continue
+            if time.monotonic() - heartbeat - cls.interval_seconds < cls.threshold_seconds:
+                continue
+            frame = sys._current_frames().get(loop_thread_id)  # pylint: disable=protected-access
+            if frame is None:
+                continue
+            try:
+                site, stack = cls._call_site(frame)
+            finally:
+                del frame
+            with cls._lock:
+                cls._pending = (heartbeat, site, stack)
+            captured_for = heartbeat
+
+    @classmethod
+    def _call_site(cls, frame) -> Tuple[str, List[str]]:
+        """
+        Blocking call site and stack (innermost first) for a frame.
+
+        The site is the innermost application frame, so time spent inside
+        pandas or TA-Lib is charged to the app line that called it; the
+        innermost frame is used when no application frame is on the stack.
+        """
+        site = None
+        stack = []
+        while frame is not None:
+            label = frame_label(frame)
+            if len(stack) < cls.stack_depth:
+                stack.append(label)
+            if site is None and _APP_MARKER in frame.f_code.co_filename:
+                site = label
+            frame = frame.f_back
+        return site or (stack[0] if stack else "unknown"), stack
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def lag_percentiles(cls) -> Dict[str, float]:
+        """p50/p95/p99/max lag in seconds over the recent window (empty before any sample)"""
+        samples = sorted(cls._samples)
+        if not samples:
+            return {}
+        last = len(samples) - 1
+        result = {name: samples[min(last, int(q * len(samples)))] for name, q in _PERCENTILES}
+        result["max"] = samples[-1]
+        return result
+
+    @classmethod
+    def publish_metrics(cls):
+        """Set the windowed lag percentile gauges (called on each /metrics scrape)"""
+        for name, value in cls.lag_percentiles().items():
+            Metrics.set_gauge("event_loop_lag_window_seconds", value, quantile=name)
+
+    @classmethod
+    def top_sites(cls, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Blocking call sites ordered by total blocked time"""
+        ranked = sorted(cls._sites.items(), key=lambda item: item[1]["total_seconds"], reverse=True)
+        return [
+            {
+                "site": site,
+                "count": entry["count"],
+                "total_seconds": round(entry["total_seconds"], 3),
+                "max_seconds": round(entry["max_seconds"], 3),
+                "stack": entry["stack"],
+            }
+            for site, entry in ranked[: limit if limit is not None else cls.top_n]
+        ]
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """Lag percentiles (ms), stall counters and the worst blocking call sites"""
+        return {
+            "enabled": cls.enabled,
+            "running": cls.is_running(),
+            "threshold_ms": round(cls.threshold_seconds * 1000, 1),
+            "lag_ms": {name: round(value * 1000, 1) for name, value in cls.lag_percentiles().items()},
+            **cls._stats,
+            "top_sites": cls.top_sites(),
+        }
@@ -0,0 +1,269 @@
+"""
+Market Session
+Exchange-calendar based market clock (replaces per-cycle /clock lookups)
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytz  # type: ignore
+
+from app.src.common.alpaca import AlpacaClient
+from app.src.common.loguru_logger import logger
+from app.src.config.constants import DEBUG_DAY_TRADING
+
+EST_TZ = pytz.timezone("America/New_York")
+
+# Regular session close (entry cutoffs are shifted earlier on early-close days)
+REGULAR_CLOSE_HOUR_ET = 16
+
+
+@dataclass(frozen=True)
+class TradingSession:
+    """One trading day with open/close instants as UTC epoch seconds"""
+
+    session_date: date
+    open_at: float
+    close_at: float
+
+    @property
+    def is_early_close(self) -> bool:
+        close_et = datetime.fromtimestamp(self.close_at, EST_TZ)
+        return close_et.hour < REGULAR_CLOSE_HOUR_ET
+
+    def instant_et(self, hour: int, minute: int) -> float:
+        """Epoch seconds of hour:minute ET on this session's date"""
+        local = EST_TZ.localize(
+            datetime(self.session_date.year, self.session_date.month, self.session_date.day, hour, minute)
+        )
+        return local.timestamp()
+
+
+class MarketSession:
+    """
+    Market open/close state computed from the Alpaca trading calendar.
+
+    The calendar is loaded once (about a month ahead) and every query is
+    answered from a monotonic clock without locks or API calls, including
+    holidays and early closes. Falls back to AlpacaClient.clock() when the
+    calendar can't be loaded.
+    """
+
+    load_days_ahead: int = 35
+    # Reload when fewer than this many days of sessions remain
+    reload_margin_days: int = 7
+    # Retry interval after a failed calendar load
+    retry_seconds: float = 60.0
+
+    _sessions: List[TradingSession] = []
+    _idx: int = 0
+    _wall_anchor: float = 0.0
+    _mono_anchor: float = 0.0
+    _reload_at_mono: float = 0.0
+    _load_lock: asyncio.Lock = asyncio.Lock()
+    _cutoff_cache: Dict[Tuple[date, int, int], float] = {}
+
+    @classmethod
+    def reset(cls):
+        """Drop the loaded calendar (next query reloads it)"""
+        cls._sessions = []
+        cls._idx = 0
+        cls._reload_at_mono = 0.0
+        cls._cutoff_cache = {}
+
+    @classmethod
+    def _now(cls) -> float:
+        """Current epoch seconds derived from the monotonic clock"""
+        return cls._wall_anchor + (time.monotonic() - cls._mono_anchor)
+
+    @classmethod
+    def load_sessions(cls, calendar: List[Dict[str, Any]]) -> int:
+        """
+        Replace the session table from Alpaca calendar entries.
+
+        Args:
+            calendar: Entries with "date" (YYYY-MM-DD), "open"/"close" (HH:MM ET)
+
+        Returns:
+            Number of sessions loaded
+        """
+        sessions = []
+        for entry in calendar:
+            try:
+                session_date = date.fromisoformat(entry["date"])
+                open_h, open_m = (int(x) for x in entry["open"].split(":")[:2])
+                close_h, close_m = (int(x) for x in entry["close"].split(":")[:2])
+            except (KeyError, ValueError, AttributeError) as e:
+                logger.debug(f"Skipping malformed calendar entry {entry}: {e}")
+                continue
+            base = TradingSession(session_date, 0.0, 0.0)
+            sessions.append(
+                TradingSession(
+                    session_date,
+                    base.instant_et(open_h, open_m),
+                    base.instant_et(close_h, close_m),
+                )
+            )
+        sessions.sort(key=lambda s: s.open_at)
+
+        cls._wall_anchor = time.time()
+        cls._mono_anchor = time.monotonic()
+        cls._sessions = sessions
+        cls._idx = 0
+        cls._cutoff_cache = {}
+        if sessions:
+            last_close = sessions[-1].close_at
+            reload_at = last_close - cls.reload_margin_days * 86400
+            cls._reload_at_mono = cls._mono_anchor + max(3600.0, reload_at - cls._wall_anchor)
+        return len(sessions)
+
+    @classmethod
+    async def ensure_loaded(cls) -> bool:
+        """
+        Load (or refresh) the calendar if needed; O(1) once loaded.
+
+        Returns:
+            True if a session table is available
+        """
+        if cls._sessions and time.monotonic() < cls._reload_at_mono:
+            return True
+        if not cls._sessions and time.monotonic() < cls._reload_at_mono:
+            return False  # recent load failed; wait before retrying
+
+        async with cls._load_lock:
+            if time.monotonic() < cls._reload_at_mono:
+                return bool(cls._sessions)
+            today = datetime.now(EST_TZ).date()
+            calendar = await AlpacaClient.calendar(
+                today - timedelta(days=1), today + timedelta(days=cls.load_days_ahead)
+            )
+            if calendar:
+                count = cls.load_sessions(calendar)
+                early = sum(1 for s in cls._sessions if s.is_early_close)
+                logger.info(
+                    f"Loaded market calendar: {count} sessions through "
+                    f"{cls._sessions[-1].session_date.isoformat() if cls._sessions else 'n/a'}"
+                    f" ({early} early close)"
+                )
+            else:
+                logger.warning(
+                    f"Could not load market calendar, retrying in {cls.retry_seconds:.0f}s"
+                )
+                cls._reload_at_mono = time.monotonic() + cls.retry_seconds
+        return bool(cls._sessions)
+
+    @classmethod
+    def current_session(cls) -> Optional[TradingSession]:
+        """The session in progress, or the next one if the market is closed"""
+        now = cls._now()
+        sessions = cls._sessions
+        while cls._idx < len(sessions) and sessions[cls._idx].close_at <= now:
+            cls._idx += 1
+        return sessions[cls._idx] if cls._idx < len(sessions) else None
+
+    @classmethod
+    def is_open(cls) -> bool:
+        """True if the market is open right now (requires a loaded calendar)"""
+        session = cls.current_session()
+        return session is not None and session.open_at <= cls._now() < session.close_at
+
+    @classmethod
+    def seconds_to_close(cls) -> float:
+        """Seconds until the current session closes (0 when closed)"""
+        session = cls.current_session()
+        now = cls._now()
+        if session is None or not session.open_at <= now < session.close_at:
+            return 0.0
+        return session.close_at - now
+
+    @classmethod
+    def seconds_to_open(cls) -> Optional[float]:
+        """Seconds until the next open (0 when open, None if unknown)"""
+        session = cls.current_session()
+        if session is None:
+            return None
+        return max(0.0, session.open_at - cls._now())
+
+    @classmethod
+    def is_near_close(cls, minutes: float) -> bool:
+        """
+        True if within `minutes` of the close, or the market is closed
+        (with DEBUG_DAY_TRADING a closed market uses the wall clock instead)
+        """
+        if not cls._sessions or (DEBUG_DAY_TRADING and not cls.is_open()):
+            return cls._wall_clock_past(REGULAR_CLOSE_HOUR_ET, 0, lead_minutes=minutes)
+        return not cls.is_open() or cls.seconds_to_close() <= minutes * 60
+
+    @classmethod
+    def past_entry_cutoff(cls, hour_et: int, minute_et: int = 0) -> bool:
+        """
+        True if new entries should stop: past hour:minute ET, or past the
+        equivalent point before an early close (e.g. 15:55 -> 12:55 on a
+        13:00 close), or the market is closed (with DEBUG_DAY_TRADING a
+        closed market uses the wall clock instead).
+        """
+        if not cls._sessions:
+            return cls._wall_clock_past(hour_et, minute_et)
+        session = cls.current_session()
+        now = cls._now()
+        if session is None or not session.open_at <= now < session.close_at:
+            if DEBUG_DAY_TRADING:
+                return cls._wall_clock_past(hour_et, minute_et)
+            return True
+
+        key = (session.session_date, hour_et, minute_et)
+        cutoff = cls._cutoff_cache.get(key)
+        if cutoff is None:
+            cutoff = session.instant_et(hour_et, minute_et)
+            lead = session.instant_et(REGULAR_CLOSE_HOUR_ET, 0) - cutoff
+            cutoff = min(cutoff, session.close_at - max(0.0, lead))
+            cls._cutoff_cache[key] = cutoff
+        return now >= cutoff
+
+    @staticmethod
+    def _wall_clock_past(hour_et: int, minute_et: int, lead_minutes: float = 0.0) -> bool:
+        """Fallback: compare against today's hour:minute ET on the wall clock"""
+        now_et = datetime.now(timezone.utc).astimezone(EST_TZ)
+        target = EST_TZ.localize(
+            datetime(now_et.year, now_et.month, now_et.day, hour_et, minute_et)
+        )
+        return (target - now_et).total_seconds() <= lead_minutes * 60
+
+    @classmethod
+    async def is_market_open(cls) -> bool:
+        """
+        Check if the market is open.
+
+        Returns:
+            True if open (always True with DEBUG_DAY_TRADING)
+        """
+        if DEBUG_DAY_TRADING:
+            return True
+        if await cls.ensure_loaded():
+            return cls.is_open()
+        return await AlpacaClient.is_market_open()
+
+    @classmethod
+    async def wait_for_open(cls, max_wait_seconds: float = 900.0, fallback_seconds: float = 5.0):
+        """
+        Sleep until the next session opens (capped at max_wait_seconds) instead
+        of polling every cycle. Returns immediately when the market is open.
+
+        Args:
+            max_wait_seconds: Longest single sleep (callers re-check and call again)
+            fallback_seconds: Sleep used when the calendar is unavailable
+        """
+        if DEBUG_DAY_TRADING:
+            return
+        if not await cls.ensure_loaded():
+            await asyncio.sleep(fallback_seconds)
+            return
+        delay = cls.seconds_to_open()
+        if delay is None:
+            await asyncio.sleep(fallback_seconds)
+            return
+        if delay > 0:
+            await asyncio.sleep(min(delay, max_wait_seconds))
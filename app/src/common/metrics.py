@@ -0,0 +1,240 @@
+"""
+Runtime Metrics
+In-process counters, gauges and histograms with Prometheus text exposition
+
+Disabled with METRICS_ENABLED=false, in which case `timed` returns the
+original function and `span` returns a shared no-op context manager.
+"""
+
+import bisect
+import contextlib
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# Seconds; covers sub-millisecond cache hits up to multi-minute cycles
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_NOOP_SPAN = contextlib.nullcontext()
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class _Span:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name: str, labels: Dict[str, Any]):
+        self.name = name
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        labels = dict(self.labels)
+        labels["stage"] = self.name
+        labels["outcome"] = "error" if exc_type is not None else "ok"
+        Metrics.observe("stage_duration_seconds", time.perf_counter() - self.start, **labels)
+        return False
+
+
+class Metrics:
+    """Process-wide metrics registry"""
+
+    enabled: bool = METRICS_ENABLED
+
+    _lock = threading.Lock()
+    _counters: Dict[str, Dict[LabelKey, float]] = {}
+    _gauges: Dict[str, Dict[LabelKey, float]] = {}
+    _histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+    _help: Dict[str, str] = {}
+
+    @classmethod
+    def reset(cls):
+        """Clear all recorded values"""
+        with cls._lock:
+            cls._counters = {}
+            cls._gauges = {}
+            cls._histograms = {}
+
+    @staticmethod
+    def _key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    @classmethod
+    def describe(cls, name: str, help_text: str):
+        """Attach HELP text to a metric"""
+        cls._help[name] = help_text
+
+    @classmethod
+    def inc(cls, name: str, value: float = 1.0, **labels: Any):
+        """Increment a counter"""
+        if not cls.enabled:
+            return
+        key = cls._key(labels)
+        with cls._lock:
+            series = cls._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    @classmethod
+    def set_gauge(cls, name: str, value: float, **labels: Any):
+        """Set a gauge to an absolute value"""
+        if not cls.enabled:
+            return
+        key = cls._key(labels)
+        with cls._lock:
+            cls._gauges.setdefault(name, {})[key] = float(value)
+
+    @classmethod
+    def observe(cls, name: str, value: float, buckets: Sequence[float] = DEFAULT_BUCKETS, **labels: Any):
+        """Record a histogram observation"""
+        if not cls.enabled:
+            return
+        key = cls._key(labels)
+        with cls._lock:
+            series = cls._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = _Histogram(buckets)
+                series[key] = histogram
+            histogram.observe(value)
+
+    @classmethod
+    def span(cls, stage: str, **labels: Any):
+        """
+        Time a pipeline stage into stage_duration_seconds{stage=...}.
+
+        Usage:
+            with Metrics.span("market_data_fetch", indicator="Penny Stocks"):
+                ...
+        """
+        if not cls.enabled:
+            return _NOOP_SPAN
+        return _Span(stage, labels)
+
+    @classmethod
+    def timed(cls, stage: str, **labels: Any) -> Callable:
+        """Decorator form of span() for sync and async functions"""
+
+        def decorator(func: Callable) -> Callable:
+            if not cls.enabled:
+                return func
+
+            if _is_coroutine_function(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with _Span(stage, labels):
+                        return await func(*args, **kwargs)
+
+                return async_wrapper
+
+            @functools.wraps(func)
+            def sync_wrapper(*args, **kwargs):
+                with _Span(stage, labels):
+                    return func(*args, **kwargs)
+
+            return sync_wrapper
+
+        return decorator
+
+    @classmethod
+    def get_counter(cls, name: str, **labels: Any) -> float:
+        """Current value of a counter series (0 if never incremented)"""
+        with cls._lock:
+            return cls._counters.get(name, {}).get(cls._key(labels), 0.0)
+
+    @classmethod
+    def get_histogram_count(cls, name: str, **labels: Any) -> int:
+        """Number of observations in a histogram series"""
+        with cls._lock:
+            histogram = cls._histograms.get(name, {}).get(cls._key(labels))
+            return histogram.count if histogram else 0
+
+    @staticmethod
+    def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = key + extra
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    @classmethod
+    def render_prometheus(cls) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        with cls._lock:
+            for kind, store in (("counter", cls._counters), ("gauge", cls._gauges)):
+                for name in sorted(store):
+                    if name in cls._help:
+                        lines.append(f"# HELP {name} {cls._help[name]}")
+                    lines.append(f"# TYPE {name} {kind}")
+                    for key, value in sorted(store[name].items()):
+                        lines.append(f"{name}{cls._format_labels(key)} {value:g}")
+
+            for name in sorted(cls._histograms):
+                if name in cls._help:
+                    lines.append(f"# HELP {name} {cls._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(cls._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(
+                            f"{name}_bucket{cls._format_labels(key, (('le', f'{bound:g}'),))} {cumulative}"
+                        )
+                    lines.append(
+                        f"{name}_bucket{cls._format_labels(key, (('le', '+Inf'),))} {histogram.count}"
+                    )
+                    lines.append(f"{name}_sum{cls._format_labels(key)} {histogram.total:g}")
+                    lines.append(f"{name}_count{cls._format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _is_coroutine_function(func: Callable) -> bool:
+    code = getattr(func, "__code__", None)
+    return bool(code is not None and code.co_flags & 0x80)  # CO_COROUTINE
+
+
+Metrics.describe("stage_duration_seconds", "Time spent per pipeline stage")
+Metrics.describe("cycle_duration_seconds", "Entry/exit cycle duration while the market is open")
+Metrics.describe("cycle_overrun_seconds", "Cycle time in excess of the configured cycle interval")
+Metrics.describe("api_requests_total", "External API responses by endpoint and status class")
+Metrics.describe("api_rate_limited_total", "HTTP 429 responses by endpoint")
+Metrics.describe("api_retries_total", "Retried API requests by endpoint")
+Metrics.describe("api_cache_requests_total", "External API response cache lookups by endpoint and result")
+Metrics.describe("db_pages_total", "DynamoDB result pages read by operation")
+Metrics.describe("market_regime_age_seconds", "Age of the published market regime snapshot")
+Metrics.describe("startup_phase_seconds", "Seconds from process start to each boot phase")
+Metrics.describe("event_loop_lag_seconds", "How late the loop watchdog's sleeps woke up")
+Metrics.describe("event_loop_lag_window_seconds", "Event-loop lag percentiles over the watchdog's recent window")
+Metrics.describe("event_loop_blocked_total", "Event-loop stalls over the watchdog threshold by blocking call site")
+Metrics.describe("event_loop_blocked_seconds_total", "Event-loop time lost to stalls by blocking call site")
+Metrics.describe("compute_jobs_total", "Jobs submitted to the compute executor by job and mode")
+Metrics.describe("compute_job_seconds", "Compute executor call time from submission to result (queue wait included)")
@@ -0,0 +1,90 @@
+"""
+Startup Timer
+Records how long each boot phase takes (import, health server bind,
+trading stack load, configure, first entry/exit cycle)
+
+Heroku kills a web dyno that does not bind $PORT within 60 seconds, so the
+app binds the health server before importing the trading stack. This module
+must stay import-light: app.py imports it first and its clock starts then.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.src.common.loguru_logger import logger
+from app.src.common.memory_monitor import MemoryMonitor
+from app.src.common.metrics import Metrics
+
+_PROCESS_T0 = time.perf_counter()
+
+
+class StartupTimer:
+    """
+    Boot phase timings, relative to the first import of this module.
+
+    Each phase is recorded once (the first mark wins) with the elapsed time
+    and the process RSS at that point. The report is logged when the final
+    phase (the first completed exit cycle) is reached.
+    """
+
+    FINAL_PHASE = "first_exit_cycle"
+
+    _phases: List[Tuple[str, float, float]] = []
+
+    @classmethod
+    def reset(cls):
+        """Forget recorded phases (tests)"""
+        cls._phases = []
+
+    @classmethod
+    def reached(cls, phase: str) -> bool:
+        """Whether a phase has been recorded"""
+        return any(name == phase for name, _, _ in cls._phases)
+
+    @classmethod
+    def elapsed(cls, phase: str) -> Optional[float]:
+        """Seconds from process start to the phase, or None if not reached"""
+        for name, seconds, _ in cls._phases:
+            if name == phase:
+                return seconds
+        return None
+
+    @classmethod
+    def mark(cls, phase: str) -> bool:
+        """
+        Record a boot phase (no-op if it was already recorded).
+
+        Args:
+            phase: Phase name, e.g. "import", "health_server", "configure"
+
+        Returns:
+            True if this call recorded the phase
+        """
+        if cls.reached(phase):
+            return False
+        seconds = time.perf_counter() - _PROCESS_T0
+        memory_mb = MemoryMonitor.get_current_memory_mb()
+        previous = cls._phases[-1][1] if cls._phases else 0.0
+        cls._phases.append((phase, seconds, memory_mb))
+        Metrics.set_gauge("startup_phase_seconds", seconds, phase=phase)
+        logger.info(
+            f"🚦 Startup phase '{phase}' at {seconds:.2f}s "
+            f"(+{seconds - previous:.2f}s, {memory_mb:.0f}MB)"
+        )
+        if phase == cls.FINAL_PHASE:
+            cls.log_report()
+        return True
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """Phase -> seconds since start and memory at that point"""
+        return {
+            name: {"seconds": round(seconds, 3), "memory_mb": round(memory_mb, 1)}
+            for name, seconds, memory_mb in cls._phases
+        }
+
+    @classmethod
+    def log_report(cls):
+        """Log all recorded phases on one line"""
+        summary = ", ".join(f"{name}={seconds:.2f}s" for name, seconds, _ in cls._phases)
+        logger.info(f"🚦 Startup report: {summary}")
@@ -11,8 +11,11 @@ from typing import Any, Callable, Union
 from typing_extensions import Dict
 
 import pytz
-from app.src.common.alpaca import AlpacaClient
 from app.src.common.loguru_logger import logger
+from app.src.common.market_session import MarketSession
+from app.src.common.startup_timer import StartupTimer
+from app.src.common.metrics import Metrics
+from app.src.models.price_series import PriceSeries
 from app.src.models.technical_indicators import TechnicalIndicators
 
 
@@ -85,10 +88,39 @@ def convert_utc_to_est(utc_timestamp: Union[str, datetime]) -> str:
     return est_dt.isoformat()
 
 
+def _record_cycle_metrics(owner: Any, func_name: str, elapsed_time: float, outcome: str) -> None:
+    """
+    Record cycle_duration_seconds (and overruns past the configured cycle
+    interval) for indicator entry/exit cycles; other functions are recorded
+    as a stage_duration_seconds span.
+    """
+    cycle = "entry" if "entry" in func_name else "exit" if "exit" in func_name else None
+    name_getter = getattr(owner, "indicator_name", None)
+    if cycle is None or not callable(name_getter):
+        Metrics.observe(
+            "stage_duration_seconds", elapsed_time, stage=func_name.lstrip("_"), outcome=outcome
+        )
+        return
+
+    indicator = name_getter()
+    Metrics.observe(
+        "cycle_duration_seconds", elapsed_time, indicator=indicator, cycle=cycle, outcome=outcome
+    )
+    interval = getattr(owner, f"{cycle}_cycle_seconds", None)
+    if isinstance(interval, (int, float)) and elapsed_time > interval:
+        Metrics.inc("cycle_overruns_total", indicator=indicator, cycle=cycle)
+        Metrics.observe(
+            "cycle_overrun_seconds", elapsed_time - interval, indicator=indicator, cycle=cycle
+        )
+
+
 def measure_latency(func: Callable) -> Callable:
     """
     Decorator to measure and log the execution latency of async functions.
 
+    While the market is open the duration is also recorded in the metrics
+    registry (cycle_duration_seconds for indicator entry/exit cycles).
+
     Usage:
         @measure_latency
         async def my_function():
@@ -103,63 +135,59 @@ def measure_latency(func: Callable) -> Callable:
     if not hasattr(func, "__name__"):
         return func
 
+    def _owner_of(args: tuple) -> Any:
+        # Handle both classmethods (args[0] is a class) and instance methods (args[0] is an instance)
+        if args and hasattr(args[0], "__class__"):
+            return args[0] if inspect.isclass(args[0]) else args[0].__class__
+        return None
+
     @functools.wraps(func)
     async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
         start_time = time.perf_counter()
         func_name = func.__name__
-        # Handle both classmethods (args[0] is a class) and instance methods (args[0] is an instance)
-        if args and hasattr(args[0], "__class__"):
-            if inspect.isclass(args[0]):
-                # For classmethods, args[0] is the class itself
-                class_name = args[0].__name__
-            else:
-                # For instance methods, args[0] is an instance
-                class_name = args[0].__class__.__name__
-        else:
-            class_name = ""
-        display_name = f"{class_name}.{func_name}" if class_name else func_name
+        owner = _owner_of(args)
+        display_name = f"{owner.__name__}.{func_name}" if owner is not None else func_name
 
         try:
             result = await func(*args, **kwargs)
             elapsed_time = time.perf_counter() - start_time
-            if await AlpacaClient.is_market_open():
+            if func_name == "_run_exit_cycle":
+                StartupTimer.mark("first_exit_cycle")
+            elif func_name == "_run_entry_cycle":
+                StartupTimer.mark("first_entry_cycle")
+            if await MarketSession.is_market_open():
                 logger.info(f"⏱️  {display_name} completed in {elapsed_time:.3f}s")
+                _record_cycle_metrics(owner, func_name, elapsed_time, "ok")
             return result
         except Exception as e:
             elapsed_time = time.perf_counter() - start_time
             logger.warning(
                 f"⏱️  {display_name} failed after {elapsed_time:.3f}s: {str(e)}"
             )
+            _record_cycle_metrics(owner, func_name, elapsed_time, "error")
             raise
 
     @functools.wraps(func)
     async def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
         start_time = time.perf_counter()
         func_name = func.__name__
-        # Handle both classmethods (args[0] is a class) and instance methods (args[0] is an instance)
-        if args and hasattr(args[0], "__class__"):
-            if inspect.isclass(args[0]):
-                # For classmethods, args[0] is the class itself
-                class_name = args[0].__name__
-            else:
-                # For instance methods, args[0] is an instance
-                class_name = args[0].__class__.__name__
-        else:
-            class_name = ""
-        display_name = f"{class_name}.{func_name}" if class_name else func_name
+        owner = _owner_of(args)
+        display_name = f"{owner.__name__}.{func_name}" if owner is not None else func_name
 
         try:
             # Run sync function in thread pool to make it awaitable
             result = await asyncio.to_thread(func, *args, **kwargs)
             elapsed_time = time.perf_counter() - start_time
-            if await AlpacaClient.is_market_open():
+            if await MarketSession.is_market_open():
                 logger.info(f"⏱️  {display_name} completed in {elapsed_time:.3f}s")
+                _record_cycle_metrics(owner, func_name, elapsed_time, "ok")
             return result
         except Exception as e:
             elapsed_time = time.perf_counter() - start_time
             logger.warning(
                 f"⏱️  {display_name} failed after {elapsed_time:.3f}s: {str(e)}"
             )
+            _record_cycle_metrics(owner, func_name, elapsed_time, "error")
             raise
 
     # Check if function is a coroutine function (async)
@@ -220,10 +248,13 @@ def dict_to_technical_indicators(indicators_dict: Dict) -> TechnicalIndicators |
             )
 
         datetime_price = indicators_dict.get("datetime_price", ())
-        if not isinstance(datetime_price, tuple):
+        if isinstance(datetime_price, dict):
+            # Persisted/legacy {iso_timestamp: price} form
+            datetime_price = PriceSeries.coerce(datetime_price)
+        elif not isinstance(datetime_price, (tuple, PriceSeries)):
             datetime_price = (
                 tuple(datetime_price)
-                if isinstance(datetime_price, (list, tuple))
+                if isinstance(datetime_price, list)
                 else ()
             )
 
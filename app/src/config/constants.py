@@ -3,6 +3,7 @@ Constants and configuration loaded from environment variables
 """
 
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -66,6 +67,77 @@ WEBHOOK_URLS = [url.strip() for url in WEBHOOK_URL.split(",") if url.strip()]
 WEBHOOK_TIMEOUT = 10  # Increase per-attempt timeout to reduce 504s
 WEBHOOK_RETRY_ATTEMPTS = 3  # Allow an extra retry during transient slowdowns
 WEBHOOK_RETRY_DELAY = 2  # Slightly longer backoff between attempts
+# Per-URL circuit breaker: open after N consecutive failures, probe again after the cooldown
+WEBHOOK_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("WEBHOOK_CIRCUIT_FAILURE_THRESHOLD", "5"))
+WEBHOOK_CIRCUIT_RESET_SECONDS = float(os.environ.get("WEBHOOK_CIRCUIT_RESET_SECONDS", "60"))
+# Max pooled keep-alive connections per webhook host
+WEBHOOK_POOL_SIZE = int(os.environ.get("WEBHOOK_POOL_SIZE", "10"))
+# Optional durable outbox (SQLite file). When set, signals are queued and delivered
+# in the background with at-least-once semantics instead of blocking trading cycles.
+WEBHOOK_OUTBOX_PATH = os.environ.get("WEBHOOK_OUTBOX_PATH", "")
+WEBHOOK_OUTBOX_MAX_AGE_SECONDS = float(os.environ.get("WEBHOOK_OUTBOX_MAX_AGE_SECONDS", "86400"))
+
+# Alpaca request scheduler (shared token bucket across all AlpacaClient calls)
+ALPACA_RATE_LIMIT_PER_MINUTE = int(os.environ.get("ALPACA_RATE_LIMIT_PER_MINUTE", "200"))
+ALPACA_RATE_LIMIT_BURST = int(os.environ.get("ALPACA_RATE_LIMIT_BURST", "20"))
+# Tokens only the exit lane may consume, so entry scans can't starve exits
+ALPACA_EXIT_RESERVE_TOKENS = int(os.environ.get("ALPACA_EXIT_RESERVE_TOKENS", "3"))
+
+# Asset directory (bulk /v2/assets download indexed in memory; replaces per-ticker
+# shortability and security-type lookups). Snapshot survives restarts; set to "" to disable.
+ASSET_DIRECTORY_ENABLED = os.environ.get("ASSET_DIRECTORY_ENABLED", "true").lower() == "true"
+ASSET_DIRECTORY_SNAPSHOT_PATH = os.environ.get(
+    "ASSET_DIRECTORY_SNAPSHOT_PATH",
+    os.path.join(tempfile.gettempdir(), "alpaca_assets_snapshot.json"),
+)
+# Intraday refresh interval (shortable/easy-to-borrow flags change during the day)
+ASSET_DIRECTORY_REFRESH_SECONDS = float(os.environ.get("ASSET_DIRECTORY_REFRESH_SECONDS", "1800"))
+
+# Warm-restart state snapshot (cooldowns, losing tickers, exit-engine counters, position
+# state, bars for open positions, screener cache). Written on shutdown and periodically,
+# restored at boot. Point the path at storage that outlives the container if available.
+STATE_SNAPSHOT_ENABLED = os.environ.get("STATE_SNAPSHOT_ENABLED", "true").lower() == "true"
+STATE_SNAPSHOT_PATH = os.environ.get(
+    "STATE_SNAPSHOT_PATH",
+    os.path.join(tempfile.gettempdir(), "day_trader_state_snapshot.json.gz"),
+)
+STATE_SNAPSHOT_INTERVAL_SECONDS = float(os.environ.get("STATE_SNAPSHOT_INTERVAL_SECONDS", "30"))
+# Older snapshots only restore day-scoped state (cooldowns, losing tickers, counts);
+# market data, exit-engine counters and position state are rebuilt from live sources
+STATE_SNAPSHOT_MAX_AGE_SECONDS = float(os.environ.get("STATE_SNAPSHOT_MAX_AGE_SECONDS", "900"))
+# Upper bound on the boot-time fetch of fresh bars/quotes for open positions
+STATE_SNAPSHOT_PREWARM_TIMEOUT_SECONDS = float(
+    os.environ.get("STATE_SNAPSHOT_PREWARM_TIMEOUT_SECONDS", "5")
+)
+
+# Shared market-data hub (one bars/quote fetch per ticker per tick for all indicators)
+MARKET_DATA_HUB_ENABLED = os.environ.get("MARKET_DATA_HUB_ENABLED", "true").lower() == "true"
+MARKET_DATA_HUB_BARS_TTL_SECONDS = float(os.environ.get("MARKET_DATA_HUB_BARS_TTL_SECONDS", "10"))
+MARKET_DATA_HUB_QUOTE_TTL_SECONDS = float(os.environ.get("MARKET_DATA_HUB_QUOTE_TTL_SECONDS", "1"))
+# First fetch per ticker is at least this deep so 50- and 200-bar consumers share it
+MARKET_DATA_HUB_MIN_DEPTH = int(os.environ.get("MARKET_DATA_HUB_MIN_DEPTH", "200"))
+MARKET_DATA_HUB_MAX_DEPTH = int(os.environ.get("MARKET_DATA_HUB_MAX_DEPTH", "1000"))
+MARKET_DATA_HUB_MAX_TICKERS = int(os.environ.get("MARKET_DATA_HUB_MAX_TICKERS", "500"))
+# Cached entries older than this are evicted even below the ticker cap
+MARKET_DATA_HUB_MAX_AGE_SECONDS = float(os.environ.get("MARKET_DATA_HUB_MAX_AGE_SECONDS", "900"))
+# Bars read from an exit cycle are refetched once older than this
+MARKET_DATA_HUB_EXIT_BARS_TTL_SECONDS = float(os.environ.get("MARKET_DATA_HUB_EXIT_BARS_TTL_SECONDS", "2"))
+# A deeper bar request keeps raising the fetch depth for this long after its last call
+MARKET_DATA_HUB_DEPTH_DECAY_SECONDS = float(os.environ.get("MARKET_DATA_HUB_DEPTH_DECAY_SECONDS", "300"))
+
+# Market regime service (QQQ/SPY/IWM trends and screener breadth refreshed in the
+# background on each 1-minute bar close; entry checks read the published snapshot)
+MARKET_REGIME_ENABLED = os.environ.get("MARKET_REGIME_ENABLED", "true").lower() == "true"
+MARKET_REGIME_PRIMARY_SYMBOL = os.environ.get("MARKET_REGIME_PRIMARY_SYMBOL", "QQQ").upper()
+MARKET_REGIME_SYMBOLS = [
+    s.strip().upper()
+    for s in os.environ.get("MARKET_REGIME_SYMBOLS", "QQQ,SPY,IWM").split(",")
+    if s.strip()
+]
+# Seconds after the minute boundary to wait for the closed bar to be published
+MARKET_REGIME_BAR_CLOSE_DELAY_SECONDS = float(os.environ.get("MARKET_REGIME_BAR_CLOSE_DELAY_SECONDS", "2"))
+# Snapshots older than this are treated as unavailable (regime reads SIDEWAYS)
+MARKET_REGIME_MAX_AGE_SECONDS = float(os.environ.get("MARKET_REGIME_MAX_AGE_SECONDS", "300"))
 
 ACTIVE_TICKERS_TABLE_NAME = os.environ.get(
     "ACTIVE_TICKERS_TABLE_NAME", "ActiveTickersForMarketData"
@@ -76,6 +148,11 @@ WEBHOOK_NOTIFIER_TABLE_NAME = os.environ.get(
 TRADING_PERFORMANCE_TABLE_NAME = os.environ.get(
     "TRADING_PERFORMANCE_TABLE_NAME", "CompletedTradesForAutomatedDayTrading"
 )
+# GSI on InactiveTickersForDayTrading (indicator HASH, timestamp RANGE) for time-window
+# reads; created by scripts/create_dynamodb_tables.py (readers fall back to a scan without it)
+INACTIVE_TICKERS_TIME_INDEX_NAME = os.environ.get(
+    "INACTIVE_TICKERS_TIME_INDEX_NAME", "indicator-timestamp-index"
+)
 
 
 CUSTOMER_TABLE_NAME = os.environ.get("CUSTOMER_TABLE", "Customer")
@@ -97,6 +174,30 @@ if isinstance(DEBUG_TRADING_SERVICE, str):
     else:
         DEBUG_TRADING_SERVICE = False
 
+# /debug/* routes on the health server are only registered when a token is set
+DEBUG_ENDPOINTS_TOKEN = os.environ.get("DEBUG_ENDPOINTS_TOKEN", "")
+DEBUG_PROFILE_MAX_SECONDS = float(os.environ.get("DEBUG_PROFILE_MAX_SECONDS", "60"))
+# tracemalloc slows every allocation; leave it off unless explicitly wanted at boot
+MEMORY_TRACKING_AT_BOOT = os.environ.get("MEMORY_TRACKING_AT_BOOT", "false").lower() == "true"
+
+# Event-loop lag watchdog: a task measures how late its sleeps wake up; when the loop
+# stalls past the threshold a helper thread records the blocking frame's call site
+LOOP_WATCHDOG_ENABLED = os.environ.get("LOOP_WATCHDOG_ENABLED", "true").lower() == "true"
+LOOP_WATCHDOG_INTERVAL_SECONDS = float(os.environ.get("LOOP_WATCHDOG_INTERVAL_SECONDS", "0.1"))
+LOOP_WATCHDOG_THRESHOLD_SECONDS = float(os.environ.get("LOOP_WATCHDOG_THRESHOLD_SECONDS", "0.25"))
+# Lag samples kept for the percentiles (3000 x 0.1s = the last 5 minutes)
+LOOP_WATCHDOG_WINDOW_SIZE = int(os.environ.get("LOOP_WATCHDOG_WINDOW_SIZE", "3000"))
+# Blocking call sites reported on /health (all sites are exported on /metrics)
+LOOP_WATCHDOG_TOP_N = int(os.environ.get("LOOP_WATCHDOG_TOP_N", "10"))
+
+# Off-loop executor for indicator and validation math. "thread" (default) suits numpy/
+# TA-Lib sections that release the GIL, "process" runs pure-Python jobs in spawned workers
+# (each one re-imports the trading stack, so budget memory), "sync" runs jobs inline (tests)
+COMPUTE_EXECUTOR_MODE = os.environ.get("COMPUTE_EXECUTOR_MODE", "thread").lower()
+COMPUTE_EXECUTOR_WORKERS = int(os.environ.get("COMPUTE_EXECUTOR_WORKERS", "2"))
+# Per-ticker jobs handed to a worker together (amortizes dispatch overhead)
+COMPUTE_EXECUTOR_BATCH_SIZE = int(os.environ.get("COMPUTE_EXECUTOR_BATCH_SIZE", "8"))
+
 
 MARKET_DATA_ANALYZER_INDICATOR = "Market Data Analyzer"
 
@@ -104,6 +205,13 @@ MARKET_DATA_ANALYZER_INDICATOR = "Market Data Analyzer"
 AWS_BEDROCK_MODEL_ID: str = os.getenv(
     "AWS_BEDROCK_MODEL_ID", "global.anthropic.claude-sonnet-4-5-20250929-v1:0"
 )
+# Whole-call deadline for one model invocation (connect + generation)
+AWS_BEDROCK_TIMEOUT_SECONDS = float(os.getenv("AWS_BEDROCK_TIMEOUT_SECONDS", "60"))
+# Identical prompts within the TTL reuse the previous response (0 disables)
+AWS_BEDROCK_CACHE_TTL_SECONDS = float(os.getenv("AWS_BEDROCK_CACHE_TTL_SECONDS", "900"))
+AWS_BEDROCK_CACHE_MAX_ENTRIES = int(os.getenv("AWS_BEDROCK_CACHE_MAX_ENTRIES", "64"))
+# "stub" answers locally without AWS (development and tests)
+AWS_BEDROCK_BACKEND = os.getenv("AWS_BEDROCK_BACKEND", "bedrock").lower()
 
 # =============================================================================
 # Unusual Whales API Configuration
@@ -118,6 +226,22 @@ UW_RATE_LIMIT_DELAY = float(os.environ.get("UW_RATE_LIMIT_DELAY", "0.2"))
 # Timeout for UW API requests (seconds)
 UW_REQUEST_TIMEOUT = int(os.environ.get("UW_REQUEST_TIMEOUT", "15"))
 
+# Token bucket: sustained rate defaults to 1 / UW_RATE_LIMIT_DELAY requests per second
+UW_RATE_LIMIT_PER_SECOND = float(
+    os.environ.get("UW_RATE_LIMIT_PER_SECOND", str(1.0 / max(UW_RATE_LIMIT_DELAY, 0.001)))
+)
+UW_RATE_LIMIT_BURST = int(os.environ.get("UW_RATE_LIMIT_BURST", "5"))
+
+# Maximum concurrent UW requests (also the pooled connection limit)
+UW_MAX_CONCURRENT_REQUESTS = int(os.environ.get("UW_MAX_CONCURRENT_REQUESTS", "8"))
+
+# Per-endpoint response cache TTLs (seconds, 0 disables caching for that group)
+UW_CACHE_TTL_FLOW_SECONDS = float(os.environ.get("UW_CACHE_TTL_FLOW_SECONDS", "60"))
+UW_CACHE_TTL_DARKPOOL_SECONDS = float(os.environ.get("UW_CACHE_TTL_DARKPOOL_SECONDS", "120"))
+UW_CACHE_TTL_MARKET_TIDE_SECONDS = float(os.environ.get("UW_CACHE_TTL_MARKET_TIDE_SECONDS", "60"))
+UW_CACHE_TTL_STOCK_INFO_SECONDS = float(os.environ.get("UW_CACHE_TTL_STOCK_INFO_SECONDS", "3600"))
+UW_CACHE_MAX_ENTRIES = int(os.environ.get("UW_CACHE_MAX_ENTRIES", "2000"))
+
 # =============================================================================
 # Volatility Configuration (Optional Overrides)
 # =============================================================================
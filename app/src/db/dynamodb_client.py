@@ -2,15 +2,19 @@
 DynamoDB client for automated day trading application.
 Provides async operations for data persistence with error handling and logging.
 """
+import asyncio
 import os
 import json
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
 from datetime import datetime, timezone
-from decimal import Decimal
 from zoneinfo import ZoneInfo
 import aioboto3
 from botocore.exceptions import ClientError, BotoCoreError
 from loguru import logger
+from app.src.common.metrics import Metrics
+from app.src.config.constants import INACTIVE_TICKERS_TIME_INDEX_NAME
+from app.src.db.dynamodb_serializer import to_dynamodb_compatible
+from app.src.models.price_series import json_default
 
 
 def _convert_floats_to_decimals(obj: Any) -> Any:
@@ -18,21 +22,15 @@ def _convert_floats_to_decimals(obj: Any) -> Any:
     Recursively convert all float values to Decimal for DynamoDB compatibility.
     DynamoDB doesn't support native Python float types.
     
+    Delegates to the cached, numpy-aware serializer in dynamodb_serializer.
+    
     Args:
-        obj: Object to convert (can be dict, list, float, or any other type)
+        obj: Object to convert (can be dict, list, float, numpy array, or any other type)
         
     Returns:
         Object with all floats converted to Decimals
     """
-    if isinstance(obj, dict):
-        return {k: _convert_floats_to_decimals(v) for k, v in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        # Convert both lists and tuples, but return as list for DynamoDB compatibility
-        return [_convert_floats_to_decimals(item) for item in obj]
-    elif isinstance(obj, float):
-        return Decimal(str(obj))
-    else:
-        return obj
+    return to_dynamodb_compatible(obj)
 
 
 def _get_est_timestamp() -> str:
@@ -50,9 +48,16 @@ class DynamoDBClient:
     """
     Async DynamoDB client with comprehensive error handling.
     
-    Provides operations: put_item, get_item, delete_item, query, scan, update_item
+    Provides operations: put_item, get_item, batch_get_items, delete_item, query, scan, update_item
     All operations include detailed logging and graceful degradation on failures.
     """
+
+    BATCH_GET_MAX_KEYS = 100
+    THROTTLING_ERROR_CODES = frozenset({
+        'ProvisionedThroughputExceededException',
+        'ThrottlingException',
+        'RequestLimitExceeded',
+    })
     
     def __init__(self):
         """Initialize DynamoDB client with AWS credentials from environment."""
@@ -72,6 +77,7 @@ class DynamoDBClient:
         
         logger.info(f"DynamoDB client initialized for region: {self.aws_region}")
     
+    @Metrics.timed("db_write", op="put_item")
     async def put_item(self, table_name: str, item: Dict[str, Any]) -> bool:
         """
         Insert item into DynamoDB table.
@@ -153,6 +159,7 @@ class DynamoDBClient:
             )
             return False
     
+    @Metrics.timed("db_read", op="get_item")
     async def get_item(self, table_name: str, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Retrieve item from DynamoDB table by key.
@@ -235,6 +242,7 @@ class DynamoDBClient:
             )
             return None
     
+    @Metrics.timed("db_write", op="delete_item")
     async def delete_item(self, table_name: str, key: Dict[str, Any]) -> bool:
         """
         Delete item from DynamoDB table.
@@ -298,6 +306,7 @@ class DynamoDBClient:
             )
             return False
     
+    @Metrics.timed("db_read", op="query")
     async def query(
         self,
         table_name: str,
@@ -329,8 +338,11 @@ class DynamoDBClient:
                 if expression_attribute_names:
                     query_params['ExpressionAttributeNames'] = expression_attribute_names
                 
-                response = await table.query(**query_params)
-                items = response.get('Items', [])
+                items = [
+                    item
+                    async for page in self._paginate(table, "query", query_params)
+                    for item in page
+                ]
             
             logger.debug(
                 f"DynamoDB query successful",
@@ -381,6 +393,7 @@ class DynamoDBClient:
             )
             return []
     
+    @Metrics.timed("db_read", op="scan")
     async def scan(
         self,
         table_name: str,
@@ -415,8 +428,11 @@ class DynamoDBClient:
                 if expression_attribute_names:
                     scan_params['ExpressionAttributeNames'] = expression_attribute_names
                 
-                response = await table.scan(**scan_params)
-                items = response.get('Items', [])
+                items = [
+                    item
+                    async for page in self._paginate(table, "scan", scan_params)
+                    for item in page
+                ]
             
             logger.debug(
                 f"DynamoDB scan successful",
@@ -467,13 +483,281 @@ class DynamoDBClient:
             )
             return []
     
+    # =========================================================================
+    # Streaming reads (follow LastEvaluatedKey, constant memory)
+    # =========================================================================
+
+    @staticmethod
+    async def _paginate(table: Any, op: str, params: Dict[str, Any]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield result pages of a scan or query until the last page.
+
+        Args:
+            table: DynamoDB Table resource
+            op: "scan" or "query"
+            params: Request parameters (ExclusiveStartKey is managed here)
+        """
+        request = dict(params)
+        operation = getattr(table, op)
+        while True:
+            response = await operation(**request)
+            Metrics.inc("db_pages_total", op=op)
+            yield response.get('Items', [])
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return
+            request['ExclusiveStartKey'] = last_key
+
+    @classmethod
+    async def _parallel_scan_pages(
+        cls,
+        table: Any,
+        params: Dict[str, Any],
+        total_segments: int,
+        max_concurrency: int
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield pages from a parallel scan (Segment/TotalSegments).
+
+        At most max_concurrency segments are read at once and at most that many
+        pages are buffered, so memory stays bounded however large the table is.
+        """
+        pages: asyncio.Queue = asyncio.Queue(maxsize=max_concurrency)
+        finished = object()
+        segments = iter(range(total_segments))
+
+        async def worker():
+            for segment in segments:  # shared iterator: each segment is claimed once
+                segment_params = {**params, 'Segment': segment, 'TotalSegments': total_segments}
+                async for page in cls._paginate(table, "scan", segment_params):
+                    await pages.put(page)
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(max_concurrency, total_segments))]
+
+        async def supervise():
+            done, pending = await asyncio.wait(workers, return_when=asyncio.FIRST_EXCEPTION)
+            for task in pending:
+                task.cancel()
+            error = next((t.exception() for t in done if not t.cancelled() and t.exception()), None)
+            await pages.put((finished, error))
+
+        supervisor = asyncio.create_task(supervise())
+        try:
+            while True:
+                page = await pages.get()
+                if isinstance(page, tuple) and page and page[0] is finished:
+                    if page[1] is not None:
+                        raise page[1]
+                    return
+                yield page
+        finally:
+            for task in (*workers, supervisor):
+                task.cancel()
+            await asyncio.gather(*workers, supervisor, return_exceptions=True)
+
+    @staticmethod
+    def _log_stream_error(operation: str, table_name: str, error: Exception):
+        if isinstance(error, ClientError):
+            message = error.response['Error']['Message']
+            extra = {"error_code": error.response['Error']['Code'], "error_message": message}
+            prefix = "DynamoDB ClientError"
+        else:
+            message = str(error)
+            extra = {"error": message}
+            prefix = "DynamoDB BotoCoreError" if isinstance(error, BotoCoreError) else "Unexpected error"
+        logger.error(
+            f"{prefix} in {operation}: {message}",
+            extra={"operation": operation, "table": table_name, "status": "failed", **extra}
+        )
+
+    async def scan_iter(
+        self,
+        table_name: str,
+        filter_expression: Optional[str] = None,
+        expression_attribute_values: Optional[Dict[str, Any]] = None,
+        expression_attribute_names: Optional[Dict[str, str]] = None,
+        projection_expression: Optional[str] = None,
+        page_size: Optional[int] = None,
+        total_segments: int = 1,
+        max_concurrency: int = 4
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every item of a scan, following pagination.
+
+        Args:
+            table_name: Name of the DynamoDB table
+            filter_expression: Optional filter expression string
+            expression_attribute_values: Optional dictionary of expression attribute values
+            expression_attribute_names: Optional dictionary of expression attribute names
+            projection_expression: Optional attributes to return (e.g. "#t, ticker")
+            page_size: Optional items evaluated per request (Limit)
+            total_segments: >1 runs a parallel scan with that many segments
+            max_concurrency: Segments read at the same time for a parallel scan
+
+        Yields:
+            Items one at a time
+
+        Raises:
+            The read error (after logging it), so a consumer can't mistake a
+            truncated stream for a complete one
+        """
+        scan_params: Dict[str, Any] = {}
+        if filter_expression:
+            scan_params['FilterExpression'] = filter_expression
+        if expression_attribute_values:
+            scan_params['ExpressionAttributeValues'] = expression_attribute_values
+        if expression_attribute_names:
+            scan_params['ExpressionAttributeNames'] = expression_attribute_names
+        if projection_expression:
+            scan_params['ProjectionExpression'] = projection_expression
+        if page_size:
+            scan_params['Limit'] = page_size
+
+        try:
+            async with self.session.resource('dynamodb') as dynamodb:
+                table = await dynamodb.Table(table_name)
+                if total_segments > 1:
+                    pages = self._parallel_scan_pages(
+                        table, scan_params, total_segments, max(1, max_concurrency)
+                    )
+                else:
+                    pages = self._paginate(table, "scan", scan_params)
+                async for page in pages:
+                    for item in page:
+                        yield item
+        except Exception as e:
+            self._log_stream_error("scan_iter", table_name, e)
+            raise
+
+    async def query_iter(
+        self,
+        table_name: str,
+        key_condition_expression: str,
+        expression_attribute_values: Dict[str, Any],
+        expression_attribute_names: Optional[Dict[str, str]] = None,
+        filter_expression: Optional[str] = None,
+        projection_expression: Optional[str] = None,
+        index_name: Optional[str] = None,
+        scan_index_forward: bool = True,
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every item of a query, following pagination.
+
+        Args:
+            table_name: Name of the DynamoDB table
+            key_condition_expression: Key condition expression string
+            expression_attribute_values: Dictionary of expression attribute values
+            expression_attribute_names: Optional dictionary of expression attribute names
+            filter_expression: Optional filter applied after the key condition
+            projection_expression: Optional attributes to return
+            index_name: Optional secondary index to query
+            scan_index_forward: False returns items in descending sort-key order
+            page_size: Optional items evaluated per request (Limit)
+
+        Yields:
+            Items one at a time
+
+        Raises:
+            The read error (after logging it), so a consumer can't mistake a
+            truncated stream for a complete one
+        """
+        query_params: Dict[str, Any] = {
+            'KeyConditionExpression': key_condition_expression,
+            'ExpressionAttributeValues': expression_attribute_values
+        }
+        if expression_attribute_names:
+            query_params['ExpressionAttributeNames'] = expression_attribute_names
+        if filter_expression:
+            query_params['FilterExpression'] = filter_expression
+        if projection_expression:
+            query_params['ProjectionExpression'] = projection_expression
+        if index_name:
+            query_params['IndexName'] = index_name
+        if not scan_index_forward:
+            query_params['ScanIndexForward'] = False
+        if page_size:
+            query_params['Limit'] = page_size
+
+        try:
+            async with self.session.resource('dynamodb') as dynamodb:
+                table = await dynamodb.Table(table_name)
+                async for page in self._paginate(table, "query", query_params):
+                    for item in page:
+                        yield item
+        except Exception as e:
+            self._log_stream_error("query_iter", table_name, e)
+            raise
+
+    @Metrics.timed("db_read", op="batch_get_item")
+    async def batch_get_items(
+        self,
+        table_name: str,
+        keys: List[Dict[str, Any]],
+        projection_expression: Optional[str] = None,
+        expression_attribute_names: Optional[Dict[str, str]] = None,
+        max_retries: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve many items by key with BatchGetItem (100 keys per request).
+
+        Unprocessed keys (throttling, 16 MB response limit) are retried with
+        exponential backoff; keys still unprocessed after max_retries are
+        dropped with a warning.
+
+        Args:
+            table_name: Name of the DynamoDB table
+            keys: Primary keys to read (duplicates are read once)
+            projection_expression: Optional attributes to return
+            expression_attribute_names: Optional dictionary of expression attribute names
+            max_retries: Retries of unprocessed keys per request
+
+        Returns:
+            Found items in no particular order (missing keys are omitted)
+        """
+        unique_keys = list({json.dumps(key, sort_keys=True, default=str): key for key in keys}.values())
+        items: List[Dict[str, Any]] = []
+        if not unique_keys:
+            return items
+
+        try:
+            async with self.session.resource('dynamodb') as dynamodb:
+                for start in range(0, len(unique_keys), self.BATCH_GET_MAX_KEYS):
+                    request: Dict[str, Any] = {'Keys': unique_keys[start:start + self.BATCH_GET_MAX_KEYS]}
+                    if projection_expression:
+                        request['ProjectionExpression'] = projection_expression
+                    if expression_attribute_names:
+                        request['ExpressionAttributeNames'] = expression_attribute_names
+
+                    pending = {table_name: request}
+                    for attempt in range(max_retries + 1):
+                        response = await dynamodb.batch_get_item(RequestItems=pending)
+                        items.extend(response.get('Responses', {}).get(table_name, []))
+                        pending = response.get('UnprocessedKeys') or {}
+                        if not pending:
+                            break
+                        if attempt < max_retries:
+                            await asyncio.sleep(min(0.05 * 2 ** attempt, 2.0))
+                    if pending:
+                        logger.warning(
+                            f"DynamoDB batch_get_item left {len(pending[table_name]['Keys'])} keys unprocessed",
+                            extra={"operation": "batch_get_item", "table": table_name, "status": "partial"}
+                        )
+        except Exception as e:
+            self._log_stream_error("batch_get_item", table_name, e)
+
+        return items
+
+    @Metrics.timed("db_write", op="update_item")
     async def update_item(
         self,
         table_name: str,
         key: Dict[str, Any],
         update_expression: str,
         expression_attribute_values: Dict[str, Any],
-        expression_attribute_names: Optional[Dict[str, str]] = None
+        expression_attribute_names: Optional[Dict[str, str]] = None,
+        raise_on_throttle: bool = False,
+        condition_expression: Optional[str] = None
     ) -> bool:
         """
         Update item attributes in DynamoDB table.
@@ -484,6 +768,9 @@ class DynamoDBClient:
             update_expression: Update expression string
             expression_attribute_values: Dictionary of expression attribute values
             expression_attribute_names: Optional dictionary of expression attribute names
+            raise_on_throttle: Re-raise throttling ClientErrors so callers can back off
+            condition_expression: Optional condition the item must meet; an update
+                skipped because it isn't met counts as successful (nothing to retry)
             
         Returns:
             True if successful, False otherwise
@@ -505,6 +792,9 @@ class DynamoDBClient:
                 if expression_attribute_names:
                     update_params['ExpressionAttributeNames'] = expression_attribute_names
                 
+                if condition_expression:
+                    update_params['ConditionExpression'] = condition_expression
+                
                 await table.update_item(**update_params)
             
             logger.debug(
@@ -518,6 +808,18 @@ class DynamoDBClient:
             return True
             
         except ClientError as e:
+            if raise_on_throttle and e.response['Error']['Code'] in self.THROTTLING_ERROR_CODES:
+                raise
+            if condition_expression and e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.debug(
+                    f"DynamoDB update_item skipped, condition not met: {condition_expression}",
+                    extra={
+                        "operation": "update_item",
+                        "table": table_name,
+                        "status": "skipped"
+                    }
+                )
+                return True
             logger.error(
                 f"DynamoDB ClientError in update_item: {e.response['Error']['Message']}",
                 extra={
@@ -605,7 +907,7 @@ class DynamoDBClient:
         instance = cls._get_instance()
         
         # Convert technical_indicators to JSON string to avoid DynamoDB type issues
-        tech_indicators_json = json.dumps(technical_indicators_for_enter or {}, default=str)
+        tech_indicators_json = json.dumps(technical_indicators_for_enter or {}, default=json_default)
         
         item = {
             'ticker': ticker,
@@ -682,6 +984,9 @@ class DynamoDBClient:
         """
         Update trailing stop and peak profit for an active momentum trade.
         
+        The update only applies while the row exists, so a write that lands
+        after the trade was exited (and its row deleted) doesn't recreate it.
+        
         Args:
             ticker: Stock ticker symbol
             indicator: Trading indicator name
@@ -703,7 +1008,8 @@ class DynamoDBClient:
                 ':pp': peak_profit_percent,
                 ':ser': skipped_exit_reason,
                 ':ua': _get_est_timestamp(),
-            }
+            },
+            condition_expression='attribute_exists(ticker)',
         )
     
     @classmethod
@@ -915,7 +1221,7 @@ class DynamoDBClient:
         timestamp = datetime.now(ZoneInfo('America/New_York')).isoformat()
         
         # Convert technical_indicators to JSON string to avoid DynamoDB type issues
-        tech_indicators_json = json.dumps(technical_indicators or {}, default=str)
+        tech_indicators_json = json.dumps(technical_indicators or {}, default=json_default)
         
         item = {
             'ticker': ticker,
@@ -962,6 +1268,97 @@ class DynamoDBClient:
             technical_indicators=technical_indicators
         )
     
+    # None until the first time-index query tells us whether the GSI exists
+    _inactive_time_index_available: Optional[bool] = None
+
+    async def iter_inactive_tickers(
+        self,
+        indicator: str,
+        since: str,
+        until: Optional[str] = None,
+        filter_expression: Optional[str] = None,
+        expression_attribute_values: Optional[Dict[str, Any]] = None,
+        projection_expression: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream InactiveTickersForDayTrading records for an indicator in a time window.
+
+        Queries the (indicator, timestamp) GSI so read cost scales with the
+        window, not the table. If the index does not exist yet, falls back to
+        the previous filtered scan (remembered for the process lifetime).
+
+        Args:
+            indicator: Trading indicator name
+            since: Inclusive lower bound (ISO timestamp, America/New_York)
+            until: Optional inclusive upper bound
+            filter_expression: Optional extra filter on non-key attributes
+            expression_attribute_values: Values referenced by filter_expression
+            projection_expression: Optional attributes to return
+                (#ind and #ts name indicator and timestamp)
+
+        Yields:
+            Matching records one at a time
+
+        Raises:
+            The read error (after logging it) if the stream fails part way
+        """
+        table_name = 'InactiveTickersForDayTrading'
+        names = {'#ind': 'indicator', '#ts': 'timestamp'}
+        values = {':indicator': indicator, ':since': since, **(expression_attribute_values or {})}
+        time_condition = '#ts >= :since'
+        if until is not None:
+            values[':until'] = until
+            time_condition = '#ts BETWEEN :since AND :until'
+
+        if DynamoDBClient._inactive_time_index_available is not False:
+            query_params: Dict[str, Any] = {
+                'IndexName': INACTIVE_TICKERS_TIME_INDEX_NAME,
+                'KeyConditionExpression': f'#ind = :indicator AND {time_condition}',
+                'ExpressionAttributeNames': names,
+                'ExpressionAttributeValues': values
+            }
+            if filter_expression:
+                query_params['FilterExpression'] = filter_expression
+            if projection_expression:
+                query_params['ProjectionExpression'] = projection_expression
+            try:
+                async with self.session.resource('dynamodb') as dynamodb:
+                    table = await dynamodb.Table(table_name)
+                    async for page in self._paginate(table, 'query', query_params):
+                        DynamoDBClient._inactive_time_index_available = True
+                        for item in page:
+                            yield item
+                return
+            except ClientError as e:
+                missing_index = (
+                    e.response['Error']['Code'] == 'ValidationException'
+                    and 'index' in e.response['Error']['Message'].lower()
+                    and DynamoDBClient._inactive_time_index_available is None
+                )
+                if not missing_index:
+                    self._log_stream_error("iter_inactive_tickers", table_name, e)
+                    raise
+                logger.warning(
+                    f"Index {INACTIVE_TICKERS_TIME_INDEX_NAME} not found on {table_name}; "
+                    f"falling back to a filtered scan (run scripts/create_dynamodb_tables.py)"
+                )
+                DynamoDBClient._inactive_time_index_available = False
+            except Exception as e:
+                self._log_stream_error("iter_inactive_tickers", table_name, e)
+                raise
+
+        scan_filter = f'#ind = :indicator AND {time_condition}'
+        if filter_expression:
+            scan_filter = f'{scan_filter} AND ({filter_expression})'
+        async for item in self.scan_iter(
+            table_name=table_name,
+            filter_expression=scan_filter,
+            expression_attribute_names=names,
+            expression_attribute_values=values,
+            projection_expression=projection_expression
+        ):
+            yield item
+
     @classmethod
     async def get_inactive_tickers_for_indicator(
         cls,
@@ -985,19 +1382,15 @@ class DynamoDBClient:
         cutoff_time = datetime.now(ZoneInfo('America/New_York')) - timedelta(minutes=minutes_window)
         cutoff_timestamp = cutoff_time.isoformat()
         
-        # Query table by indicator (sort key) with timestamp filter
-        # Since indicator is the sort key, we need to scan and filter
-        inactive_tickers = await instance.scan(
-            table_name='InactiveTickersForDayTrading',
-            filter_expression='#ind = :indicator AND #ts >= :cutoff',
-            expression_attribute_names={'#ind': 'indicator', '#ts': 'timestamp'},
-            expression_attribute_values={
-                ':indicator': indicator,
-                ':cutoff': cutoff_timestamp
-            }
-        )
-        
-        return inactive_tickers
+        # Query the (indicator, timestamp) index for the window only; a failed
+        # read returns [] (already logged) rather than part of the window
+        try:
+            return [
+                item
+                async for item in instance.iter_inactive_tickers(indicator, since=cutoff_timestamp)
+            ]
+        except Exception:
+            return []
     
     @classmethod
     async def store_day_trader_event(
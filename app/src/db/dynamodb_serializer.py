@@ -0,0 +1,258 @@
+"""
+Fast serializer for DynamoDB writes.
+
+Converts Python floats, numpy scalars and numpy arrays into DynamoDB-compatible
+values in bulk. Two output formats are supported:
+
+- Resource format (``to_dynamodb_compatible``): plain Python values with floats
+  replaced by ``Decimal``, for ``session.resource('dynamodb')`` tables.
+- Client format (``to_attribute_value`` / ``to_attribute_value_map``): low-level
+  AttributeValue maps (``{'N': '1.5'}``) for ``session.client('dynamodb')``,
+  which skips boto3's resource-layer TypeSerializer entirely.
+
+Converters are resolved once per Python type and cached, so the hot loop is a
+single dict lookup per value. Containers produced by the serializer are tagged
+(``DynamoDict`` / ``DynamoList``) and are returned as-is if they are passed in
+again, so re-serializing an already converted payload costs O(1).
+"""
+
+from decimal import Decimal
+from typing import Any, Callable, Dict
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None  # type: ignore
+
+
+class DynamoDict(dict):
+    """Dict whose values are already DynamoDB-compatible (do not mutate with floats)."""
+
+    __slots__ = ()
+
+
+class DynamoList(list):
+    """List whose items are already DynamoDB-compatible (do not mutate with floats)."""
+
+    __slots__ = ()
+
+
+# Types that DynamoDB accepts unchanged
+_PASSTHROUGH_TYPES = frozenset({str, int, bool, type(None), Decimal, bytes, bytearray})
+
+# Per-type converter cache, filled lazily by _converter_for()
+_CONVERTERS: Dict[type, Callable[[Any], Any]] = {}
+
+
+def _identity(obj: Any) -> Any:
+    return obj
+
+
+def _float_to_decimal(obj: float) -> Decimal:
+    # float.__repr__ gives the shortest round-tripping string (same as str())
+    # and also works for float subclasses such as numpy.float64
+    return Decimal(float.__repr__(obj))
+
+
+def _convert_dict(obj: Dict[Any, Any]) -> DynamoDict:
+    out = DynamoDict()
+    passthrough = _PASSTHROUGH_TYPES
+    for key, value in obj.items():
+        value_type = type(value)
+        if value_type in passthrough:
+            out[key] = value
+        elif value_type is float:
+            out[key] = Decimal(repr(value))
+        else:
+            out[key] = _converter_for(value_type)(value)
+    return out
+
+
+def _convert_sequence(obj: Any) -> DynamoList:
+    out = DynamoList()
+    append = out.append
+    passthrough = _PASSTHROUGH_TYPES
+    for value in obj:
+        value_type = type(value)
+        if value_type in passthrough:
+            append(value)
+        elif value_type is float:
+            append(Decimal(repr(value)))
+        else:
+            append(_converter_for(value_type)(value))
+    return out
+
+
+def _convert_set(obj: Any) -> set:
+    return {_converter_for(type(value))(value) for value in obj}
+
+
+def _convert_ndarray(arr: Any) -> DynamoList:
+    """Convert a numpy array with one C-level ``tolist()`` call plus a bulk map."""
+    if arr.ndim == 1:
+        kind = arr.dtype.kind
+        if kind == 'f':
+            return DynamoList(map(Decimal, map(repr, arr.tolist())))
+        if kind in ('i', 'u', 'b'):
+            return DynamoList(arr.tolist())
+    return _convert_sequence(arr.tolist())
+
+
+def _convert_numpy_scalar(obj: Any) -> Any:
+    value = obj.item()
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    return value
+
+
+def _convert_to_dict_object(obj: Any) -> DynamoDict:
+    """Objects such as PriceSeries are persisted through their ``to_dict()`` form."""
+    return _convert_dict(obj.to_dict())
+
+
+def _resolve_converter(value_type: type) -> Callable[[Any], Any]:
+    """Pick the converter for a type (called once per type)."""
+    if value_type in (DynamoDict, DynamoList) or value_type in _PASSTHROUGH_TYPES:
+        return _identity
+    if issubclass(value_type, bool):
+        return _identity
+    if issubclass(value_type, float):
+        return _float_to_decimal
+    if issubclass(value_type, dict):
+        return _convert_dict
+    if issubclass(value_type, (list, tuple)):
+        return _convert_sequence
+    if issubclass(value_type, (set, frozenset)):
+        return _convert_set
+    if NUMPY_AVAILABLE:
+        if issubclass(value_type, np.ndarray):
+            return _convert_ndarray
+        if issubclass(value_type, np.generic):
+            return _convert_numpy_scalar
+    if callable(getattr(value_type, 'to_dict', None)):
+        return _convert_to_dict_object
+    return _identity
+
+
+def _converter_for(value_type: type) -> Callable[[Any], Any]:
+    converter = _CONVERTERS.get(value_type)
+    if converter is None:
+        converter = _resolve_converter(value_type)
+        _CONVERTERS[value_type] = converter
+    return converter
+
+
+def to_dynamodb_compatible(obj: Any) -> Any:
+    """
+    Convert a value to the resource-layer format accepted by DynamoDB.
+
+    Floats (including numpy floats) become Decimals, tuples and numpy arrays
+    become lists, numpy integer/bool scalars become Python ints/bools, and
+    objects exposing ``to_dict()`` (e.g. PriceSeries) become maps.
+    Everything else is returned unchanged.
+
+    Args:
+        obj: Value to convert (dict, list, tuple, float, numpy value, ...)
+
+    Returns:
+        DynamoDB-compatible value
+    """
+    value_type = type(obj)
+    if value_type in _PASSTHROUGH_TYPES:
+        return obj
+    if value_type is float:
+        return Decimal(repr(obj))
+    return _converter_for(value_type)(obj)
+
+
+# =========================================================================
+# Low-level AttributeValue encoding (client API)
+# =========================================================================
+
+def _number_string(obj: Any) -> str:
+    if isinstance(obj, float):
+        if obj != obj or obj in (float('inf'), float('-inf')):
+            raise TypeError("Infinity and NaN not supported by DynamoDB")
+        return float.__repr__(obj)
+    if isinstance(obj, Decimal):
+        if not obj.is_finite():
+            raise TypeError("Infinity and NaN not supported by DynamoDB")
+        return str(obj)
+    return str(int(obj))
+
+
+def to_attribute_value(obj: Any) -> Dict[str, Any]:
+    """
+    Encode a Python value as a low-level DynamoDB AttributeValue.
+
+    Args:
+        obj: Value to encode
+
+    Returns:
+        AttributeValue dict, e.g. ``{'N': '1.5'}`` or ``{'M': {...}}``
+
+    Raises:
+        TypeError: If the value cannot be represented in DynamoDB
+    """
+    if obj is None:
+        return {'NULL': True}
+    value_type = type(obj)
+    if value_type is str:
+        return {'S': obj}
+    if value_type is bool:
+        return {'BOOL': obj}
+    if value_type is int or value_type is float or value_type is Decimal:
+        return {'N': _number_string(obj)}
+    if isinstance(obj, dict):
+        return {'M': to_attribute_value_map(obj)}
+    if isinstance(obj, (list, tuple)):
+        return {'L': [to_attribute_value(item) for item in obj]}
+    if isinstance(obj, (bytes, bytearray)):
+        return {'B': bytes(obj)}
+    if isinstance(obj, bool):
+        return {'BOOL': bool(obj)}
+    if isinstance(obj, (int, float, Decimal)):
+        return {'N': _number_string(obj)}
+    if isinstance(obj, str):
+        return {'S': str(obj)}
+    if NUMPY_AVAILABLE:
+        if isinstance(obj, np.ndarray):
+            if obj.ndim == 1 and obj.dtype.kind == 'f':
+                values = obj.tolist()
+                return {'L': [{'N': _number_string(value)} for value in values]}
+            return to_attribute_value(obj.tolist())
+        if isinstance(obj, np.generic):
+            return to_attribute_value(obj.item())
+    if isinstance(obj, (set, frozenset)):
+        if obj and all(isinstance(item, str) for item in obj):
+            return {'SS': list(obj)}
+        if obj and all(isinstance(item, (int, float, Decimal)) and not isinstance(item, bool) for item in obj):
+            return {'NS': [_number_string(item) for item in obj]}
+    if callable(getattr(obj, 'to_dict', None)):
+        return {'M': to_attribute_value_map(obj.to_dict())}
+    raise TypeError(f"Unsupported type for DynamoDB AttributeValue: {value_type.__name__}")
+
+
+def to_attribute_value_map(item: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Encode a whole item as a low-level AttributeValue map.
+
+    Args:
+        item: Item dictionary
+
+    Returns:
+        Dict of attribute name -> AttributeValue, ready for ``client.put_item``
+        or ``client.batch_write_item``
+    """
+    return {str(key): to_attribute_value(value) for key, value in item.items()}
+
+
+__all__ = [
+    'DynamoDict',
+    'DynamoList',
+    'to_dynamodb_compatible',
+    'to_attribute_value',
+    'to_attribute_value_map',
+]
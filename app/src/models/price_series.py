@@ -0,0 +1,206 @@
+"""
+Compact price series used for the ``datetime_price`` field of technical analysis.
+
+``TechnicalAnalysisLib.calculate_all_indicators`` used to hand out a dict of
+ISO timestamp strings -> price, and every consumer re-parsed and re-sorted the
+keys each cycle. ``PriceSeries`` keeps the same data as two parallel numpy
+arrays (int64 epoch nanoseconds and float64 prices) that are already sorted
+oldest -> newest, so consumers read ``prices`` directly. The ISO-keyed dict is
+only rendered when a record is persisted or logged (``to_dict``).
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class PriceSeries:
+    """
+    Chronologically sorted (epoch, price) series backed by numpy arrays.
+
+    Attributes:
+        epochs: int64 nanoseconds since the Unix epoch (UTC)
+        prices: float64 prices aligned with ``epochs``
+        tz: Timezone used when rendering timestamps (None renders naive times)
+    """
+
+    __slots__ = ("epochs", "prices", "tz", "_iso")
+
+    def __init__(self, epochs: np.ndarray, prices: np.ndarray, tz: Optional[str] = None):
+        """
+        Wrap already clean arrays. Use ``from_frame`` / ``from_timestamps`` /
+        ``coerce`` for raw input; they drop invalid rows and sort.
+
+        Args:
+            epochs: int64 epoch nanoseconds
+            prices: float64 prices, same length as ``epochs``
+            tz: Timezone name for rendering
+        """
+        self.epochs = np.asarray(epochs, dtype=np.int64)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.tz = tz
+        self._iso: Optional[List[str]] = None
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def empty(cls) -> "PriceSeries":
+        """Series with no points"""
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+
+    @classmethod
+    def _from_index(cls, index: pd.DatetimeIndex, prices: Any) -> "PriceSeries":
+        tz = str(index.tz) if index.tz is not None else None
+        # pandas may pick second/microsecond resolution; epochs are always ns
+        epochs = index.as_unit("ns").asi8
+        values = np.asarray(prices, dtype=np.float64)
+        keep = ~index.isna() & np.isfinite(values) & (values > 0)
+        if not keep.all():
+            epochs = epochs[keep]
+            values = values[keep]
+        if len(epochs) > 1 and (np.diff(epochs) < 0).any():
+            order = np.argsort(epochs, kind="stable")
+            epochs = epochs[order]
+            values = values[order]
+        return cls(epochs, values, tz)
+
+    @staticmethod
+    def _to_index(timestamps: Any) -> pd.DatetimeIndex:
+        try:
+            index = pd.DatetimeIndex(pd.to_datetime(timestamps, errors="coerce"))
+        except (ValueError, TypeError):
+            # Mixed naive/aware or mixed offsets: normalise everything to UTC
+            index = pd.DatetimeIndex(pd.to_datetime(timestamps, errors="coerce", utc=True))
+        return index
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, time_column: str = "timestamp", price_column: str = "price") -> "PriceSeries":
+        """
+        Build from a DataFrame without per-row Python work.
+
+        Args:
+            frame: DataFrame holding a timestamp and a price column
+            time_column: Name of the timestamp column
+            price_column: Name of the price column
+
+        Returns:
+            PriceSeries (empty when the columns are missing)
+        """
+        if frame is None or time_column not in frame.columns or price_column not in frame.columns:
+            return cls.empty()
+        return cls._from_index(cls._to_index(frame[time_column]), frame[price_column].to_numpy())
+
+    @classmethod
+    def from_timestamps(cls, timestamps: Iterable[Any], prices: Iterable[Any]) -> "PriceSeries":
+        """
+        Build from parallel sequences of timestamps (strings or datetimes) and prices.
+
+        Args:
+            timestamps: ISO strings, datetimes or pandas Timestamps
+            prices: Prices aligned with ``timestamps``
+
+        Returns:
+            PriceSeries with unparseable or non-positive rows dropped
+        """
+        timestamps = list(timestamps)
+        if not timestamps:
+            return cls.empty()
+        prices = pd.to_numeric(pd.Series(list(prices), dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+        return cls._from_index(cls._to_index(timestamps), prices)
+
+    @classmethod
+    def coerce(cls, datetime_price: Any) -> "PriceSeries":
+        """
+        Convert any legacy ``datetime_price`` shape into a PriceSeries.
+
+        Accepts a PriceSeries (returned as-is), a dict of timestamp -> price,
+        or a list/tuple of ``[timestamp, price]`` pairs or
+        ``{"timestamp"|"datetime": ..., "price"|"close": ...}`` dicts.
+
+        Args:
+            datetime_price: Value in any of the supported shapes
+
+        Returns:
+            PriceSeries (empty for unsupported input)
+        """
+        if isinstance(datetime_price, PriceSeries):
+            return datetime_price
+        if not datetime_price:
+            return cls.empty()
+        if isinstance(datetime_price, dict):
+            return cls.from_timestamps(datetime_price.keys(), datetime_price.values())
+        if isinstance(datetime_price, (list, tuple)):
+            timestamps: List[Any] = []
+            prices: List[Any] = []
+            for entry in datetime_price:
+                if isinstance(entry, (list, tuple)) and len(entry) >= 2:
+                    timestamps.append(entry[0])
+                    prices.append(entry[1])
+                elif isinstance(entry, dict):
+                    timestamps.append(entry.get("datetime") or entry.get("timestamp"))
+                    prices.append(entry.get("price") or entry.get("close") or entry.get("close_price"))
+            return cls.from_timestamps(timestamps, prices)
+        return cls.empty()
+
+    # ------------------------------------------------------------------
+    # Container protocol
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __bool__(self) -> bool:
+        return len(self.prices) > 0
+
+    def __iter__(self) -> Iterator[Tuple[str, float]]:
+        """Iterate ``(iso_timestamp, price)`` pairs, like the legacy pair list"""
+        return iter(self.items())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, PriceSeries):
+            return np.array_equal(self.epochs, other.epochs) and np.array_equal(self.prices, other.prices)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        if not self:
+            return "PriceSeries([])"
+        first, last = self.isoformat()[0], self.isoformat()[-1]
+        return f"PriceSeries(n={len(self)}, {first} .. {last})"
+
+    # ------------------------------------------------------------------
+    # Rendering (persist/log time only)
+    # ------------------------------------------------------------------
+
+    def isoformat(self) -> List[str]:
+        """ISO 8601 timestamps in ``tz`` (rendered once, then cached)"""
+        if self._iso is None:
+            index = pd.DatetimeIndex(self.epochs.view("M8[ns]"), tz="UTC")
+            index = index.tz_convert(self.tz) if self.tz else index.tz_localize(None)
+            self._iso = [ts.isoformat() for ts in index]
+        return self._iso
+
+    def items(self) -> List[Tuple[str, float]]:
+        """``(iso_timestamp, price)`` pairs, oldest first"""
+        return list(zip(self.isoformat(), self.prices.tolist()))
+
+    def to_dict(self) -> Dict[str, float]:
+        """Legacy ``{iso_timestamp: price}`` form used in persisted records"""
+        return dict(zip(self.isoformat(), self.prices.tolist()))
+
+
+def json_default(obj: Any) -> Any:
+    """
+    ``json.dumps`` default hook: render objects exposing ``to_dict`` (such as
+    PriceSeries) through it and fall back to ``str`` like ``default=str``.
+    """
+    to_dict = getattr(obj, "to_dict", None)
+    if callable(to_dict):
+        return to_dict()
+    return str(obj)
@@ -1,5 +1,7 @@
 import json
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Tuple, Union
+
+from app.src.models.price_series import PriceSeries
 
 try:
     from pydantic import BaseModel
@@ -10,6 +12,9 @@ except Exception:  # pragma: no cover - lightweight fallback for test envs witho
 
 
 class TechnicalIndicators(BaseModel):
+    # datetime_price holds a PriceSeries (numpy-backed, not a pydantic type)
+    model_config = {"arbitrary_types_allowed": True}
+
     # Trend indicators
     rsi: float
     macd: Tuple[float, float, float]  # macd, signal, hist
@@ -35,7 +40,7 @@ class TechnicalIndicators(BaseModel):
     wma: float
     volume: float
     close_price: float
-    datetime_price: Tuple
+    datetime_price: Union[PriceSeries, Tuple]
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert the model to a dictionary."""
@@ -71,7 +76,11 @@ class TechnicalIndicators(BaseModel):
             "wma": self.wma,
             "volume": self.volume,
             "close_price": self.close_price,
-            "datetime_price": self.datetime_price,
+            "datetime_price": (
+                self.datetime_price.to_dict()
+                if isinstance(self.datetime_price, PriceSeries)
+                else self.datetime_price
+            ),
         }
 
     def to_json(self) -> str:
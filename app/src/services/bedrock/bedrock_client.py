@@ -2,44 +2,204 @@
 AWS Bedrock Client for LLM interactions
 """
 
+import asyncio
+import hashlib
 import json
-import boto3
-from typing import Dict, Any, Optional
+import time
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 from app.src.common.loguru_logger import logger
+from app.src.common.metrics import Metrics
 from app.src.config.constants import (
     AWS_ACCESS_KEY_ID,
     AWS_SECRET_ACCESS_KEY,
     AWS_DEFAULT_REGION,
+    AWS_BEDROCK_BACKEND,
+    AWS_BEDROCK_CACHE_MAX_ENTRIES,
+    AWS_BEDROCK_CACHE_TTL_SECONDS,
     AWS_BEDROCK_MODEL_ID,
+    AWS_BEDROCK_TIMEOUT_SECONDS,
 )
 
 
+class StubBedrockModel:
+    """
+    Local stand-in for the Bedrock runtime (AWS_BEDROCK_BACKEND=stub, tests).
+
+    Answers every prompt with responder(prompt); the default recommends no
+    threshold changes, in the JSON shape ThresholdAdjustmentService expects.
+    """
+
+    def __init__(
+        self,
+        responder: Optional[Callable[[str], str]] = None,
+        latency_seconds: float = 0.0,
+    ):
+        self.responder = responder or self.no_change_response
+        self.latency_seconds = latency_seconds
+        self.calls: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def no_change_response(prompt: str) -> str:
+        return json.dumps(
+            {
+                "threshold_changes": {},
+                "max_long_trades": 5,
+                "max_short_trades": 5,
+                "reasoning": "Stub model: no changes recommended",
+            }
+        )
+
+    async def invoke(self, model_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        self.calls.append(body)
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        prompt = body["messages"][0]["content"]
+        return {"content": [{"type": "text", "text": self.responder(prompt)}]}
+
+    async def close(self):
+        pass
+
+
+class _AioBedrockModel:
+    """bedrock-runtime over aioboto3, one pooled client per event loop"""
+
+    def __init__(self, timeout_seconds: float):
+        # botocore/aioboto3 load on first real Bedrock use, not at import time
+        from botocore.config import Config
+
+        self._config = Config(
+            connect_timeout=10,
+            read_timeout=timeout_seconds,
+            retries={"max_attempts": 2, "mode": "standard"},
+            max_pool_connections=4,
+        )
+        self._stack: Optional[AsyncExitStack] = None
+        self._client: Any = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _get_client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A client bound to another (closed) loop can't be reused or closed
+            self._stack, self._client = None, None
+            self._loop, self._lock = loop, asyncio.Lock()
+        if self._client is not None:
+            return self._client
+
+        async with self._lock:
+            if self._client is None:
+                import aioboto3
+
+                session_kwargs = {"region_name": AWS_DEFAULT_REGION}
+                if AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY:
+                    session_kwargs["aws_access_key_id"] = AWS_ACCESS_KEY_ID
+                    session_kwargs["aws_secret_access_key"] = AWS_SECRET_ACCESS_KEY
+                stack = AsyncExitStack()
+                self._client = await stack.enter_async_context(
+                    aioboto3.Session(**session_kwargs).client("bedrock-runtime", config=self._config)
+                )
+                self._stack = stack
+        return self._client
+
+    async def invoke(self, model_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        client = await self._get_client()
+        response = await client.invoke_model(modelId=model_id, body=json.dumps(body))
+        return json.loads(await response["body"].read())
+
+    async def close(self):
+        if self._stack is not None and self._loop is asyncio.get_running_loop():
+            await self._stack.aclose()
+        self._stack, self._client = None, None
+
+
 class BedrockClient:
-    """Client for AWS Bedrock LLM interactions"""
+    """
+    Client for AWS Bedrock LLM interactions.
 
-    _bedrock_runtime = None
+    Uses a pooled async bedrock-runtime client (no executor threads), bounds
+    each call by AWS_BEDROCK_TIMEOUT_SECONDS and caches responses by prompt
+    hash for AWS_BEDROCK_CACHE_TTL_SECONDS, so re-sending an unchanged
+    analysis costs nothing.
+    """
+
+    model_id: str = AWS_BEDROCK_MODEL_ID
+    timeout_seconds: float = AWS_BEDROCK_TIMEOUT_SECONDS
+    cache_ttl_seconds: float = AWS_BEDROCK_CACHE_TTL_SECONDS
+    cache_max_entries: int = AWS_BEDROCK_CACHE_MAX_ENTRIES
+
+    _model: Any = None
+    _cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
 
     @classmethod
-    def _ensure_client(cls):
-        """Initialize Bedrock runtime client if not already initialized"""
-        if cls._bedrock_runtime:
-            return
-
-        if AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY:
-            cls._bedrock_runtime = boto3.client(
-                "bedrock-runtime",
-                aws_access_key_id=AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-                region_name=AWS_DEFAULT_REGION,
-            )
-        else:
-            cls._bedrock_runtime = boto3.client(
-                "bedrock-runtime", region_name=AWS_DEFAULT_REGION
-            )
+    def set_model(cls, model: Any):
+        """Use a specific backend (e.g. StubBedrockModel); None restores the default"""
+        cls._model = model
+
+    @classmethod
+    def _get_model(cls) -> Any:
+        if cls._model is None:
+            if AWS_BEDROCK_BACKEND == "stub":
+                logger.info("Using local stub Bedrock model (AWS_BEDROCK_BACKEND=stub)")
+                cls._model = StubBedrockModel()
+            else:
+                cls._model = _AioBedrockModel(cls.timeout_seconds)
+        return cls._model
+
+    @classmethod
+    def clear_cache(cls):
+        cls._cache = OrderedDict()
+
+    @classmethod
+    async def close(cls):
+        """Close the pooled runtime client"""
+        if cls._model is not None:
+            await cls._model.close()
+
+    @staticmethod
+    def _cache_key(model_id: str, body: Dict[str, Any]) -> str:
+        payload = json.dumps({"model": model_id, **body}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _cache_get(cls, key: str) -> Optional[str]:
+        entry = cls._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, text = entry
+        if time.monotonic() >= expires_at:
+            del cls._cache[key]
+            return None
+        cls._cache.move_to_end(key)
+        return text
+
+    @classmethod
+    def _cache_put(cls, key: str, text: str):
+        cls._cache[key] = (time.monotonic() + cls.cache_ttl_seconds, text)
+        cls._cache.move_to_end(key)
+        while len(cls._cache) > cls.cache_max_entries:
+            cls._cache.popitem(last=False)
+
+    @staticmethod
+    def _extract_text(response_body: Dict[str, Any]) -> Optional[str]:
+        """Extract text from a Claude messages response"""
+        content = response_body.get("content")
+        if isinstance(content, list) and len(content) > 0:
+            return content[0].get("text", "")
+        if isinstance(content, str):
+            return content
+        return None
 
     @classmethod
     async def invoke_model(
-        cls, prompt: str, max_tokens: int = 4000, temperature: float = 0.7
+        cls,
+        prompt: str,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        use_cache: bool = True,
     ) -> Optional[str]:
         """
         Invoke AWS Bedrock model with a prompt
@@ -48,49 +208,51 @@ class BedrockClient:
             prompt: The prompt to send to the model
             max_tokens: Maximum tokens in response
             temperature: Temperature for generation (0.0-1.0)
+            use_cache: Reuse a cached response for an identical request
 
         Returns:
             Model response text or None if error
         """
-        try:
-            cls._ensure_client()
-
-            # Prepare the request body for Claude models
-            body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    }
-                ],
-            }
-
-            # Run synchronous boto3 call in executor to make it async
-            import asyncio
-
-            loop = asyncio.get_event_loop()
-
-            def _invoke():
-                response = cls._bedrock_runtime.invoke_model(
-                    modelId=AWS_BEDROCK_MODEL_ID, body=json.dumps(body)
-                )
-                return json.loads(response.get("body").read())
+        # Prepare the request body for Claude models
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt,
+                }
+            ],
+        }
 
-            response_body = await loop.run_in_executor(None, _invoke)
-
-            # Extract text from Claude response
-            if "content" in response_body:
-                content = response_body["content"]
-                if isinstance(content, list) and len(content) > 0:
-                    text = content[0].get("text", "")
-                    return text
-                elif isinstance(content, str):
-                    return content
+        caching = use_cache and cls.cache_ttl_seconds > 0
+        key = cls._cache_key(cls.model_id, body) if caching else ""
+        if caching:
+            cached = cls._cache_get(key)
+            if cached is not None:
+                Metrics.inc("api_cache_requests_total", api="bedrock", endpoint="invoke_model", result="hit")
+                logger.debug("Bedrock response served from cache")
+                return cached
+            Metrics.inc("api_cache_requests_total", api="bedrock", endpoint="invoke_model", result="miss")
 
+        try:
+            response_body = await asyncio.wait_for(
+                cls._get_model().invoke(cls.model_id, body), timeout=cls.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Bedrock model call timed out after {cls.timeout_seconds:.0f}s")
             return None
         except Exception as e:
             logger.error(f"Error invoking Bedrock model: {str(e)}")
             return None
+
+        text = cls._extract_text(response_body)
+        if text and caching:
+            cls._cache_put(key, text)
+        return text
+
+
+async def close_bedrock_client():
+    """Close the pooled Bedrock runtime client"""
+    await BedrockClient.close()
@@ -13,7 +13,9 @@ from typing import Dict, List, Set
 
 import aiohttp
 
+from app.src.common.alpaca_request_scheduler import AlpacaRequestScheduler, RequestLane
 from app.src.common.loguru_logger import logger
+from app.src.common.metrics import Metrics
 from app.src.common.singleton import SingletonMeta
 
 ALPACA_API_KEY = os.environ.get("REAL_TRADE_API_KEY")
@@ -51,6 +53,7 @@ class AlpacaScreenerService(metaclass=SingletonMeta):
         self._update_task = None
         self._update_interval = 10  # Update every 10 seconds
 
+    @Metrics.timed("screener_fetch", endpoint="most_actives")
     async def get_most_actives(self, top: int = 10, by: str = "volume") -> List[str]:
         """
         Get most active stocks by volume or trade count
@@ -69,6 +72,7 @@ class AlpacaScreenerService(metaclass=SingletonMeta):
                 "top": top,
             }
 
+            await AlpacaRequestScheduler.acquire(RequestLane.SCREENER)
             async with aiohttp.ClientSession() as session:
                 async with session.get(
                     url,
@@ -76,6 +80,7 @@ class AlpacaScreenerService(metaclass=SingletonMeta):
                     params=params,
                     timeout=aiohttp.ClientTimeout(total=10),
                 ) as response:
+                    AlpacaRequestScheduler.observe_response(response.status, response.headers, endpoint="most_actives")
                     if response.status == 200:
                         data = await response.json()
                         most_actives = data.get("most_actives", [])
@@ -94,6 +99,7 @@ class AlpacaScreenerService(metaclass=SingletonMeta):
             logger.error(f"Error fetching most active stocks: {str(e)}", exc_info=True)
             return []
 
+    @Metrics.timed("screener_fetch", endpoint="movers")
     async def get_movers(self, top: int = 10) -> Dict[str, List[str]]:
         """
         Get top gainers and losers
@@ -113,6 +119,7 @@ class AlpacaScreenerService(metaclass=SingletonMeta):
                 f"and headers {list(self._headers.keys())}"  # pylint: disable=line-too-long
             )
 
+            await AlpacaRequestScheduler.acquire(RequestLane.SCREENER)
             async with aiohttp.ClientSession() as session:
                 async with session.get(
                     url,
@@ -120,6 +127,7 @@ class AlpacaScreenerService(metaclass=SingletonMeta):
                     params=params,
                     timeout=aiohttp.ClientTimeout(total=10),
                 ) as response:
+                    AlpacaRequestScheduler.observe_response(response.status, response.headers, endpoint="movers")
                     logger.debug(f"Movers API response status: {response.status}")
 
                     if response.status == 200:
@@ -221,6 +229,28 @@ class AlpacaScreenerService(metaclass=SingletonMeta):
         except Exception as e:
             logger.error(f"Error updating screener cache: {str(e)}", exc_info=True)
 
+    def export_cache(self) -> Dict[str, List[str]]:
+        """Cached screened tickers as sorted lists (warm-restart snapshot)"""
+        return {key: sorted(tickers) for key, tickers in self._cached_screened_tickers.items()}
+
+    def restore_cache(self, cache: Dict[str, List[str]]) -> bool:
+        """
+        Seed an empty cache from export_cache() output.
+
+        Returns:
+            True if the cache was empty and has been restored
+        """
+        if any(self._cached_screened_tickers.values()) or not any(cache.values()):
+            return False
+        self._cached_screened_tickers = {
+            key: set(cache.get(key) or []) for key in ("most_actives", "gainers", "losers", "all")
+        }
+        return True
+
+    async def refresh_cache(self):
+        """Fetch fresh screener results now (replaces a restored cache)"""
+        await self._update_cache()
+
     async def _background_cache_updater(self):
         """Background task that updates the cache every 10 seconds"""
         while self._running:
@@ -8,6 +8,7 @@ from typing import Set
 
 from app.src.common.loguru_logger import logger
 from app.src.common.alpaca import AlpacaClient
+from app.src.common.market_session import MarketSession
 from app.src.common.singleton import SingletonMeta
 from app.src.common.utils import measure_latency
 from app.src.db.dynamodb_client import DynamoDBClient
@@ -140,7 +141,7 @@ class ScreenerMonitorService(metaclass=SingletonMeta):
 
         # Initial check (only if market is open)
         try:
-            is_open = await AlpacaClient.is_market_open()
+            is_open = await MarketSession.is_market_open()
             if is_open:
                 await self._check_and_add_tickers()
             else:
@@ -172,7 +173,7 @@ class ScreenerMonitorService(metaclass=SingletonMeta):
 
                 # Check market open status
                 try:
-                    is_open = await AlpacaClient.is_market_open()
+                    is_open = await MarketSession.is_market_open()
                     if not is_open:
                         # Get clock data for next_open info if needed
                         try:
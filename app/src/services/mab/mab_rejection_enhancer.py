@@ -7,11 +7,15 @@ It provides both real-time enhancement and batch backfill capabilities.
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime, timezone
+import os
+import random
+from typing import AsyncIterator, List, Dict, Any, Optional, Set, Tuple
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
+from botocore.exceptions import ClientError
 from loguru import logger
 
+from app.src.common.adaptive_concurrency import AdaptiveConcurrency
 from app.src.db.dynamodb_client import DynamoDBClient
 from app.src.services.mab.mab_service import MABService
 
@@ -26,11 +30,22 @@ class MABRejectionEnhancer:
     3. Update records with enhanced rejection information
     4. Provide real-time enhancement for new records
     """
+
+    EMPTY_REASONS_FILTER = (
+        '(attribute_not_exists(reason_not_to_enter_long) OR reason_not_to_enter_long = :empty) AND '
+        '(attribute_not_exists(reason_not_to_enter_short) OR reason_not_to_enter_short = :empty)'
+    )
     
     def __init__(self):
         """Initialize the MAB rejection enhancer."""
         self.dynamodb_client = DynamoDBClient()
         self.mab_service = MABService()
+
+    @staticmethod
+    def _cutoff_timestamp(hours_lookback: int) -> str:
+        """Start of the hour hours_lookback hours ago (EST), as an ISO timestamp"""
+        cutoff_time = datetime.now(ZoneInfo('America/New_York')) - timedelta(hours=hours_lookback)
+        return cutoff_time.replace(minute=0, second=0, microsecond=0).isoformat()
     
     async def enhance_empty_rejection_records(
         self,
@@ -123,34 +138,13 @@ class MABRejectionEnhancer:
         """
         try:
             # Calculate cutoff time
-            cutoff_time = datetime.now(ZoneInfo('America/New_York'))
-            cutoff_time = cutoff_time.replace(
-                hour=cutoff_time.hour - hours_lookback,
-                minute=0, second=0, microsecond=0
-            )
-            cutoff_timestamp = cutoff_time.isoformat()
+            cutoff_timestamp = self._cutoff_timestamp(hours_lookback)
             
-            # Scan the table for records with empty rejection reasons
-            # Note: This is a simplified approach. In production, you might want to use
-            # a GSI (Global Secondary Index) on indicator + timestamp for better performance
-            
-            all_records = await self.dynamodb_client.scan(
-                table_name='InactiveTickersForDayTrading',
-                filter_expression=(
-                    '#ind = :indicator AND #ts >= :cutoff AND '
-                    '(attribute_not_exists(reason_not_to_enter_long) OR reason_not_to_enter_long = :empty) AND '
-                    '(attribute_not_exists(reason_not_to_enter_short) OR reason_not_to_enter_short = :empty)'
-                ),
-                expression_attribute_names={
-                    '#ind': 'indicator',
-                    '#ts': 'timestamp'
-                },
-                expression_attribute_values={
-                    ':indicator': indicator,
-                    ':cutoff': cutoff_timestamp,
-                    ':empty': ''
-                }
-            )
+            # Query the (indicator, timestamp) index for the lookback window only
+            all_records = [
+                record
+                async for record in self._iter_empty_rejection_records(indicator, cutoff_timestamp)
+            ]
             
             logger.debug(f"Found {len(all_records)} records with empty rejection reasons")
             return all_records
@@ -159,6 +153,19 @@ class MABRejectionEnhancer:
             logger.error(f"Error getting empty rejection records: {str(e)}")
             return []
     
+    def _iter_empty_rejection_records(
+        self,
+        indicator: str,
+        cutoff_timestamp: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream records since cutoff_timestamp whose long and short reasons are both empty"""
+        return self.dynamodb_client.iter_inactive_tickers(
+            indicator,
+            since=cutoff_timestamp,
+            filter_expression=self.EMPTY_REASONS_FILTER,
+            expression_attribute_values={':empty': ''}
+        )
+
     async def _enhance_record_batch(
         self,
         records: List[Dict[str, Any]],
@@ -227,25 +234,63 @@ class MABRejectionEnhancer:
         try:
             # Get MAB stats for this ticker
             stats = await self.mab_service.get_stats(indicator, ticker)
-            
-            # Generate rejection reason based on MAB stats
-            if stats is None:
-                # New ticker - would have been explored by Thompson Sampling
-                reason = "MAB: New ticker - not selected by Thompson Sampling (successes: 0, failures: 0, total: 0)"
-            else:
-                # Use the existing MAB rejection reason generator
-                reason = MABService.get_rejection_reason(stats, ticker)
-            
-            # For penny stocks, we need to determine if this would be long or short
-            # Since we don't have the momentum score, we'll apply to both directions
-            return {
-                'reason_long': reason,
-                'reason_short': reason
-            }
+            return self._mab_reasons_from_stats(stats, ticker)
             
         except Exception as e:
             logger.error(f"Error generating MAB rejection reason for {ticker}: {str(e)}")
             return {'reason_long': '', 'reason_short': ''}
+
+    @staticmethod
+    def _mab_reasons_from_stats(
+        stats: Optional[Dict[str, Any]],
+        ticker: str
+    ) -> Dict[str, str]:
+        """
+        Build MAB rejection reasons from already-fetched MAB stats.
+        
+        Args:
+            stats: MAB stats record, or None for a ticker without one
+            ticker: Stock ticker symbol
+            
+        Returns:
+            Dictionary with 'reason_long' and 'reason_short' keys
+        """
+        if stats is None:
+            # New ticker - would have been explored by Thompson Sampling
+            reason = "MAB: New ticker - not selected by Thompson Sampling (successes: 0, failures: 0, total: 0)"
+        else:
+            # Use the existing MAB rejection reason generator
+            reason = MABService.get_rejection_reason(stats, ticker)
+        
+        # For penny stocks, we need to determine if this would be long or short
+        # Since we don't have the momentum score, we'll apply to both directions
+        return {
+            'reason_long': reason,
+            'reason_short': reason
+        }
+
+    async def _prefetch_mab_stats(
+        self,
+        indicator: str,
+        records: List[Dict[str, Any]],
+        mab_stats: Dict[str, Optional[Dict[str, Any]]]
+    ):
+        """Batch-read MAB stats for the tickers in records not yet in mab_stats"""
+        missing = sorted({r['ticker'] for r in records if r.get('ticker')} - mab_stats.keys())
+        if missing:
+            mab_stats.update(await self.mab_service.get_stats_many(indicator, missing))
+
+    def _reasons_for_record(
+        self,
+        record: Dict[str, Any],
+        mab_stats: Dict[str, Optional[Dict[str, Any]]]
+    ) -> Dict[str, str]:
+        """Rejection reasons for a record from prefetched MAB stats (generic fallback)"""
+        ticker = record['ticker']
+        enhanced_reasons = self._mab_reasons_from_stats(mab_stats.get(ticker), ticker)
+        if not enhanced_reasons['reason_long'] and not enhanced_reasons['reason_short']:
+            enhanced_reasons = self._create_generic_rejection_reason(record)
+        return enhanced_reasons
     
     def _create_generic_rejection_reason(
         self,
@@ -293,7 +338,8 @@ class MABRejectionEnhancer:
     async def _update_record_with_reasons(
         self,
         record: Dict[str, Any],
-        enhanced_reasons: Dict[str, str]
+        enhanced_reasons: Dict[str, str],
+        raise_on_throttle: bool = False
     ) -> bool:
         """
         Update a record with enhanced rejection reasons.
@@ -301,6 +347,7 @@ class MABRejectionEnhancer:
         Args:
             record: Original record dictionary
             enhanced_reasons: Dictionary with 'reason_long' and 'reason_short'
+            raise_on_throttle: Re-raise DynamoDB throttling errors to the caller
             
         Returns:
             True if update successful, False otherwise
@@ -324,14 +371,178 @@ class MABRejectionEnhancer:
                 table_name='InactiveTickersForDayTrading',
                 key={'ticker': ticker, 'timestamp': timestamp},
                 update_expression=update_expression,
-                expression_attribute_values=expression_attribute_values
+                expression_attribute_values=expression_attribute_values,
+                raise_on_throttle=raise_on_throttle
             )
             
             return success
             
         except Exception as e:
+            if raise_on_throttle and isinstance(e, ClientError):
+                raise
             logger.error(f"Error updating record: {str(e)}")
             return False
+
+    async def _update_record_adaptively(
+        self,
+        record: Dict[str, Any],
+        enhanced_reasons: Dict[str, str],
+        limiter: AdaptiveConcurrency,
+        max_retries: int = 8
+    ) -> bool:
+        """
+        Update a record under the limiter, backing off and retrying when throttled.
+        
+        Returns:
+            True if update successful, False otherwise (including retries exhausted)
+        """
+        for attempt in range(max_retries + 1):
+            async with limiter:
+                try:
+                    success = await self._update_record_with_reasons(
+                        record, enhanced_reasons, raise_on_throttle=True
+                    )
+                except ClientError:
+                    limiter.on_throttle()
+                else:
+                    if success:
+                        limiter.on_success()
+                    return success
+            # Back off outside the limiter so other writers are not blocked
+            await asyncio.sleep(min(0.05 * 2 ** attempt, 5.0) * random.uniform(0.5, 1.0))
+        logger.warning(f"Giving up on {record.get('ticker')} after {max_retries} throttled retries")
+        return False
+
+    @staticmethod
+    async def _prefetch_chunks(
+        records: AsyncIterator[Dict[str, Any]],
+        chunk_size: int,
+        depth: int = 2
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Group a record stream into chunks, reading ahead up to depth chunks.
+        
+        Reading continues in the background while the consumer processes the
+        current chunk, so DynamoDB reads overlap with MAB lookups and writes.
+        A read error is raised to the consumer after the chunks read before it.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=depth)
+        finished = object()
+
+        async def read():
+            chunk: List[Dict[str, Any]] = []
+            try:
+                async for record in records:
+                    chunk.append(record)
+                    if len(chunk) >= chunk_size:
+                        await queue.put(chunk)
+                        chunk = []
+                if chunk:
+                    await queue.put(chunk)
+            except Exception as e:
+                logger.error(f"Error reading records for enhancement: {str(e)}")
+                await queue.put(e)
+                return
+            await queue.put(finished)
+
+        reader = asyncio.create_task(read())
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is finished:
+                    return
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+
+    async def enhance_empty_rejection_records_pipelined(
+        self,
+        indicator: str,
+        hours_lookback: int = 24,
+        chunk_size: int = 500,
+        max_concurrency: int = 32,
+        min_concurrency: int = 2
+    ) -> Dict[str, int]:
+        """
+        Enhance records with empty rejection reasons as a streaming pipeline.
+        
+        Suited to large backfills: records are streamed from the index in
+        chunks (read-ahead in the background), MAB stats are batch-read once
+        per distinct ticker, and updates run concurrently under an adaptive
+        limit that halves on ProvisionedThroughputExceeded and grows back
+        while writes succeed. Memory is bounded by chunk_size and the number
+        of distinct tickers.
+        
+        Args:
+            indicator: Trading indicator name (e.g., "Penny Stocks")
+            hours_lookback: How many hours back to look for records
+            chunk_size: Records read (and MAB-prefetched) per chunk
+            max_concurrency: Upper bound on concurrent updates
+            min_concurrency: Lower bound the throttling backoff shrinks to
+            
+        Returns:
+            Dictionary with enhancement statistics (same keys as
+            enhance_empty_rejection_records, plus 'throttled')
+        """
+        logger.info(
+            f"Starting pipelined MAB rejection enhancement for {indicator} "
+            f"(last {hours_lookback} hours, concurrency <= {max_concurrency})"
+        )
+
+        stats = {'total_found': 0, 'enhanced': 0, 'skipped': 0, 'errors': 0, 'throttled': 0}
+        limiter = AdaptiveConcurrency(max_concurrency, min_limit=min(min_concurrency, max_concurrency))
+        mab_stats: Dict[str, Optional[Dict[str, Any]]] = {}
+        in_flight: Set[asyncio.Task] = set()
+
+        async def update(record: Dict[str, Any], enhanced_reasons: Dict[str, str]):
+            try:
+                success = await self._update_record_adaptively(record, enhanced_reasons, limiter)
+            except Exception as e:
+                logger.error(f"Error enhancing record {record.get('ticker', 'unknown')}: {str(e)}")
+                success = False
+            stats['enhanced' if success else 'errors'] += 1
+
+        try:
+            records = self._iter_empty_rejection_records(indicator, self._cutoff_timestamp(hours_lookback))
+            async for chunk in self._prefetch_chunks(records, chunk_size):
+                stats['total_found'] += len(chunk)
+                await self._prefetch_mab_stats(indicator, chunk, mab_stats)
+
+                for record in chunk:
+                    if not record.get('ticker'):
+                        stats['skipped'] += 1
+                        continue
+                    # Keep at most ~limit update tasks alive (bounded memory)
+                    while len(in_flight) >= limiter.limit:
+                        await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    task = asyncio.create_task(update(record, self._reasons_for_record(record, mab_stats)))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+
+                logger.info(
+                    f"Queued {stats['total_found']} records: {stats['enhanced']} enhanced, "
+                    f"{stats['errors']} errors, concurrency limit {limiter.limit}"
+                )
+
+            if in_flight:
+                await asyncio.gather(*in_flight)
+        except Exception as e:
+            logger.error(f"Error during pipelined MAB rejection enhancement: {str(e)}")
+            stats['errors'] += 1
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+        stats['throttled'] = limiter.throttle_events
+        logger.info(
+            f"Pipelined MAB rejection enhancement complete for {indicator}: "
+            f"{stats['enhanced']}/{stats['total_found']} records enhanced, "
+            f"{stats['throttled']} throttled writes"
+        )
+        return stats
     
     @classmethod
     async def enhance_real_time_record(
@@ -373,15 +584,23 @@ class MABRejectionEnhancer:
         self,
         indicator: str,
         hours_lookback: int = 24,
-        output_file: str = "enhanced_inactive_tickers.csv"
+        output_file: str = "enhanced_inactive_tickers.csv",
+        chunk_size: int = 500
     ) -> str:
         """
         Generate a CSV export with enhanced rejection reasons.
         
+        Records are streamed to the file in chunks; MAB stats for records
+        that need enhancing are batch-read once per distinct ticker. Rows go
+        to "<output_file>.partial", renamed to output_file only once every
+        record has been read; a failed read leaves the .partial file and
+        raises.
+        
         Args:
             indicator: Trading indicator name
             hours_lookback: Hours to look back from now
             output_file: Output CSV file path
+            chunk_size: Records read (and MAB-prefetched) per chunk
             
         Returns:
             Path to the generated CSV file
@@ -393,71 +612,82 @@ class MABRejectionEnhancer:
         
         try:
             # Get all records for the indicator
-            cutoff_time = datetime.now(ZoneInfo('America/New_York'))
-            cutoff_time = cutoff_time.replace(
-                hour=cutoff_time.hour - hours_lookback,
-                minute=0, second=0, microsecond=0
-            )
-            cutoff_timestamp = cutoff_time.isoformat()
+            cutoff_timestamp = self._cutoff_timestamp(hours_lookback)
             
-            all_records = await self.dynamodb_client.scan(
-                table_name='InactiveTickersForDayTrading',
-                filter_expression='#ind = :indicator AND #ts >= :cutoff',
-                expression_attribute_names={
-                    '#ind': 'indicator',
-                    '#ts': 'timestamp'
-                },
-                expression_attribute_values={
-                    ':indicator': indicator,
-                    ':cutoff': cutoff_timestamp
-                }
+            fieldnames = [
+                'ticker', 'indicator', 'reason_not_to_enter_long',
+                'reason_not_to_enter_short', 'technical_indicators', 'timestamp'
+            ]
+
+            # Stream matching records straight into the CSV (constant memory,
+            # only the exported attributes are read)
+            records = self.dynamodb_client.iter_inactive_tickers(
+                indicator,
+                since=cutoff_timestamp,
+                projection_expression=(
+                    'ticker, #ind, #ts, reason_not_to_enter_long, '
+                    'reason_not_to_enter_short, technical_indicators'
+                )
             )
-            
-            # Enhance records that need it
-            enhanced_records = []
-            for record in all_records:
-                ticker = record.get('ticker', '')
-                reason_long = record.get('reason_not_to_enter_long', '')
-                reason_short = record.get('reason_not_to_enter_short', '')
-                
-                # If both reasons are empty, enhance them
-                if not reason_long and not reason_short:
-                    enhanced_reasons = await self._generate_mab_rejection_reason(ticker, indicator)
-                    if not enhanced_reasons['reason_long'] and not enhanced_reasons['reason_short']:
-                        enhanced_reasons = self._create_generic_rejection_reason(record)
-                    
-                    reason_long = enhanced_reasons['reason_long']
-                    reason_short = enhanced_reasons['reason_short']
-                
-                # Prepare record for CSV
-                tech_indicators = record.get('technical_indicators', '{}')
-                if isinstance(tech_indicators, dict):
-                    tech_indicators = json.dumps(tech_indicators)
-                
-                enhanced_records.append({
-                    'ticker': ticker,
-                    'indicator': record.get('indicator', ''),
-                    'reason_not_to_enter_long': reason_long,
-                    'reason_not_to_enter_short': reason_short,
-                    'technical_indicators': tech_indicators,
-                    'timestamp': record.get('timestamp', '')
-                })
-            
-            # Write to CSV
-            with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    'ticker', 'indicator', 'reason_not_to_enter_long', 
-                    'reason_not_to_enter_short', 'technical_indicators', 'timestamp'
-                ]
+
+            written = 0
+            mab_stats: Dict[str, Optional[Dict[str, Any]]] = {}
+            partial_file = f"{output_file}.partial"
+            with open(partial_file, 'w', newline='', encoding='utf-8') as csvfile:
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
                 writer.writeheader()
-                writer.writerows(enhanced_records)
-            
-            logger.info(f"Enhanced CSV export complete: {len(enhanced_records)} records written to {output_file}")
+
+                async for chunk in self._prefetch_chunks(records, chunk_size):
+                    # One batched MAB read for the chunk's records that need enhancing
+                    await self._prefetch_mab_stats(
+                        indicator,
+                        [
+                            r for r in chunk
+                            if not r.get('reason_not_to_enter_long') and not r.get('reason_not_to_enter_short')
+                        ],
+                        mab_stats
+                    )
+
+                    for record in chunk:
+                        ticker = record.get('ticker', '')
+                        reason_long = record.get('reason_not_to_enter_long', '')
+                        reason_short = record.get('reason_not_to_enter_short', '')
+
+                        # If both reasons are empty, enhance them
+                        if not reason_long and not reason_short:
+                            if ticker:
+                                enhanced_reasons = self._reasons_for_record(record, mab_stats)
+                            else:
+                                enhanced_reasons = self._create_generic_rejection_reason(record)
+                            reason_long = enhanced_reasons['reason_long']
+                            reason_short = enhanced_reasons['reason_short']
+
+                        # Prepare record for CSV
+                        tech_indicators = record.get('technical_indicators', '{}')
+                        if isinstance(tech_indicators, dict):
+                            tech_indicators = json.dumps(tech_indicators)
+
+                        writer.writerow({
+                            'ticker': ticker,
+                            'indicator': record.get('indicator', ''),
+                            'reason_not_to_enter_long': reason_long,
+                            'reason_not_to_enter_short': reason_short,
+                            'technical_indicators': tech_indicators,
+                            'timestamp': record.get('timestamp', '')
+                        })
+                    written += len(chunk)
+                    # Rows reach disk chunk by chunk rather than at close
+                    csvfile.flush()
+
+            os.replace(partial_file, output_file)
+            logger.info(f"Enhanced CSV export complete: {written} records written to {output_file}")
             return output_file
             
         except Exception as e:
-            logger.error(f"Error generating enhanced CSV export: {str(e)}")
+            logger.error(
+                f"Error generating enhanced CSV export: {str(e)} "
+                f"(incomplete rows left in {output_file}.partial)"
+            )
             raise
 
 
@@ -471,6 +701,8 @@ async def main():
     parser.add_argument('--hours', type=int, default=24, help='Hours to look back')
     parser.add_argument('--export-csv', help='Export enhanced data to CSV file')
     parser.add_argument('--enhance-existing', action='store_true', help='Enhance existing records with empty reasons')
+    parser.add_argument('--pipelined', action='store_true', help='Use the concurrent pipeline (large backfills)')
+    parser.add_argument('--concurrency', type=int, default=32, help='Maximum concurrent updates when pipelined')
     
     args = parser.parse_args()
     
@@ -485,10 +717,17 @@ async def main():
         print(f"Enhanced CSV exported to: {output_file}")
     
     if args.enhance_existing:
-        stats = await enhancer.enhance_empty_rejection_records(
-            indicator=args.indicator,
-            hours_lookback=args.hours
-        )
+        if args.pipelined:
+            stats = await enhancer.enhance_empty_rejection_records_pipelined(
+                indicator=args.indicator,
+                hours_lookback=args.hours,
+                max_concurrency=args.concurrency
+            )
+        else:
+            stats = await enhancer.enhance_empty_rejection_records(
+                indicator=args.indicator,
+                hours_lookback=args.hours
+            )
         print(f"Enhancement complete: {stats}")
 
 
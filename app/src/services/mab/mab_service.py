@@ -10,6 +10,7 @@ from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 from loguru import logger
 
+from app.src.common.metrics import Metrics
 from app.src.common.logging_utils import log_mab_selection, log_error_with_context
 from app.src.db.dynamodb_client import DynamoDBClient
 from app.src.models.trade_models import MABStats
@@ -75,6 +76,31 @@ class MABService:
 
         return stats
 
+    async def get_stats_many(
+        self, indicator: str, tickers: List[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get MAB statistics for many tickers of one indicator with batched reads.
+
+        Args:
+            indicator: Trading indicator name
+            tickers: Stock ticker symbols (duplicates are read once)
+
+        Returns:
+            Dictionary mapping every requested ticker to its statistics,
+            or None if the ticker has no record
+        """
+        unique_tickers = list(dict.fromkeys(tickers))
+        items = await self.dynamodb_client.batch_get_items(
+            table_name=self.MAB_STATS_TABLE,
+            keys=[{"ticker": ticker, "indicator": indicator} for ticker in unique_tickers],
+        )
+        found = {item.get("ticker"): item for item in items}
+        logger.debug(
+            f"Retrieved MAB stats for {len(found)}/{len(unique_tickers)} {indicator} tickers"
+        )
+        return {ticker: found.get(ticker) for ticker in unique_tickers}
+
     async def update_stats(self, indicator: str, ticker: str, success: bool) -> bool:
         """
         Update MAB statistics after a trade completion.
@@ -306,6 +332,7 @@ class MABService:
 
         return ranked_indices
 
+    @Metrics.timed("mab_selection")
     async def select_tickers(
         self, indicator: str, candidates: List[str], direction: str, top_k: int
     ) -> List[str]:
@@ -0,0 +1,372 @@
+"""
+Market Data Hub
+Process-wide bars/quotes cache shared by all concurrently running indicators
+
+Every indicator scans largely the same screener universe. Without a shared
+layer each one fetched its own bars (50, 200 or 1000 deep) and quotes for the
+same tickers on its own cadence, so enabling another indicator multiplied
+Alpaca traffic. The hub fetches each ticker once per tick at the deepest
+depth any consumer has asked for and hands every caller a view of it.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from app.src.common.alpaca import AlpacaClient
+from app.src.common.alpaca_request_scheduler import AlpacaRequestScheduler, RequestLane
+from app.src.config.constants import (
+    MARKET_DATA_HUB_BARS_TTL_SECONDS,
+    MARKET_DATA_HUB_DEPTH_DECAY_SECONDS,
+    MARKET_DATA_HUB_ENABLED,
+    MARKET_DATA_HUB_EXIT_BARS_TTL_SECONDS,
+    MARKET_DATA_HUB_MAX_AGE_SECONDS,
+    MARKET_DATA_HUB_MAX_DEPTH,
+    MARKET_DATA_HUB_MAX_TICKERS,
+    MARKET_DATA_HUB_MIN_DEPTH,
+    MARKET_DATA_HUB_QUOTE_TTL_SECONDS,
+)
+from app.src.services.candidate_generator.alpaca_screener import AlpacaScreenerService
+
+
+@dataclass
+class _Entry:
+    """Cached response plus the depth it was fetched at"""
+
+    data: Optional[Dict[str, Any]]
+    fetched_at: float
+    depth: int = 0
+
+
+class MarketDataHub:
+    """
+    Shared, single-flight cache in front of AlpacaClient.
+
+    - Bars: fetched once per tick per ticker at the deepest depth requested
+      for that ticker within MARKET_DATA_HUB_DEPTH_DECAY_SECONDS (at least
+      MARKET_DATA_HUB_MIN_DEPTH). Shallower requests get the tail of the
+      same bar list; the bar dicts are shared, so consumers must treat them
+      as read-only. Callers in an exit-priority context refetch bars older
+      than MARKET_DATA_HUB_EXIT_BARS_TTL_SECONDS.
+    - Quotes: shared for MARKET_DATA_HUB_QUOTE_TTL_SECONDS. Callers in an
+      exit-priority context always get a fresh quote.
+    - Universe: the screener union is shared for one bars tick.
+    - Eviction: entries older than MARKET_DATA_HUB_MAX_AGE_SECONDS, then the
+      oldest beyond MARKET_DATA_HUB_MAX_TICKERS.
+
+    Concurrent requests for the same key await one in-flight fetch.
+    """
+
+    enabled: bool = MARKET_DATA_HUB_ENABLED
+    bars_ttl_seconds: float = MARKET_DATA_HUB_BARS_TTL_SECONDS
+    exit_bars_ttl_seconds: float = MARKET_DATA_HUB_EXIT_BARS_TTL_SECONDS
+    quote_ttl_seconds: float = MARKET_DATA_HUB_QUOTE_TTL_SECONDS
+    min_depth: int = MARKET_DATA_HUB_MIN_DEPTH
+    max_depth: int = MARKET_DATA_HUB_MAX_DEPTH
+    depth_decay_seconds: float = MARKET_DATA_HUB_DEPTH_DECAY_SECONDS
+    max_tickers: int = MARKET_DATA_HUB_MAX_TICKERS
+    max_age_seconds: float = MARKET_DATA_HUB_MAX_AGE_SECONDS
+
+    _bars: Dict[str, _Entry] = {}
+    _quotes: Dict[str, _Entry] = {}
+    # ticker -> {requested depth: monotonic time of the last request}
+    _depth: Dict[str, Dict[int, float]] = {}
+    _swept_at: Dict[str, float] = {}
+    _inflight: Dict[tuple, asyncio.Future] = {}
+    _universe: List[str] = []
+    _universe_at: float = 0.0
+    _stats: Dict[str, int] = {
+        "bars_hits": 0,
+        "bars_fetches": 0,
+        "quote_hits": 0,
+        "quote_fetches": 0,
+        "joined_inflight": 0,
+    }
+
+    @classmethod
+    def reset(cls):
+        """Drop all cached data (tests, or after a long market close)"""
+        cls._bars = {}
+        cls._quotes = {}
+        cls._depth = {}
+        cls._swept_at = {}
+        cls._inflight = {}
+        cls._universe = []
+        cls._universe_at = 0.0
+        cls._stats = {key: 0 for key in cls._stats}
+
+    # ------------------------------------------------------------------
+    # Universe
+    # ------------------------------------------------------------------
+
+    @classmethod
+    async def get_universe(cls) -> List[str]:
+        """Union of most actives, gainers and losers from the screener cache"""
+        if cls.enabled and cls._universe and time.monotonic() - cls._universe_at < cls.bars_ttl_seconds:
+            return list(cls._universe)
+
+        screened_data = await AlpacaScreenerService().get_all_screened_tickers()
+        if not screened_data:
+            return []
+        combined = set(screened_data.get("most_actives", set()))
+        combined.update(screened_data.get("gainers", set()))
+        combined.update(screened_data.get("losers", set()))
+        cls._universe = sorted(combined)
+        cls._universe_at = time.monotonic()
+        return list(cls._universe)
+
+    @classmethod
+    def cached_universe(cls) -> List[str]:
+        """Last screener union seen by the hub (no I/O)"""
+        return list(cls._universe)
+
+    # ------------------------------------------------------------------
+    # Single-flight helper
+    # ------------------------------------------------------------------
+
+    @classmethod
+    async def _single_flight(cls, key: tuple, fetch) -> Any:
+        pending = cls._inflight.get(key)
+        if pending is not None:
+            cls._stats["joined_inflight"] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        cls._inflight[key] = future
+        try:
+            result = await fetch()
+        except BaseException as e:
+            if not future.done():
+                if isinstance(e, asyncio.CancelledError):
+                    # Joiners get "no data" (None) rather than the leader's
+                    # cancellation (e.g. a timed-out prewarm read)
+                    cls._inflight.pop(key, None)
+                    future.set_result(None)
+                else:
+                    future.set_exception(e)
+                    future.exception()  # mark retrieved when nobody joined
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            cls._inflight.pop(key, None)
+
+    @classmethod
+    def _evict(cls, cache: Dict[str, _Entry]):
+        now = time.monotonic()
+        name = "bars" if cache is cls._bars else "quotes"
+        # Age sweep at most once per bars tick (it scans the whole cache)
+        if now - cls._swept_at.get(name, 0.0) >= cls.bars_ttl_seconds:
+            cls._swept_at[name] = now
+            expired = [t for t, entry in cache.items() if now - entry.fetched_at > cls.max_age_seconds]
+            for ticker in expired:
+                cls._drop(cache, ticker)
+        if len(cache) <= cls.max_tickers:
+            return
+        oldest = sorted(cache, key=lambda t: cache[t].fetched_at)[: len(cache) - cls.max_tickers]
+        for ticker in oldest:
+            cls._drop(cache, ticker)
+
+    @classmethod
+    def _drop(cls, cache: Dict[str, _Entry], ticker: str):
+        cache.pop(ticker, None)
+        if cache is cls._bars:
+            cls._depth.pop(ticker, None)
+
+    @classmethod
+    def _fetch_depth(cls, ticker: str, limit: int, now: float) -> int:
+        """Deepest depth requested for the ticker within the decay window"""
+        requests = cls._depth.setdefault(ticker, {})
+        requests[limit] = now
+        for depth, requested_at in list(requests.items()):
+            if now - requested_at > cls.depth_decay_seconds:
+                del requests[depth]
+        return max(max(requests), cls.min_depth)
+
+    # ------------------------------------------------------------------
+    # Bars
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _tail(data: Dict[str, Any], ticker: str, limit: int) -> Dict[str, Any]:
+        """View of the last `limit` bars (shares the bar dicts, no deep copy)"""
+        view = {}
+        for field in ("bars", "bars_est"):
+            bars = data.get(field, {}).get(ticker, [])
+            view[field] = {ticker: bars if len(bars) <= limit else bars[-limit:]}
+        return view
+
+    @classmethod
+    async def get_market_data(cls, ticker: str, limit: int = 50) -> Optional[Dict[str, Any]]:
+        """
+        Drop-in replacement for AlpacaClient.get_market_data backed by the hub.
+
+        Args:
+            ticker: Stock ticker symbol
+            limit: Number of most recent 1-minute bars needed
+
+        Returns:
+            Same structure as AlpacaClient.get_market_data, or None
+        """
+        if not cls.enabled:
+            return await AlpacaClient.get_market_data(ticker, limit=limit)
+
+        limit = min(limit, cls.max_depth)
+        now = time.monotonic()
+        depth = cls._fetch_depth(ticker, limit, now)
+
+        exit_context = AlpacaRequestScheduler.resolve_lane(RequestLane.BARS) == RequestLane.EXIT
+        ttl = min(cls.bars_ttl_seconds, cls.exit_bars_ttl_seconds) if exit_context else cls.bars_ttl_seconds
+        entry = cls._bars.get(ticker)
+        if entry is not None and now - entry.fetched_at < ttl and entry.depth >= limit:
+            cls._stats["bars_hits"] += 1
+            return cls._tail(entry.data, ticker, limit) if entry.data else None
+
+        async def fetch():
+            cls._stats["bars_fetches"] += 1
+            data = await AlpacaClient.get_market_data(ticker, limit=depth)
+            cls._bars[ticker] = _Entry(data, time.monotonic(), depth)
+            cls._evict(cls._bars)
+            return data
+
+        # Exit reads don't join an entry-lane fetch queued behind other traffic
+        key = ("bars", ticker, depth, "exit") if exit_context else ("bars", ticker, depth)
+        data = await cls._single_flight(key, fetch)
+        if not data:
+            return None
+        return cls._tail(data, ticker, limit)
+
+    @classmethod
+    def cached_bars(cls, ticker: str) -> List[Dict[str, Any]]:
+        """
+        Bars already in the cache for a ticker, regardless of age (no I/O).
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            Cached 1-minute bars (read-only), or an empty list
+        """
+        entry = cls._bars.get(ticker)
+        if entry is None or not entry.data:
+            return []
+        return entry.data.get("bars", {}).get(ticker, [])
+
+    # ------------------------------------------------------------------
+    # Quotes
+    # ------------------------------------------------------------------
+
+    @classmethod
+    async def quote(cls, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Drop-in replacement for AlpacaClient.quote backed by the hub.
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            Same structure as AlpacaClient.quote, or None
+        """
+        if not cls.enabled:
+            return await AlpacaClient.quote(ticker)
+
+        exit_context = AlpacaRequestScheduler.resolve_lane(RequestLane.ENTRY_QUOTE) == RequestLane.EXIT
+        entry = cls._quotes.get(ticker)
+        if (
+            not exit_context
+            and entry is not None
+            and time.monotonic() - entry.fetched_at < cls.quote_ttl_seconds
+        ):
+            cls._stats["quote_hits"] += 1
+            return entry.data
+
+        async def fetch():
+            cls._stats["quote_fetches"] += 1
+            data = await AlpacaClient.quote(ticker)
+            if data:
+                cls._quotes[ticker] = _Entry(data, time.monotonic())
+                cls._evict(cls._quotes)
+            return data
+
+        if exit_context:
+            return await fetch()
+        return await cls._single_flight(("quote", ticker), fetch)
+
+    # ------------------------------------------------------------------
+    # Warm-restart snapshot
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def export_state(cls, tickers: List[str]) -> Dict[str, Any]:
+        """
+        Cached bars for the given tickers plus the universe, JSON-safe.
+
+        Args:
+            tickers: Tickers whose bars to include (typically open positions)
+
+        Returns:
+            Dict with bars (ticker -> data, depth, age) and universe
+        """
+        now = time.monotonic()
+        bars = {}
+        for ticker in tickers:
+            entry = cls._bars.get(ticker)
+            if entry is not None and entry.data:
+                bars[ticker] = {
+                    "data": entry.data,
+                    "depth": entry.depth,
+                    "age": round(now - entry.fetched_at, 3),
+                }
+        return {
+            "bars": bars,
+            "universe": list(cls._universe),
+            "universe_age": round(now - cls._universe_at, 3) if cls._universe else None,
+        }
+
+    @classmethod
+    def restore_state(cls, state: Dict[str, Any], snapshot_age: float) -> int:
+        """
+        Seed the cache from export_state() output.
+
+        Entries keep their original age (plus the time since the snapshot),
+        so TTL checks still trigger a refetch while cached_bars() readers get
+        the restored bars immediately. Tickers already cached are left alone.
+
+        Args:
+            state: Dict from export_state()
+            snapshot_age: Seconds between the snapshot and now
+
+        Returns:
+            Number of tickers whose bars were restored
+        """
+        now = time.monotonic()
+        restored = 0
+        for ticker, row in (state.get("bars") or {}).items():
+            if ticker in cls._bars or not row.get("data"):
+                continue
+            depth = int(row.get("depth", 0))
+            cls._bars[ticker] = _Entry(row["data"], now - snapshot_age - float(row.get("age", 0.0)), depth)
+            restored += 1
+        if state.get("universe") and not cls._universe:
+            cls._universe = list(state["universe"])
+            cls._universe_at = now - snapshot_age - float(state.get("universe_age") or 0.0)
+        cls._evict(cls._bars)
+        return restored
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """Cache sizes and hit/fetch counters"""
+        bars_total = cls._stats["bars_hits"] + cls._stats["bars_fetches"]
+        quote_total = cls._stats["quote_hits"] + cls._stats["quote_fetches"]
+        return {
+            "enabled": cls.enabled,
+            "tickers_cached": len(cls._bars),
+            "quotes_cached": len(cls._quotes),
+            "universe_size": len(cls._universe),
+            "bars_hit_rate": round(cls._stats["bars_hits"] / bars_total, 3) if bars_total else 0.0,
+            "quote_hit_rate": round(cls._stats["quote_hits"] / quote_total, 3) if quote_total else 0.0,
+            **cls._stats,
+        }
+
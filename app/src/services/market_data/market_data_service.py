@@ -3,16 +3,18 @@ Market Data Service
 Provides entry and exit analysis for trading signals
 """
 
-import asyncio
 import math
-import os
 from datetime import datetime, timezone
-from typing import Any, Dict, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 
 import aiohttp
 import pytz
 
+from app.src.common.alpaca import AlpacaClient
+from app.src.common.alpaca_request_scheduler import AlpacaRequestScheduler, RequestLane
+from app.src.common.asset_directory import AssetDirectory
 from app.src.common.loguru_logger import logger
+from app.src.models.price_series import PriceSeries
 from app.src.models.technical_indicators import TechnicalIndicators
 from app.src.services.technical_analysis.technical_analysis_lib import TechnicalAnalysisLib
 from app.src.common.utils import dict_to_technical_indicators
@@ -41,11 +43,9 @@ class MarketDataService:
     _low_volume_threshold_avg = 0.6
     _low_volume_threshold_single = 0.45
 
-    # Rate limiting for Alpaca API shortability checks
+    # Cache for Alpaca API shortability checks
     _shortability_cache: Dict[str, Tuple[bool, str, datetime]] = {}
     _shortability_cache_ttl_seconds = 300  # 5 minutes cache
-    _last_shortability_check_time: Optional[datetime] = None
-    _min_seconds_between_checks = 0.1  # 100ms between API calls to respect rate limits
 
     # Local in-memory cache for is_shortable (ticker -> is_shortable)
     _is_shortable_local_cache: Dict[str, bool] = {}
@@ -56,8 +56,9 @@ class MarketDataService:
     ) -> Tuple[bool, str]:
         """
         Check if a ticker is shortable.
-        Checks in order: local cache -> DynamoDB -> Alpaca API.
-        Includes rate limiting, caching, and retry logic for 429 errors.
+        Checks in order: asset directory -> local cache -> DynamoDB -> Alpaca API.
+        The per-ticker paths only run for symbols the asset directory does not
+        know; the API call goes through the shared Alpaca request scheduler.
 
         Args:
             ticker: Stock ticker symbol
@@ -66,7 +67,18 @@ class MarketDataService:
         Returns:
             Tuple of (is_shortable: bool, reason: str)
         """
-        # Check local in-memory cache first (fastest)
+        # Bulk-loaded asset directory (in-memory, loaded and refreshed in the background)
+        asset = AssetDirectory.get(ticker)
+        if asset is not None:
+            if not asset.tradable:
+                return False, f"{ticker} is not tradable"
+            if not asset.shortable:
+                return False, f"{ticker} is not shortable"
+            if not asset.easy_to_borrow:
+                logger.debug(f"{ticker} is shortable but not easy to borrow")
+            return True, f"{ticker} is shortable"
+
+        # Check local in-memory cache (fastest per-ticker path)
         if ticker in cls._is_shortable_local_cache:
             is_shortable = cls._is_shortable_local_cache[ticker]
             logger.debug(f"Using local cache for {ticker} shortability: {is_shortable}")
@@ -106,10 +118,7 @@ class MarketDataService:
                 )
                 return cached_result, cached_reason
 
-        api_key = os.environ.get("REAL_TRADE_API_KEY", "")
-        api_secret = os.environ.get("REAL_TRADE_SECRET_KEY", "")
-
-        if not api_key or not api_secret:
+        if not AlpacaClient.API_KEY_ID or not AlpacaClient.API_SECRET_KEY:
             logger.warning(
                 f"No Alpaca API credentials available, assuming {ticker} is shortable"
             )
@@ -118,156 +127,84 @@ class MarketDataService:
             cls._is_shortable_local_cache[ticker] = True
             return result
 
-        # Rate limiting: ensure minimum time between API calls
-        if cls._last_shortability_check_time:
-            time_since_last = (now - cls._last_shortability_check_time).total_seconds()
-            if time_since_last < cls._min_seconds_between_checks:
-                await asyncio.sleep(cls._min_seconds_between_checks - time_since_last)
-
         url = f"https://api.alpaca.markets/v2/assets/{ticker}"
         headers = {
             "accept": "application/json",
-            "APCA-API-KEY-ID": api_key,
-            "APCA-API-SECRET-KEY": api_secret,
+            "APCA-API-KEY-ID": AlpacaClient.API_KEY_ID,
+            "APCA-API-SECRET-KEY": AlpacaClient.API_SECRET_KEY,
         }
 
-        # Retry logic for 429 errors with exponential backoff
+        # Spacing and 429 backoff come from the shared Alpaca request scheduler
         max_retries = 3
-        base_delay = 1.0  # Start with 1 second delay
 
         for attempt in range(max_retries):
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)
-                    ) as response:
-                        cls._last_shortability_check_time = datetime.now(timezone.utc)
-
-                        if response.status == 200:
-                            data = await response.json()
-                            shortable = data.get("shortable", False)
-                            easy_to_borrow = data.get("easy_to_borrow", False)
-                            tradable = data.get("tradable", False)
-
-                            if not tradable:
-                                result = (False, f"{ticker} is not tradable")
-                                cls._shortability_cache[ticker] = (*result, now)
-                                cls._is_shortable_local_cache[ticker] = False
-                                # Store in DynamoDB if indicator provided
-                                if indicator:
-                                    from app.src.db.dynamodb_client import (
-                                        DynamoDBClient,
-                                    )
-
-                                    await DynamoDBClient.log_inactive_ticker_reason(
-                                        ticker=ticker,
-                                        indicator=indicator,
-                                        is_shortable=False,
-                                    )
-                                return result
-                            if not shortable:
-                                result = (False, f"{ticker} is not shortable")
-                                cls._shortability_cache[ticker] = (*result, now)
-                                cls._is_shortable_local_cache[ticker] = False
-                                # Store in DynamoDB if indicator provided
-                                if indicator:
-                                    from app.src.db.dynamodb_client import (
-                                        DynamoDBClient,
-                                    )
-
-                                    await DynamoDBClient.log_inactive_ticker_reason(
-                                        ticker=ticker,
-                                        indicator=indicator,
-                                        is_shortable=False,
-                                    )
-                                return result
+                await AlpacaRequestScheduler.acquire(RequestLane.ASSETS, retry=attempt > 0)
+                session = await AlpacaClient._get_session()
+                async with session.get(
+                    url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)
+                ) as response:
+                    AlpacaRequestScheduler.observe_response(
+                        response.status, response.headers, endpoint="assets"
+                    )
+
+                    if response.status == 200:
+                        data = await response.json()
+                        shortable = data.get("shortable", False)
+                        easy_to_borrow = data.get("easy_to_borrow", False)
+                        tradable = data.get("tradable", False)
+
+                        if not tradable:
+                            result = (False, f"{ticker} is not tradable")
+                        elif not shortable:
+                            result = (False, f"{ticker} is not shortable")
+                        else:
                             if not easy_to_borrow:
                                 logger.warning(
                                     f"{ticker} is shortable but not easy to borrow"
                                 )
                                 # Still allow it, but log a warning
-
                             result = (True, f"{ticker} is shortable")
-                            cls._shortability_cache[ticker] = (*result, now)
-                            cls._is_shortable_local_cache[ticker] = True
-                            # Store in DynamoDB if indicator provided
-                            if indicator:
-                                from app.src.db.dynamodb_client import DynamoDBClient
-
-                                await DynamoDBClient.log_inactive_ticker_reason(
-                                    ticker=ticker,
-                                    indicator=indicator,
-                                    is_shortable=True,
-                                )
-                            return result
-                        elif response.status == 404:
-                            result = (False, f"{ticker} not found in Alpaca assets")
-                            cls._shortability_cache[ticker] = (*result, now)
-                            cls._is_shortable_local_cache[ticker] = False
-                            # Store in DynamoDB if indicator provided
-                            if indicator:
-                                from app.src.db.dynamodb_client import DynamoDBClient
-
-                                await DynamoDBClient.log_inactive_ticker_reason(
-                                    ticker=ticker,
-                                    indicator=indicator,
-                                    is_shortable=False,
-                                )
-                            return result
-                        elif response.status == 429:
-                            # Rate limited - retry with exponential backoff
-                            if attempt < max_retries - 1:
-                                delay = base_delay * (2**attempt)  # Exponential backoff
-                                logger.warning(
-                                    f"Rate limited (429) for {ticker}, retrying in {delay:.1f}s "
-                                    f"(attempt {attempt + 1}/{max_retries})"
-                                )
-                                await asyncio.sleep(delay)
-                                continue
-                            else:
-                                logger.warning(
-                                    f"Rate limited (429) for {ticker} after {max_retries} attempts, assuming shortable"
-                                )
-                                # Fail open after max retries
-                                result = (
-                                    True,
-                                    f"Rate limited after {max_retries} attempts, assuming shortable",
-                                )
-                                cls._shortability_cache[ticker] = (*result, now)
-                                cls._is_shortable_local_cache[ticker] = True
-                                return result
-                        else:
-                            logger.warning(
-                                f"Alpaca API returned status {response.status} for {ticker} asset check"
-                            )
-                            # Assume shortable if API call fails (fail open)
-                            result = (
-                                True,
-                                f"API error (status {response.status}), assuming shortable",
-                            )
-                            cls._shortability_cache[ticker] = (*result, now)
-                            cls._is_shortable_local_cache[ticker] = True
-                            return result
+                        return await cls._record_shortability(ticker, indicator, result, now)
+                    elif response.status == 404:
+                        result = (False, f"{ticker} not found in Alpaca assets")
+                        return await cls._record_shortability(ticker, indicator, result, now)
+                    elif response.status == 429 and attempt < max_retries - 1:
+                        # Rate limited: the scheduler pauses until the window resets
+                        logger.warning(
+                            f"Rate limited (429) for {ticker}, retrying "
+                            f"(attempt {attempt + 1}/{max_retries})"
+                        )
+                        continue
+                    else:
+                        logger.warning(
+                            f"Alpaca API returned status {response.status} for {ticker} asset check"
+                        )
+                        # Assume shortable if API call fails (fail open)
+                        result = (
+                            True,
+                            f"API error (status {response.status}), assuming shortable",
+                        )
+                        cls._shortability_cache[ticker] = (*result, now)
+                        cls._is_shortable_local_cache[ticker] = True
+                        return result
             except Exception as e:
                 if attempt < max_retries - 1:
-                    delay = base_delay * (2**attempt)
                     logger.warning(
-                        f"Error checking if {ticker} is shortable (attempt {attempt + 1}/{max_retries}): {str(e)}, retrying in {delay:.1f}s"
+                        f"Error checking if {ticker} is shortable (attempt {attempt + 1}/{max_retries}): {str(e)}, retrying"
                     )
-                    await asyncio.sleep(delay)
                     continue
-                else:
-                    logger.warning(
-                        f"Error checking if {ticker} is shortable after {max_retries} attempts: {str(e)}, assuming shortable"
-                    )
-                    # Fail open - assume shortable if check fails
-                    result = (
-                        True,
-                        f"Error checking shortability after {max_retries} attempts: {str(e)}, assuming shortable",
-                    )
-                    cls._shortability_cache[ticker] = (*result, now)
-                    cls._is_shortable_local_cache[ticker] = True
-                    return result
+                logger.warning(
+                    f"Error checking if {ticker} is shortable after {max_retries} attempts: {str(e)}, assuming shortable"
+                )
+                # Fail open - assume shortable if check fails
+                result = (
+                    True,
+                    f"Error checking shortability after {max_retries} attempts: {str(e)}, assuming shortable",
+                )
+                cls._shortability_cache[ticker] = (*result, now)
+                cls._is_shortable_local_cache[ticker] = True
+                return result
 
         # Should not reach here, but fail open just in case
         result = (True, "Max retries exceeded, assuming shortable")
@@ -275,6 +212,39 @@ class MarketDataService:
         cls._is_shortable_local_cache[ticker] = True
         return result
 
+    @classmethod
+    async def _record_shortability(
+        cls,
+        ticker: str,
+        indicator: Optional[str],
+        result: Tuple[bool, str],
+        now: datetime,
+    ) -> Tuple[bool, str]:
+        """
+        Cache a definitive Alpaca assets answer locally and in DynamoDB.
+
+        Args:
+            ticker: Stock ticker symbol
+            indicator: Optional indicator name for the DynamoDB record
+            result: Tuple of (is_shortable: bool, reason: str)
+            now: Time of the check
+
+        Returns:
+            The result, unchanged
+        """
+        cls._shortability_cache[ticker] = (*result, now)
+        cls._is_shortable_local_cache[ticker] = result[0]
+        # Store in DynamoDB if indicator provided
+        if indicator:
+            from app.src.db.dynamodb_client import DynamoDBClient
+
+            await DynamoDBClient.log_inactive_ticker_reason(
+                ticker=ticker,
+                indicator=indicator,
+                is_shortable=result[0],
+            )
+        return result
+
     @classmethod
     async def check_ticker_shortable(
         cls, ticker: str, indicator: Optional[str] = None
@@ -1020,98 +990,118 @@ class MarketDataService:
             return cls._is_downward_trend(indicators)
 
     @classmethod
-    def _check_price_trend_upward(cls, datetime_price: Tuple) -> bool:
+    def _chronological_prices(cls, datetime_price: Any) -> List[float]:
         """
-        Check if price trend is upward by analyzing datetime_price time-series data.
-        Data is sorted by timestamp in ascending order (oldest to newest).
+        Prices from datetime_price ordered oldest to newest.
+
+        PriceSeries (from TechnicalAnalysisLib) is already sorted, so its
+        prices are used directly. Legacy tuple/list entries are parsed and
+        sorted by timestamp.
 
         Args:
-            datetime_price: Tuple/list of price data entries, each containing [timestamp, price] or dict
+            datetime_price: PriceSeries, or tuple/list of [timestamp, price] or dict entries
 
         Returns:
-            True if price shows upward trend
+            List of prices in chronological order
         """
-        if not datetime_price or len(datetime_price) < 3:
-            return False
+        if isinstance(datetime_price, PriceSeries):
+            return datetime_price.prices.tolist()
 
-        try:
-            # Parse and extract (timestamp, price) pairs
-            price_points = []
-            for entry in datetime_price:
-                try:
-                    if isinstance(entry, (list, tuple)) and len(entry) >= 2:
-                        # Format: [timestamp, price] or [datetime_str, price]
-                        timestamp_str = str(entry[0])
-                        price = float(entry[1])
+        # Parse and extract (timestamp, price) pairs
+        price_points = []
+        for entry in datetime_price:
+            try:
+                if isinstance(entry, (list, tuple)) and len(entry) >= 2:
+                    # Format: [timestamp, price] or [datetime_str, price]
+                    timestamp_str = str(entry[0])
+                    price = float(entry[1])
+                    price_points.append((timestamp_str, price))
+                elif isinstance(entry, dict):
+                    # Format: {"datetime": ..., "price": ...} or {"datetime": ..., "close": ...}
+                    timestamp_str = str(
+                        entry.get("datetime") or entry.get("timestamp") or ""
+                    )
+                    price = float(
+                        entry.get("price")
+                        or entry.get("close")
+                        or entry.get("close_price")
+                        or 0.0
+                    )
+                    if price > 0:
                         price_points.append((timestamp_str, price))
-                    elif isinstance(entry, dict):
-                        # Format: {"datetime": ..., "price": ...} or {"datetime": ..., "close": ...}
-                        timestamp_str = str(
-                            entry.get("datetime") or entry.get("timestamp") or ""
-                        )
-                        price = float(
-                            entry.get("price")
-                            or entry.get("close")
-                            or entry.get("close_price")
-                            or 0.0
-                        )
-                        if price > 0:
-                            price_points.append((timestamp_str, price))
-                except (ValueError, TypeError, KeyError, IndexError):
-                    continue
+            except (ValueError, TypeError, KeyError, IndexError):
+                continue
 
-            if len(price_points) < 3:
-                return False
+        if len(price_points) < 3:
+            return []
 
-            # Sort by timestamp in ascending order (oldest to newest)
-            # Handle EST timestamps - parse and sort properly
-            est_tz = pytz.timezone("America/New_York")
-
-            def parse_timestamp(ts_str: str) -> datetime:
-                """Parse timestamp string, handling various formats"""
-                ts_str = str(ts_str).strip()
-                # Try ISO format first
-                try:
-                    if "T" in ts_str or "+" in ts_str or ts_str.endswith("Z"):
-                        dt = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                    else:
-                        # Try common formats
-                        for fmt in [
-                            "%Y-%m-%d %H:%M:%S",
-                            "%Y-%m-%d %H:%M:%S.%f",
-                            "%Y-%m-%d",
-                        ]:
-                            try:
-                                dt = datetime.strptime(ts_str, fmt)
-                                break
-                            except ValueError:
-                                continue
-                        else:
-                            # Fallback: try ISO without timezone
-                            dt = datetime.fromisoformat(ts_str)
+        # Sort by timestamp in ascending order (oldest to newest)
+        # Handle EST timestamps - parse and sort properly
+        est_tz = pytz.timezone("America/New_York")
 
-                    # Ensure timezone-aware (assume EST if not specified)
-                    if dt.tzinfo is None:
-                        dt = est_tz.localize(dt)
+        def parse_timestamp(ts_str: str) -> datetime:
+            """Parse timestamp string, handling various formats"""
+            ts_str = str(ts_str).strip()
+            # Try ISO format first
+            try:
+                if "T" in ts_str or "+" in ts_str or ts_str.endswith("Z"):
+                    dt = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
+                else:
+                    # Try common formats
+                    for fmt in [
+                        "%Y-%m-%d %H:%M:%S",
+                        "%Y-%m-%d %H:%M:%S.%f",
+                        "%Y-%m-%d",
+                    ]:
+                        try:
+                            dt = datetime.strptime(ts_str, fmt)
+                            break
+                        except ValueError:
+                            continue
                     else:
-                        dt = dt.astimezone(est_tz)
+                        # Fallback: try ISO without timezone
+                        dt = datetime.fromisoformat(ts_str)
 
-                    return dt
-                except Exception:
-                    # If parsing fails, return a default datetime
-                    return datetime.now(est_tz)
+                # Ensure timezone-aware (assume EST if not specified)
+                if dt.tzinfo is None:
+                    dt = est_tz.localize(dt)
+                else:
+                    dt = dt.astimezone(est_tz)
 
-            # Sort by timestamp (ascending - oldest to newest)
-            try:
-                price_points_sorted = sorted(
-                    price_points, key=lambda x: parse_timestamp(x[0])
-                )
+                return dt
             except Exception:
-                # If sorting fails, use original order
-                price_points_sorted = price_points
+                # If parsing fails, return a default datetime
+                return datetime.now(est_tz)
+
+        # Sort by timestamp (ascending - oldest to newest)
+        try:
+            price_points_sorted = sorted(
+                price_points, key=lambda x: parse_timestamp(x[0])
+            )
+        except Exception:
+            # If sorting fails, use original order
+            price_points_sorted = price_points
+
+        # Extract prices in chronological order
+        return [float(price) for _, price in price_points_sorted]
+
+    @classmethod
+    def _check_price_trend_upward(cls, datetime_price: Any) -> bool:
+        """
+        Check if price trend is upward by analyzing datetime_price time-series data.
+        Data is sorted by timestamp in ascending order (oldest to newest).
+
+        Args:
+            datetime_price: PriceSeries, or tuple/list of [timestamp, price] or dict entries
 
-            # Extract prices in chronological order
-            prices = [float(price) for _, price in price_points_sorted]
+        Returns:
+            True if price shows upward trend
+        """
+        if not datetime_price or len(datetime_price) < 3:
+            return False
+
+        try:
+            prices = cls._chronological_prices(datetime_price)
 
             if len(prices) < 3:
                 return False
@@ -1152,13 +1142,13 @@ class MarketDataService:
             return False
 
     @classmethod
-    def _check_price_trend_downward(cls, datetime_price: Tuple) -> bool:
+    def _check_price_trend_downward(cls, datetime_price: Any) -> bool:
         """
         Check if price trend is downward by analyzing datetime_price time-series data.
         Data is sorted by timestamp in ascending order (oldest to newest).
 
         Args:
-            datetime_price: Tuple/list of price data entries, each containing [timestamp, price] or dict
+            datetime_price: PriceSeries, or tuple/list of [timestamp, price] or dict entries
 
         Returns:
             True if price shows downward trend
@@ -1167,73 +1157,7 @@ class MarketDataService:
             return False
 
         try:
-            # Parse and extract (timestamp, price) pairs
-            price_points = []
-            for entry in datetime_price:
-                try:
-                    if isinstance(entry, (list, tuple)) and len(entry) >= 2:
-                        timestamp_str = str(entry[0])
-                        price = float(entry[1])
-                        price_points.append((timestamp_str, price))
-                    elif isinstance(entry, dict):
-                        timestamp_str = str(
-                            entry.get("datetime") or entry.get("timestamp") or ""
-                        )
-                        price = float(
-                            entry.get("price")
-                            or entry.get("close")
-                            or entry.get("close_price")
-                            or 0.0
-                        )
-                        if price > 0:
-                            price_points.append((timestamp_str, price))
-                except (ValueError, TypeError, KeyError, IndexError):
-                    continue
-
-            if len(price_points) < 3:
-                return False
-
-            # Sort by timestamp in ascending order (oldest to newest)
-            est_tz = pytz.timezone("America/New_York")
-
-            def parse_timestamp(ts_str: str) -> datetime:
-                """Parse timestamp string, handling various formats"""
-                ts_str = str(ts_str).strip()
-                try:
-                    if "T" in ts_str or "+" in ts_str or ts_str.endswith("Z"):
-                        dt = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                    else:
-                        for fmt in [
-                            "%Y-%m-%d %H:%M:%S",
-                            "%Y-%m-%d %H:%M:%S.%f",
-                            "%Y-%m-%d",
-                        ]:
-                            try:
-                                dt = datetime.strptime(ts_str, fmt)
-                                break
-                            except ValueError:
-                                continue
-                        else:
-                            dt = datetime.fromisoformat(ts_str)
-
-                    if dt.tzinfo is None:
-                        dt = est_tz.localize(dt)
-                    else:
-                        dt = dt.astimezone(est_tz)
-
-                    return dt
-                except Exception:
-                    return datetime.now(est_tz)
-
-            try:
-                price_points_sorted = sorted(
-                    price_points, key=lambda x: parse_timestamp(x[0])
-                )
-            except Exception:
-                price_points_sorted = price_points
-
-            # Extract prices in chronological order
-            prices = [float(price) for _, price in price_points_sorted]
+            prices = cls._chronological_prices(datetime_price)
 
             if len(prices) < 3:
                 return False
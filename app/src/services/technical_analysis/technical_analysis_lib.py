@@ -33,8 +33,11 @@ except ImportError:
     import warnings
     warnings.warn("TA-Lib not available. Some technical indicators will not work.")
 
+from app.src.common.compute_executor import ComputeExecutor
 from app.src.common.loguru_logger import logger
-from app.src.common.alpaca import AlpacaClient
+from app.src.common.metrics import Metrics
+from app.src.models.price_series import PriceSeries
+from app.src.services.market_data.market_data_hub import MarketDataHub
 
 
 # MEMORY OPTIMIZATION: No caching for Basic dyno (512MB)
@@ -215,7 +218,7 @@ class TechnicalAnalysisLib:
             "vwap": 0.0,
             "volume": 0.0,
             "close_price": 0.0,
-            "datetime_price": {},
+            "datetime_price": PriceSeries.empty(),
         }
 
     @classmethod
@@ -303,6 +306,7 @@ class TechnicalAnalysisLib:
         return count
 
     @classmethod
+    @Metrics.timed("indicator_computation")
     async def calculate_all_indicators(cls, ticker: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Calculate all technical indicators using TA-Lib, including additional ones.
@@ -324,7 +328,7 @@ class TechnicalAnalysisLib:
 
         # Get market data from Alpaca API
         # BASIC DYNO: Only 50 bars to minimize memory (minimum needed for indicators)
-        bars_data = await AlpacaClient.get_market_data(ticker, limit=50)
+        bars_data = await MarketDataHub.get_market_data(ticker, limit=50)
 
         if not bars_data:
             logger.warning(f"No bars data for {ticker}, returning default indicators")
@@ -345,6 +349,31 @@ class TechnicalAnalysisLib:
             )
             return await cls._create_default_indicators(ticker)
 
+        # Indicator math runs on the compute executor so one ticker's pandas/TA-Lib
+        # work doesn't hold up quote fetches and exit checks for the others
+        result = await ComputeExecutor.run(cls._compute_indicators, ticker, ticker_bars)
+        if result is None:
+            return await cls._create_default_indicators(ticker)
+
+        # Cache the result before returning
+        if use_cache:
+            await _indicator_cache.put(ticker, result)
+
+        return result
+
+    @classmethod
+    def _compute_indicators(cls, ticker: str, ticker_bars: list) -> Optional[Dict[str, Any]]:
+        """
+        Indicator math for calculate_all_indicators (synchronous, no I/O).
+
+        Args:
+            ticker: Stock ticker symbol
+            ticker_bars: Bars with EST timestamps (at least 5)
+
+        Returns:
+            Dict with all technical indicators, or None if the defaults
+            should be used (too little data, TA-Lib missing, or an error)
+        """
         # Convert bars to DataFrame (timestamps are already in EST)
         prices = cls._bars_to_dataframe(ticker_bars, ticker)
 
@@ -352,7 +381,7 @@ class TechnicalAnalysisLib:
             logger.debug(
                 f"Insufficient data after conversion: {len(prices)} rows for {ticker}"
             )
-            return await cls._create_default_indicators(ticker)
+            return None
 
         try:
             # Prepare data
@@ -378,7 +407,7 @@ class TechnicalAnalysisLib:
             # Check if TA-Lib is available before using it
             if not TALIB_AVAILABLE or talib is None:
                 logger.warning(f"TA-Lib not available for {ticker}, using fallback indicators")
-                return await cls._create_default_indicators(ticker)
+                return None
 
             # Calculate main indicators using TA-Lib
             rsi_array = talib.RSI(close, timeperiod=cls._default_periods["rsi"])
@@ -499,26 +528,8 @@ class TechnicalAnalysisLib:
             # Volume
             volume_val = volume[-1] if len(volume) > 0 else 0.0
 
-            # Extract datetime and price for datetime_price dict from original prices DataFrame
-            datetime_price: dict = {}  # Default
-            if "timestamp" in prices.columns and "price" in prices.columns:
-                datetime_price_df = prices[["timestamp", "price"]].copy()
-                # Ensure timestamp is datetime type
-                if not pd.api.types.is_datetime64_any_dtype(
-                    datetime_price_df["timestamp"]
-                ):
-                    datetime_price_df["timestamp"] = pd.to_datetime(
-                        datetime_price_df["timestamp"]
-                    )
-
-                # Timestamps are already in EST from get_market_data(), no conversion needed
-                datetime_price = {}
-                for ts, price in datetime_price_df.itertuples(index=False, name=None):
-                    if hasattr(ts, "isoformat"):
-                        ts_str = ts.isoformat()
-                    else:
-                        ts_str = str(ts)
-                    datetime_price[ts_str] = float(price)
+            # Sorted epoch/price arrays; the ISO-keyed dict is only rendered on persist
+            datetime_price = PriceSeries.from_frame(prices)
 
             # Return all as dict to include additional
             result = {
@@ -556,10 +567,6 @@ class TechnicalAnalysisLib:
                 "datetime_price": datetime_price,
             }
 
-            # Cache the result before returning
-            if use_cache:
-                await _indicator_cache.put(ticker, result)
-
             # Explicitly delete large objects to help GC
             del prices, processed_prices, recent_prices
             del high, low, close, volume, open_
@@ -568,7 +575,7 @@ class TechnicalAnalysisLib:
 
         except Exception as e:
             logger.info(f"Error calculating indicators for {ticker}: {e}")
-            return await cls._create_default_indicators(ticker)
+            return None
 
     @classmethod
     def _clean_and_enhance_data(cls, df: pd.DataFrame) -> pd.DataFrame:
@@ -0,0 +1,197 @@
+"""
+Rejection Statistics
+Compact summaries of inactive-ticker records for threshold-tuning prompts
+
+Raw records (reason strings plus a technical-indicator blob per ticker) grow
+with rejection volume. The summary here has a fixed upper size: rejection
+reasons are folded into rule templates (numbers and the ticker replaced by
+placeholders) with per-side counts and quantiles of the numbers each reason
+quoted, plus quantiles of the most common numeric technical indicators.
+"""
+
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+_NUMBER_PATTERN = re.compile(r"(?<![A-Za-z_])[-+]?\$?\d+(?:\.\d+)?")
+_QUANTILES = (10, 25, 50, 75, 90)
+_MAX_TEMPLATE_CHARS = 160
+
+
+def reason_template(reason: str, ticker: Optional[str] = None) -> Tuple[str, List[float]]:
+    """
+    Fold a rejection reason into a rule template and the numbers it quoted.
+
+    "AAPL momentum 2.1% below min 3.0%" -> ("{ticker} momentum #% below min #%", [2.1, 3.0])
+
+    Args:
+        reason: Rejection reason text
+        ticker: Ticker to replace with {ticker}
+
+    Returns:
+        Tuple of (template, values)
+    """
+    text = reason.strip()
+    if ticker:
+        text = re.sub(rf"\b{re.escape(ticker)}\b", "{ticker}", text)
+    values: List[float] = []
+
+    def replace(match: re.Match) -> str:
+        token = match.group()
+        values.append(float(token.replace("$", "")))
+        return "$#" if "$" in token else "#"
+
+    template = _NUMBER_PATTERN.sub(replace, text)
+    if len(template) > _MAX_TEMPLATE_CHARS:
+        template = template[: _MAX_TEMPLATE_CHARS - 3] + "..."
+    return template, values
+
+
+def quantile_summary(values: Iterable[float]) -> Dict[str, Any]:
+    """count, min, p10..p90 and max of a set of values (rounded for prompts)"""
+    array = np.asarray([v for v in values if v is not None and np.isfinite(v)], dtype=np.float64)
+    if array.size == 0:
+        return {"count": 0}
+    points = np.percentile(array, _QUANTILES)
+    summary: Dict[str, Any] = {"count": int(array.size), "min": _round(array.min())}
+    for q, value in zip(_QUANTILES, points):
+        summary[f"p{q}"] = _round(value)
+    summary["max"] = _round(array.max())
+    return summary
+
+
+def _round(value: float) -> float:
+    return float(f"{float(value):.4g}")
+
+
+def _numeric_indicators(raw: Any) -> Dict[str, float]:
+    """Numeric fields of a technical_indicators blob (JSON string or dict), one level deep"""
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except (ValueError, TypeError):
+            return {}
+    if not isinstance(raw, dict):
+        return {}
+    numeric: Dict[str, float] = {}
+    for key, value in raw.items():
+        if isinstance(value, dict):
+            for child, child_value in value.items():
+                if isinstance(child_value, (int, float)) and not isinstance(child_value, bool):
+                    numeric[f"{key}.{child}"] = float(child_value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            numeric[key] = float(value)
+        elif hasattr(value, "__float__") and not isinstance(value, (str, bool)):
+            numeric[key] = float(value)  # Decimal from DynamoDB
+    return numeric
+
+
+@dataclass
+class _RuleAccumulator:
+    long: int = 0
+    short: int = 0
+    values: List[List[float]] = field(default_factory=list)
+
+    def add(self, side: str, values: List[float], max_slots: int):
+        if side == "long":
+            self.long += 1
+        else:
+            self.short += 1
+        for slot, value in enumerate(values[:max_slots]):
+            while len(self.values) <= slot:
+                self.values.append([])
+            self.values[slot].append(value)
+
+
+def summarize_rejections(
+    records: Iterable[Dict[str, Any]],
+    max_rules: int = 12,
+    max_indicators: int = 10,
+    max_value_slots: int = 3,
+) -> Dict[str, Any]:
+    """
+    Summarize inactive-ticker records into bounded rule histograms and quantiles.
+
+    The output size depends only on the limits, not on how many records
+    were rejected.
+
+    Args:
+        records: InactiveTickersForDayTrading records
+        max_rules: Rule templates listed individually (the rest are aggregated)
+        max_indicators: Technical indicators with quantiles (most frequent first)
+        max_value_slots: Quoted numbers summarized per rule
+
+    Returns:
+        Dictionary with total_inactive, rules, other_rules and indicator_quantiles
+    """
+    rules: Dict[str, _RuleAccumulator] = {}
+    indicator_values: Dict[str, List[float]] = {}
+    total = 0
+
+    for record in records:
+        total += 1
+        ticker = record.get("ticker")
+        for side in ("long", "short"):
+            reason = record.get(f"reason_not_to_enter_{side}")
+            if not reason:
+                continue
+            template, values = reason_template(str(reason), ticker)
+            rules.setdefault(template, _RuleAccumulator()).add(side, values, max_value_slots)
+        for name, value in _numeric_indicators(record.get("technical_indicators")).items():
+            indicator_values.setdefault(name, []).append(value)
+
+    ranked = sorted(rules.items(), key=lambda item: (-(item[1].long + item[1].short), item[0]))
+    top, rest = ranked[:max_rules], ranked[max_rules:]
+
+    indicator_counts = Counter({name: len(values) for name, values in indicator_values.items()})
+    top_indicators = sorted(indicator_counts.items(), key=lambda item: (-item[1], item[0]))[:max_indicators]
+
+    return {
+        "total_inactive": total,
+        "rules": [
+            {
+                "rule": template,
+                "long": acc.long,
+                "short": acc.short,
+                "quoted_values": [quantile_summary(slot) for slot in acc.values],
+            }
+            for template, acc in top
+        ],
+        "other_rules": {
+            "rules": len(rest),
+            "rejections": sum(acc.long + acc.short for _, acc in rest),
+        },
+        "indicator_quantiles": {
+            name: quantile_summary(indicator_values[name]) for name, _ in top_indicators
+        },
+    }
+
+
+def format_rejection_statistics(stats: Dict[str, Any]) -> str:
+    """Render summarize_rejections output as compact prompt text"""
+    lines = ["Rule (long/short rejections): quantiles of the numbers (#) quoted in the reason"]
+    for rule in stats.get("rules", []):
+        lines.append(f"- [{rule['long']}/{rule['short']}] {rule['rule']}")
+        for slot, summary in enumerate(rule["quoted_values"], start=1):
+            if summary.get("count"):
+                lines.append(f"    #{slot}: {_format_quantiles(summary)}")
+    other = stats.get("other_rules", {})
+    if other.get("rules"):
+        lines.append(f"- {other['rules']} other rules: {other['rejections']} rejections")
+
+    indicators = stats.get("indicator_quantiles", {})
+    if indicators:
+        lines.append("")
+        lines.append("Technical indicator quantiles across rejected tickers")
+        for name, summary in indicators.items():
+            lines.append(f"- {name}: {_format_quantiles(summary)}")
+    return "\n".join(lines)
+
+
+def _format_quantiles(summary: Dict[str, Any]) -> str:
+    keys = ["min", *(f"p{q}" for q in _QUANTILES), "max"]
+    return f"n={summary['count']} " + " ".join(f"{key}={summary[key]:g}" for key in keys)
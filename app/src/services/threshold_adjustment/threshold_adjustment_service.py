@@ -11,10 +11,13 @@ from datetime import date
 from app.src.common.loguru_logger import logger
 from app.src.common.logging_utils import log_threshold_adjustment, log_operation, log_error_with_context
 from app.src.common.alpaca import AlpacaClient
+from app.src.common.market_session import MarketSession
 from app.src.db.dynamodb_client import DynamoDBClient
 from app.src.services.bedrock.bedrock_client import BedrockClient
-from app.src.services.trading.momentum_indicator import MomentumIndicator
-from app.src.services.trading.deep_analyzer_indicator import DeepAnalyzerIndicator
+from app.src.services.threshold_adjustment.rejection_statistics import (
+    format_rejection_statistics,
+    summarize_rejections,
+)
 
 
 class ThresholdAdjustmentService:
@@ -63,7 +66,7 @@ class ThresholdAdjustmentService:
             try:
                 # Check market open status before running analysis
                 try:
-                    is_open = await AlpacaClient.is_market_open()
+                    is_open = await MarketSession.is_market_open()
                     if not is_open:
                         # Get clock data for next_open info if needed
                         try:
@@ -106,6 +109,10 @@ class ThresholdAdjustmentService:
     @classmethod
     async def _analyze_and_adjust_thresholds(cls):
         """Analyze inactive tickers and adjust thresholds for each indicator"""
+        # Imported here so loading this service does not pull in indicator modules
+        from app.src.services.trading.momentum_indicator import MomentumIndicator
+        from app.src.services.trading.deep_analyzer_indicator import DeepAnalyzerIndicator
+
         indicators = [
             ("Momentum Trading", MomentumIndicator),
             ("Deep Analyzer", DeepAnalyzerIndicator),
@@ -244,39 +251,13 @@ class ThresholdAdjustmentService:
     def _prepare_analysis_data(
         cls, inactive_tickers: List[Dict[str, Any]], indicator_name: str
     ) -> Dict[str, Any]:
-        """Prepare data for LLM analysis"""
-        # Group by reason
-        reasons_summary: Dict[str, int] = {}
-        technical_indicators_samples = []
-
-        for ticker_data in inactive_tickers[:50]:  # Limit to 50 for prompt size
-            ticker = ticker_data.get("ticker", "UNKNOWN")
-            reason_long = ticker_data.get("reason_not_to_enter_long")
-            reason_short = ticker_data.get("reason_not_to_enter_short")
-            tech_indicators = ticker_data.get("technical_indicators", {})
-
-            if reason_long:
-                reasons_summary[reason_long] = reasons_summary.get(reason_long, 0) + 1
-            if reason_short:
-                reasons_summary[reason_short] = reasons_summary.get(reason_short, 0) + 1
-
-            if tech_indicators:
-                technical_indicators_samples.append(
-                    {
-                        "ticker": ticker,
-                        "indicators": tech_indicators,
-                        "reason_long": reason_long,
-                        "reason_short": reason_short,
-                    }
-                )
+        """
+        Prepare data for LLM analysis.
 
-        return {
-            "total_inactive": len(inactive_tickers),
-            "reasons_summary": reasons_summary,
-            "technical_indicators_samples": technical_indicators_samples[
-                :10
-            ],  # Limit samples
-        }
+        Every record is folded into rule histograms and quantiles, so the
+        prompt size is bounded no matter how many tickers were rejected.
+        """
+        return summarize_rejections(inactive_tickers)
 
     @classmethod
     def _get_current_thresholds(cls, indicator_cls: Any) -> Dict[str, Any]:
@@ -340,8 +321,7 @@ class ThresholdAdjustmentService:
         current_thresholds: Dict[str, Any],
     ) -> str:
         """Construct prompt for LLM analysis"""
-        reasons_summary = analysis_data.get("reasons_summary", {})
-        tech_samples = analysis_data.get("technical_indicators_samples", [])
+        rejection_statistics = format_rejection_statistics(analysis_data)
 
         prompt = f"""You are an expert quantitative trading analyst. Analyze the following data for the "{indicator_name}" trading indicator and suggest threshold adjustments to improve trade entry rates while maintaining profitability.
 
@@ -350,10 +330,8 @@ class ThresholdAdjustmentService:
 - Current thresholds: {json.dumps(current_thresholds, indent=2)}
 
 ## Reasons for Not Entering Trades
-{json.dumps(reasons_summary, indent=2)}
-
-## Sample Technical Indicators
-{json.dumps(tech_samples[:5], indent=2)}
+Reasons are grouped into rules: {{ticker}} stands for the ticker and # for a number.
+{rejection_statistics}
 
 ## Your Task
 1. Analyze why tickers are not entering trades
@@ -1,12 +1,20 @@
 """
 Trading Indicators Module
 Contains base classes and implementations for different trading indicators
+
+Exports are resolved on first attribute access so importing a submodule
+(e.g. market_regime_service) does not load every indicator and their
+pandas/TA-Lib/aioboto3 dependencies.
 """
 
-from app.src.services.trading.base_trading_indicator import BaseTradingIndicator
-from app.src.services.trading.momentum_indicator import MomentumIndicator
-from app.src.services.trading.deep_analyzer_indicator import DeepAnalyzerIndicator
-from app.src.services.trading.trading_service import TradingService
+import importlib
+
+_EXPORTS = {
+    "BaseTradingIndicator": "app.src.services.trading.base_trading_indicator",
+    "MomentumIndicator": "app.src.services.trading.momentum_indicator",
+    "DeepAnalyzerIndicator": "app.src.services.trading.deep_analyzer_indicator",
+    "TradingService": "app.src.services.trading.trading_service",
+}
 
 __all__ = [
     "BaseTradingIndicator",
@@ -15,3 +23,8 @@ __all__ = [
     "TradingService",
 ]
 
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,20 +7,22 @@ import asyncio
 import os
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Tuple, Optional, ClassVar
-from datetime import datetime, date, timezone, time
-import pytz
+from datetime import datetime, date, timezone
 
 import gc
 from app.src.common.alpaca import AlpacaClient
+from app.src.common.alpaca_request_scheduler import AlpacaRequestScheduler
+from app.src.common.market_session import EST_TZ, MarketSession
 from app.src.common.loguru_logger import logger
 from app.src.common.memory_monitor import MemoryMonitor
 from app.src.services.technical_analysis.technical_analysis_lib import (
     TechnicalAnalysisLib,
 )
-from app.src.services.candidate_generator.alpaca_screener import AlpacaScreenerService
+from app.src.services.market_data.market_data_hub import MarketDataHub
 from app.src.db.dynamodb_client import DynamoDBClient, _get_est_timestamp
 from app.src.services.webhook.send_signal import send_signal_to_webhook
 from app.src.services.mab.mab_service import MABService
+from app.src.services.trading.position_state_cache import PositionStateCache
 
 
 # Memory optimization: Limit max tickers to process per cycle
@@ -92,6 +94,50 @@ class BaseTradingIndicator(ABC):
             cls.ticker_exit_timestamps = {}
         return cls.ticker_exit_timestamps
 
+    @classmethod
+    def get_snapshot_state(cls) -> Dict[str, Any]:
+        """Day-scoped in-memory state for the warm-restart snapshot (JSON-safe)"""
+        return {
+            "daily_trades_count": cls.daily_trades_count,
+            "daily_trades_date": cls.daily_trades_date,
+            "mab_reset_date": cls.mab_reset_date,
+            "mab_reset_timestamp": (
+                cls.mab_reset_timestamp.isoformat() if cls.mab_reset_timestamp else None
+            ),
+            "ticker_exit_timestamps": {
+                ticker: exit_time.isoformat()
+                for ticker, exit_time in cls._get_ticker_exit_timestamps().items()
+            },
+        }
+
+    @classmethod
+    def restore_snapshot_state(
+        cls, state: Dict[str, Any], fresh: bool = True, complete: bool = False  # noqa: ARG003
+    ) -> None:
+        """
+        Restore state captured by get_snapshot_state() after a restart.
+
+        Restoring the MAB reset markers keeps a mid-day restart from running
+        the daily MAB reset (and clearing cooldowns) a second time.
+
+        Args:
+            state: Dict from get_snapshot_state()
+            fresh: False when the snapshot is old enough that short-lived
+                state (exit-engine counters) should be rebuilt instead
+            complete: True when the snapshot was written at shutdown rather
+                than periodically (nothing happened after it was taken)
+        """
+        cls.daily_trades_count = int(state.get("daily_trades_count", 0) or 0)
+        cls.daily_trades_date = state.get("daily_trades_date")
+        cls.mab_reset_date = state.get("mab_reset_date")
+        reset_timestamp = state.get("mab_reset_timestamp")
+        cls.mab_reset_timestamp = (
+            datetime.fromisoformat(reset_timestamp) if reset_timestamp else None
+        )
+        exit_timestamps = cls._get_ticker_exit_timestamps()
+        for ticker, exit_time in (state.get("ticker_exit_timestamps") or {}).items():
+            exit_timestamps[ticker] = datetime.fromisoformat(exit_time)
+
     @classmethod
     def _is_ticker_in_cooldown(cls, ticker: str) -> bool:
         """Check if ticker is in cooldown period"""
@@ -145,7 +191,7 @@ class BaseTradingIndicator(ABC):
         current_time_utc = datetime.now(timezone.utc)
 
         # Convert to EST only for market-hour logic
-        est_tz = pytz.timezone("America/New_York")
+        est_tz = EST_TZ
         current_time_est = current_time_utc.astimezone(est_tz)
         today = current_time_est.date().isoformat()  # Use EST date for market day
 
@@ -159,8 +205,9 @@ class BaseTradingIndicator(ABC):
         # 1. It's after 9:30 AM EST
         # 2. We haven't reset today yet
         # 3. The date has changed (safety check)
+        market_open = await MarketSession.is_market_open()
         if (
-            await AlpacaClient.is_market_open()
+            market_open
             and not already_reset_today
             and cls.mab_reset_date != today
         ):
@@ -175,7 +222,7 @@ class BaseTradingIndicator(ABC):
             cls.daily_trades_count = 0
             cls.daily_trades_date = today
             cls._get_ticker_exit_timestamps().clear()
-        elif not await AlpacaClient.is_market_open():
+        elif not market_open:
             # Log if we're before market open (only once to avoid spam)
             if cls.mab_reset_date != today:
                 logger.debug(
@@ -185,19 +232,9 @@ class BaseTradingIndicator(ABC):
 
     @classmethod
     async def _get_screened_tickers(cls) -> List[str]:
-        """Get screened tickers from Alpaca screener service directly"""
+        """Get screened tickers from the shared market-data hub universe"""
         try:
-            screened_data = await AlpacaScreenerService().get_all_screened_tickers()
-            if not screened_data:
-                return []
-
-            # Extract sets and convert to lists, then combine
-            most_actives = list(screened_data.get("most_actives", set()))
-            gainers = list(screened_data.get("gainers", set()))
-            losers = list(screened_data.get("losers", set()))
-
-            # Combine all unique tickers
-            return list(set(most_actives + gainers + losers))
+            return await MarketDataHub.get_universe()
         except Exception as e:
             logger.error(f"Error getting screened tickers: {e}", exc_info=True)
             return []
@@ -277,8 +314,9 @@ class BaseTradingIndicator(ABC):
 
     @classmethod
     async def _get_active_trades(cls) -> List[Dict[str, Any]]:
-        """Get active trades for this indicator"""
-        return await DynamoDBClient.get_all_momentum_trades(cls.indicator_name())
+        """Get active trades for this indicator (with in-session trailing stop state applied)"""
+        trades = await DynamoDBClient.get_all_momentum_trades(cls.indicator_name())
+        return PositionStateCache.apply_to_trades(trades)
 
     @classmethod
     async def _get_active_ticker_set(cls) -> set:
@@ -444,7 +482,8 @@ class BaseTradingIndicator(ABC):
                 technical_indicators_for_exit=technical_indicators_exit,
             )
 
-            # Delete from active trades
+            # Delete from active trades (pending trailing-stop writes land first)
+            await PositionStateCache.discard(ticker)
             await DynamoDBClient.delete_momentum_trade(ticker, cls.indicator_name())
 
             # Send webhook signal with profit/loss
@@ -556,28 +595,13 @@ class BaseTradingIndicator(ABC):
     def _is_near_market_close(cls) -> bool:
         """
         Check if we're within the specified minutes before market close.
-        Market close is 4:00 PM ET (16:00).
+        Uses the session's actual close (4:00 PM ET, or earlier on early-close days).
 
         Returns:
             True if within minutes_before_close_to_exit of market close
         """
         minutes_before_close = getattr(cls, "minutes_before_close_to_exit", 15)
-
-        est_tz = pytz.timezone("America/New_York")
-        current_time_est = datetime.now(est_tz)
-        market_close_time = time(16, 0)  # 4:00 PM ET
-
-        # Calculate minutes until market close
-        close_datetime = datetime.combine(current_time_est.date(), market_close_time)
-        close_datetime = est_tz.localize(close_datetime)
-        current_datetime = current_time_est
-
-        if current_datetime >= close_datetime:
-            # Already past market close
-            return True
-
-        minutes_until_close = (close_datetime - current_datetime).total_seconds() / 60.0
-        return minutes_until_close <= minutes_before_close
+        return MarketSession.is_near_close(minutes_before_close)
 
     @classmethod
     async def _check_hard_stop_loss(
@@ -922,4 +946,9 @@ class BaseTradingIndicator(ABC):
             gc.collect()
             await cls.entry_service()
         
-        await asyncio.gather(cls.exit_service(), delayed_entry_service())
+        async def exit_lane_service():
+            # Alpaca requests made by the exit cycle are served ahead of entry scans
+            with AlpacaRequestScheduler.exit_priority():
+                await cls.exit_service()
+
+        await asyncio.gather(exit_lane_service(), delayed_entry_service())
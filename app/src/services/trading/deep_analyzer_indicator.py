@@ -6,12 +6,13 @@ Uses MarketDataService for deep technical analysis to identify entry and exit si
 import asyncio
 from typing import List, Tuple, Dict, Any, Optional
 from datetime import datetime, date, timezone
-import pytz
 
 from app.src.common.loguru_logger import logger
 from app.src.common.utils import measure_latency
 from app.src.common.memory_monitor import MemoryMonitor
 from app.src.common.alpaca import AlpacaClient
+from app.src.services.market_data.market_data_hub import MarketDataHub
+from app.src.common.market_session import EST_TZ, MarketSession
 from app.src.services.technical_analysis.technical_analysis_lib import (
     TechnicalAnalysisLib,
 )
@@ -19,6 +20,7 @@ from app.src.services.market_data.market_data_service import MarketDataService
 from app.src.services.mab.mab_service import MABService
 from app.src.db.dynamodb_client import DynamoDBClient
 from app.src.services.trading.base_trading_indicator import BaseTradingIndicator
+from app.src.services.trading.position_state_cache import PositionStateCache
 
 
 class DeepAnalyzerIndicator(BaseTradingIndicator):
@@ -49,8 +51,7 @@ class DeepAnalyzerIndicator(BaseTradingIndicator):
         base_threshold = 0.70
 
         # During first/last hour, require stronger signals (more noise)
-        est_tz = pytz.timezone("America/New_York")
-        current_hour = datetime.now(est_tz).hour
+        current_hour = datetime.now(EST_TZ).hour
         if current_hour == 9 or current_hour >= 15:
             base_threshold += 0.05
 
@@ -135,7 +136,7 @@ class DeepAnalyzerIndicator(BaseTradingIndicator):
                 )
             )
             if not is_shortable:
-                logger.debug(f"Skipping short entry for {ticker}: {shortable_reason}")
+                logger.debug("Skipping short entry for {}: {}", ticker, shortable_reason)
                 short_result: Dict[str, Any] = {
                     "ticker": ticker,
                     "action": "sell_to_open",
@@ -210,16 +211,12 @@ class DeepAnalyzerIndicator(BaseTradingIndicator):
 
                 if long_analysis_score > short_analysis_score:
                     reason = long_result.get("message", "No entry signal")
-                    logger.debug(
-                        f"{ticker} no entry: long_score={long_analysis_score:.2f}, "
-                        f"short_score={short_analysis_score:.2f}, reason={reason}"
-                    )
                 else:
                     reason = short_result.get("message", "No entry signal")
-                    logger.debug(
-                        f"{ticker} no entry: long_score={long_analysis_score:.2f}, "
-                        f"short_score={short_analysis_score:.2f}, reason={reason}"
-                    )
+                logger.debug(
+                    "{} no entry: long_score={:.2f}, short_score={:.2f}, reason={}",
+                    ticker, long_analysis_score, short_analysis_score, reason,
+                )
 
                 return None, None, reason, detailed_results
 
@@ -322,9 +319,9 @@ class DeepAnalyzerIndicator(BaseTradingIndicator):
         """Execute a single Deep Analyzer entry cycle."""
         logger.debug("Starting Deep Analyzer entry cycle")
         # Check market open
-        if not await AlpacaClient.is_market_open():
+        if not await MarketSession.is_market_open():
             logger.debug("Market is closed, skipping Deep Analyzer entry logic")
-            await asyncio.sleep(cls.entry_cycle_seconds)
+            await MarketSession.wait_for_open(fallback_seconds=cls.entry_cycle_seconds)
             return
 
         logger.info("Market is open, proceeding with Deep Analyzer entry logic")
@@ -426,7 +423,7 @@ class DeepAnalyzerIndicator(BaseTradingIndicator):
                     )
                     if not correlation_ok:
                         stats["no_entry_signal"] += 1  # Reuse this stat
-                        logger.debug(f"Skipping {ticker}: {correlation_reason}")
+                        logger.debug("Skipping {}: {}", ticker, correlation_reason)
                         inactive_ticker_logs.append(
                             {
                                 "ticker": ticker,
@@ -457,8 +454,8 @@ class DeepAnalyzerIndicator(BaseTradingIndicator):
                 else:
                     stats["low_entry_score"] += 1
                     logger.debug(
-                        f"Skipping {ticker}: entry score {entry_score:.2f} < "
-                        f"dynamic threshold {dynamic_threshold:.2f}"
+                        "Skipping {}: entry score {:.2f} < dynamic threshold {:.2f}",
+                        ticker, entry_score, dynamic_threshold,
                     )
                     # Log reason based on action
                     if action == "buy_to_open":
@@ -479,7 +476,7 @@ class DeepAnalyzerIndicator(BaseTradingIndicator):
                     )
             else:
                 stats["no_entry_signal"] += 1
-                logger.debug(f"Skipping {ticker}: {reason}")
+                logger.debug("Skipping {}: {}", ticker, reason)
 
                 # Use detailed_results from evaluation to avoid double API calls
                 reason_long = None
@@ -658,7 +655,7 @@ class DeepAnalyzerIndicator(BaseTradingIndicator):
                 current_price_hint = technical_analysis.get("close_price", 0.0)
 
             # Get entry price using Alpaca API
-            quote_response = await AlpacaClient.quote(ticker)
+            quote_response = await MarketDataHub.quote(ticker)
             enter_price = None
             quote_source = "none"
 
@@ -794,7 +791,7 @@ class DeepAnalyzerIndicator(BaseTradingIndicator):
                 current_price_hint = technical_analysis.get("close_price", 0.0)
 
             # Get entry price using Alpaca API
-            quote_response = await AlpacaClient.quote(ticker)
+            quote_response = await MarketDataHub.quote(ticker)
             enter_price = None
             quote_source = "none"
 
@@ -912,9 +909,9 @@ class DeepAnalyzerIndicator(BaseTradingIndicator):
     @measure_latency
     async def _run_exit_cycle(cls):
         """Execute a single Deep Analyzer exit monitoring cycle."""
-        if not await AlpacaClient.is_market_open():
+        if not await MarketSession.is_market_open():
             logger.debug("Market is closed, skipping Deep Analyzer exit logic")
-            await asyncio.sleep(cls.exit_cycle_seconds)
+            await MarketSession.wait_for_open(fallback_seconds=cls.exit_cycle_seconds)
             return
 
         active_trades = await cls._get_active_trades()
@@ -1016,7 +1013,7 @@ class DeepAnalyzerIndicator(BaseTradingIndicator):
             if not should_exit:
                 # Update peak profit in database
                 new_peak = max(peak_profit_percent, profit_percent)
-                await DynamoDBClient.update_momentum_trade_trailing_stop(
+                await PositionStateCache.update(
                     ticker=ticker,
                     indicator=cls.indicator_name(),
                     trailing_stop=cls.trailing_stop_percent,
@@ -1024,8 +1021,8 @@ class DeepAnalyzerIndicator(BaseTradingIndicator):
                     skipped_exit_reason=f"Holding: profit {profit_percent:.2f}%",
                 )
                 logger.debug(
-                    f"{ticker}: Holding (profit: {profit_percent:.2f}%, "
-                    f"peak: ${peak_price:.4f}, stop: ${trailing_stop_price:.4f})"
+                    "{}: Holding (profit: {:.2f}%, peak: ${:.4f}, stop: ${:.4f})",
+                    ticker, profit_percent, peak_price, trailing_stop_price,
                 )
                 continue
 
@@ -9,6 +9,7 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 from app.src.common.loguru_logger import logger
+from app.src.common.metrics import Metrics
 from app.src.services.trading.peak_detection_config import PeakDetectionConfig, DEFAULT_CONFIG
 from app.src.services.trading.peak_detection_models import (
     ValidationResult,
@@ -46,6 +47,7 @@ class EnhancedValidationPipeline:
         """
         self.config = config
     
+    @Metrics.timed("validation", validator="enhanced_pipeline")
     def validate_entry(
         self,
         ticker: str,
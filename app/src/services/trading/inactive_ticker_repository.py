@@ -7,35 +7,26 @@ and failing tickers) to the InactiveTickersForDayTrading table.
 
 import json
 from typing import List, Dict, Any
-from decimal import Decimal
 import aioboto3
 from botocore.exceptions import ClientError, BotoCoreError
 from loguru import logger
+from app.src.db.dynamodb_serializer import to_attribute_value_map
 
 
 def _convert_to_dynamodb_format(record: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Convert evaluation record to DynamoDB format.
+    Convert evaluation record to low-level DynamoDB AttributeValue format.
     
-    Converts floats to Decimals and handles nested dictionaries.
+    batch_write_item is called on the low-level client, which expects typed
+    AttributeValue maps ({'N': '1.5'}, {'M': {...}}) rather than plain values.
     
     Args:
         record: Evaluation record dictionary
         
     Returns:
-        DynamoDB-compatible record
+        DynamoDB AttributeValue map for the record
     """
-    def convert_value(value):
-        if isinstance(value, dict):
-            return {k: convert_value(v) for k, v in value.items()}
-        elif isinstance(value, list):
-            return [convert_value(item) for item in value]
-        elif isinstance(value, float):
-            return Decimal(str(value))
-        else:
-            return value
-    
-    return convert_value(record)
+    return to_attribute_value_map(record)
 
 
 class InactiveTickerRepository:
@@ -90,56 +81,53 @@ class InactiveTickerRepository:
                 for i in range(0, len(dynamodb_records), batch_size)
             ]
             
-            async with self.session.resource('dynamodb') as dynamodb:
-                table = await dynamodb.Table(self.table_name)
+            for batch in batches:
+                # Build batch write request
+                request_items = {
+                    self.table_name: [
+                        {'PutRequest': {'Item': record}}
+                        for record in batch
+                    ]
+                }
+                
+                # Execute batch write
+                async with self.session.client('dynamodb') as client:
+                    response = await client.batch_write_item(RequestItems=request_items)
+                
+                # Handle unprocessed items (retry logic)
+                unprocessed = response.get('UnprocessedItems', {})
+                retry_count = 0
+                max_retries = 3
                 
-                for batch in batches:
-                    # Build batch write request
-                    request_items = {
-                        self.table_name: [
-                            {'PutRequest': {'Item': record}}
-                            for record in batch
-                        ]
-                    }
+                while unprocessed and retry_count < max_retries:
+                    logger.warning(
+                        f"Retrying {len(unprocessed.get(self.table_name, []))} unprocessed items",
+                        extra={
+                            "operation": "batch_write_evaluations",
+                            "table": self.table_name,
+                            "retry_count": retry_count + 1
+                        }
+                    )
+                    
+                    # Exponential backoff
+                    import asyncio
+                    await asyncio.sleep(2 ** retry_count)
                     
-                    # Execute batch write
                     async with self.session.client('dynamodb') as client:
-                        response = await client.batch_write_item(RequestItems=request_items)
+                        response = await client.batch_write_item(RequestItems=unprocessed)
                     
-                    # Handle unprocessed items (retry logic)
                     unprocessed = response.get('UnprocessedItems', {})
-                    retry_count = 0
-                    max_retries = 3
-                    
-                    while unprocessed and retry_count < max_retries:
-                        logger.warning(
-                            f"Retrying {len(unprocessed.get(self.table_name, []))} unprocessed items",
-                            extra={
-                                "operation": "batch_write_evaluations",
-                                "table": self.table_name,
-                                "retry_count": retry_count + 1
-                            }
-                        )
-                        
-                        # Exponential backoff
-                        import asyncio
-                        await asyncio.sleep(2 ** retry_count)
-                        
-                        async with self.session.client('dynamodb') as client:
-                            response = await client.batch_write_item(RequestItems=unprocessed)
-                        
-                        unprocessed = response.get('UnprocessedItems', {})
-                        retry_count += 1
-                    
-                    if unprocessed:
-                        logger.error(
-                            f"Failed to write {len(unprocessed.get(self.table_name, []))} items after {max_retries} retries",
-                            extra={
-                                "operation": "batch_write_evaluations",
-                                "table": self.table_name,
-                                "status": "partial_failure"
-                            }
-                        )
+                    retry_count += 1
+                
+                if unprocessed:
+                    logger.error(
+                        f"Failed to write {len(unprocessed.get(self.table_name, []))} items after {max_retries} retries",
+                        extra={
+                            "operation": "batch_write_evaluations",
+                            "table": self.table_name,
+                            "status": "partial_failure"
+                        }
+                    )
             
             logger.info(
                 f"Successfully wrote {len(records)} evaluation records to DynamoDB",
@@ -8,7 +8,7 @@ from datetime import datetime, timezone
 from typing import Tuple, Dict, Any
 
 from app.src.common.loguru_logger import logger
-from app.src.common.alpaca import AlpacaClient
+from app.src.services.market_data.market_data_hub import MarketDataHub
 
 
 class MarketDirectionFilter:
@@ -88,7 +88,7 @@ class MarketDirectionFilter:
 
         try:
             # Fetch 3 days of daily data (1-day bars for 3 days)
-            bars_data = await AlpacaClient.get_market_data("QQQ", limit=3)
+            bars_data = await MarketDataHub.get_market_data("QQQ", limit=3)
 
             if not bars_data or "bars" not in bars_data:
                 logger.warning("Failed to fetch QQQ daily data")
@@ -128,7 +128,7 @@ class MarketDirectionFilter:
 
         try:
             # Fetch intraday data (last 50 bars)
-            bars_data = await AlpacaClient.get_market_data("QQQ", limit=50)
+            bars_data = await MarketDataHub.get_market_data("QQQ", limit=50)
 
             if not bars_data or "bars" not in bars_data:
                 logger.warning("Failed to fetch QQQ intraday data")
@@ -0,0 +1,366 @@
+"""
+Market Regime Service
+Background refresh of market trend and breadth, published as an immutable snapshot
+
+MarketDirectionFilter used to recompute the QQQ trend inside every entry
+check whenever its 2-minute cache expired, so concurrent entries could all
+miss at once and each fetch bars. This service recomputes the regime once
+per 1-minute bar close in a background task; entry checks read the latest
+snapshot synchronously and never touch the network.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from app.src.common.loguru_logger import logger
+from app.src.common.market_session import MarketSession
+from app.src.config.constants import (
+    MARKET_REGIME_BAR_CLOSE_DELAY_SECONDS,
+    MARKET_REGIME_ENABLED,
+    MARKET_REGIME_MAX_AGE_SECONDS,
+    MARKET_REGIME_PRIMARY_SYMBOL,
+    MARKET_REGIME_SYMBOLS,
+)
+from app.src.services.market_data.market_data_hub import MarketDataHub
+from app.src.services.trading.market_direction_filter import MarketDirectionFilter
+
+# Same depths MarketDirectionFilter requested (both served by one hub fetch)
+_DAILY_BARS = 3
+_INTRADAY_BARS = 50
+# Minimum series lengths MarketDirectionFilter accepted before trusting a trend
+_MIN_DAILY_BARS = 2
+_MIN_INTRADAY_BARS = 10
+
+
+@dataclass(frozen=True)
+class SymbolRegime:
+    """Trend state of one regime symbol (e.g. QQQ)"""
+
+    symbol: str
+    daily_trend: str
+    intraday_trend: str
+    trend: str
+    last_close: Optional[float]
+    bars_analyzed: int
+    computed_at: float = field(default_factory=time.time)
+
+    def age_seconds(self, now: Optional[float] = None) -> float:
+        return (time.time() if now is None else now) - self.computed_at
+
+
+@dataclass(frozen=True)
+class Breadth:
+    """Advancers vs decliners across the screener universe"""
+
+    advancers: int = 0
+    decliners: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.advancers + self.decliners + self.unchanged
+
+    @property
+    def ratio(self) -> float:
+        """(advancers - decliners) / (advancers + decliners), in [-1, 1]"""
+        moved = self.advancers + self.decliners
+        return (self.advancers - self.decliners) / moved if moved else 0.0
+
+
+@dataclass(frozen=True)
+class RegimeSnapshot:
+    """Immutable market regime published by MarketRegimeService"""
+
+    computed_at: float
+    primary_symbol: str
+    symbols: Mapping[str, SymbolRegime] = field(default_factory=lambda: MappingProxyType({}))
+    breadth: Breadth = field(default_factory=Breadth)
+
+    @property
+    def primary(self) -> Optional[SymbolRegime]:
+        return self.symbols.get(self.primary_symbol)
+
+    @property
+    def trend(self) -> str:
+        """Combined trend of the primary symbol ("UP", "DOWN" or "SIDEWAYS")"""
+        primary = self.primary
+        return primary.trend if primary else "SIDEWAYS"
+
+    def age_seconds(self, now: Optional[float] = None) -> float:
+        return (time.time() if now is None else now) - self.computed_at
+
+    def trend_details(self) -> Dict[str, Any]:
+        """Details in the shape MarketDirectionFilter.get_hybrid_qqq_trend returns"""
+        primary = self.primary
+        daily = primary.daily_trend if primary else "SIDEWAYS"
+        intraday = primary.intraday_trend if primary else "SIDEWAYS"
+        return {
+            "final_trend": self.trend,
+            "daily_trend": daily,
+            "intraday_trend": intraday,
+            "daily_weight": MarketDirectionFilter._daily_trend_weight,
+            "intraday_weight": MarketDirectionFilter._intraday_trend_weight,
+            "decision_logic": MarketDirectionFilter._get_decision_logic(daily, intraday, self.trend),
+            "regime_age_seconds": round(self.age_seconds(), 1),
+            "regime_symbols": {symbol: regime.trend for symbol, regime in self.symbols.items()},
+            "breadth": {
+                "advancers": self.breadth.advancers,
+                "decliners": self.breadth.decliners,
+                "ratio": round(self.breadth.ratio, 3),
+            },
+        }
+
+
+class MarketRegimeService:
+    """
+    Recomputes the market regime on each bar close and publishes a snapshot.
+
+    - Symbols: MARKET_REGIME_SYMBOLS (primary MARKET_REGIME_PRIMARY_SYMBOL
+      drives entry blocking, the others are informational), each scored with
+      MarketDirectionFilter's hybrid daily/intraday trend.
+    - Breadth: advancers/decliners over the screener universe from bars the
+      MarketDataHub already holds (no extra fetches).
+
+    Bars go through MarketDataHub, so the refresh shares fetches with the
+    indicators. Readers get the current snapshot by reference; it is
+    replaced, never mutated.
+    """
+
+    enabled: bool = MARKET_REGIME_ENABLED
+    primary_symbol: str = MARKET_REGIME_PRIMARY_SYMBOL
+    symbols: List[str] = MARKET_REGIME_SYMBOLS
+    bar_close_delay_seconds: float = MARKET_REGIME_BAR_CLOSE_DELAY_SECONDS
+    max_age_seconds: float = MARKET_REGIME_MAX_AGE_SECONDS
+    # Bars back used to classify a universe ticker as advancing/declining
+    breadth_lookback_bars: int = 30
+
+    _snapshot: Optional[RegimeSnapshot] = None
+    _task: Optional[asyncio.Task] = None
+    _stats: Dict[str, int] = {"refreshes": 0, "refresh_errors": 0, "reads": 0, "stale_reads": 0}
+
+    @classmethod
+    def reset(cls):
+        """Drop the published snapshot and counters (tests)"""
+        cls._snapshot = None
+        cls._task = None
+        cls._stats = {key: 0 for key in cls._stats}
+
+    # ------------------------------------------------------------------
+    # Readers (synchronous, no I/O)
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def snapshot(cls) -> Optional[RegimeSnapshot]:
+        """Latest snapshot, or None if nothing has been published yet"""
+        return cls._snapshot
+
+    @classmethod
+    def is_running(cls) -> bool:
+        return cls._task is not None and not cls._task.done()
+
+    @classmethod
+    def evaluate_trade(cls, action: str, indicator_name: str) -> Tuple[bool, str, Dict[str, Any]]:
+        """
+        Check a trade against the published regime.
+
+        A missing or stale snapshot reads as SIDEWAYS (trade allowed), the same
+        outcome MarketDirectionFilter had when its QQQ fetch failed. So does a
+        primary symbol whose own state is stale (its fetch keeps failing and
+        refresh() only carries the old state forward).
+
+        Args:
+            action: Trading action ("BUY_TO_OPEN" or "SELL_TO_OPEN")
+            indicator_name: Name of the trading indicator
+
+        Returns:
+            Tuple[bool, str, Dict[str, Any]]: (should_allow, reason, trend_details)
+        """
+        cls._stats["reads"] += 1
+        snapshot = cls._snapshot
+        if snapshot is None or snapshot.age_seconds() > cls.max_age_seconds:
+            cls._stats["stale_reads"] += 1
+            age = f"{snapshot.age_seconds():.0f}s old" if snapshot else "not yet available"
+            reason = f"Market regime {age} - allowing {action} for {indicator_name}"
+            logger.debug(reason)
+            return True, reason, {"final_trend": "SIDEWAYS", "error": f"regime {age}"}
+
+        primary = snapshot.primary
+        if primary is not None and primary.age_seconds() > cls.max_age_seconds:
+            cls._stats["stale_reads"] += 1
+            age = f"{primary.age_seconds():.0f}s old"
+            reason = f"{primary.symbol} regime {age} - allowing {action} for {indicator_name}"
+            logger.debug(reason)
+            return True, reason, {"final_trend": "SIDEWAYS", "error": f"{primary.symbol} regime {age}"}
+
+        trend = snapshot.trend
+        symbol = snapshot.primary_symbol
+        details = snapshot.trend_details()
+        if action == "BUY_TO_OPEN" and trend == "DOWN":
+            reason = f"{symbol} hybrid trend is DOWN ({trend}) - blocking LONG {indicator_name} trade to avoid losses"
+            logger.warning(reason)
+            return False, reason, details
+        if action == "SELL_TO_OPEN" and trend == "UP":
+            reason = f"{symbol} hybrid trend is UP ({trend}) - blocking SHORT {indicator_name} trade to avoid losses"
+            logger.warning(reason)
+            return False, reason, details
+
+        reason = f"{symbol} hybrid trend ({trend}) allows {action} for {indicator_name}"
+        logger.debug(reason)
+        return True, reason, details
+
+    @classmethod
+    async def should_allow_trade(cls, action: str, indicator_name: str) -> Tuple[bool, str, Dict[str, Any]]:
+        """
+        Drop-in replacement for MarketDirectionFilter.should_allow_trade.
+
+        Reads the snapshot when the background refresh is running; otherwise
+        (service disabled, or a one-off script) falls back to the filter.
+        """
+        if cls.is_running() or cls._snapshot is not None:
+            return cls.evaluate_trade(action, indicator_name)
+        return await MarketDirectionFilter.should_allow_trade(action=action, indicator_name=indicator_name)
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    @classmethod
+    async def _symbol_regime(cls, symbol: str) -> Optional[SymbolRegime]:
+        bars_data = await MarketDataHub.get_market_data(symbol, limit=_INTRADAY_BARS)
+        bars = (bars_data or {}).get("bars", {}).get(symbol, [])
+        daily_bars = bars[-_DAILY_BARS:]
+        if len(daily_bars) < _MIN_DAILY_BARS or len(bars) < _MIN_INTRADAY_BARS:
+            logger.warning(f"Insufficient {symbol} bars for regime: {len(bars)}")
+            return None
+        daily = MarketDirectionFilter._calculate_daily_trend_from_bars(daily_bars)
+        intraday = MarketDirectionFilter._calculate_intraday_trend_from_bars(bars)
+        last_close = bars[-1].get("c")
+        return SymbolRegime(
+            symbol=symbol,
+            daily_trend=daily,
+            intraday_trend=intraday,
+            trend=MarketDirectionFilter._combine_trends(daily, intraday),
+            last_close=float(last_close) if last_close is not None else None,
+            bars_analyzed=len(bars),
+        )
+
+    @classmethod
+    def _compute_breadth(cls) -> Breadth:
+        advancers = decliners = unchanged = 0
+        lookback = cls.breadth_lookback_bars
+        for ticker in MarketDataHub.cached_universe():
+            bars = MarketDataHub.cached_bars(ticker)
+            if len(bars) < 2:
+                continue
+            start = bars[-min(lookback, len(bars))].get("c")
+            end = bars[-1].get("c")
+            if not start or end is None:
+                continue
+            if end > start:
+                advancers += 1
+            elif end < start:
+                decliners += 1
+            else:
+                unchanged += 1
+        return Breadth(advancers, decliners, unchanged)
+
+    @classmethod
+    async def refresh(cls) -> RegimeSnapshot:
+        """
+        Recompute and publish the regime snapshot.
+
+        A symbol whose bars can't be fetched keeps its previous state,
+        including its computed_at, so a persistently failing symbol ages out.
+
+        Returns:
+            The newly published snapshot
+        """
+        symbols = list(dict.fromkeys([cls.primary_symbol, *cls.symbols]))
+        results = await asyncio.gather(*(cls._symbol_regime(s) for s in symbols), return_exceptions=True)
+
+        previous = cls._snapshot.symbols if cls._snapshot else {}
+        regimes: Dict[str, SymbolRegime] = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, SymbolRegime):
+                regimes[symbol] = result
+            else:
+                if isinstance(result, Exception):
+                    logger.warning(f"Market regime refresh failed for {symbol}: {result}")
+                if symbol in previous:
+                    regimes[symbol] = previous[symbol]
+
+        snapshot = RegimeSnapshot(
+            computed_at=time.time(),
+            primary_symbol=cls.primary_symbol,
+            symbols=MappingProxyType(regimes),
+            breadth=cls._compute_breadth(),
+        )
+        cls._snapshot = snapshot
+        cls._stats["refreshes"] += 1
+        logger.info(
+            f"Market regime: {snapshot.primary_symbol} {snapshot.trend} "
+            f"({', '.join(f'{s} {r.trend}' for s, r in regimes.items())}; "
+            f"breadth {snapshot.breadth.advancers}/{snapshot.breadth.decliners})"
+        )
+        return snapshot
+
+    @classmethod
+    def _seconds_until_bar_close(cls) -> float:
+        now = time.time()
+        return 60.0 - (now % 60.0) + cls.bar_close_delay_seconds
+
+    @classmethod
+    async def run(cls):
+        """Refresh loop: once at start, then after every 1-minute bar close while the market is open"""
+        logger.info(f"Market regime service started (symbols: {', '.join(cls.symbols)})")
+        first = True
+        while True:
+            try:
+                if not first:
+                    await asyncio.sleep(cls._seconds_until_bar_close())
+                first = False
+                if not await MarketSession.is_market_open():
+                    await MarketSession.wait_for_open()
+                    first = True
+                    continue
+                await cls.refresh()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                cls._stats["refresh_errors"] += 1
+                logger.warning(f"Market regime refresh error: {e}")
+        logger.info("Market regime service stopped")
+
+    @classmethod
+    def start(cls) -> bool:
+        """Start the background refresh task (no-op when disabled or already running)"""
+        if not cls.enabled or cls.is_running():
+            return False
+        cls._task = asyncio.get_running_loop().create_task(cls.run(), name="MarketRegimeService")
+        return True
+
+    @classmethod
+    async def stop(cls):
+        """Cancel the background refresh task"""
+        task = cls._task
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        cls._task = None
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """Snapshot age, primary trend and read/refresh counters"""
+        snapshot = cls._snapshot
+        age = snapshot.age_seconds() if snapshot else None
+        return {
+            "enabled": cls.enabled,
+            "running": cls.is_running(),
+            "trend": snapshot.trend if snapshot else None,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "breadth_ratio": round(snapshot.breadth.ratio, 3) if snapshot else None,
+            **cls._stats,
+        }
@@ -6,9 +6,10 @@ with symmetric validation and comprehensive technical indicators.
 """
 
 import asyncio
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from loguru import logger
 
+from app.src.models.momentum_validation import TechnicalIndicators
 from app.src.services.trading.technical_indicator_calculator import TechnicalIndicatorCalculator
 from app.src.services.trading.momentum_validator import MomentumValidator
 from app.src.services.trading.momentum_evaluation_record_builder import MomentumEvaluationRecordBuilder
@@ -61,7 +62,8 @@ class MomentumEntryCycle:
     async def evaluate_ticker(
         self,
         ticker: str,
-        bars: List[Dict[str, Any]]
+        bars: List[Dict[str, Any]],
+        technical_indicators: Optional[TechnicalIndicators] = None
     ) -> Tuple[bool, Dict[str, Any]]:
         """
         Evaluate a single ticker for entry.
@@ -69,12 +71,15 @@ class MomentumEntryCycle:
         Args:
             ticker: Stock ticker symbol
             bars: Historical price bars with OHLCV data
+            technical_indicators: Indicators already computed for these bars
+                (e.g. by run_cycle's batched calculation)
             
         Returns:
             Tuple of (is_valid, evaluation_record)
         """
         # Calculate comprehensive technical indicators
-        technical_indicators = TechnicalIndicatorCalculator.calculate_indicators(bars)
+        if technical_indicators is None:
+            technical_indicators = TechnicalIndicatorCalculator.calculate_indicators(bars)
         
         # Validate using symmetric rules
         validation_result = self.validator.validate(ticker, technical_indicators)
@@ -149,10 +154,21 @@ class MomentumEntryCycle:
             f"Starting momentum validation cycle for {len(tickers_with_data)} tickers"
         )
         
+        # Compute indicators for the whole universe as one matrix per bar count
+        try:
+            precomputed = TechnicalIndicatorCalculator.calculate_indicators_for_tickers(
+                {ticker: bars for ticker, bars in tickers_with_data}
+            )
+        except Exception as e:
+            logger.warning(f"Batched indicator calculation failed, falling back per ticker: {str(e)}")
+            precomputed = {}
+        
         # Evaluate all tickers
         for ticker, bars in tickers_with_data:
             try:
-                is_valid, record = await self.evaluate_ticker(ticker, bars)
+                is_valid, record = await self.evaluate_ticker(
+                    ticker, bars, precomputed.get(ticker)
+                )
                 evaluation_records.append(record)
                 results.append((ticker, is_valid))
                 
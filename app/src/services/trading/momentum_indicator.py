@@ -12,17 +12,21 @@ IMPROVED ALGORITHM (Dec 2024):
 
 import asyncio
 from typing import List, Tuple, Dict, Any, Optional
-from datetime import datetime, timezone, time
-import pytz
+from datetime import datetime, timezone
 
-from app.src.common.loguru_logger import logger
+from app.src.common.loguru_logger import is_level_enabled, logger, sampled
 from app.src.common.utils import measure_latency
 from app.src.common.memory_monitor import MemoryMonitor
 from app.src.common.alpaca import AlpacaClient
+from app.src.services.market_data.market_data_hub import MarketDataHub
+from app.src.common.asset_directory import AssetDirectory
+from app.src.common.market_session import EST_TZ, MarketSession
 from app.src.db.dynamodb_client import DynamoDBClient
+from app.src.models.price_series import PriceSeries
 from app.src.services.webhook.send_signal import send_signal_to_webhook
 from app.src.services.mab.mab_service import MABService
 from app.src.services.trading.base_trading_indicator import BaseTradingIndicator
+from app.src.services.trading.position_state_cache import PositionStateCache
 from app.src.services.technical_analysis.technical_analysis_lib import (
     TechnicalAnalysisLib,
 )
@@ -46,7 +50,7 @@ from app.src.services.trading.penny_stock_utils import (
     ExitDecision,
     DailyPerformanceMetrics,
 )
-from app.src.services.trading.market_direction_filter import MarketDirectionFilter
+from app.src.services.trading.market_regime_service import MarketRegimeService
 
 
 class MomentumIndicator(BaseTradingIndicator):
@@ -171,6 +175,28 @@ class MomentumIndicator(BaseTradingIndicator):
     def indicator_name(cls) -> str:
         return "Momentum Trading"
 
+    @classmethod
+    def get_snapshot_state(cls) -> Dict[str, Any]:
+        """Base snapshot state plus exit-engine consecutive loss counters"""
+        state = super().get_snapshot_state()
+        state["consecutive_loss_checks"] = (
+            dict(cls._exit_engine.consecutive_loss_checks) if cls._exit_engine else {}
+        )
+        return state
+
+    @classmethod
+    def restore_snapshot_state(
+        cls, state: Dict[str, Any], fresh: bool = True, complete: bool = False
+    ) -> None:
+        """Restore snapshot state; loss counters only from a fresh snapshot"""
+        super().restore_snapshot_state(state, fresh=fresh, complete=complete)
+        if fresh and state.get("consecutive_loss_checks"):
+            if cls._exit_engine is None:
+                cls._exit_engine = ExitDecisionEngine()
+            cls._exit_engine.consecutive_loss_checks.update(
+                {ticker: int(count) for ticker, count in state["consecutive_loss_checks"].items()}
+            )
+
     @classmethod
     def stop(cls):
         """Stop the trading indicator"""
@@ -185,21 +211,7 @@ class MomentumIndicator(BaseTradingIndicator):
         if not cls.force_close_before_market_close:
             return False
 
-        est_tz = pytz.timezone("America/New_York")
-        current_time_est = datetime.now(est_tz)
-        market_close_time = time(16, 0)  # 4:00 PM ET
-
-        # Calculate minutes until market close
-        close_datetime = datetime.combine(current_time_est.date(), market_close_time)
-        close_datetime = est_tz.localize(close_datetime)
-        current_datetime = current_time_est
-
-        if current_datetime >= close_datetime:
-            # Already past market close
-            return True
-
-        minutes_until_close = (close_datetime - current_datetime).total_seconds() / 60.0
-        return minutes_until_close <= cls.minutes_before_close_to_exit
+        return MarketSession.is_near_close(cls.minutes_before_close_to_exit)
 
     @classmethod
     def _is_after_entry_cutoff(cls) -> bool:
@@ -211,23 +223,8 @@ class MomentumIndicator(BaseTradingIndicator):
         Returns:
             True if entries should be blocked, False if entries are allowed
         """
-        est_tz = pytz.timezone("America/New_York")
-        current_time_est = datetime.now(est_tz)
-        current_hour = current_time_est.hour
-        current_minute = current_time_est.minute
-
-        # Block entries after max_entry_hour_et (e.g., after 3PM = hour 16+)
-        if current_hour > cls.max_entry_hour_et:
-            return True
-
-        # Block entries in the last 5 minutes of the allowed hour (e.g., 3:55-3:59 PM)
-        if (
-            current_hour == cls.max_entry_hour_et
-            and current_minute >= cls.max_entry_minute_et
-        ):
-            return True
-
-        return False
+        # Shifted earlier on early-close days (e.g. 12:55 PM for a 1:00 PM close)
+        return MarketSession.past_entry_cutoff(cls.max_entry_hour_et, cls.max_entry_minute_et)
 
     @classmethod
     def _filter_bars_after_entry(
@@ -459,7 +456,7 @@ class MomentumIndicator(BaseTradingIndicator):
         Returns (is_acceptable, spread_percent, reason)
         """
         try:
-            quote_response = await AlpacaClient.quote(ticker)
+            quote_response = await MarketDataHub.quote(ticker)
             if not quote_response:
                 return True, 0.0, "No quote data available, proceeding"
 
@@ -546,9 +543,9 @@ class MomentumIndicator(BaseTradingIndicator):
             return default_stop_loss
 
         try:
-            # Fetch intraday bars using AlpacaClient.get_market_data()
+            # Fetch intraday bars using MarketDataHub.get_market_data()
             # This will get latest 200 bars (or up to 1000 if we need more)
-            bars_data = await AlpacaClient.get_market_data(ticker, limit=1000)
+            bars_data = await MarketDataHub.get_market_data(ticker, limit=1000)
 
             if not bars_data:
                 logger.debug(
@@ -675,6 +672,9 @@ class MomentumIndicator(BaseTradingIndicator):
     @classmethod
     def _is_warrant_or_option(cls, ticker: str) -> bool:
         """Check if ticker is a warrant or option"""
+        known = AssetDirectory.is_special_security(ticker)
+        if known is not None:
+            return known
         ticker_upper = ticker.upper()
         warrant_suffixes = ["W", "WS", "WT", "WTS", "R", "RT"]
 
@@ -1100,26 +1100,36 @@ class MomentumIndicator(BaseTradingIndicator):
         Calculate price momentum score from datetime_price.
 
         Args:
-            datetime_price: Either a dict mapping timestamp strings to prices,
-                          or a list of entries (legacy format)
+            datetime_price: PriceSeries from TechnicalAnalysisLib, a dict mapping
+                          timestamp strings to prices, or a list of entries (legacy format)
 
         Returns:
             Tuple of (momentum_score, reason_string)
         """
-        logger.debug(
-            f"_calculate_momentum called with type: {type(datetime_price).__name__}, empty: {not datetime_price}"
-        )
+        # Called per ticker per cycle: sample the diagnostics and format lazily
+        log_diagnostics = is_level_enabled("DEBUG") and sampled("momentum.calculate_momentum")
+        if log_diagnostics:
+            logger.debug(
+                "_calculate_momentum called with type: {}, empty: {}",
+                type(datetime_price).__name__,
+                not datetime_price,
+            )
 
         if not datetime_price:
             return 0.0, "Insufficient price data"
 
         prices = []
 
-        # Handle dictionary format (current format from TechnicalAnalysisLib)
-        if isinstance(datetime_price, dict):
-            logger.debug(
-                f"Processing datetime_price as dictionary with {len(datetime_price)} entries"
-            )
+        # Current format from TechnicalAnalysisLib: already sorted and cleaned
+        if isinstance(datetime_price, PriceSeries):
+            prices = datetime_price.prices.tolist()
+
+        # Handle dictionary format (persisted/legacy records)
+        elif isinstance(datetime_price, dict):
+            if log_diagnostics:
+                logger.debug(
+                    "Processing datetime_price as dictionary with {} entries", len(datetime_price)
+                )
             try:
                 # Extract (timestamp, price) pairs and sort by timestamp
                 timestamp_price_pairs = []
@@ -1137,9 +1147,10 @@ class MomentumIndicator(BaseTradingIndicator):
                             else:
                                 dt = datetime.fromisoformat(timestamp_str)
                         else:
-                            logger.debug(
-                                f"Skipping non-string timestamp key: {type(timestamp_str)}"
-                            )
+                            if log_diagnostics:
+                                logger.debug(
+                                    "Skipping non-string timestamp key: {}", type(timestamp_str)
+                                )
                             continue
 
                         # Validate price
@@ -1149,12 +1160,16 @@ class MomentumIndicator(BaseTradingIndicator):
                             and price > 0
                         ):
                             timestamp_price_pairs.append((dt, float(price)))
-                        else:
-                            logger.debug(f"Skipping invalid price: {price}")
+                        elif log_diagnostics:
+                            logger.debug("Skipping invalid price: {}", price)
                     except (ValueError, TypeError) as e:
-                        logger.debug(
-                            f"Skipping invalid timestamp/price pair: {timestamp_str}={price}, error: {e}"
-                        )
+                        if log_diagnostics:
+                            logger.debug(
+                                "Skipping invalid timestamp/price pair: {}={}, error: {}",
+                                timestamp_str,
+                                price,
+                                e,
+                            )
                         continue
 
                 # Sort by timestamp (chronological order)
@@ -1163,11 +1178,13 @@ class MomentumIndicator(BaseTradingIndicator):
                 # Extract prices in chronological order
                 prices = [price for _, price in timestamp_price_pairs]
 
-                logger.debug(
-                    f"Extracted {len(prices)} valid prices from dictionary in chronological order"
-                )
-                if prices:
-                    logger.debug(f"Price range: {min(prices):.4f} to {max(prices):.4f}")
+                if log_diagnostics:
+                    logger.debug(
+                        "Extracted {} valid prices from dictionary in chronological order",
+                        len(prices),
+                    )
+                    if prices:
+                        logger.debug("Price range: {:.4f} to {:.4f}", min(prices), max(prices))
 
             except Exception as e:
                 logger.warning(f"Error processing datetime_price dictionary: {e}")
@@ -1175,9 +1192,10 @@ class MomentumIndicator(BaseTradingIndicator):
 
         # Handle list format (legacy format)
         elif isinstance(datetime_price, list):
-            logger.debug(
-                f"Processing datetime_price as list with {len(datetime_price)} entries"
-            )
+            if log_diagnostics:
+                logger.debug(
+                    "Processing datetime_price as list with {} entries", len(datetime_price)
+                )
             for entry in datetime_price:
                 try:
                     if isinstance(entry, list):
@@ -1196,9 +1214,10 @@ class MomentumIndicator(BaseTradingIndicator):
 
         # Handle tuple format (legacy or default indicators)
         elif isinstance(datetime_price, tuple):
-            logger.debug(
-                f"Processing datetime_price as tuple with {len(datetime_price)} entries"
-            )
+            if log_diagnostics:
+                logger.debug(
+                    "Processing datetime_price as tuple with {} entries", len(datetime_price)
+                )
             for entry in datetime_price:
                 try:
                     if isinstance(entry, (list, tuple)) and len(entry) >= 2:
@@ -1434,9 +1453,11 @@ class MomentumIndicator(BaseTradingIndicator):
 
     @classmethod
     def _extract_prices_from_datetime_price(
-        cls, datetime_price: List[Any]
+        cls, datetime_price: Any
     ) -> List[float]:
-        """Extract price values from datetime_price array."""
+        """Extract price values from datetime_price (PriceSeries or legacy array)."""
+        if isinstance(datetime_price, PriceSeries):
+            return datetime_price.prices.tolist()
         prices = []
         for entry in datetime_price:
             try:
@@ -1722,7 +1743,7 @@ class MomentumIndicator(BaseTradingIndicator):
         # For shorts, re-check quality filters at entry time
         if action == "sell_to_open":
             # Check if ticker is shortable via Alpaca API
-            is_shortable = await AlpacaClient.is_shortable(ticker)
+            is_shortable = await AssetDirectory.check_shortable(ticker)
             if not is_shortable:
                 logger.info(
                     f"Skipping {ticker} short entry: ticker is not shortable according to Alpaca API"
@@ -1740,8 +1761,9 @@ class MomentumIndicator(BaseTradingIndicator):
                 return False
 
         # MARKET DIRECTION FILTER - Check QQQ trend before allowing trades
+        # (reads the background regime snapshot; no API calls on this path)
         should_allow, market_reason, trend_details = (
-            await MarketDirectionFilter.should_allow_trade(
+            await MarketRegimeService.should_allow_trade(
                 action=action, indicator_name=cls.indicator_name()
             )
         )
@@ -1752,7 +1774,7 @@ class MomentumIndicator(BaseTradingIndicator):
             return False
 
         # Get entry price using Alpaca API
-        quote_response = await AlpacaClient.quote(ticker)
+        quote_response = await MarketDataHub.quote(ticker)
         if not quote_response:
             logger.warning(f"Failed to get quote for {ticker}, skipping")
             return False
@@ -1863,7 +1885,7 @@ class MomentumIndicator(BaseTradingIndicator):
         # NEW: Immediate momentum check - verify most recent bars still show momentum
         # This catches reversals that happened between momentum calculation and entry
         # Get bars data for immediate momentum validation
-        bars_data = await AlpacaClient.get_market_data(ticker, limit=50)
+        bars_data = await MarketDataHub.get_market_data(ticker, limit=50)
         if bars_data:
             bars_dict = bars_data.get("bars", {})
             ticker_bars = bars_dict.get(ticker, [])
@@ -1954,16 +1976,15 @@ class MomentumIndicator(BaseTradingIndicator):
     async def _run_entry_cycle(cls):
         """Execute a single momentum entry cycle."""
         logger.debug("Starting momentum entry cycle")
-        if not await AlpacaClient.is_market_open():
+        if not await MarketSession.is_market_open():
             logger.debug("Market is closed, skipping momentum entry logic")
-            await asyncio.sleep(cls.entry_cycle_seconds)
+            await MarketSession.wait_for_open(fallback_seconds=cls.entry_cycle_seconds)
             return
 
         # Check entry cutoff time - no new entries after 3:55 PM ET
         # This prevents late-day entries that don't have time to develop
         if cls._is_after_entry_cutoff():
-            est_tz = pytz.timezone("America/New_York")
-            current_time_est = datetime.now(est_tz)
+            current_time_est = datetime.now(EST_TZ)
             logger.info(
                 f"⏰ Entry cutoff reached ({current_time_est.strftime('%H:%M')} ET >= "
                 f"{cls.max_entry_hour_et}:{cls.max_entry_minute_et:02d} ET). "
@@ -2724,9 +2745,9 @@ class MomentumIndicator(BaseTradingIndicator):
     @measure_latency
     async def _run_exit_cycle(cls):
         """Execute a single momentum exit monitoring cycle."""
-        if not await AlpacaClient.is_market_open():
+        if not await MarketSession.is_market_open():
             logger.debug("Market is closed, skipping momentum exit logic")
-            await asyncio.sleep(cls.exit_cycle_seconds)
+            await MarketSession.wait_for_open(fallback_seconds=cls.exit_cycle_seconds)
             return
 
         active_trades = await cls._get_active_trades()
@@ -2828,7 +2849,7 @@ class MomentumIndicator(BaseTradingIndicator):
             is_long = original_action == "buy_to_open"
 
             # Get recent bars for peak/bottom tracking
-            bars_data_for_exit = await AlpacaClient.get_market_data(ticker, limit=50)
+            bars_data_for_exit = await MarketDataHub.get_market_data(ticker, limit=50)
 
             # Track peak price (for long) and bottom price (for short) since entry
             # FIXED: Only consider bars AFTER trade entry to avoid using pre-entry prices
@@ -3123,7 +3144,7 @@ class MomentumIndicator(BaseTradingIndicator):
                 else:
                     skipped_reason = f"Trade profitable: {profit_percent:.2f}%"
 
-                await DynamoDBClient.update_momentum_trade_trailing_stop(
+                await PositionStateCache.update(
                     ticker=ticker,
                     indicator=cls.indicator_name(),
                     trailing_stop=trailing_stop,
@@ -6,6 +6,8 @@ apply equally to both long and short positions.
 """
 
 from typing import Tuple
+from app.src.common.asset_directory import AssetDirectory
+from app.src.common.metrics import Metrics
 from app.src.models.momentum_validation import TechnicalIndicators, ValidationResult
 
 
@@ -36,6 +38,7 @@ class MomentumValidator:
         self.max_atr_percent = max_atr_percent
         self.warrant_suffixes = warrant_suffixes
     
+    @Metrics.timed("validation", validator="momentum")
     def validate(
         self,
         ticker: str,
@@ -138,7 +141,11 @@ class MomentumValidator:
             ticker: Stock ticker symbol
             
         Returns:
-            True if ticker ends with warrant/derivative suffix
+            True if the asset directory lists the ticker as a warrant/unit/right,
+            or (for symbols it does not know) the ticker ends with a warrant/derivative suffix
         """
+        known = AssetDirectory.is_special_security(ticker)
+        if known is not None:
+            return known
         ticker_upper = ticker.upper()
         return any(ticker_upper.endswith(suffix) for suffix in self.warrant_suffixes)
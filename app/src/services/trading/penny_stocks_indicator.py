@@ -12,19 +12,26 @@ IMPROVED ALGORITHM (Dec 2024):
 """
 
 import asyncio
+from dataclasses import asdict
 from datetime import datetime, timezone
 from typing import List, Tuple, Dict, Any, Optional
 
+from app.src.common.compute_executor import ComputeExecutor
 from app.src.common.loguru_logger import logger
 from app.src.common.utils import measure_latency
 from app.src.common.memory_monitor import MemoryMonitor
 from app.src.common.alpaca import AlpacaClient
+from app.src.services.market_data.market_data_hub import MarketDataHub
+from app.src.common.asset_directory import AssetDirectory
+from app.src.common.market_session import EST_TZ, MarketSession
 from app.src.db.dynamodb_client import DynamoDBClient
 from app.src.services.webhook.send_signal import send_signal_to_webhook
 from app.src.services.mab.mab_service import MABService
 from app.src.services.trading.base_trading_indicator import BaseTradingIndicator
+from app.src.services.trading.position_state_cache import PositionStateCache
 from app.src.services.trading.validation import (
     TrendAnalyzer,
+    TrendMetrics,
     QuoteData,
     RejectionCollector,
     InactiveTickerRepository,
@@ -47,7 +54,7 @@ from app.src.services.trading.enhanced_validation_pipeline import (
     get_validation_pipeline,
 )
 from app.src.services.trading.dynamic_position_sizer import DynamicPositionSizer
-from app.src.services.trading.market_direction_filter import MarketDirectionFilter
+from app.src.services.trading.market_regime_service import MarketRegimeService
 from app.src.services.trading.peak_detector import PeakDetector
 from app.src.services.trading.volume_analyzer import VolumeAnalyzer
 from app.src.services.trading.momentum_acceleration_analyzer import (
@@ -190,6 +197,58 @@ class PennyStocksIndicator(BaseTradingIndicator):
             logger.warning(f"Failed to load losing tickers from DB: {e}")
             cls._losing_tickers_loaded_from_db = True  # Don't retry on error
 
+    @classmethod
+    def get_snapshot_state(cls) -> Dict[str, Any]:
+        """Base snapshot state plus losing tickers, exit prices and exit-engine counters"""
+        state = super().get_snapshot_state()
+        state.update(
+            {
+                "losing_tickers_date": getattr(cls, "_losing_tickers_date", None),
+                "losing_tickers_today": sorted(cls._losing_tickers_today),
+                "traded_tickers_today": sorted(cls._traded_tickers_today),
+                "last_exit_prices": dict(cls._last_exit_prices),
+                "consecutive_loss_checks": (
+                    dict(cls._exit_engine.consecutive_loss_checks) if cls._exit_engine else {}
+                ),
+                "daily_metrics": asdict(cls._daily_metrics) if cls._daily_metrics else None,
+            }
+        )
+        return state
+
+    @classmethod
+    def restore_snapshot_state(
+        cls, state: Dict[str, Any], fresh: bool = True, complete: bool = False
+    ) -> None:
+        """
+        Restore snapshot state, including the day's losing tickers and exit prices.
+
+        Args:
+            state: Dict from get_snapshot_state()
+            fresh: Also restore exit-engine loss counters
+            complete: The snapshot was written at shutdown, so the losing
+                tickers are current and the DynamoDB reload can be skipped
+        """
+        super().restore_snapshot_state(state, fresh=fresh, complete=complete)
+        if state.get("losing_tickers_date"):
+            cls._losing_tickers_date = state["losing_tickers_date"]
+            cls._losing_tickers_today = set(state.get("losing_tickers_today") or [])
+            cls._traded_tickers_today = set(state.get("traded_tickers_today") or [])
+            cls._last_exit_prices = {
+                ticker: float(price)
+                for ticker, price in (state.get("last_exit_prices") or {}).items()
+            }
+            # Periodic snapshots can miss exits after the last write; reconcile from DB
+            cls._losing_tickers_loaded_from_db = complete
+
+        if state.get("daily_metrics"):
+            cls._daily_metrics = DailyPerformanceMetrics(**state["daily_metrics"])
+        if fresh and state.get("consecutive_loss_checks"):
+            if cls._exit_engine is None:
+                cls._exit_engine = EnhancedExitDecisionEngine(config=DEFAULT_CONFIG)
+            cls._exit_engine.consecutive_loss_checks.update(
+                {ticker: int(count) for ticker, count in state["consecutive_loss_checks"].items()}
+            )
+
     @classmethod
     def _is_reentry_price_too_high(cls, ticker: str, current_price: float) -> bool:
         """Check if current price has moved too far above the last exit price.
@@ -312,7 +371,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
     @classmethod
     async def _get_ticker_price(cls, ticker: str) -> Optional[float]:
         """Get current price for a ticker"""
-        quote_response = await AlpacaClient.quote(ticker)
+        quote_response = await MarketDataHub.quote(ticker)
         if not quote_response:
             return None
 
@@ -366,7 +425,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
         async def fetch_one(ticker: str) -> Tuple[str, Any]:
             """Fetch market data for a single ticker"""
             try:
-                bars_data = await AlpacaClient.get_market_data(ticker, limit=200)
+                bars_data = await MarketDataHub.get_market_data(ticker, limit=200)
                 return (ticker, bars_data)
             except Exception as e:
                 logger.debug(f"Failed to get market data for {ticker}: {str(e)}")
@@ -392,6 +451,9 @@ class PennyStocksIndicator(BaseTradingIndicator):
     @classmethod
     def _is_special_security(cls, ticker: str) -> bool:
         """Check if ticker is a special security (warrants, rights, units, etc.)"""
+        known = AssetDirectory.is_special_security(ticker)
+        if known is not None:
+            return known
         special_suffixes = [".WS", ".RT", ".U", ".W", ".R", ".V"]
         return any(ticker.upper().endswith(suffix) for suffix in special_suffixes)
 
@@ -440,13 +502,12 @@ class PennyStocksIndicator(BaseTradingIndicator):
         return 100.0 - (100.0 / (1.0 + rs))
 
     @classmethod
-    async def _validate_ticker_with_pipeline(
+    def _evaluate_entry_candidate(
         cls,
         ticker: str,
         bars: List[Dict[str, Any]],
         quote_data: QuoteData,
-        collector: RejectionCollector,
-    ) -> bool:
+    ) -> Tuple[bool, RejectionCollector, Optional[TrendMetrics]]:
         """
         Validate ticker using ENHANCED validation for penny stocks.
 
@@ -458,15 +519,19 @@ class PennyStocksIndicator(BaseTradingIndicator):
         5. Peak detection - reject if price is at/near local peak
         6. Momentum deceleration - reject if momentum is slowing down
 
+        Synchronous and free of shared state so it can run on the compute
+        executor (in a worker thread or process).
+
         Args:
             ticker: Stock ticker symbol
             bars: Historical price bars
             quote_data: Current quote data
-            collector: RejectionCollector to accumulate rejections
 
         Returns:
-            True if ticker passes validation, False otherwise
+            (passed, collector holding the rejection if any, trend metrics)
         """
+        collector = RejectionCollector()
+
         # Calculate trend metrics for logging purposes
         trend_metrics = TrendAnalyzer.calculate_trend_metrics(bars)
 
@@ -483,7 +548,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
                 reason_short=reason,
                 technical_indicators=trend_metrics.to_dict() if trend_metrics else None,
             )
-            return False
+            return False, collector, trend_metrics
 
         # 2. Valid bid/ask - must be able to actually trade
         if quote_data.bid <= 0 or quote_data.ask <= 0:
@@ -495,7 +560,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
                 reason_short=reason,
                 technical_indicators=trend_metrics.to_dict() if trend_metrics else None,
             )
-            return False
+            return False, collector, trend_metrics
 
         # 3. Spread check - use class-level max_bid_ask_spread_percent for consistency
         # The same threshold is checked again in _process_ticker_entry, so use the same value
@@ -509,7 +574,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
                 reason_short=reason,
                 technical_indicators=trend_metrics.to_dict() if trend_metrics else None,
             )
-            return False
+            return False, collector, trend_metrics
 
         # 4. RSI filter - prevent entering overbought/oversold conditions
         # This is critical for penny stocks which can spike and reverse rapidly
@@ -530,7 +595,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
                         reason_short=None,
                         technical_indicators={**(trend_metrics.to_dict() if trend_metrics else {}), "rsi": rsi},
                     )
-                    return False
+                    return False, collector, trend_metrics
                 if rsi < RSI_MIN_FOR_LONG:
                     reason = f"RSI too low at {rsi:.1f} < {RSI_MIN_FOR_LONG} - falling knife, avoid buying"
                     collector.add_rejection(
@@ -540,7 +605,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
                         reason_short=None,
                         technical_indicators={**(trend_metrics.to_dict() if trend_metrics else {}), "rsi": rsi},
                     )
-                    return False
+                    return False, collector, trend_metrics
             elif trend_metrics and trend_metrics.momentum_score < 0:
                 # For short entries: reject if RSI is oversold
                 if rsi < RSI_OVERSOLD:
@@ -552,7 +617,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
                         reason_short=reason,
                         technical_indicators={**(trend_metrics.to_dict() if trend_metrics else {}), "rsi": rsi},
                     )
-                    return False
+                    return False, collector, trend_metrics
 
         # 5. Continuation check - avoid entering when trend is weakening
         # This prevents entering at trend peaks like WOK (continuation=0.50)
@@ -572,7 +637,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
                         trend_metrics.to_dict() if trend_metrics else None
                     ),
                 )
-                return False
+                return False, collector, trend_metrics
         elif trend_metrics and trend_metrics.momentum_score < 0:
             # Downward trend - check continuation for short entries
             if trend_metrics.continuation_score < cls.min_continuation_threshold:
@@ -589,7 +654,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
                         trend_metrics.to_dict() if trend_metrics else None
                     ),
                 )
-                return False
+                return False, collector, trend_metrics
 
         # 5. NEW: Peak detection - reject if price is at/near local peak
         # This prevents entering trades like BTTC and CCHH that immediately reversed
@@ -623,7 +688,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
                     "peak_price": peak_result.peak_price,
                 },
             )
-            return False
+            return False, collector, trend_metrics
 
         # 6. NEW: Momentum deceleration - reject if momentum is slowing down
         # This catches trades at the end of a move before they reverse
@@ -657,10 +722,10 @@ class PennyStocksIndicator(BaseTradingIndicator):
                     "is_decelerating": accel_result.is_decelerating,
                 },
             )
-            return False
+            return False, collector, trend_metrics
 
         # PASSED - All enhanced validation checks passed
-        return True
+        return True, collector, trend_metrics
 
     @classmethod
     async def _passes_filters(
@@ -694,7 +759,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
             )
 
         # Get current price from quote
-        quote_response = await AlpacaClient.quote(ticker)
+        quote_response = await MarketDataHub.quote(ticker)
         if not quote_response:
             return False, "Unable to get quote", None
 
@@ -780,43 +845,23 @@ class PennyStocksIndicator(BaseTradingIndicator):
         Returns:
             True if entries should be blocked, False if entries are allowed
         """
-        import pytz
-
-        est_tz = pytz.timezone("America/New_York")
-        current_time_est = datetime.now(est_tz)
-        current_hour = current_time_est.hour
-        current_minute = current_time_est.minute
-
-        # Block entries after max_entry_hour_et (e.g., after 3PM = hour 16+)
-        if current_hour > cls.max_entry_hour_et:
-            return True
-
-        # Block entries in the last 5 minutes of the allowed hour (e.g., 3:55-3:59 PM)
-        if (
-            current_hour == cls.max_entry_hour_et
-            and current_minute >= cls.max_entry_minute_et
-        ):
-            return True
-
-        return False
+        # Shifted earlier on early-close days (e.g. 12:55 PM for a 1:00 PM close)
+        return MarketSession.past_entry_cutoff(cls.max_entry_hour_et, cls.max_entry_minute_et)
 
     @classmethod
     @measure_latency
     async def _run_entry_cycle(cls):
         """Execute a single penny stocks entry cycle"""
         logger.debug("Starting penny stocks entry cycle")
-        if not await AlpacaClient.is_market_open():
+        if not await MarketSession.is_market_open():
             logger.debug("Market is closed, skipping penny stocks entry logic")
-            await asyncio.sleep(cls.entry_cycle_seconds)
+            await MarketSession.wait_for_open(fallback_seconds=cls.entry_cycle_seconds)
             return
 
         # Check entry cutoff time - no new entries after 3:55 PM ET
         # This prevents late-day entries like ASST at 16:00 that don't have time to develop
         if cls._is_after_entry_cutoff():
-            import pytz
-
-            est_tz = pytz.timezone("America/New_York")
-            current_time_est = datetime.now(est_tz)
+            current_time_est = datetime.now(EST_TZ)
             logger.info(
                 f"⏰ Entry cutoff reached ({current_time_est.strftime('%H:%M')} ET >= "
                 f"{cls.max_entry_hour_et}:{cls.max_entry_minute_et:02d} ET). "
@@ -919,7 +964,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
                 price = await cls._get_ticker_price(ticker)
                 return (ticker, price)
             except Exception as e:
-                logger.debug(f"Error getting price for {ticker}: {e}")
+                logger.debug("Error getting price for {}: {}", ticker, e)
                 return (ticker, None)
 
         # Get prices for all candidates in parallel
@@ -950,7 +995,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
                 else:
                     price_filtered_count += 1
                     logger.debug(
-                        f"Filtered out {ticker}: price ${price:.2f} >= ${cls.max_stock_price:.2f}"
+                        "Filtered out {}: price ${:.2f} >= ${:.2f}", ticker, price, cls.max_stock_price
                     )
 
         candidates_to_fetch = penny_stock_candidates
@@ -988,23 +1033,19 @@ class PennyStocksIndicator(BaseTradingIndicator):
         # Initialize rejection collector for batch writing
         rejection_collector = RejectionCollector()
 
-        for ticker in candidates_to_fetch:
-            if not cls.running:
-                break
-
+        async def prepare(ticker: str) -> Optional[Tuple[str, List[Dict[str, Any]], QuoteData]]:
+            """Bars and current quote for one candidate (None if either is missing)"""
             bars_data = market_data_dict.get(ticker)
             if not bars_data:
-                stats["no_market_data"] += 1
-                continue
+                return None
 
             bars_dict = bars_data.get("bars", {})
             ticker_bars = bars_dict.get(ticker, [])
 
             # Get current quote for validation
-            current_quote = await AlpacaClient.quote(ticker)
+            current_quote = await MarketDataHub.quote(ticker)
             if not current_quote:
-                stats["no_market_data"] += 1
-                continue
+                return None
 
             quote_data_obj = current_quote.get("quote", {})
             quotes = quote_data_obj.get("quotes", {})
@@ -1013,19 +1054,47 @@ class PennyStocksIndicator(BaseTradingIndicator):
             ask = ticker_quote.get("ap", 0.0)
 
             # Create QuoteData object
-            quote = QuoteData.from_bid_ask(ticker, bid, ask)
-
-            # Validate using pipeline
-            passed = await cls._validate_ticker_with_pipeline(
-                ticker, ticker_bars, quote, rejection_collector
+            return ticker, ticker_bars, QuoteData.from_bid_ask(ticker, bid, ask)
+
+        # Validate on the compute executor in batches. Quotes for the next batch are
+        # fetched while the previous batch is validated, so the CPU work overlaps
+        # network I/O instead of serialising with it.
+        batch_size = max(1, ComputeExecutor.batch_size)
+        pending = []
+        for i in range(0, len(candidates_to_fetch), batch_size):
+            if not cls.running:
+                break
+            prepared = await asyncio.gather(
+                *[prepare(ticker) for ticker in candidates_to_fetch[i : i + batch_size]]
             )
+            jobs = [job for job in prepared if job is not None]
+            stats["no_market_data"] += len(prepared) - len(jobs)
+            if jobs:
+                pending.append(
+                    (jobs, ComputeExecutor.submit_batch(cls._evaluate_entry_candidate, jobs))
+                )
+
+        batch_outcomes = await asyncio.gather(*[future for _, future in pending])
+        evaluated = [
+            (ticker, ticker_bars, outcome)
+            for (jobs, _), outcomes in zip(pending, batch_outcomes)
+            for (ticker, ticker_bars, _), outcome in zip(jobs, outcomes)
+        ]
+
+        for ticker, ticker_bars, outcome in evaluated:
+            if isinstance(outcome, Exception):
+                logger.warning(f"Entry validation failed for {ticker}: {outcome}")
+                stats["failed_filters"] += 1
+                continue
+
+            passed, rejections, trend_metrics = outcome
+            rejection_collector.merge(rejections)
 
             if not passed:
                 stats["failed_filters"] += 1
                 continue
 
-            # Calculate trend metrics for passing tickers
-            trend_metrics = TrendAnalyzer.calculate_trend_metrics(ticker_bars)
+            # Trend metrics for passing tickers come from the validation job
             momentum_score = trend_metrics.momentum_score
             reason = trend_metrics.reason
             peak_price = trend_metrics.peak_price
@@ -1051,7 +1120,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
 
             stats["passed"] += 1
             ticker_momentum_scores.append((ticker, momentum_score, reason, peak_price))
-            logger.debug(f"{ticker} passed all filters: momentum={momentum_score:.2f}%")
+            logger.debug("{} passed all filters: momentum={:.2f}%", ticker, momentum_score)
 
         # Batch write all rejection records using repository
         if rejection_collector.has_records():
@@ -1646,7 +1715,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
             return False
 
         # Get latest bars for technical indicators
-        bars_data = await AlpacaClient.get_market_data(ticker_to_exit, limit=200)
+        bars_data = await MarketDataHub.get_market_data(ticker_to_exit, limit=200)
         technical_indicators = {}
         if bars_data:
             bars_dict = bars_data.get("bars", {})
@@ -1750,7 +1819,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
 
         # For shorts, check if ticker is shortable via Alpaca API
         if action == "sell_to_open":
-            is_shortable = await AlpacaClient.is_shortable(ticker)
+            is_shortable = await AssetDirectory.check_shortable(ticker)
             if not is_shortable:
                 logger.info(
                     f"Skipping {ticker} short entry: ticker is not shortable according to Alpaca API"
@@ -1764,8 +1833,9 @@ class PennyStocksIndicator(BaseTradingIndicator):
                 return False
 
         # MARKET DIRECTION FILTER - Check QQQ trend before allowing trades
+        # (reads the background regime snapshot; no API calls on this path)
         should_allow, market_reason, trend_details = (
-            await MarketDirectionFilter.should_allow_trade(
+            await MarketRegimeService.should_allow_trade(
                 action=action, indicator_name=cls.indicator_name()
             )
         )
@@ -1779,7 +1849,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
             return False
 
         # Get entry price using Alpaca API
-        quote_response = await AlpacaClient.quote(ticker)
+        quote_response = await MarketDataHub.quote(ticker)
         if not quote_response:
             logger.warning(f"Failed to get quote for {ticker}, skipping")
             await cls._log_selected_ticker_entry_failure(
@@ -2117,7 +2187,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
             )
 
         # Update trailing stop to 0.5% after entry (TIGHT for quick exits)
-        await DynamoDBClient.update_momentum_trade_trailing_stop(
+        await PositionStateCache.update(
             ticker=ticker,
             indicator=cls.indicator_name(),
             trailing_stop=cls.trailing_stop_percent,
@@ -2222,9 +2292,9 @@ class PennyStocksIndicator(BaseTradingIndicator):
         - Consecutive check requirement before stop loss exit
         - Tracks spread-induced vs genuine losses
         """
-        if not await AlpacaClient.is_market_open():
+        if not await MarketSession.is_market_open():
             logger.debug("Market is closed, skipping penny stocks exit logic")
-            await asyncio.sleep(cls.exit_cycle_seconds)
+            await MarketSession.wait_for_open(fallback_seconds=cls.exit_cycle_seconds)
             return
 
         active_trades = await cls._get_active_trades()
@@ -2328,7 +2398,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
                     )
 
                     # Get technical indicators for exit
-                    bars_data = await AlpacaClient.get_market_data(
+                    bars_data = await MarketDataHub.get_market_data(
                         ticker, limit=cls.recent_bars_for_trend + 5
                     )
                     technical_indicators_exit = {
@@ -2428,7 +2498,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
             # PRIORITY 3: MIN HOLDING PERIOD - block exits (except emergency and profit target)
             if not should_exit and holding_seconds < cls.min_holding_period_seconds:
                 new_peak = max(peak_profit_percent, profit_percent)
-                await DynamoDBClient.update_momentum_trade_trailing_stop(
+                await PositionStateCache.update(
                     ticker=ticker,
                     indicator=cls.indicator_name(),
                     trailing_stop=cls.trailing_stop_percent,
@@ -2436,14 +2506,14 @@ class PennyStocksIndicator(BaseTradingIndicator):
                     skipped_exit_reason=f"Min hold ({holding_seconds:.0f}s < {cls.min_holding_period_seconds}s), profit {profit_percent:.2f}%",
                 )
                 logger.debug(
-                    f"{ticker}: Min hold period ({holding_seconds:.0f}s < {cls.min_holding_period_seconds}s), "
-                    f"profit: {profit_percent:.2f}%"
+                    "{}: Min hold period ({:.0f}s < {}s), profit: {:.2f}%",
+                    ticker, holding_seconds, cls.min_holding_period_seconds, profit_percent,
                 )
                 continue
 
             # PRIORITY 4: ENHANCED EXIT ENGINE - tiered trailing stops, trend reversal, ATR stops
             if not should_exit:
-                recent_bars_data = await AlpacaClient.get_market_data(
+                recent_bars_data = await MarketDataHub.get_market_data(
                     ticker, limit=cls.recent_bars_for_trend + 5
                 )
                 recent_bars_list = None
@@ -2495,7 +2565,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
             if not should_exit:
                 # Update peak profit in database
                 new_peak = max(peak_profit_percent, profit_percent)
-                await DynamoDBClient.update_momentum_trade_trailing_stop(
+                await PositionStateCache.update(
                     ticker=ticker,
                     indicator=cls.indicator_name(),
                     trailing_stop=cls.trailing_stop_percent,
@@ -2503,8 +2573,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
                     skipped_exit_reason=f"Holding: profit {profit_percent:.2f}%",
                 )
                 logger.debug(
-                    f"{ticker}: Holding (profit: {profit_percent:.2f}%, "
-                    f"peak: ${peak_price:.4f})"
+                    "{}: Holding (profit: {:.2f}%, peak: ${:.4f})", ticker, profit_percent, peak_price
                 )
                 continue
 
@@ -2548,7 +2617,7 @@ class PennyStocksIndicator(BaseTradingIndicator):
                 )
 
             # Get technical indicators for exit
-            bars_data = await AlpacaClient.get_market_data(
+            bars_data = await MarketDataHub.get_market_data(
                 ticker, limit=cls.recent_bars_for_trend + 5
             )
             technical_indicators_exit = {
@@ -0,0 +1,359 @@
+"""
+Position State Cache
+
+In-memory source of truth for per-position trailing stop and peak profit
+during a trading session. Exit loops update this cache every cycle; changes
+are persisted to ActiveTickersForAutomatedDayTrader in the background, with a
+minimum interval between writes and a minimum-delta threshold, instead of one
+DynamoDB write per position per exit cycle.
+
+Crash recovery: the cache starts empty. The first time an active trade is
+read from DynamoDB it is seeded from the persisted peak/trailing stop, so a
+restart resumes from the last persisted state (at most one interval / one
+delta behind).
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from app.src.common.loguru_logger import logger
+from app.src.db.dynamodb_client import DynamoDBClient
+
+
+@dataclass
+class PositionState:
+    """Trailing-stop state for one open position"""
+
+    ticker: str
+    indicator: str
+    trailing_stop: float = 0.0
+    peak_profit_percent: float = 0.0
+    skipped_exit_reason: str = ""
+    persisted_trailing_stop: Optional[float] = None
+    persisted_peak_profit_percent: Optional[float] = None
+    last_persist_monotonic: float = 0.0
+    dirty: bool = False
+
+    @property
+    def is_persisted(self) -> bool:
+        return self.persisted_peak_profit_percent is not None
+
+    def pending_delta(self) -> float:
+        """Largest change (percentage points) not yet written to DynamoDB"""
+        if not self.is_persisted:
+            return float("inf")
+        return max(
+            abs(self.peak_profit_percent - self.persisted_peak_profit_percent),
+            abs(self.trailing_stop - (self.persisted_trailing_stop or 0.0)),
+        )
+
+
+class PositionStateCache:
+    """
+    Coalesces trailing-stop / peak-profit updates for active trades.
+
+    - update(): record new state in memory (cheap, no I/O unless the change is material)
+    - apply_to_trades(): overlay in-memory state onto trades read from DynamoDB
+    - run(): background flusher for pending changes older than the minimum interval
+    - flush_all(): forced write of all pending changes (shutdown)
+    - discard(): drop state for a position being exited (before its row is deleted)
+    """
+
+    # Minimum seconds between persisted writes for the same position
+    min_persist_interval_seconds: float = float(
+        os.getenv("POSITION_STATE_MIN_PERSIST_INTERVAL_SECONDS", "30")
+    )
+    # Changes of at least this many percentage points are written immediately
+    min_persist_delta_percent: float = float(
+        os.getenv("POSITION_STATE_MIN_PERSIST_DELTA_PERCENT", "0.5")
+    )
+    flush_check_seconds: float = float(
+        os.getenv("POSITION_STATE_FLUSH_CHECK_SECONDS", "5")
+    )
+
+    running: bool = False
+    _states: Dict[str, PositionState] = {}
+    # In-flight persist tasks and the ticker each one writes
+    _pending_writes: Dict[asyncio.Task, str] = {}
+    _stats: Dict[str, int] = {"updates": 0, "writes": 0, "failed_writes": 0}
+
+    @classmethod
+    def configure(
+        cls,
+        min_persist_interval_seconds: Optional[float] = None,
+        min_persist_delta_percent: Optional[float] = None,
+    ):
+        """Reset cache state and optionally override thresholds"""
+        if min_persist_interval_seconds is not None:
+            cls.min_persist_interval_seconds = min_persist_interval_seconds
+        if min_persist_delta_percent is not None:
+            cls.min_persist_delta_percent = min_persist_delta_percent
+        cls._states = {}
+        cls._pending_writes = {}
+        cls._stats = {"updates": 0, "writes": 0, "failed_writes": 0}
+
+    @classmethod
+    def get_state(cls, ticker: str) -> Optional[PositionState]:
+        """Get the cached state for a ticker, if any"""
+        return cls._states.get(ticker)
+
+    @classmethod
+    def apply_to_trades(cls, trades: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Overlay cached state onto trades read from DynamoDB.
+
+        Trades not yet in the cache seed it from their persisted values
+        (crash recovery). Cached entries for tickers that are no longer in
+        the indicator's active trades are left alone; they are removed via
+        discard() when the trade exits.
+
+        Args:
+            trades: Active trade dictionaries from DynamoDB (modified in place)
+
+        Returns:
+            The same list of trades with up-to-date peak/trailing stop values
+        """
+        for trade in trades:
+            ticker = trade.get("ticker")
+            if not ticker:
+                continue
+            indicator = trade.get("indicator", "")
+            state = cls._states.get(ticker)
+            if state is None or state.indicator != indicator:
+                persisted_peak = float(trade.get("peak_profit_percent", 0.0) or 0.0)
+                persisted_stop = float(trade.get("trailing_stop", 0.0) or 0.0)
+                cls._states[ticker] = PositionState(
+                    ticker=ticker,
+                    indicator=indicator,
+                    trailing_stop=persisted_stop,
+                    peak_profit_percent=persisted_peak,
+                    skipped_exit_reason=trade.get("skipped_exit_reason", "") or "",
+                    persisted_trailing_stop=persisted_stop,
+                    persisted_peak_profit_percent=persisted_peak,
+                    last_persist_monotonic=time.monotonic(),
+                )
+                continue
+            trade["peak_profit_percent"] = max(
+                state.peak_profit_percent,
+                float(trade.get("peak_profit_percent", 0.0) or 0.0),
+            )
+            trade["trailing_stop"] = state.trailing_stop
+            trade["skipped_exit_reason"] = state.skipped_exit_reason
+        return trades
+
+    @classmethod
+    async def update(
+        cls,
+        ticker: str,
+        indicator: str,
+        trailing_stop: float,
+        peak_profit_percent: float,
+        skipped_exit_reason: str,
+    ) -> bool:
+        """
+        Record the latest trailing stop and peak profit for a position.
+
+        The peak never decreases. The write to DynamoDB happens in the
+        background, immediately if this is the first state for the position or
+        the change is at least min_persist_delta_percent, otherwise from the
+        flusher once min_persist_interval_seconds has elapsed.
+
+        Returns:
+            True (the in-memory state is always updated)
+        """
+        state = cls._states.get(ticker)
+        if state is None or state.indicator != indicator:
+            state = PositionState(ticker=ticker, indicator=indicator)
+            cls._states[ticker] = state
+            state.peak_profit_percent = float(peak_profit_percent)
+        else:
+            state.peak_profit_percent = max(
+                state.peak_profit_percent, float(peak_profit_percent)
+            )
+        state.trailing_stop = float(trailing_stop)
+        state.skipped_exit_reason = skipped_exit_reason
+        state.dirty = True
+        cls._stats["updates"] += 1
+
+        if state.pending_delta() >= cls.min_persist_delta_percent:
+            cls._schedule_persist(state)
+        return True
+
+    @classmethod
+    def tickers(cls) -> List[str]:
+        """Tickers with cached state (the open positions seen this session)"""
+        return list(cls._states)
+
+    @classmethod
+    def export_states(cls) -> List[Dict[str, Any]]:
+        """Cached states as JSON-safe dicts for the warm-restart snapshot"""
+        return [
+            {
+                "ticker": state.ticker,
+                "indicator": state.indicator,
+                "trailing_stop": state.trailing_stop,
+                "peak_profit_percent": state.peak_profit_percent,
+                "skipped_exit_reason": state.skipped_exit_reason,
+                "persisted_trailing_stop": state.persisted_trailing_stop,
+                "persisted_peak_profit_percent": state.persisted_peak_profit_percent,
+                "dirty": state.dirty,
+            }
+            for state in cls._states.values()
+        ]
+
+    @classmethod
+    def restore_states(cls, rows: List[Dict[str, Any]]) -> int:
+        """
+        Seed the cache from a warm-restart snapshot.
+
+        Entries already seeded this session are kept. Restored entries that
+        were dirty at snapshot time are written on the flusher's next pass.
+
+        Returns:
+            Number of states restored
+        """
+        restored = 0
+        now = time.monotonic()
+        for row in rows:
+            ticker = row.get("ticker")
+            if not ticker or ticker in cls._states:
+                continue
+            cls._states[ticker] = PositionState(
+                ticker=ticker,
+                indicator=row.get("indicator", ""),
+                trailing_stop=float(row.get("trailing_stop", 0.0)),
+                peak_profit_percent=float(row.get("peak_profit_percent", 0.0)),
+                skipped_exit_reason=row.get("skipped_exit_reason", "") or "",
+                persisted_trailing_stop=row.get("persisted_trailing_stop"),
+                persisted_peak_profit_percent=row.get("persisted_peak_profit_percent"),
+                last_persist_monotonic=now - cls.min_persist_interval_seconds,
+                dirty=bool(row.get("dirty", False)),
+            )
+            restored += 1
+        return restored
+
+    @classmethod
+    async def discard(cls, ticker: str) -> None:
+        """
+        Drop cached state for a position being exited.
+
+        Call before deleting the position's row: in-flight writes for the
+        ticker are awaited so none lands after the delete.
+        """
+        cls._states.pop(ticker, None)
+        pending = [task for task, task_ticker in cls._pending_writes.items() if task_ticker == ticker]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    @classmethod
+    def _track_persist(cls, state: PositionState) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(cls._persist(state))
+        cls._pending_writes[task] = state.ticker
+        task.add_done_callback(lambda done: cls._pending_writes.pop(done, None))
+        return task
+
+    @classmethod
+    def _schedule_persist(cls, state: PositionState) -> None:
+        # Mark as clean now so repeated updates in the same cycle don't queue duplicates
+        state.dirty = False
+        try:
+            cls._track_persist(state)
+        except RuntimeError:
+            state.dirty = True
+
+    @classmethod
+    async def _persist(cls, state: PositionState) -> bool:
+        trailing_stop = state.trailing_stop
+        peak_profit_percent = state.peak_profit_percent
+        success = await DynamoDBClient.update_momentum_trade_trailing_stop(
+            ticker=state.ticker,
+            indicator=state.indicator,
+            trailing_stop=trailing_stop,
+            peak_profit_percent=peak_profit_percent,
+            skipped_exit_reason=state.skipped_exit_reason,
+        )
+        if success:
+            cls._stats["writes"] += 1
+            state.persisted_trailing_stop = trailing_stop
+            state.persisted_peak_profit_percent = peak_profit_percent
+            state.last_persist_monotonic = time.monotonic()
+        else:
+            cls._stats["failed_writes"] += 1
+            state.dirty = True
+        return success
+
+    @classmethod
+    async def flush_due(cls) -> int:
+        """Persist dirty positions whose minimum interval has elapsed"""
+        now = time.monotonic()
+        due = [
+            state
+            for state in list(cls._states.values())
+            if state.dirty
+            and now - state.last_persist_monotonic >= cls.min_persist_interval_seconds
+        ]
+        for state in due:
+            state.dirty = False
+        results = await asyncio.gather(
+            *(cls._track_persist(state) for state in due), return_exceptions=True
+        )
+        return sum(1 for result in results if result is True)
+
+    @classmethod
+    async def flush_all(cls) -> int:
+        """Force-persist every dirty position and wait for in-flight writes"""
+        if cls._pending_writes:
+            await asyncio.gather(*list(cls._pending_writes), return_exceptions=True)
+        dirty = [state for state in list(cls._states.values()) if state.dirty]
+        for state in dirty:
+            state.dirty = False
+        results = await asyncio.gather(
+            *(cls._track_persist(state) for state in dirty), return_exceptions=True
+        )
+        flushed = sum(1 for result in results if result is True)
+        if dirty:
+            logger.info(f"Position state cache flushed {flushed}/{len(dirty)} positions")
+        return flushed
+
+    @classmethod
+    async def run(cls):
+        """Background flusher loop"""
+        cls.running = True
+        logger.info(
+            f"Position state cache flusher started "
+            f"(interval: {cls.min_persist_interval_seconds}s, "
+            f"delta: {cls.min_persist_delta_percent}%)"
+        )
+        try:
+            while cls.running:
+                await asyncio.sleep(cls.flush_check_seconds)
+                try:
+                    await cls.flush_due()
+                except Exception as e:
+                    logger.warning(f"Position state flush failed: {e}")
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await cls.flush_all()
+            logger.info("Position state cache flusher stopped")
+
+    @classmethod
+    def stop(cls):
+        """Stop the background flusher"""
+        cls.running = False
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """Get update/write counters (writes / updates is the write ratio)"""
+        updates = cls._stats["updates"]
+        writes = cls._stats["writes"]
+        return {
+            "positions": len(cls._states),
+            "updates": updates,
+            "writes": writes,
+            "failed_writes": cls._stats["failed_writes"],
+            "write_reduction": f"{(1 - writes / updates) * 100:.1f}%" if updates else "0.0%",
+        }
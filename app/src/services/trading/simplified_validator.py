@@ -5,6 +5,7 @@ This module implements the streamlined validation logic that uses
 momentum score as the primary driver for trend-based decisions.
 """
 
+from app.src.common.metrics import Metrics
 from app.src.models.simplified_validation import TrendMetrics, Quote, ValidationResult
 
 
@@ -20,6 +21,7 @@ class SimplifiedValidator:
         """
         self.max_bid_ask_spread = max_bid_ask_spread
     
+    @Metrics.timed("validation", validator="simplified")
     def validate(
         self,
         ticker: str,
@@ -0,0 +1,319 @@
+"""
+State Snapshot
+
+Warm-restart snapshot of in-memory trading state. Heroku restarts the dyno
+daily and on every deploy; without a snapshot the cooldowns, the day's
+losing tickers and exit prices, exit-engine loss counters, daily trade
+counts, position state, bars for open positions and the screener cache are
+all rebuilt through DynamoDB reads and cold Alpaca fetches while positions
+are open.
+
+The snapshot is one gzip-compressed JSON file written atomically on
+shutdown and every STATE_SNAPSHOT_INTERVAL_SECONDS. At boot it is restored
+before any indicator starts:
+
+- Snapshots from another trading session (or another format version) are
+  ignored.
+- Snapshots older than STATE_SNAPSHOT_MAX_AGE_SECONDS restore only
+  day-scoped state (cooldowns, losing tickers, exit prices, trade counts);
+  market data, exit-engine counters and position state come from live
+  sources instead.
+
+After a restore, fresh bars and quotes for the open positions (and a fresh
+screener result) are fetched in the background on the exit lane, so the
+first exit cycle starts from warm caches.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from app.src.common.alpaca_request_scheduler import AlpacaRequestScheduler
+from app.src.common.loguru_logger import logger
+from app.src.common.market_session import EST_TZ
+from app.src.config.constants import (
+    STATE_SNAPSHOT_ENABLED,
+    STATE_SNAPSHOT_INTERVAL_SECONDS,
+    STATE_SNAPSHOT_MAX_AGE_SECONDS,
+    STATE_SNAPSHOT_PATH,
+    STATE_SNAPSHOT_PREWARM_TIMEOUT_SECONDS,
+)
+from app.src.services.candidate_generator.alpaca_screener import AlpacaScreenerService
+from app.src.services.market_data.market_data_hub import MarketDataHub
+from app.src.services.trading.base_trading_indicator import BaseTradingIndicator
+from app.src.services.trading.position_state_cache import PositionStateCache
+
+
+class StateSnapshot:
+    """
+    Periodic and shutdown snapshots of trading state, restored at boot.
+
+    - configure(): choose the indicator classes whose state is captured
+    - save(): write a snapshot (reason "shutdown" marks it as complete)
+    - restore(): load the snapshot at boot and start pre-warming caches
+    - run(): background writer loop
+    """
+
+    VERSION = 1
+
+    enabled: bool = STATE_SNAPSHOT_ENABLED
+    path: str = STATE_SNAPSHOT_PATH
+    interval_seconds: float = STATE_SNAPSHOT_INTERVAL_SECONDS
+    max_age_seconds: float = STATE_SNAPSHOT_MAX_AGE_SECONDS
+    prewarm_timeout_seconds: float = STATE_SNAPSHOT_PREWARM_TIMEOUT_SECONDS
+
+    running: bool = False
+    _indicators: List[Type[BaseTradingIndicator]] = []
+    _prewarm_task: Optional[asyncio.Task] = None
+    _stats: Dict[str, Any] = {"saves": 0, "failed_saves": 0, "restored": None}
+
+    @classmethod
+    def configure(cls, indicators: Sequence[Type[BaseTradingIndicator]], path: Optional[str] = None):
+        """
+        Reset state and register the indicator classes to snapshot.
+
+        Args:
+            indicators: Configured indicator classes
+            path: Optional snapshot file override ("" disables snapshots)
+        """
+        if path is not None:
+            cls.path = path
+        cls._indicators = list(indicators)
+        cls._prewarm_task = None
+        cls._stats = {"saves": 0, "failed_saves": 0, "restored": None}
+
+    @staticmethod
+    def _session_date() -> str:
+        return datetime.now(EST_TZ).date().isoformat()
+
+    # ------------------------------------------------------------------
+    # Capture / save
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def capture(cls, reason: str = "periodic") -> Dict[str, Any]:
+        """
+        Collect the snapshot payload from the registered services (no I/O).
+
+        Args:
+            reason: "shutdown" or "periodic"
+
+        Returns:
+            JSON-safe snapshot dict
+        """
+        open_tickers = PositionStateCache.tickers()
+        return {
+            "version": cls.VERSION,
+            "saved_at": time.time(),
+            "session_date": cls._session_date(),
+            "reason": reason,
+            "indicators": {
+                indicator.indicator_name(): indicator.get_snapshot_state()
+                for indicator in cls._indicators
+            },
+            "position_state": PositionStateCache.export_states(),
+            "market_data": MarketDataHub.export_state(open_tickers),
+            "screener": AlpacaScreenerService().export_cache(),
+        }
+
+    @classmethod
+    async def save(cls, reason: str = "periodic") -> bool:
+        """
+        Capture and write a snapshot; failures are logged, never raised.
+
+        The payload references live service state (hub bar lists, indicator
+        dicts), so it is serialized on the loop; only the file write runs in
+        a thread.
+        """
+        if not cls.enabled or not cls.path:
+            return False
+        try:
+            payload = cls._encode_snapshot(cls.capture(reason))
+            await asyncio.to_thread(cls._write_snapshot, cls.path, payload)
+        except (OSError, TypeError, ValueError) as e:
+            cls._stats["failed_saves"] += 1
+            logger.warning(f"Failed to write state snapshot {cls.path}: {e}")
+            return False
+        cls._stats["saves"] += 1
+        if reason == "shutdown":
+            logger.info(f"State snapshot written to {cls.path} ({reason})")
+        return True
+
+    @staticmethod
+    def _encode_snapshot(data: Dict[str, Any]) -> bytes:
+        return gzip.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"), compresslevel=5)
+
+    @staticmethod
+    def _write_snapshot(path: str, payload: bytes):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_snapshot(path: str) -> Dict[str, Any]:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    # ------------------------------------------------------------------
+    # Restore
+    # ------------------------------------------------------------------
+
+    @classmethod
+    async def restore(cls, prewarm: bool = True) -> bool:
+        """
+        Load and apply the snapshot, then pre-warm caches in the background.
+
+        Call after configure() and before the indicators start.
+
+        Returns:
+            True if a snapshot was applied
+        """
+        if not cls.enabled or not cls.path or not os.path.exists(cls.path):
+            return False
+        try:
+            data = await asyncio.to_thread(cls._read_snapshot, cls.path)
+        except (OSError, EOFError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable state snapshot {cls.path}: {e}")
+            return False
+
+        if not cls.apply(data):
+            return False
+        if prewarm:
+            cls._prewarm_task = asyncio.create_task(cls.prewarm(), name="StateSnapshotPrewarm")
+        return True
+
+    @classmethod
+    def apply(cls, data: Dict[str, Any]) -> bool:
+        """
+        Apply a snapshot payload after staleness checks.
+
+        Returns:
+            True if any state was restored
+        """
+        if data.get("version") != cls.VERSION:
+            logger.info(f"Ignoring state snapshot with version {data.get('version')}")
+            return False
+        if data.get("session_date") != cls._session_date():
+            logger.info(f"Ignoring state snapshot from session {data.get('session_date')}")
+            return False
+
+        age = max(0.0, time.time() - float(data.get("saved_at", 0.0)))
+        fresh = age <= cls.max_age_seconds
+        complete = data.get("reason") == "shutdown"
+
+        states = data.get("indicators") or {}
+        restored_indicators = []
+        for indicator in cls._indicators:
+            state = states.get(indicator.indicator_name())
+            if state:
+                indicator.restore_snapshot_state(state, fresh=fresh, complete=complete)
+                restored_indicators.append(indicator.indicator_name())
+
+        positions = bars = 0
+        screener = False
+        if fresh:
+            positions = PositionStateCache.restore_states(data.get("position_state") or [])
+            bars = MarketDataHub.restore_state(data.get("market_data") or {}, age)
+            screener = AlpacaScreenerService().restore_cache(data.get("screener") or {})
+
+        cls._stats["restored"] = {
+            "age_seconds": round(age, 1),
+            "reason": data.get("reason"),
+            "fresh": fresh,
+            "indicators": restored_indicators,
+            "positions": positions,
+            "bars": bars,
+            "screener": screener,
+        }
+        logger.info(
+            f"Restored state snapshot ({data.get('reason')}, {age:.0f}s old"
+            f"{'' if fresh else ', day-scoped state only'}): "
+            f"{len(restored_indicators)} indicators, {positions} positions, "
+            f"{bars} bar series, screener={'yes' if screener else 'no'}"
+        )
+        return True
+
+    @classmethod
+    async def prewarm(cls) -> int:
+        """
+        Fetch fresh bars and quotes for open positions on the exit lane.
+
+        Also refreshes the screener so a restored universe is replaced
+        promptly. Bounded by prewarm_timeout_seconds.
+
+        Returns:
+            Number of tickers pre-warmed
+        """
+        tickers = PositionStateCache.tickers()
+
+        async def warm(ticker: str):
+            await MarketDataHub.get_market_data(ticker, limit=MarketDataHub.min_depth)
+            await MarketDataHub.quote(ticker)
+
+        started = time.monotonic()
+        with AlpacaRequestScheduler.exit_priority():
+            try:
+                results = await asyncio.wait_for(
+                    asyncio.gather(
+                        *(warm(ticker) for ticker in tickers),
+                        AlpacaScreenerService().refresh_cache(),
+                        return_exceptions=True,
+                    ),
+                    timeout=cls.prewarm_timeout_seconds,
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"State snapshot pre-warm timed out after {cls.prewarm_timeout_seconds}s"
+                )
+                return 0
+
+        warmed = sum(1 for result in results[: len(tickers)] if not isinstance(result, Exception))
+        logger.info(
+            f"Pre-warmed {warmed}/{len(tickers)} open positions "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+        return warmed
+
+    # ------------------------------------------------------------------
+    # Background writer
+    # ------------------------------------------------------------------
+
+    @classmethod
+    async def run(cls):
+        """Write a snapshot every interval_seconds until stopped"""
+        if not cls.enabled or not cls.path:
+            return
+        cls.running = True
+        logger.info(f"State snapshot writer started (interval: {cls.interval_seconds}s, path: {cls.path})")
+        try:
+            while cls.running:
+                await asyncio.sleep(cls.interval_seconds)
+                if cls.running:
+                    await cls.save("periodic")
+        except asyncio.CancelledError:
+            pass
+        finally:
+            logger.info("State snapshot writer stopped")
+
+    @classmethod
+    def stop(cls):
+        """Stop the background writer"""
+        cls.running = False
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """Save counters and what the boot-time restore recovered"""
+        return {
+            "enabled": cls.enabled and bool(cls.path),
+            "saves": cls._stats["saves"],
+            "failed_saves": cls._stats["failed_saves"],
+            "restored": cls._stats["restored"],
+        }
@@ -3,18 +3,29 @@ Technical indicator calculator for momentum trading validation.
 
 This module calculates comprehensive technical analysis indicators including
 momentum, trend, volatility, and volume-based indicators.
+
+All indicators are computed with numpy over a (tickers x bars) matrix, one row
+per ticker, so a whole screener universe of equal-length bar windows is
+evaluated with a handful of array operations instead of per-ticker Python
+loops. ``calculate_indicators`` is the single-ticker entry point (a 1-row
+matrix); ``calculate_batch`` / ``calculate_indicators_for_tickers`` are the
+batched ones.
 """
 
-from typing import List, Dict, Tuple
-import statistics
-from loguru import logger
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
 
 from app.src.models.momentum_validation import TechnicalIndicators
 
+# Columns processed per step when building EMA series. Keeps decay**-k well
+# inside float64 range for any period while still vectorising over bars.
+_EMA_BLOCK = 64
+
 
 class TechnicalIndicatorCalculator:
     """Calculate comprehensive technical analysis indicators."""
-    
+
     @staticmethod
     def calculate_indicators(
         bars: List[Dict],
@@ -28,7 +39,7 @@ class TechnicalIndicatorCalculator:
     ) -> TechnicalIndicators:
         """
         Calculate all technical indicators from price and volume data.
-        
+
         Args:
             bars: List of price bar dictionaries with OHLCV data
             period_rsi: RSI period (default: 14)
@@ -38,82 +49,231 @@ class TechnicalIndicatorCalculator:
             period_bollinger: Bollinger Bands period (default: 20)
             period_atr: ATR period (default: 14)
             period_adx: ADX period (default: 14)
-            
+
         Returns:
             TechnicalIndicators with all calculated values
         """
-        # Extract price and volume data
-        closes = [bar.get('c', 0.0) for bar in bars if bar.get('c') is not None and bar.get('c') > 0]
-        highs = [bar.get('h', 0.0) for bar in bars if bar.get('h') is not None and bar.get('h') > 0]
-        lows = [bar.get('l', 0.0) for bar in bars if bar.get('l') is not None and bar.get('l') > 0]
-        opens = [bar.get('o', 0.0) for bar in bars if bar.get('o') is not None and bar.get('o') > 0]
-        volumes = [bar.get('v', 0) for bar in bars if bar.get('v') is not None]
-        timestamps = [bar.get('t', '') for bar in bars if bar.get('t')]
-        
+        arrays = TechnicalIndicatorCalculator._bars_to_arrays(bars)
+
         # Handle insufficient data
-        if not closes:
+        if arrays is None:
             return TechnicalIndicatorCalculator._create_default_indicators()
-        
-        current_close = closes[-1]
-        current_volume = volumes[-1] if volumes else 0
-        
-        # Calculate indicators
-        rsi = TechnicalIndicatorCalculator._calculate_rsi(closes, period_rsi)
-        macd_values = TechnicalIndicatorCalculator._calculate_macd(
-            closes, period_ema_fast, period_ema_slow, period_signal
+
+        closes, highs, lows, volumes, timestamps = arrays
+        results = TechnicalIndicatorCalculator.calculate_batch(
+            closes[None, :],
+            highs[None, :],
+            lows[None, :],
+            volumes[None, :],
+            period_rsi=period_rsi,
+            period_ema_fast=period_ema_fast,
+            period_ema_slow=period_ema_slow,
+            period_signal=period_signal,
+            period_bollinger=period_bollinger,
+            period_atr=period_atr,
+            period_adx=period_adx,
         )
-        bollinger_values = TechnicalIndicatorCalculator._calculate_bollinger(
-            closes, period_bollinger
+        current_volume = bars[-1].get('v') if bars[-1].get('v') is not None else 0
+        return TechnicalIndicatorCalculator._to_model(
+            results, 0, closes, timestamps, current_volume
+        )
+
+    @staticmethod
+    def calculate_indicators_for_tickers(
+        bars_by_ticker: Dict[str, List[Dict]],
+        **periods: int
+    ) -> Dict[str, TechnicalIndicators]:
+        """
+        Calculate indicators for many tickers at once.
+
+        Tickers are grouped by bar count and each group is evaluated as one
+        (tickers x bars) matrix with ``calculate_batch``.
+
+        Args:
+            bars_by_ticker: Mapping of ticker -> list of OHLCV bar dictionaries
+            **periods: Same period keyword arguments as ``calculate_indicators``
+
+        Returns:
+            Mapping of ticker -> TechnicalIndicators
+        """
+        results: Dict[str, TechnicalIndicators] = {}
+        groups: Dict[int, List[Tuple[str, Tuple[np.ndarray, ...], Any]]] = {}
+
+        for ticker, bars in bars_by_ticker.items():
+            arrays = TechnicalIndicatorCalculator._bars_to_arrays(bars)
+            if arrays is None:
+                results[ticker] = TechnicalIndicatorCalculator._create_default_indicators()
+                continue
+            current_volume = bars[-1].get('v') if bars[-1].get('v') is not None else 0
+            groups.setdefault(len(arrays[0]), []).append((ticker, arrays, current_volume))
+
+        for members in groups.values():
+            closes = np.vstack([arrays[0] for _, arrays, _ in members])
+            highs = np.vstack([arrays[1] for _, arrays, _ in members])
+            lows = np.vstack([arrays[2] for _, arrays, _ in members])
+            volumes = np.vstack([arrays[3] for _, arrays, _ in members])
+            batch = TechnicalIndicatorCalculator.calculate_batch(closes, highs, lows, volumes, **periods)
+            for row, (ticker, arrays, current_volume) in enumerate(members):
+                results[ticker] = TechnicalIndicatorCalculator._to_model(
+                    batch, row, arrays[0], arrays[4], current_volume
+                )
+
+        return results
+
+    @staticmethod
+    def calculate_batch(
+        closes: np.ndarray,
+        highs: Optional[np.ndarray] = None,
+        lows: Optional[np.ndarray] = None,
+        volumes: Optional[np.ndarray] = None,
+        period_rsi: int = 14,
+        period_ema_fast: int = 12,
+        period_ema_slow: int = 26,
+        period_signal: int = 9,
+        period_bollinger: int = 20,
+        period_atr: int = 14,
+        period_adx: int = 14
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate every indicator for a (tickers x bars) matrix.
+
+        Rows are tickers, columns are bars oldest -> newest; all rows share
+        the same bar count. Missing highs/lows default to the closes and
+        missing volumes to zeros.
+
+        Args:
+            closes: Close prices, shape (tickers, bars)
+            highs: High prices, same shape as ``closes``
+            lows: Low prices, same shape as ``closes``
+            volumes: Volumes, same shape as ``closes``
+            period_*: Indicator periods, as for ``calculate_indicators``
+
+        Returns:
+            Dict of indicator name -> float64 vector of length ``tickers``
+            (MACD, Bollinger and Stochastic components are separate keys)
+        """
+        closes = np.atleast_2d(np.asarray(closes, dtype=np.float64))
+        highs = closes if highs is None else np.atleast_2d(np.asarray(highs, dtype=np.float64))
+        lows = closes if lows is None else np.atleast_2d(np.asarray(lows, dtype=np.float64))
+        volumes = (
+            np.zeros_like(closes) if volumes is None
+            else np.atleast_2d(np.asarray(volumes, dtype=np.float64))
+        )
+
+        calc = TechnicalIndicatorCalculator
+        # Each EMA series is built once and shared by the EMA values and both MACD legs
+        fast_series = calc._ema_series(closes, period_ema_fast)
+        slow_series = calc._ema_series(closes, period_ema_slow)
+        macd, signal, hist = calc._calculate_macd(
+            closes, period_ema_fast, period_ema_slow, period_signal,
+            fast_series=fast_series, slow_series=slow_series,
+        )
+        upper, middle, lower = calc._calculate_bollinger(closes, period_bollinger)
+        stoch_k, stoch_d = calc._calculate_stochastic(highs, lows, closes, 14, 3)
+
+        return {
+            'rsi': calc._calculate_rsi(closes, period_rsi),
+            'macd': macd,
+            'macd_signal': signal,
+            'macd_hist': hist,
+            'bb_upper': upper,
+            'bb_middle': middle,
+            'bb_lower': lower,
+            'adx': calc._calculate_adx(highs, lows, closes, period_adx),
+            'ema_fast': calc._calculate_ema(closes, period_ema_fast, series=fast_series),
+            'ema_slow': calc._calculate_ema(closes, period_ema_slow, series=slow_series),
+            'volume_sma': calc._calculate_sma(volumes, min(20, volumes.shape[1])),
+            'obv': calc._calculate_obv(closes, volumes),
+            'mfi': calc._calculate_mfi(highs, lows, closes, volumes, 14),
+            'ad': calc._calculate_ad(highs, lows, closes, volumes),
+            'stoch_k': stoch_k,
+            'stoch_d': stoch_d,
+            'cci': calc._calculate_cci(highs, lows, closes, 20),
+            'atr': calc._calculate_atr(highs, lows, closes, period_atr),
+            'willr': calc._calculate_williams_r(highs, lows, closes, 14),
+            'roc': calc._calculate_roc(closes, 12),
+            'vwap': calc._calculate_vwap(closes, volumes),
+            'vwma': calc._calculate_vwma(closes, volumes, 20),
+            'wma': calc._calculate_wma(closes, 20),
+            'close_price': closes[:, -1].copy(),
+        }
+
+    @staticmethod
+    def _bars_to_arrays(bars: List[Dict]) -> Optional[Tuple[np.ndarray, ...]]:
+        """
+        Convert bars to aligned float arrays, keeping only bars with a valid close.
+
+        Missing or non-positive highs/lows fall back to the close, missing
+        volumes to zero.
+
+        Returns:
+            (closes, highs, lows, volumes, timestamps) or None if no bar has a close
+        """
+        closes: List[float] = []
+        highs: List[float] = []
+        lows: List[float] = []
+        volumes: List[float] = []
+        timestamps: List[str] = []
+        for bar in bars or []:
+            close = bar.get('c')
+            if close is None or close <= 0:
+                continue
+            high = bar.get('h')
+            low = bar.get('l')
+            closes.append(close)
+            highs.append(high if high is not None and high > 0 else close)
+            lows.append(low if low is not None and low > 0 else close)
+            volumes.append(bar.get('v') or 0)
+            timestamps.append(bar.get('t', ''))
+
+        if not closes:
+            return None
+        return (
+            np.asarray(closes, dtype=np.float64),
+            np.asarray(highs, dtype=np.float64),
+            np.asarray(lows, dtype=np.float64),
+            np.asarray(volumes, dtype=np.float64),
+            timestamps,
         )
-        adx = TechnicalIndicatorCalculator._calculate_adx(highs, lows, closes, period_adx)
-        ema_fast = TechnicalIndicatorCalculator._calculate_ema(closes, period_ema_fast)
-        ema_slow = TechnicalIndicatorCalculator._calculate_ema(closes, period_ema_slow)
-        
-        # Volume indicators
-        volume_sma = TechnicalIndicatorCalculator._calculate_sma(volumes, min(20, len(volumes))) if volumes else 0.0
-        obv = TechnicalIndicatorCalculator._calculate_obv(closes, volumes)
-        mfi = TechnicalIndicatorCalculator._calculate_mfi(highs, lows, closes, volumes, 14)
-        ad = TechnicalIndicatorCalculator._calculate_ad(highs, lows, closes, volumes)
-        
-        # Momentum indicators
-        stoch_values = TechnicalIndicatorCalculator._calculate_stochastic(highs, lows, closes, 14, 3)
-        cci = TechnicalIndicatorCalculator._calculate_cci(highs, lows, closes, 20)
-        atr = TechnicalIndicatorCalculator._calculate_atr(highs, lows, closes, period_atr)
-        willr = TechnicalIndicatorCalculator._calculate_williams_r(highs, lows, closes, 14)
-        roc = TechnicalIndicatorCalculator._calculate_roc(closes, 12)
-        
-        # Price averages
-        vwap = TechnicalIndicatorCalculator._calculate_vwap(closes, volumes)
-        vwma = TechnicalIndicatorCalculator._calculate_vwma(closes, volumes, 20)
-        wma = TechnicalIndicatorCalculator._calculate_wma(closes, 20)
-        
+
+    @staticmethod
+    def _to_model(
+        results: Dict[str, np.ndarray],
+        row: int,
+        closes: np.ndarray,
+        timestamps: List[str],
+        current_volume: Any
+    ) -> TechnicalIndicators:
+        """Build the TechnicalIndicators model for one row of a batch result."""
+        value = {name: float(vector[row]) for name, vector in results.items()}
+
         # Time series data
-        datetime_price = list(zip(timestamps[-20:], closes[-20:])) if timestamps else []
-        
+        recent = [(ts, price) for ts, price in zip(timestamps[-20:], closes[-20:].tolist()) if ts]
+
         return TechnicalIndicators(
-            rsi=rsi,
-            macd=macd_values,
-            stoch=stoch_values,
-            cci=cci,
-            willr=willr,
-            roc=roc,
-            adx=adx,
-            ema_fast=ema_fast,
-            ema_slow=ema_slow,
-            bollinger=bollinger_values,
-            atr=atr,
+            rsi=value['rsi'],
+            macd=[value['macd'], value['macd_signal'], value['macd_hist']],
+            stoch=[value['stoch_k'], value['stoch_d']],
+            cci=value['cci'],
+            willr=value['willr'],
+            roc=value['roc'],
+            adx=value['adx'],
+            ema_fast=value['ema_fast'],
+            ema_slow=value['ema_slow'],
+            bollinger=[value['bb_upper'], value['bb_middle'], value['bb_lower']],
+            atr=value['atr'],
             volume=current_volume,
-            volume_sma=volume_sma,
-            obv=obv,
-            mfi=mfi,
-            ad=ad,
-            vwap=vwap,
-            vwma=vwma,
-            wma=wma,
-            close_price=current_close,
-            datetime_price=datetime_price
+            volume_sma=value['volume_sma'],
+            obv=value['obv'],
+            mfi=value['mfi'],
+            ad=value['ad'],
+            vwap=value['vwap'],
+            vwma=value['vwma'],
+            wma=value['wma'],
+            close_price=value['close_price'],
+            datetime_price=recent
         )
-    
+
     @staticmethod
     def _create_default_indicators() -> TechnicalIndicators:
         """Create default indicators when data is insufficient."""
@@ -140,315 +300,252 @@ class TechnicalIndicatorCalculator:
             close_price=0.0,
             datetime_price=[]
         )
-    
+
+    # ------------------------------------------------------------------
+    # Vectorised indicators: every helper takes (tickers x bars) matrices
+    # and returns one value per ticker.
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        """Element-wise division that yields 0 where the denominator is 0."""
+        out = np.zeros_like(numerator, dtype=np.float64)
+        np.divide(numerator, denominator, out=out, where=denominator != 0)
+        return out
+
     @staticmethod
-    def _calculate_sma(values: List[float], period: int) -> float:
-        """Calculate Simple Moving Average."""
-        if not values or len(values) < period:
-            return 0.0
-        return sum(values[-period:]) / period
-    
+    def _calculate_sma(values: np.ndarray, period: int) -> np.ndarray:
+        """Calculate Simple Moving Average of the last ``period`` bars."""
+        if period <= 0 or values.shape[1] < period:
+            return np.zeros(values.shape[0])
+        return values[:, -period:].mean(axis=1)
+
+    @staticmethod
+    def _ema_series(values: np.ndarray, period: int) -> np.ndarray:
+        """
+        Full EMA series per row, seeded with the SMA of the first ``period`` bars.
+
+        Columns before the seed are NaN. The recursion
+        ``ema[i] = a * x[i] + (1 - a) * ema[i - 1]`` is evaluated in blocks as
+        ``ema[i] = d**(i+1) * (ema[-1] + a * cumsum(x[j] / d**(j+1)))`` with
+        ``d = 1 - a``, so there is no per-bar Python loop.
+        """
+        rows, count = values.shape
+        out = np.full((rows, count), np.nan)
+        if count < period:
+            return out
+
+        alpha = 2 / (period + 1)
+        decay = 1 - alpha
+        out[:, period - 1] = values[:, :period].mean(axis=1)
+        state = out[:, period - 1]
+        start = period
+        while start < count:
+            block = values[:, start:start + _EMA_BLOCK]
+            powers = decay ** np.arange(1, block.shape[1] + 1)
+            ema_block = powers * (state[:, None] + alpha * np.cumsum(block / powers, axis=1))
+            out[:, start:start + block.shape[1]] = ema_block
+            state = ema_block[:, -1]
+            start += block.shape[1]
+        return out
+
     @staticmethod
-    def _calculate_ema(values: List[float], period: int) -> float:
-        """Calculate Exponential Moving Average."""
-        if not values or len(values) < period:
-            return values[-1] if values else 0.0
-        
-        multiplier = 2 / (period + 1)
-        ema = sum(values[:period]) / period  # Start with SMA
-        
-        for price in values[period:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-        
-        return ema
-    
+    def _calculate_ema(values: np.ndarray, period: int, series: Optional[np.ndarray] = None) -> np.ndarray:
+        """Calculate Exponential Moving Average (last value; last price if too short)."""
+        if values.shape[1] < period:
+            return values[:, -1].copy()
+        if series is None:
+            series = TechnicalIndicatorCalculator._ema_series(values, period)
+        return series[:, -1]
+
     @staticmethod
-    def _calculate_rsi(closes: List[float], period: int = 14) -> float:
+    def _calculate_rsi(closes: np.ndarray, period: int = 14) -> np.ndarray:
         """Calculate Relative Strength Index."""
-        if len(closes) < period + 1:
-            return 50.0
-        
-        gains = []
-        losses = []
-        
-        for i in range(1, len(closes)):
-            change = closes[i] - closes[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-        
-        if len(gains) < period:
-            return 50.0
-        
-        avg_gain = sum(gains[-period:]) / period
-        avg_loss = sum(losses[-period:]) / period
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
-    
+        if closes.shape[1] < period + 1:
+            return np.full(closes.shape[0], 50.0)
+
+        changes = np.diff(closes[:, -(period + 1):], axis=1)
+        avg_gain = np.clip(changes, 0, None).sum(axis=1) / period
+        avg_loss = np.clip(-changes, 0, None).sum(axis=1) / period
+
+        rs = TechnicalIndicatorCalculator._safe_divide(avg_gain, avg_loss)
+        return np.where(avg_loss == 0, 100.0, 100 - (100 / (1 + rs)))
+
     @staticmethod
     def _calculate_macd(
-        closes: List[float],
+        closes: np.ndarray,
         fast_period: int = 12,
         slow_period: int = 26,
-        signal_period: int = 9
-    ) -> List[float]:
-        """Calculate MACD (Moving Average Convergence Divergence)."""
-        if len(closes) < slow_period:
-            return [0.0, 0.0, 0.0]
-        
-        ema_fast = TechnicalIndicatorCalculator._calculate_ema(closes, fast_period)
-        ema_slow = TechnicalIndicatorCalculator._calculate_ema(closes, slow_period)
-        macd_line = ema_fast - ema_slow
-        
-        # Calculate signal line (EMA of MACD)
-        # Simplified: use current MACD as signal
-        signal_line = macd_line * 0.9  # Approximation
-        histogram = macd_line - signal_line
-        
-        return [macd_line, signal_line, histogram]
-    
+        signal_period: int = 9,
+        fast_series: Optional[np.ndarray] = None,
+        slow_series: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate MACD (Moving Average Convergence Divergence).
+
+        The signal line is the ``signal_period`` EMA of the MACD line. While
+        fewer than ``signal_period`` MACD values exist it equals the MACD line.
+        Precomputed fast/slow EMA series can be passed to avoid rebuilding them.
+        """
+        rows, count = closes.shape
+        if count < slow_period:
+            zeros = np.zeros(rows)
+            return zeros, zeros.copy(), zeros.copy()
+
+        if fast_series is None:
+            fast_series = TechnicalIndicatorCalculator._ema_series(closes, fast_period)
+        if slow_series is None:
+            slow_series = TechnicalIndicatorCalculator._ema_series(closes, slow_period)
+        macd_series = fast_series[:, slow_period - 1:] - slow_series[:, slow_period - 1:]
+        macd_line = macd_series[:, -1]
+        signal_line = TechnicalIndicatorCalculator._calculate_ema(macd_series, signal_period)
+        return macd_line, signal_line, macd_line - signal_line
+
     @staticmethod
-    def _calculate_bollinger(closes: List[float], period: int = 20) -> List[float]:
-        """Calculate Bollinger Bands."""
-        if len(closes) < period:
-            current = closes[-1] if closes else 0.0
-            return [current, current, current]
-        
-        sma = sum(closes[-period:]) / period
-        variance = sum((x - sma) ** 2 for x in closes[-period:]) / period
-        std_dev = variance ** 0.5
-        
-        upper = sma + (2 * std_dev)
-        lower = sma - (2 * std_dev)
-        
-        return [upper, sma, lower]
-    
+    def _calculate_bollinger(closes: np.ndarray, period: int = 20) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Calculate Bollinger Bands (upper, middle, lower)."""
+        if closes.shape[1] < period:
+            current = closes[:, -1]
+            return current.copy(), current.copy(), current.copy()
+
+        window = closes[:, -period:]
+        sma = window.mean(axis=1)
+        std_dev = window.std(axis=1)
+        return sma + 2 * std_dev, sma, sma - 2 * std_dev
+
     @staticmethod
-    def _calculate_atr(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> float:
+    def _calculate_atr(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = 14) -> np.ndarray:
         """Calculate Average True Range."""
-        if len(closes) < 2 or len(highs) < 2 or len(lows) < 2:
-            return 0.0
-        
-        true_ranges = []
-        for i in range(1, len(closes)):
-            high_low = highs[i] - lows[i]
-            high_close = abs(highs[i] - closes[i-1])
-            low_close = abs(lows[i] - closes[i-1])
-            true_range = max(high_low, high_close, low_close)
-            true_ranges.append(true_range)
-        
-        if len(true_ranges) < period:
-            return sum(true_ranges) / len(true_ranges) if true_ranges else 0.0
-        
-        return sum(true_ranges[-period:]) / period
-    
+        if closes.shape[1] < 2:
+            return np.zeros(closes.shape[0])
+
+        prev_close = closes[:, :-1]
+        true_ranges = np.maximum.reduce([
+            highs[:, 1:] - lows[:, 1:],
+            np.abs(highs[:, 1:] - prev_close),
+            np.abs(lows[:, 1:] - prev_close),
+        ])
+        return true_ranges[:, -period:].mean(axis=1)
+
     @staticmethod
-    def _calculate_adx(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> float:
+    def _calculate_adx(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = 14) -> np.ndarray:
         """Calculate Average Directional Index (simplified)."""
-        if len(closes) < period + 1:
-            return 0.0
-        
-        # Simplified ADX calculation
-        up_moves = []
-        down_moves = []
-        
-        for i in range(1, len(highs)):
-            up_move = highs[i] - highs[i-1]
-            down_move = lows[i-1] - lows[i]
-            up_moves.append(max(up_move, 0))
-            down_moves.append(max(down_move, 0))
-        
-        if not up_moves or not down_moves:
-            return 0.0
-        
-        avg_up = sum(up_moves[-period:]) / period
-        avg_down = sum(down_moves[-period:]) / period
-        
-        if avg_up + avg_down == 0:
-            return 0.0
-        
-        dx = abs(avg_up - avg_down) / (avg_up + avg_down) * 100
-        return dx
-    
+        if closes.shape[1] < period + 1:
+            return np.zeros(closes.shape[0])
+
+        avg_up = np.clip(np.diff(highs[:, -(period + 1):], axis=1), 0, None).sum(axis=1) / period
+        avg_down = np.clip(-np.diff(lows[:, -(period + 1):], axis=1), 0, None).sum(axis=1) / period
+        return TechnicalIndicatorCalculator._safe_divide(np.abs(avg_up - avg_down), avg_up + avg_down) * 100
+
     @staticmethod
-    def _calculate_obv(closes: List[float], volumes: List[int]) -> float:
+    def _calculate_obv(closes: np.ndarray, volumes: np.ndarray) -> np.ndarray:
         """Calculate On-Balance Volume."""
-        if len(closes) < 2 or len(volumes) < 2:
-            return 0.0
-        
-        obv = 0.0
-        for i in range(1, len(closes)):
-            if closes[i] > closes[i-1]:
-                obv += volumes[i]
-            elif closes[i] < closes[i-1]:
-                obv -= volumes[i]
-        
-        return obv
-    
+        if closes.shape[1] < 2:
+            return np.zeros(closes.shape[0])
+        return (np.sign(np.diff(closes, axis=1)) * volumes[:, 1:]).sum(axis=1)
+
     @staticmethod
     def _calculate_mfi(
-        highs: List[float],
-        lows: List[float],
-        closes: List[float],
-        volumes: List[int],
+        highs: np.ndarray,
+        lows: np.ndarray,
+        closes: np.ndarray,
+        volumes: np.ndarray,
         period: int = 14
-    ) -> float:
+    ) -> np.ndarray:
         """Calculate Money Flow Index."""
-        if len(closes) < period + 1 or not volumes:
-            return 50.0
-        
-        typical_prices = [(h + l + c) / 3 for h, l, c in zip(highs, lows, closes)]
-        money_flows = [tp * v for tp, v in zip(typical_prices, volumes)]
-        
-        positive_flow = 0.0
-        negative_flow = 0.0
-        
-        for i in range(1, len(typical_prices)):
-            if typical_prices[i] > typical_prices[i-1]:
-                positive_flow += money_flows[i]
-            elif typical_prices[i] < typical_prices[i-1]:
-                negative_flow += money_flows[i]
-        
-        if negative_flow == 0:
-            return 100.0
-        
-        money_ratio = positive_flow / negative_flow
-        mfi = 100 - (100 / (1 + money_ratio))
-        
-        return mfi
-    
+        if closes.shape[1] < period + 1:
+            return np.full(closes.shape[0], 50.0)
+
+        typical_prices = (highs + lows + closes) / 3
+        money_flows = (typical_prices * volumes)[:, 1:]
+        direction = np.diff(typical_prices, axis=1)
+        positive_flow = np.where(direction > 0, money_flows, 0.0).sum(axis=1)
+        negative_flow = np.where(direction < 0, money_flows, 0.0).sum(axis=1)
+
+        money_ratio = TechnicalIndicatorCalculator._safe_divide(positive_flow, negative_flow)
+        return np.where(negative_flow == 0, 100.0, 100 - (100 / (1 + money_ratio)))
+
     @staticmethod
-    def _calculate_ad(highs: List[float], lows: List[float], closes: List[float], volumes: List[int]) -> float:
+    def _calculate_ad(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, volumes: np.ndarray) -> np.ndarray:
         """Calculate Accumulation/Distribution."""
-        if not highs or not lows or not closes or not volumes:
-            return 0.0
-        
-        ad = 0.0
-        for h, l, c, v in zip(highs, lows, closes, volumes):
-            if h == l:
-                continue
-            clv = ((c - l) - (h - c)) / (h - l)
-            ad += clv * v
-        
-        return ad
-    
+        clv = TechnicalIndicatorCalculator._safe_divide((closes - lows) - (highs - closes), highs - lows)
+        return (clv * volumes).sum(axis=1)
+
     @staticmethod
     def _calculate_stochastic(
-        highs: List[float],
-        lows: List[float],
-        closes: List[float],
+        highs: np.ndarray,
+        lows: np.ndarray,
+        closes: np.ndarray,
         period: int = 14,
         smooth: int = 3
-    ) -> List[float]:
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """Calculate Stochastic Oscillator."""
-        if len(closes) < period:
-            return [50.0, 50.0]
-        
-        highest_high = max(highs[-period:])
-        lowest_low = min(lows[-period:])
-        
-        if highest_high == lowest_low:
-            return [50.0, 50.0]
-        
-        k = ((closes[-1] - lowest_low) / (highest_high - lowest_low)) * 100
-        d = k  # Simplified: use K as D
-        
-        return [k, d]
-    
+        if closes.shape[1] < period:
+            return np.full(closes.shape[0], 50.0), np.full(closes.shape[0], 50.0)
+
+        highest_high = highs[:, -period:].max(axis=1)
+        lowest_low = lows[:, -period:].min(axis=1)
+        price_range = highest_high - lowest_low
+
+        k = np.where(
+            price_range == 0,
+            50.0,
+            TechnicalIndicatorCalculator._safe_divide(closes[:, -1] - lowest_low, price_range) * 100,
+        )
+        return k, k.copy()  # Simplified: use K as D
+
     @staticmethod
-    def _calculate_cci(highs: List[float], lows: List[float], closes: List[float], period: int = 20) -> float:
+    def _calculate_cci(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = 20) -> np.ndarray:
         """Calculate Commodity Channel Index."""
-        if len(closes) < period:
-            return 0.0
-        
-        typical_prices = [(h + l + c) / 3 for h, l, c in zip(highs[-period:], lows[-period:], closes[-period:])]
-        sma_tp = sum(typical_prices) / len(typical_prices)
-        mean_deviation = sum(abs(tp - sma_tp) for tp in typical_prices) / len(typical_prices)
-        
-        if mean_deviation == 0:
-            return 0.0
-        
-        cci = (typical_prices[-1] - sma_tp) / (0.015 * mean_deviation)
-        return cci
-    
+        if closes.shape[1] < period:
+            return np.zeros(closes.shape[0])
+
+        typical_prices = (highs[:, -period:] + lows[:, -period:] + closes[:, -period:]) / 3
+        sma_tp = typical_prices.mean(axis=1)
+        mean_deviation = np.abs(typical_prices - sma_tp[:, None]).mean(axis=1)
+        return TechnicalIndicatorCalculator._safe_divide(typical_prices[:, -1] - sma_tp, 0.015 * mean_deviation)
+
     @staticmethod
-    def _calculate_williams_r(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> float:
+    def _calculate_williams_r(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = 14) -> np.ndarray:
         """Calculate Williams %R."""
-        if len(closes) < period:
-            return -50.0
-        
-        highest_high = max(highs[-period:])
-        lowest_low = min(lows[-period:])
-        
-        if highest_high == lowest_low:
-            return -50.0
-        
-        willr = ((highest_high - closes[-1]) / (highest_high - lowest_low)) * -100
-        return willr
-    
+        if closes.shape[1] < period:
+            return np.full(closes.shape[0], -50.0)
+
+        highest_high = highs[:, -period:].max(axis=1)
+        lowest_low = lows[:, -period:].min(axis=1)
+        price_range = highest_high - lowest_low
+
+        willr = TechnicalIndicatorCalculator._safe_divide(highest_high - closes[:, -1], price_range) * -100
+        return np.where(price_range == 0, -50.0, willr)
+
     @staticmethod
-    def _calculate_roc(closes: List[float], period: int = 12) -> float:
+    def _calculate_roc(closes: np.ndarray, period: int = 12) -> np.ndarray:
         """Calculate Rate of Change."""
-        if len(closes) < period + 1:
-            return 0.0
-        
-        old_close = closes[-period-1]
-        if old_close == 0:
-            return 0.0
-        
-        roc = ((closes[-1] - old_close) / old_close) * 100
-        return roc
-    
+        if closes.shape[1] < period + 1:
+            return np.zeros(closes.shape[0])
+
+        old_close = closes[:, -period - 1]
+        return TechnicalIndicatorCalculator._safe_divide(closes[:, -1] - old_close, old_close) * 100
+
     @staticmethod
-    def _calculate_vwap(closes: List[float], volumes: List[int]) -> float:
+    def _calculate_vwap(closes: np.ndarray, volumes: np.ndarray) -> np.ndarray:
         """Calculate Volume Weighted Average Price."""
-        if not closes or not volumes or len(closes) != len(volumes):
-            return closes[-1] if closes else 0.0
-        
-        total_pv = sum(p * v for p, v in zip(closes, volumes))
-        total_v = sum(volumes)
-        
-        if total_v == 0:
-            return closes[-1]
-        
-        return total_pv / total_v
-    
+        total_v = volumes.sum(axis=1)
+        vwap = TechnicalIndicatorCalculator._safe_divide((closes * volumes).sum(axis=1), total_v)
+        return np.where(total_v == 0, closes[:, -1], vwap)
+
     @staticmethod
-    def _calculate_vwma(closes: List[float], volumes: List[int], period: int = 20) -> float:
+    def _calculate_vwma(closes: np.ndarray, volumes: np.ndarray, period: int = 20) -> np.ndarray:
         """Calculate Volume Weighted Moving Average."""
-        if not closes or not volumes or len(closes) < period:
-            return closes[-1] if closes else 0.0
-        
-        recent_closes = closes[-period:]
-        recent_volumes = volumes[-period:]
-        
-        total_pv = sum(p * v for p, v in zip(recent_closes, recent_volumes))
-        total_v = sum(recent_volumes)
-        
-        if total_v == 0:
-            return recent_closes[-1]
-        
-        return total_pv / total_v
-    
+        if closes.shape[1] < period:
+            return closes[:, -1].copy()
+        return TechnicalIndicatorCalculator._calculate_vwap(closes[:, -period:], volumes[:, -period:])
+
     @staticmethod
-    def _calculate_wma(closes: List[float], period: int = 20) -> float:
+    def _calculate_wma(closes: np.ndarray, period: int = 20) -> np.ndarray:
         """Calculate Weighted Moving Average."""
-        if not closes or len(closes) < period:
-            return closes[-1] if closes else 0.0
-        
-        recent_closes = closes[-period:]
-        weights = list(range(1, period + 1))
-        
-        weighted_sum = sum(p * w for p, w in zip(recent_closes, weights))
-        weight_sum = sum(weights)
-        
-        return weighted_sum / weight_sum
+        if closes.shape[1] < period:
+            return closes[:, -1].copy()
+
+        weights = np.arange(1, period + 1, dtype=np.float64)
+        return closes[:, -period:] @ weights / weights.sum()
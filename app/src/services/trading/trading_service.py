@@ -4,14 +4,29 @@ Manages multiple trading indicators running concurrently with error isolation
 """
 
 import asyncio
+import importlib
 import os
-from typing import List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Type
 from app.src.common.loguru_logger import logger
 from app.src.common.memory_monitor import MemoryMonitor
-from app.src.services.trading.momentum_indicator import MomentumIndicator
-from app.src.services.trading.deep_analyzer_indicator import DeepAnalyzerIndicator
-from app.src.services.trading.uw_enhanced_momentum_indicator import UWEnhancedMomentumIndicator
-from app.src.services.trading.penny_stocks_indicator import PennyStocksIndicator
+from app.src.services.trading.base_trading_indicator import BaseTradingIndicator
+from app.src.services.trading.position_state_cache import PositionStateCache
+from app.src.services.trading.state_snapshot import StateSnapshot
+
+# (display name, module, class, enable flag, flag default), in start order.
+# Indicator modules are imported only when enabled, so a disabled indicator
+# costs no import time or memory.
+INDICATOR_SPECS: List[Tuple[str, str, str, str, str]] = [
+    # DISABLED by default: unprofitable in backtesting, penny stocks covers <$5 universe
+    ("Momentum Trading Indicator", "app.src.services.trading.momentum_indicator",
+     "MomentumIndicator", "ENABLE_MOMENTUM_INDICATOR", "false"),
+    ("Penny Stocks Indicator", "app.src.services.trading.penny_stocks_indicator",
+     "PennyStocksIndicator", "ENABLE_PENNY_STOCKS_INDICATOR", "true"),
+    ("Deep Analyzer Indicator", "app.src.services.trading.deep_analyzer_indicator",
+     "DeepAnalyzerIndicator", "ENABLE_DEEP_ANALYZER_INDICATOR", "true"),
+    ("UW-Enhanced Momentum Indicator", "app.src.services.trading.uw_enhanced_momentum_indicator",
+     "UWEnhancedMomentumIndicator", "ENABLE_UW_ENHANCED_INDICATOR", "true"),
+]
 
 
 class TradingServiceCoordinator:
@@ -24,6 +39,7 @@ class TradingServiceCoordinator:
     """
 
     _enabled_indicators: List[str] = []
+    _indicator_classes: Dict[str, Type[BaseTradingIndicator]] = {}
 
     @classmethod
     def configure(
@@ -44,40 +60,17 @@ class TradingServiceCoordinator:
         # Determine which indicators are enabled via environment variables
         # Requirement 1.5: WHERE a Trading Indicator is disabled, THEN exclude from execution
         cls._enabled_indicators = []
-        
-        enable_momentum = os.getenv("ENABLE_MOMENTUM_INDICATOR", "false").lower() == "true"  # DISABLED: unprofitable in backtesting, penny stocks covers <$5 universe
-        enable_penny_stocks = os.getenv("ENABLE_PENNY_STOCKS_INDICATOR", "true").lower() == "true"
-        enable_deep_analyzer = os.getenv("ENABLE_DEEP_ANALYZER_INDICATOR", "true").lower() == "true"
-        enable_uw_enhanced = os.getenv("ENABLE_UW_ENHANCED_INDICATOR", "true").lower() == "true"
-
-        # Configure enabled indicators
-        if enable_momentum:
-            MomentumIndicator.configure()
-            cls._enabled_indicators.append("Momentum Trading Indicator")
-            logger.info("Momentum Trading Indicator enabled")
-        else:
-            logger.info("Momentum Trading Indicator disabled via configuration")
-
-        if enable_penny_stocks:
-            PennyStocksIndicator.configure()
-            cls._enabled_indicators.append("Penny Stocks Indicator")
-            logger.info("Penny Stocks Indicator enabled")
-        else:
-            logger.info("Penny Stocks Indicator disabled via configuration")
-
-        if enable_deep_analyzer:
-            DeepAnalyzerIndicator.configure()
-            cls._enabled_indicators.append("Deep Analyzer Indicator")
-            logger.info("Deep Analyzer Indicator enabled")
-        else:
-            logger.info("Deep Analyzer Indicator disabled via configuration")
-
-        if enable_uw_enhanced:
-            UWEnhancedMomentumIndicator.configure()
-            cls._enabled_indicators.append("UW-Enhanced Momentum Indicator")
-            logger.info("UW-Enhanced Momentum Indicator enabled")
-        else:
-            logger.info("UW-Enhanced Momentum Indicator disabled via configuration")
+        cls._indicator_classes = {}
+
+        for name, module_path, class_name, flag, default in INDICATOR_SPECS:
+            if os.getenv(flag, default).lower() != "true":
+                logger.info(f"{name} disabled via configuration")
+                continue
+            indicator_cls = getattr(importlib.import_module(module_path), class_name)
+            indicator_cls.configure()
+            cls._enabled_indicators.append(name)
+            cls._indicator_classes[name] = indicator_cls
+            logger.info(f"{name} enabled")
 
         # Configure shared services
         from app.src.db.dynamodb_client import DynamoDBClient
@@ -85,9 +78,16 @@ class TradingServiceCoordinator:
 
         DynamoDBClient.configure()
         MABService.configure()
+        PositionStateCache.configure()
+        StateSnapshot.configure(cls._enabled_indicator_classes())
 
         logger.info(f"Trading Service Coordinator configured with {len(cls._enabled_indicators)} enabled indicators")
 
+    @classmethod
+    def _enabled_indicator_classes(cls) -> List[Type[BaseTradingIndicator]]:
+        """Indicator classes for the enabled indicator names"""
+        return [cls._indicator_classes[name] for name in cls._enabled_indicators]
+
     @classmethod
     def stop(cls):
         """
@@ -96,11 +96,11 @@ class TradingServiceCoordinator:
         """
         logger.info("Stopping all trading indicators...")
         
-        # Stop all indicators regardless of enabled status (in case they were running)
-        MomentumIndicator.stop()
-        PennyStocksIndicator.stop()
-        DeepAnalyzerIndicator.stop()
-        UWEnhancedMomentumIndicator.stop()
+        # Only configured indicators were imported, so only they can be running
+        for indicator_cls in cls._indicator_classes.values():
+            indicator_cls.stop()
+        PositionStateCache.stop()
+        StateSnapshot.stop()
         
         logger.info("All trading indicators stopped")
 
@@ -123,6 +123,13 @@ class TradingServiceCoordinator:
         for indicator_name in cls._enabled_indicators:
             logger.info(f"  - {indicator_name}")
 
+        # Warm restart: restore cooldowns, losing tickers, position state and
+        # cached bars before the first exit cycle (fresh data loads in the background)
+        try:
+            await StateSnapshot.restore()
+        except Exception as e:
+            logger.warning(f"State snapshot restore failed: {e}")
+
         # BASIC DYNO (512MB): Long stagger delay between indicators
         # Each indicator starts with a delay to avoid simultaneous memory spikes
         stagger_delay = int(os.getenv("INDICATOR_STAGGER_DELAY_SECONDS", "30"))
@@ -140,24 +147,9 @@ class TradingServiceCoordinator:
         tasks: List[Tuple[str, Any]] = []
         current_delay = 0
         
-        if "Momentum Trading Indicator" in cls._enabled_indicators:
-            tasks.append(("Momentum Trading Indicator", 
-                         run_with_delay("Momentum Trading Indicator", MomentumIndicator.run(), current_delay)))
-            current_delay += stagger_delay
-        
-        if "Penny Stocks Indicator" in cls._enabled_indicators:
-            tasks.append(("Penny Stocks Indicator", 
-                         run_with_delay("Penny Stocks Indicator", PennyStocksIndicator.run(), current_delay)))
+        for name in cls._enabled_indicators:
+            tasks.append((name, run_with_delay(name, cls._indicator_classes[name].run(), current_delay)))
             current_delay += stagger_delay
-        
-        if "Deep Analyzer Indicator" in cls._enabled_indicators:
-            tasks.append(("Deep Analyzer Indicator", 
-                         run_with_delay("Deep Analyzer Indicator", DeepAnalyzerIndicator.run(), current_delay)))
-            current_delay += stagger_delay
-        
-        if "UW-Enhanced Momentum Indicator" in cls._enabled_indicators:
-            tasks.append(("UW-Enhanced Momentum Indicator", 
-                         run_with_delay("UW-Enhanced Momentum Indicator", UWEnhancedMomentumIndicator.run(), current_delay)))
 
         # Add periodic memory monitoring task
         async def periodic_memory_monitor():
@@ -177,6 +169,12 @@ class TradingServiceCoordinator:
         
         tasks.append(("Memory Monitor", periodic_memory_monitor()))
 
+        # Background persistence of coalesced trailing-stop / peak-profit updates
+        tasks.append(("Position State Flusher", PositionStateCache.run()))
+
+        # Periodic warm-restart snapshot (also written on shutdown)
+        tasks.append(("State Snapshot Writer", StateSnapshot.run()))
+
         # Run all enabled indicators concurrently with error isolation
         # Requirement 1.2: Using return_exceptions=True to capture exceptions without stopping others
         indicator_names = [name for name, _ in tasks]
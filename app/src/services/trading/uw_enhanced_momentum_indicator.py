@@ -13,20 +13,24 @@ import asyncio
 import os
 from typing import List, Tuple, Dict, Any, Optional
 from datetime import datetime, timezone
-import pytz
 
 import aiohttp
 
 from app.src.common.loguru_logger import logger
 from app.src.common.utils import measure_latency
 from app.src.common.alpaca import AlpacaClient
+from app.src.services.market_data.market_data_hub import MarketDataHub
+from app.src.common.asset_directory import AssetDirectory
+from app.src.common.market_session import EST_TZ, MarketSession
 from app.src.services.technical_analysis.technical_analysis_lib import (
     TechnicalAnalysisLib,
 )
 from app.src.db.dynamodb_client import DynamoDBClient
+from app.src.models.price_series import PriceSeries
 from app.src.services.webhook.send_signal import send_signal_to_webhook
 from app.src.services.mab.mab_service import MABService
 from app.src.services.trading.base_trading_indicator import BaseTradingIndicator
+from app.src.services.trading.position_state_cache import PositionStateCache
 from app.src.services.market_data.market_data_service import MarketDataService
 from app.src.services.trading.volatility_utils import VolatilityUtils
 from app.src.services.trading.trading_config import (
@@ -172,10 +176,7 @@ class UWEnhancedMomentumIndicator(BaseTradingIndicator):
         Check if current time is after the entry cutoff time (15:00 ET).
         No new entries allowed after this time to avoid late-day volatility.
         """
-        est_tz = pytz.timezone("America/New_York")
-        current_time_est = datetime.now(est_tz)
-        current_hour = current_time_est.hour
-        return current_hour >= cls.max_entry_hour_et
+        return MarketSession.past_entry_cutoff(cls.max_entry_hour_et)
 
     @classmethod
     async def _get_entry_price_quote(
@@ -192,7 +193,7 @@ class UWEnhancedMomentumIndicator(BaseTradingIndicator):
         Returns:
             Tuple of (enter_price: Optional[float], quote_source: str)
         """
-        quote_response = await AlpacaClient.quote(ticker)
+        quote_response = await MarketDataHub.quote(ticker)
         enter_price = None
         quote_source = "none"
 
@@ -215,7 +216,7 @@ class UWEnhancedMomentumIndicator(BaseTradingIndicator):
     ) -> Tuple[bool, float, str]:
         """Check if bid-ask spread is acceptable for entry"""
         try:
-            quote_response = await AlpacaClient.quote(ticker)
+            quote_response = await MarketDataHub.quote(ticker)
             if not quote_response:
                 return True, 0.0, "No quote data available, proceeding"
 
@@ -377,6 +378,9 @@ class UWEnhancedMomentumIndicator(BaseTradingIndicator):
     @classmethod
     def _is_warrant_or_option(cls, ticker: str) -> bool:
         """Check if ticker is a warrant or option"""
+        known = AssetDirectory.is_special_security(ticker)
+        if known is not None:
+            return known
         ticker_upper = ticker.upper()
         warrant_suffixes = ["W", "WS", "WT", "WTS", "R", "RT"]
         for suffix in warrant_suffixes:
@@ -662,28 +666,32 @@ class UWEnhancedMomentumIndicator(BaseTradingIndicator):
         return True, f"Passed all quality filters (ADX: {adx:.2f}, RSI: {rsi:.2f})"
 
     @classmethod
-    def _calculate_momentum(cls, datetime_price: List[Any]) -> Tuple[float, str]:
-        """Calculate price momentum score from datetime_price array or Alpaca quotes"""
+    def _calculate_momentum(cls, datetime_price: Any) -> Tuple[float, str]:
+        """Calculate price momentum score from a PriceSeries, datetime_price array or Alpaca quotes"""
         if not datetime_price or len(datetime_price) < 3:
             return 0.0, "Insufficient price data"
 
-        prices = []
-        for entry in datetime_price:
-            try:
-                if isinstance(entry, list):
-                    if len(entry) >= 2:
-                        prices.append(float(entry[1]))
-                elif isinstance(entry, dict):
-                    # Support both MCP datetime_price format and Alpaca quotes format
-                    price = (
-                        entry.get("price")
-                        or entry.get("close")
-                        or entry.get("close_price")
-                    )
-                    if price is not None:
-                        prices.append(float(price))
-            except (ValueError, TypeError, KeyError, IndexError):
-                continue
+        if isinstance(datetime_price, PriceSeries):
+            # Already sorted oldest -> newest with invalid prices dropped
+            prices = datetime_price.prices.tolist()
+        else:
+            prices = []
+            for entry in datetime_price:
+                try:
+                    if isinstance(entry, list):
+                        if len(entry) >= 2:
+                            prices.append(float(entry[1]))
+                    elif isinstance(entry, dict):
+                        # Support both MCP datetime_price format and Alpaca quotes format
+                        price = (
+                            entry.get("price")
+                            or entry.get("close")
+                            or entry.get("close_price")
+                        )
+                        if price is not None:
+                            prices.append(float(price))
+                except (ValueError, TypeError, KeyError, IndexError):
+                    continue
 
         if len(prices) < 3:
             return 0.0, "Insufficient price data"
@@ -898,17 +906,16 @@ class UWEnhancedMomentumIndicator(BaseTradingIndicator):
     async def _run_entry_cycle(cls):
         """Execute a single momentum entry cycle with enhanced filtering"""
         logger.debug("Starting UW-Enhanced Momentum entry cycle")
-        if not await AlpacaClient.is_market_open():
+        if not await MarketSession.is_market_open():
             logger.debug("Market is closed, skipping entry logic")
-            await asyncio.sleep(cls.entry_cycle_seconds)
+            await MarketSession.wait_for_open(fallback_seconds=cls.entry_cycle_seconds)
             return
 
         logger.info("Market is open, proceeding with UW-Enhanced Momentum entry logic")
 
         # Check if we're past entry cutoff time (15:00 ET)
         if cls._is_after_entry_cutoff():
-            est_tz = pytz.timezone("America/New_York")
-            current_time_est = datetime.now(est_tz)
+            current_time_est = datetime.now(EST_TZ)
             logger.info(
                 f"Past entry cutoff time ({cls.max_entry_hour_et}:00 ET), "
                 f"skipping new entries (current: {current_time_est.strftime('%H:%M %Z')})"
@@ -951,6 +958,30 @@ class UWEnhancedMomentumIndicator(BaseTradingIndicator):
             candidates_to_fetch, max_concurrent=None
         )
 
+        # Momentum is cheap; compute it up front so the Unusual Whales data
+        # for every ticker that can reach UW validation is fetched in one
+        # concurrent batch instead of one round trip per ticker in the loop
+        momentum_by_ticker = {}
+        for ticker in candidates_to_fetch:
+            technical_analysis = (market_data_dict.get(ticker) or {}).get("technical_analysis", {})
+            datetime_price = technical_analysis.get("datetime_price", [])
+            if datetime_price:
+                momentum_by_ticker[ticker] = cls._calculate_momentum(datetime_price)
+
+        if cls.use_unusual_whales:
+            uw_client = get_unusual_whales_client()
+            uw_candidates = [
+                ticker
+                for ticker, (score, _) in momentum_by_ticker.items()
+                if cls.min_momentum_threshold <= abs(score) <= cls.max_momentum_threshold
+            ]
+            if uw_client.is_configured and uw_candidates:
+                prefetched = await uw_client.prefetch(uw_candidates)
+                logger.debug(
+                    f"Prefetched {prefetched} Unusual Whales responses for "
+                    f"{len(uw_candidates)} momentum candidates"
+                )
+
         ticker_momentum_scores = []
         stats = {
             "no_market_data": 0,
@@ -985,9 +1016,7 @@ class UWEnhancedMomentumIndicator(BaseTradingIndicator):
                 stats["no_datetime_price"] += 1
                 continue
 
-            momentum_score, reason = cls._calculate_momentum(
-                datetime_price_for_momentum
-            )
+            momentum_score, reason = momentum_by_ticker[ticker]
             abs_momentum = abs(momentum_score)
 
             if abs_momentum < cls.min_momentum_threshold:
@@ -1431,8 +1460,8 @@ class UWEnhancedMomentumIndicator(BaseTradingIndicator):
     @measure_latency
     async def _run_exit_cycle(cls):
         """Execute a single momentum exit monitoring cycle with cooling period"""
-        if not await AlpacaClient.is_market_open():
-            await asyncio.sleep(cls.exit_cycle_seconds)
+        if not await MarketSession.is_market_open():
+            await MarketSession.wait_for_open(fallback_seconds=cls.exit_cycle_seconds)
             return
 
         active_trades = await cls._get_active_trades()
@@ -1730,7 +1759,7 @@ class UWEnhancedMomentumIndicator(BaseTradingIndicator):
                     f"peak: {peak_profit_percent:.2f}%"
                 )
 
-                await DynamoDBClient.update_momentum_trade_trailing_stop(
+                await PositionStateCache.update(
                     ticker=ticker,
                     indicator=cls.indicator_name(),
                     trailing_stop=trailing_stop,
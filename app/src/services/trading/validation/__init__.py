@@ -24,6 +24,12 @@ from app.src.services.trading.validation.rules import (
 )
 from app.src.services.trading.validation.rejection_collector import RejectionCollector
 from app.src.services.trading.validation.inactive_ticker_repository import InactiveTickerRepository
+from app.src.services.trading.validation.batch_evaluator import (
+    RejectionCode,
+    CandidateTable,
+    BatchValidationResult,
+    BatchValidationEvaluator
+)
 
 __all__ = [
     "TrendMetrics",
@@ -39,5 +45,9 @@ __all__ = [
     "PriceExtremeRule",
     "MomentumThresholdRule",
     "RejectionCollector",
-    "InactiveTickerRepository"
+    "InactiveTickerRepository",
+    "RejectionCode",
+    "CandidateTable",
+    "BatchValidationResult",
+    "BatchValidationEvaluator"
 ]
@@ -0,0 +1,535 @@
+"""
+Columnar batch evaluation of validation rules.
+
+The per-ticker path (TrendAnalyzer.calculate_trend_metrics followed by each
+ValidationRule.validate) re-extracts closes from bar dicts and formats reason
+strings for every ticker, including the ones that are simply discarded. This
+module evaluates the same rules over a whole candidate universe at once:
+
+- CandidateTable holds one numpy column per metric (one row per ticker)
+- BatchValidationEvaluator runs every rule as a vectorized mask over the rows
+  still active, so later rules only see tickers that passed earlier ones
+- The first failing rule is recorded per ticker as a RejectionCode; reason
+  strings are only rendered for records that are persisted
+"""
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.src.services.trading.validation.models import (
+    QuoteData,
+    TrendMetrics,
+    ValidationResult,
+)
+from app.src.services.trading.validation.rejection_collector import RejectionCollector
+from app.src.services.trading.validation.rules import (
+    ContinuationRule,
+    DataQualityRule,
+    LiquidityRule,
+    MomentumThresholdRule,
+    PriceExtremeRule,
+    TrendDirectionRule,
+    ValidationRule,
+)
+from app.src.services.trading.validation.trend_analyzer import TrendAnalyzer
+
+
+class RejectionCode(IntEnum):
+    """Compact code for the first rule that rejected a ticker (per side)."""
+
+    NONE = 0
+    NO_MARKET_DATA = 1
+    INSUFFICIENT_BARS = 2
+    INVALID_QUOTE = 3
+    SPREAD_TOO_WIDE = 4
+    DOWNWARD_TREND = 5
+    UPWARD_TREND = 6
+    WEAK_CONTINUATION_AT_PEAK = 7
+    WEAK_CONTINUATION_AT_BOTTOM = 8
+    AT_PEAK = 9
+    AT_BOTTOM = 10
+    WEAK_UPWARD_MOMENTUM = 11
+    WEAK_DOWNWARD_MOMENTUM = 12
+    EXCESSIVE_UPWARD_MOMENTUM = 13
+    EXCESSIVE_DOWNWARD_MOMENTUM = 14
+    CUSTOM_RULE = 15
+
+
+# TrendAnalyzer reasons for rows without computed metrics
+_TREND_INSUFFICIENT_BARS = 0
+_TREND_INSUFFICIENT_PRICES = 1
+_TREND_COMPUTED = 2
+
+
+class CandidateTable:
+    """
+    Per-ticker validation inputs stored as numpy columns.
+
+    Attributes:
+        tickers: Ticker symbols, row order of every column
+        bar_count: Number of bars per ticker (0 when there is no data)
+        recent_bar_count: Bars in the trend window (at most RECENT_BARS_COUNT)
+        trend_status: Whether trend metrics were computed for the row
+        momentum_score, continuation_score, peak_price, bottom_price,
+        overall_change_percent, up_moves, down_moves: Trend metrics
+        bid, ask, mid_price, spread_percent: Quote columns
+        bars: Original bar lists, only used by custom (non-builtin) rules
+    """
+
+    def __init__(self, tickers: List[str], bars: List[Optional[List[Dict[str, Any]]]]):
+        n = len(tickers)
+        self.tickers = list(tickers)
+        self.bars = bars
+        self.bar_count = np.zeros(n, dtype=np.int64)
+        self.recent_bar_count = np.zeros(n, dtype=np.int64)
+        self.trend_status = np.full(n, _TREND_INSUFFICIENT_BARS, dtype=np.int8)
+        self.momentum_score = np.zeros(n)
+        self.continuation_score = np.zeros(n)
+        self.peak_price = np.zeros(n)
+        self.bottom_price = np.zeros(n)
+        self.overall_change_percent = np.zeros(n)
+        self.up_moves = np.zeros(n, dtype=np.int64)
+        self.down_moves = np.zeros(n, dtype=np.int64)
+        self.bid = np.zeros(n)
+        self.ask = np.zeros(n)
+        self.mid_price = np.zeros(n)
+        self.spread_percent = np.zeros(n)
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    @classmethod
+    def from_market_data(
+        cls,
+        bars_by_ticker: Mapping[str, Optional[List[Dict[str, Any]]]],
+        quotes: Mapping[str, Any],
+    ) -> "CandidateTable":
+        """
+        Build the table from raw bars and quotes.
+
+        Close prices are extracted once per ticker; trend metrics are then
+        computed in one matrix pass per window length (3, 4 or 5 valid closes).
+
+        Args:
+            bars_by_ticker: Ticker -> list of bar dicts (None/empty for no data)
+            quotes: Ticker -> QuoteData or (bid, ask) tuple; missing tickers
+                get bid=ask=0
+
+        Returns:
+            CandidateTable with one row per ticker in bars_by_ticker
+        """
+        tickers = list(bars_by_ticker)
+        table = cls(tickers, [bars_by_ticker[t] for t in tickers])
+
+        windows: Dict[int, Tuple[List[int], List[List[float]]]] = {}
+        for row, bars in enumerate(table.bars):
+            count = len(bars) if bars else 0
+            table.bar_count[row] = count
+            table.recent_bar_count[row] = min(count, TrendAnalyzer.RECENT_BARS_COUNT)
+            if count < 3:
+                continue
+            closes = TrendAnalyzer.extract_recent_closes(bars)
+            if len(closes) < 3:
+                table.trend_status[row] = _TREND_INSUFFICIENT_PRICES
+                continue
+            rows, matrix = windows.setdefault(len(closes), ([], []))
+            rows.append(row)
+            matrix.append(closes)
+
+        for rows, matrix in windows.values():
+            index = np.asarray(rows)
+            metrics = TrendAnalyzer.calculate_trend_arrays(np.asarray(matrix))
+            table.trend_status[index] = _TREND_COMPUTED
+            for name, values in metrics.items():
+                getattr(table, name)[index] = values
+
+        for row, ticker in enumerate(tickers):
+            quote = quotes.get(ticker)
+            if quote is None:
+                continue
+            if not isinstance(quote, QuoteData):
+                quote = QuoteData.from_bid_ask(ticker, *quote)
+            table.bid[row] = quote.bid
+            table.ask[row] = quote.ask
+            table.mid_price[row] = quote.mid_price
+            table.spread_percent[row] = quote.spread_percent
+        return table
+
+    def trend_metrics(self, row: int) -> TrendMetrics:
+        """
+        Materialize the TrendMetrics of one row (renders the reason string).
+
+        Args:
+            row: Row index
+
+        Returns:
+            TrendMetrics equal to TrendAnalyzer.calculate_trend_metrics(bars)
+        """
+        status = self.trend_status[row]
+        if status != _TREND_COMPUTED:
+            return TrendMetrics(
+                momentum_score=0.0,
+                continuation_score=0.0,
+                peak_price=0.0,
+                bottom_price=0.0,
+                reason=(
+                    "Insufficient bars data"
+                    if status == _TREND_INSUFFICIENT_BARS
+                    else "Insufficient valid prices"
+                ),
+            )
+        return TrendMetrics(
+            momentum_score=float(self.momentum_score[row]),
+            continuation_score=float(self.continuation_score[row]),
+            peak_price=float(self.peak_price[row]),
+            bottom_price=float(self.bottom_price[row]),
+            reason=TrendAnalyzer.format_reason(
+                int(self.recent_bar_count[row]),
+                float(self.overall_change_percent[row]),
+                int(self.up_moves[row]),
+                int(self.down_moves[row]),
+                float(self.peak_price[row]),
+                float(self.bottom_price[row]),
+                float(self.continuation_score[row]),
+            ),
+        )
+
+    def quote_data(self, row: int) -> QuoteData:
+        """Materialize the QuoteData of one row."""
+        return QuoteData(
+            ticker=self.tickers[row],
+            bid=float(self.bid[row]),
+            ask=float(self.ask[row]),
+            mid_price=float(self.mid_price[row]),
+            spread_percent=float(self.spread_percent[row]),
+        )
+
+
+@dataclass
+class BatchValidationResult:
+    """
+    Outcome of evaluating a rule chain over a CandidateTable.
+
+    Attributes:
+        table: The evaluated candidates
+        rules: Rule chain, in evaluation order
+        long_code: RejectionCode per row for the long side (NONE if not rejected)
+        short_code: RejectionCode per row for the short side
+        failed_rule: Index into rules of the first failing rule (-1 if passed)
+        custom_results: ValidationResult per row rejected by a custom rule
+    """
+
+    table: CandidateTable
+    rules: Sequence[ValidationRule]
+    long_code: np.ndarray
+    short_code: np.ndarray
+    failed_rule: np.ndarray
+    custom_results: Dict[int, ValidationResult]
+
+    @property
+    def passed(self) -> np.ndarray:
+        """Boolean mask of rows that passed every rule."""
+        return self.failed_rule < 0
+
+    def passed_tickers(self) -> List[str]:
+        """Tickers that passed every rule, in table order."""
+        return [self.table.tickers[row] for row in np.flatnonzero(self.passed)]
+
+    def rejected_rows(self) -> np.ndarray:
+        """Row indices rejected by some rule."""
+        return np.flatnonzero(~self.passed)
+
+    def render_reasons(self, row: int) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Render the human-readable (reason_long, reason_short) of one row.
+
+        Args:
+            row: Row index
+
+        Returns:
+            The exact reasons the failing rule's validate() would have returned
+        """
+        rule_index = int(self.failed_rule[row])
+        if rule_index < 0:
+            return None, None
+        if row in self.custom_results:
+            result = self.custom_results[row]
+            return result.reason_long, result.reason_short
+        rule = self.rules[rule_index]
+        return (
+            _render_reason(RejectionCode(int(self.long_code[row])), rule, self.table, row),
+            _render_reason(RejectionCode(int(self.short_code[row])), rule, self.table, row),
+        )
+
+    def collect_rejections(self, collector: RejectionCollector, indicator: str) -> int:
+        """
+        Render reasons and add one rejection record per rejected row.
+
+        Args:
+            collector: RejectionCollector receiving the records
+            indicator: Name of the trading indicator
+
+        Returns:
+            Number of records added
+        """
+        rows = self.rejected_rows()
+        for row in rows:
+            reason_long, reason_short = self.render_reasons(row)
+            collector.add_rejection(
+                ticker=self.table.tickers[row],
+                indicator=indicator,
+                reason_long=reason_long,
+                reason_short=reason_short,
+                technical_indicators=self.table.trend_metrics(row).to_dict(),
+            )
+        return len(rows)
+
+
+class BatchValidationEvaluator:
+    """
+    Evaluates a chain of ValidationRule instances over a CandidateTable.
+
+    Built-in rules are evaluated as numpy masks using the thresholds of the
+    given rule instances. Any other ValidationRule subclass falls back to its
+    own validate() for the rows still active when it is reached.
+    """
+
+    def __init__(self, rules: Sequence[ValidationRule]):
+        """
+        Initialize the evaluator.
+
+        Args:
+            rules: Rule chain; a ticker is rejected by the first rule that fails
+        """
+        self.rules = list(rules)
+
+    def evaluate(self, table: CandidateTable) -> BatchValidationResult:
+        """
+        Run the rule chain over every row with short-circuiting.
+
+        Args:
+            table: Candidate table to validate
+
+        Returns:
+            BatchValidationResult with per-row rejection codes
+        """
+        n = len(table)
+        long_code = np.zeros(n, dtype=np.int8)
+        short_code = np.zeros(n, dtype=np.int8)
+        failed_rule = np.full(n, -1, dtype=np.int16)
+        custom_results: Dict[int, ValidationResult] = {}
+        active = np.arange(n)
+
+        for rule_index, rule in enumerate(self.rules):
+            if not len(active):
+                break
+            mask_fn = _RULE_MASKS.get(type(rule))
+            if mask_fn is not None:
+                fail_long, fail_short = mask_fn(rule, table, active)
+            else:
+                fail_long, fail_short = _custom_rule_masks(rule, table, active, custom_results)
+
+            failed = (fail_long != RejectionCode.NONE) | (fail_short != RejectionCode.NONE)
+            if not failed.any():
+                continue
+            rows = active[failed]
+            long_code[rows] = fail_long[failed]
+            short_code[rows] = fail_short[failed]
+            failed_rule[rows] = rule_index
+            active = active[~failed]
+
+        return BatchValidationResult(
+            table=table,
+            rules=self.rules,
+            long_code=long_code,
+            short_code=short_code,
+            failed_rule=failed_rule,
+            custom_results=custom_results,
+        )
+
+
+# ----------------------------------------------------------------------
+# Vectorized rule masks: (rule, table, active rows) -> (long codes, short codes)
+# ----------------------------------------------------------------------
+
+
+def _codes(size: int) -> Tuple[np.ndarray, np.ndarray]:
+    return np.zeros(size, dtype=np.int8), np.zeros(size, dtype=np.int8)
+
+
+def _data_quality_masks(rule: DataQualityRule, table: CandidateTable, rows: np.ndarray):
+    fail_long, fail_short = _codes(len(rows))
+    bar_count = table.bar_count[rows]
+    fail_long[bar_count < rule.required_bars] = RejectionCode.INSUFFICIENT_BARS
+    fail_long[bar_count == 0] = RejectionCode.NO_MARKET_DATA
+    fail_short[:] = fail_long
+    return fail_long, fail_short
+
+
+def _liquidity_masks(rule: LiquidityRule, table: CandidateTable, rows: np.ndarray):
+    fail_long, fail_short = _codes(len(rows))
+    fail_long[table.spread_percent[rows] > rule.max_spread_percent] = RejectionCode.SPREAD_TOO_WIDE
+    fail_long[(table.bid[rows] <= 0) | (table.ask[rows] <= 0)] = RejectionCode.INVALID_QUOTE
+    fail_short[:] = fail_long
+    return fail_long, fail_short
+
+
+def _trend_direction_masks(rule: TrendDirectionRule, table: CandidateTable, rows: np.ndarray):
+    fail_long, fail_short = _codes(len(rows))
+    momentum = table.momentum_score[rows]
+    fail_long[momentum < 0] = RejectionCode.DOWNWARD_TREND
+    fail_short[momentum > 0] = RejectionCode.UPWARD_TREND
+    return fail_long, fail_short
+
+
+def _continuation_masks(rule: ContinuationRule, table: CandidateTable, rows: np.ndarray):
+    fail_long, fail_short = _codes(len(rows))
+    momentum = table.momentum_score[rows]
+    weak = table.continuation_score[rows] < rule.min_continuation
+    fail_long[weak & (momentum > 0)] = RejectionCode.WEAK_CONTINUATION_AT_PEAK
+    fail_short[weak & (momentum < 0)] = RejectionCode.WEAK_CONTINUATION_AT_BOTTOM
+    return fail_long, fail_short
+
+
+def _price_extreme_masks(rule: PriceExtremeRule, table: CandidateTable, rows: np.ndarray):
+    fail_long, fail_short = _codes(len(rows))
+    momentum = table.momentum_score[rows]
+    current = table.mid_price[rows]
+    peak = table.peak_price[rows]
+    bottom = table.bottom_price[rows]
+    valid = (current > 0) & (peak > 0) & (bottom > 0)
+    threshold = rule.extreme_threshold_percent
+    with np.errstate(divide="ignore", invalid="ignore"):
+        near_peak = ((current - peak) / peak) * 100 > -threshold
+        near_bottom = ((current - bottom) / bottom) * 100 < threshold
+    fail_long[valid & (momentum > 0) & near_peak] = RejectionCode.AT_PEAK
+    fail_short[valid & (momentum < 0) & near_bottom] = RejectionCode.AT_BOTTOM
+    return fail_long, fail_short
+
+
+def _momentum_threshold_masks(rule: MomentumThresholdRule, table: CandidateTable, rows: np.ndarray):
+    fail_long, fail_short = _codes(len(rows))
+    momentum = table.momentum_score[rows]
+    abs_momentum = np.abs(momentum)
+    weak = abs_momentum < rule.min_momentum
+    # The weak check runs first in validate(); an excessive value only
+    # rejects when the weak check did not
+    excessive = ~weak & (abs_momentum > rule.max_momentum)
+    fail_long[weak & (momentum > 0)] = RejectionCode.WEAK_UPWARD_MOMENTUM
+    fail_short[weak & (momentum < 0)] = RejectionCode.WEAK_DOWNWARD_MOMENTUM
+    fail_long[excessive & (momentum > 0)] = RejectionCode.EXCESSIVE_UPWARD_MOMENTUM
+    fail_short[excessive & (momentum < 0)] = RejectionCode.EXCESSIVE_DOWNWARD_MOMENTUM
+    return fail_long, fail_short
+
+
+def _custom_rule_masks(
+    rule: ValidationRule,
+    table: CandidateTable,
+    rows: np.ndarray,
+    custom_results: Dict[int, ValidationResult],
+):
+    fail_long, fail_short = _codes(len(rows))
+    for position, row in enumerate(rows):
+        result = rule.validate(
+            table.tickers[row],
+            table.trend_metrics(row),
+            table.quote_data(row),
+            table.bars[row] or [],
+        )
+        if not result.passed:
+            custom_results[int(row)] = result
+            fail_long[position] = RejectionCode.CUSTOM_RULE
+            fail_short[position] = RejectionCode.CUSTOM_RULE
+    return fail_long, fail_short
+
+
+_RULE_MASKS = {
+    DataQualityRule: _data_quality_masks,
+    LiquidityRule: _liquidity_masks,
+    TrendDirectionRule: _trend_direction_masks,
+    ContinuationRule: _continuation_masks,
+    PriceExtremeRule: _price_extreme_masks,
+    MomentumThresholdRule: _momentum_threshold_masks,
+}
+
+
+# ----------------------------------------------------------------------
+# Reason rendering (must stay in sync with the messages in rules.py)
+# ----------------------------------------------------------------------
+
+
+def _render_reason(
+    code: RejectionCode, rule: ValidationRule, table: CandidateTable, row: int
+) -> Optional[str]:
+    if code == RejectionCode.NONE:
+        return None
+
+    momentum = float(table.momentum_score[row])
+    continuation = float(table.continuation_score[row])
+    current_price = float(table.mid_price[row])
+
+    if code == RejectionCode.NO_MARKET_DATA:
+        return "No market data response"
+    if code == RejectionCode.INSUFFICIENT_BARS:
+        return f"Insufficient bars data (need {rule.required_bars}, got {int(table.bar_count[row])})"
+    if code == RejectionCode.INVALID_QUOTE:
+        return f"Invalid bid/ask: bid={float(table.bid[row])}, ask={float(table.ask[row])}"
+    if code == RejectionCode.SPREAD_TOO_WIDE:
+        return (
+            f"Bid-ask spread too wide: {float(table.spread_percent[row]):.2f}% > "
+            f"{rule.max_spread_percent}%"
+        )
+    if code == RejectionCode.DOWNWARD_TREND:
+        return f"Recent bars show downward trend ({momentum:.2f}%), not suitable for long entry"
+    if code == RejectionCode.UPWARD_TREND:
+        return f"Recent bars show upward trend ({momentum:.2f}%), not suitable for short entry"
+    if code == RejectionCode.WEAK_CONTINUATION_AT_PEAK:
+        return (
+            f"Recent bars show upward trend but trend is not continuing strongly "
+            f"(continuation={continuation:.2f} < {rule.min_continuation}) - "
+            f"likely at peak, avoid long entry"
+        )
+    if code == RejectionCode.WEAK_CONTINUATION_AT_BOTTOM:
+        return (
+            f"Recent bars show downward trend but trend is not continuing strongly "
+            f"(continuation={continuation:.2f} < {rule.min_continuation}) - "
+            f"likely at bottom, avoid short entry"
+        )
+    if code == RejectionCode.AT_PEAK:
+        peak_price = float(table.peak_price[row])
+        price_vs_peak = ((current_price - peak_price) / peak_price) * 100
+        return (
+            f"Current price ${current_price:.4f} is at/near peak ${peak_price:.4f} "
+            f"(diff: {price_vs_peak:.2f}%) - likely at peak, avoid long entry"
+        )
+    if code == RejectionCode.AT_BOTTOM:
+        bottom_price = float(table.bottom_price[row])
+        price_vs_bottom = ((current_price - bottom_price) / bottom_price) * 100
+        return (
+            f"Current price ${current_price:.4f} is at/near bottom ${bottom_price:.4f} "
+            f"(diff: {price_vs_bottom:.2f}%) - likely at bottom, avoid short entry"
+        )
+    if code == RejectionCode.WEAK_UPWARD_MOMENTUM:
+        return (
+            f"Recent bars show weak upward trend: {momentum:.2f}% < "
+            f"minimum threshold {rule.min_momentum}% (trend not strong enough for long entry)"
+        )
+    if code == RejectionCode.WEAK_DOWNWARD_MOMENTUM:
+        return (
+            f"Recent bars show weak downward trend: {momentum:.2f}% < "
+            f"minimum threshold {rule.min_momentum}% (trend not strong enough for short entry)"
+        )
+    if code == RejectionCode.EXCESSIVE_UPWARD_MOMENTUM:
+        return (
+            f"Recent bars show excessive upward trend: {momentum:.2f}% > "
+            f"maximum threshold {rule.max_momentum}% (likely at peak, avoid long entry)"
+        )
+    if code == RejectionCode.EXCESSIVE_DOWNWARD_MOMENTUM:
+        return (
+            f"Recent bars show excessive downward trend: {momentum:.2f}% > "
+            f"maximum threshold {rule.max_momentum}% (likely at bottom, avoid short entry)"
+        )
+    return None
@@ -76,6 +76,15 @@ class RejectionCollector:
         """
         return self._records.copy()
     
+    def merge(self, other: "RejectionCollector") -> None:
+        """
+        Append the records collected by another collector.
+
+        Args:
+            other: Collector filled elsewhere (e.g. by a compute-executor job)
+        """
+        self._records.extend(other._records)
+
     def clear(self) -> None:
         """Clear all collected records."""
         self._records.clear()
@@ -6,6 +6,9 @@ continuation score, and price extremes.
 """
 
 from typing import List, Dict, Any
+
+import numpy as np
+
 from app.src.services.trading.validation.models import TrendMetrics
 
 
@@ -58,22 +61,13 @@ class TrendAnalyzer:
                 reason="Insufficient bars data"
             )
         
-        # Extract recent bars
+        # Extract recent bars and their close prices
         recent_bars = (
             bars[-cls.RECENT_BARS_COUNT:]
             if len(bars) >= cls.RECENT_BARS_COUNT
             else bars
         )
-        
-        # Extract close prices
-        prices = []
-        for bar in recent_bars:
-            try:
-                close_price = bar.get("c")
-                if close_price is not None:
-                    prices.append(float(close_price))
-            except (ValueError, TypeError):
-                continue
+        prices = cls.extract_recent_closes(bars)
         
         # Validate we have enough valid prices
         if len(prices) < 3:
@@ -136,12 +130,14 @@ class TrendAnalyzer:
         )
         
         # Build reason string
-        reason = (
-            f"Recent trend ({len(recent_bars)} bars): "
-            f"{overall_change_percent:.2f}% change, "
-            f"{up_moves} up/{down_moves} down moves, "
-            f"peak=${peak_price:.4f}, bottom=${bottom_price:.4f}, "
-            f"continuation={recent_continuation:.2f}"
+        reason = cls.format_reason(
+            len(recent_bars),
+            overall_change_percent,
+            up_moves,
+            down_moves,
+            peak_price,
+            bottom_price,
+            recent_continuation,
         )
         
         return TrendMetrics(
@@ -152,6 +148,108 @@ class TrendAnalyzer:
             reason=reason
         )
     
+    @classmethod
+    def extract_recent_closes(cls, bars: List[Dict[str, Any]]) -> List[float]:
+        """
+        Extract valid close prices from the most recent bars.
+        
+        Args:
+            bars: List of price bar dictionaries with 'c' (close) prices
+            
+        Returns:
+            Close prices of the last RECENT_BARS_COUNT bars, skipping missing
+            or non-numeric values
+        """
+        prices = []
+        for bar in bars[-cls.RECENT_BARS_COUNT:]:
+            try:
+                close_price = bar.get("c")
+                if close_price is not None:
+                    prices.append(float(close_price))
+            except (ValueError, TypeError):
+                continue
+        return prices
+    
+    @classmethod
+    def format_reason(
+        cls,
+        recent_bars_count: int,
+        overall_change_percent: float,
+        up_moves: int,
+        down_moves: int,
+        peak_price: float,
+        bottom_price: float,
+        continuation: float,
+    ) -> str:
+        """Human-readable description of a trend calculation."""
+        return (
+            f"Recent trend ({recent_bars_count} bars): "
+            f"{overall_change_percent:.2f}% change, "
+            f"{up_moves} up/{down_moves} down moves, "
+            f"peak=${peak_price:.4f}, bottom=${bottom_price:.4f}, "
+            f"continuation={continuation:.2f}"
+        )
+    
+    @classmethod
+    def calculate_trend_arrays(cls, prices: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Vectorized trend metrics for many tickers at once.
+        
+        Same algorithm as calculate_trend_metrics, applied to every row of a
+        (tickers x window) matrix of valid close prices. All rows must have the
+        same window length (at least 3); no reason strings are built.
+        
+        Args:
+            prices: 2-D float array, one row of recent closes per ticker
+            
+        Returns:
+            Dictionary of 1-D arrays: momentum_score, continuation_score,
+            peak_price, bottom_price, overall_change_percent, up_moves, down_moves
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        first_price = prices[:, 0]
+        last_price = prices[:, -1]
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            overall_change_percent = np.where(
+                first_price > 0, ((last_price - first_price) / first_price) * 100, 0.0
+            )
+        
+        price_changes = np.diff(prices, axis=1)
+        moves = price_changes.shape[1]
+        up_moves = (price_changes > 0).sum(axis=1)
+        down_moves = (price_changes < 0).sum(axis=1)
+        
+        consistency_score = ((up_moves - down_moves) / moves) * 100
+        momentum_score = (
+            cls.MOMENTUM_OVERALL_WEIGHT * overall_change_percent +
+            cls.MOMENTUM_CONSISTENCY_WEIGHT * consistency_score
+        )
+        trend_strength = np.maximum(up_moves, down_moves) / moves
+        momentum_score = np.where(
+            trend_strength < cls.MIN_TREND_STRENGTH,
+            momentum_score * cls.TREND_STRENGTH_PENALTY,
+            momentum_score,
+        )
+        
+        # Continuation over the last 2 changes (last 3 prices) in trend direction
+        recent_changes = price_changes[:, -2:]
+        continuation_score = np.where(
+            momentum_score > 0,
+            (recent_changes > 0).sum(axis=1),
+            (recent_changes < 0).sum(axis=1),
+        ) / recent_changes.shape[1]
+        
+        return {
+            "momentum_score": momentum_score,
+            "continuation_score": continuation_score,
+            "peak_price": prices.max(axis=1),
+            "bottom_price": prices.min(axis=1),
+            "overall_change_percent": overall_change_percent,
+            "up_moves": up_moves,
+            "down_moves": down_moves,
+        }
+    
     @classmethod
     def _calculate_continuation(cls, prices: List[float], momentum_score: float) -> float:
         """
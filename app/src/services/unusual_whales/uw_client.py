@@ -10,12 +10,25 @@ API Documentation: https://api.unusualwhales.com/docs
 
 import os
 import asyncio
+import time
 from collections import OrderedDict
 from datetime import datetime, date, timedelta, timezone
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from enum import Enum
 import aiohttp
 from app.src.common.loguru_logger import logger
+from app.src.common.metrics import Metrics
+from app.src.config.constants import (
+    UW_CACHE_MAX_ENTRIES,
+    UW_CACHE_TTL_DARKPOOL_SECONDS,
+    UW_CACHE_TTL_FLOW_SECONDS,
+    UW_CACHE_TTL_MARKET_TIDE_SECONDS,
+    UW_CACHE_TTL_STOCK_INFO_SECONDS,
+    UW_MAX_CONCURRENT_REQUESTS,
+    UW_RATE_LIMIT_BURST,
+    UW_RATE_LIMIT_PER_SECOND,
+    UW_REQUEST_TIMEOUT,
+)
 
 
 class FlowSentiment(Enum):
@@ -26,6 +39,32 @@ class FlowSentiment(Enum):
     MIXED = "mixed"
 
 
+class _TokenBucket:
+    """
+    Token bucket that lets concurrent callers reserve request slots.
+
+    Each acquire() takes a token immediately; when the bucket is empty the
+    balance goes negative and the caller sleeps until its token has accrued,
+    so N concurrent callers are spread at the sustained rate instead of being
+    serialized behind one another's round trips.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = max(rate_per_second, 0.001)
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+
+    async def acquire(self):
+        """Reserve one request slot, sleeping until it is available"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+        self._tokens -= 1.0
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
 class UnusualWhalesClient:
     """
     Client for Unusual Whales API
@@ -36,6 +75,12 @@ class UnusualWhalesClient:
     - Market sentiment (put/call ratios, flow sentiment)
     - Institutional activity signals
     
+    Requests share one pooled aiohttp session, run concurrently under a
+    token-bucket rate limit, and identical in-flight requests are coalesced.
+    Market tide, dark pool, flow and stock info responses are cached per
+    endpoint for their configured TTL; cached payloads are shared between
+    callers and must be treated as read-only.
+    
     Usage:
         client = UnusualWhalesClient()
         flow_data = await client.get_stock_flow("AAPL")
@@ -44,6 +89,17 @@ class UnusualWhalesClient:
     
     BASE_URL = "https://api.unusualwhales.com"
     
+    # Endpoint label -> cache group (labels come from _endpoint_label)
+    CACHE_GROUPS = {
+        "/api/market/tide": "market_tide",
+        "/api/darkpool/recent": "darkpool",
+        "/api/darkpool/ticker/{ticker}": "darkpool",
+        "/api/stock/{ticker}/flow": "flow",
+        "/api/stock/{ticker}/flow-summary": "flow",
+        "/api/option-trades/flow-alerts": "flow",
+        "/api/stock/{ticker}": "stock_info",
+    }
+    
     def __init__(self, api_token: Optional[str] = None):
         """
         Initialize Unusual Whales client.
@@ -52,9 +108,23 @@ class UnusualWhalesClient:
             api_token: API token (or set UW_API_TOKEN env var)
         """
         self._api_token = api_token or os.environ.get("UW_API_TOKEN", "")
-        self._timeout = aiohttp.ClientTimeout(total=15)
-        self._rate_limit_delay = 0.2  # 200ms between requests
-        self._last_request_time = 0.0
+        self._timeout = aiohttp.ClientTimeout(total=UW_REQUEST_TIMEOUT)
+        self._max_concurrent = max(1, UW_MAX_CONCURRENT_REQUESTS)
+        self._bucket = _TokenBucket(UW_RATE_LIMIT_PER_SECOND, UW_RATE_LIMIT_BURST)
+        self._cache_ttls: Dict[str, float] = {
+            "market_tide": UW_CACHE_TTL_MARKET_TIDE_SECONDS,
+            "darkpool": UW_CACHE_TTL_DARKPOOL_SECONDS,
+            "flow": UW_CACHE_TTL_FLOW_SECONDS,
+            "stock_info": UW_CACHE_TTL_STOCK_INFO_SECONDS,
+        }
+        self._cache_max_entries = max(1, UW_CACHE_MAX_ENTRIES)
+        self._cache: "OrderedDict[tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        
+        # Loop-bound state, (re)created on first use in each event loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[tuple, asyncio.Future] = {}
         
         if not self._api_token:
             logger.warning(
@@ -75,15 +145,70 @@ class UnusualWhalesClient:
             "Content-Type": "application/json",
         }
     
-    async def _rate_limit(self):
-        """Enforce rate limiting between requests"""
-        import time
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-        if time_since_last < self._rate_limit_delay:
-            await asyncio.sleep(self._rate_limit_delay - time_since_last)
-        self._last_request_time = time.time()
+    def _bind_loop(self):
+        """Reset loop-bound primitives when called from a new event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._session = None
+            self._semaphore = asyncio.Semaphore(self._max_concurrent)
+            self._inflight = {}
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the pooled session (keep-alive connections are reused)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._max_concurrent,
+                ttl_dns_cache=300,
+                keepalive_timeout=30,
+                enable_cleanup_closed=True,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self._timeout
+            )
+            logger.debug("Created pooled Unusual Whales API session")
+        return self._session
+    
+    async def close(self):
+        """Close the pooled session. Call this when shutting down the application."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.debug("Closed pooled Unusual Whales API session")
+        self._session = None
     
+    def clear_cache(self):
+        """Drop all cached responses"""
+        self._cache.clear()
+    
+    @staticmethod
+    def _endpoint_label(endpoint: str) -> str:
+        """Endpoint path with ticker segments collapsed (keeps metric labels bounded)"""
+        return "/".join(
+            "{ticker}" if part and part.upper() == part and any(c.isalpha() for c in part) else part
+            for part in endpoint.split("/")
+        )
+
+    def _cache_ttl(self, endpoint_label: str) -> float:
+        group = self.CACHE_GROUPS.get(endpoint_label)
+        return self._cache_ttls.get(group, 0.0) if group else 0.0
+
+    def _cache_get(self, key: tuple) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+        expires_at, data = entry
+        if time.monotonic() >= expires_at:
+            del self._cache[key]
+            return False, None
+        self._cache.move_to_end(key)
+        return True, data
+
+    def _cache_put(self, key: tuple, data: Dict[str, Any], ttl: float):
+        self._cache[key] = (time.monotonic() + ttl, data)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_max_entries:
+            self._cache.popitem(last=False)
+
     async def _make_request(
         self, 
         endpoint: str, 
@@ -92,6 +217,9 @@ class UnusualWhalesClient:
         """
         Make authenticated request to Unusual Whales API.
         
+        Served from the per-endpoint cache when fresh; concurrent identical
+        requests share one HTTP call.
+        
         Args:
             endpoint: API endpoint path (e.g., "/api/stock/AAPL/flow")
             params: Optional query parameters
@@ -103,22 +231,78 @@ class UnusualWhalesClient:
             logger.debug("Unusual Whales API not configured, skipping request")
             return None
         
-        await self._rate_limit()
+        self._bind_loop()
+        endpoint_label = self._endpoint_label(endpoint)
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        ttl = self._cache_ttl(endpoint_label)
+        
+        if ttl > 0:
+            hit, data = self._cache_get(key)
+            if hit:
+                Metrics.inc(
+                    "api_cache_requests_total", api="unusual_whales", endpoint=endpoint_label, result="hit"
+                )
+                return data
+        
+        pending = self._inflight.get(key)
+        if pending is not None:
+            Metrics.inc(
+                "api_cache_requests_total", api="unusual_whales", endpoint=endpoint_label, result="joined"
+            )
+            return await asyncio.shield(pending)
         
+        if ttl > 0:
+            Metrics.inc(
+                "api_cache_requests_total", api="unusual_whales", endpoint=endpoint_label, result="miss"
+            )
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._fetch(endpoint, params, endpoint_label)
+        except BaseException:
+            # Joiners get the failed-request result (None), not the leader's
+            # cancellation or error
+            self._inflight.pop(key, None)
+            if not future.done():
+                future.set_result(None)
+            raise
+        else:
+            if result is not None and ttl > 0:
+                self._cache_put(key, result, ttl)
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _fetch(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        endpoint_label: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Perform one rate-limited HTTP request on the pooled session"""
         url = f"{self.BASE_URL}{endpoint}"
         
-        try:
-            async with aiohttp.ClientSession(timeout=self._timeout) as session:
-                async with session.get(
+        async with self._semaphore:
+            await self._bucket.acquire()
+            try:
+                async with self._get_session().get(
                     url,
                     headers=self._get_headers(),
                     params=params
                 ) as response:
+                    Metrics.inc(
+                        "api_requests_total",
+                        api="unusual_whales",
+                        endpoint=endpoint_label,
+                        status=f"{response.status // 100}xx",
+                    )
                     if response.status == 200:
                         return await response.json()
                     elif response.status == 401:
                         logger.error("Unusual Whales API: Unauthorized - check API token")
                     elif response.status == 429:
+                        Metrics.inc("api_rate_limited_total", api="unusual_whales", endpoint=endpoint_label)
                         logger.warning("Unusual Whales API: Rate limited")
                         await asyncio.sleep(1.0)
                     elif response.status == 404:
@@ -129,15 +313,48 @@ class UnusualWhalesClient:
                             f"Unusual Whales API error {response.status}: {error_text[:200]}"
                         )
                     return None
-        except asyncio.TimeoutError:
-            logger.warning(f"Unusual Whales API timeout: {endpoint}")
-            return None
-        except aiohttp.ClientError as e:
-            logger.error(f"Unusual Whales API client error: {e}")
-            return None
-        except Exception as e:
-            logger.exception(f"Unusual Whales API unexpected error: {e}")
-            return None
+            except asyncio.TimeoutError:
+                logger.warning(f"Unusual Whales API timeout: {endpoint}")
+                return None
+            except aiohttp.ClientError as e:
+                logger.error(f"Unusual Whales API client error: {e}")
+                return None
+            except Exception as e:
+                logger.exception(f"Unusual Whales API unexpected error: {e}")
+                return None
+
+    async def prefetch(
+        self,
+        tickers: Iterable[str],
+        flow_limit: int = 100,
+        include_darkpool: bool = False,
+    ) -> int:
+        """
+        Warm the response cache for a whole candidate list concurrently.
+        
+        Fetches market tide once plus recent flow (at the depth used by
+        analyze_flow_sentiment) and optionally dark pool data per ticker, so
+        the per-ticker analysis calls that follow are served from cache.
+        
+        Args:
+            tickers: Candidate tickers
+            flow_limit: Flow depth to fetch (must match the later calls)
+            include_darkpool: Also prefetch per-ticker dark pool data
+            
+        Returns:
+            Number of requests that returned data
+        """
+        if not self.is_configured:
+            return 0
+        
+        requests = [self.get_market_tide()]
+        for ticker in dict.fromkeys(t.upper() for t in tickers):
+            requests.append(self.get_stock_flow_recent(ticker, limit=flow_limit))
+            if include_darkpool:
+                requests.append(self.get_darkpool_ticker(ticker))
+        
+        results = await asyncio.gather(*requests, return_exceptions=True)
+        return sum(1 for r in results if r is not None and not isinstance(r, BaseException))
 
     # =========================================================================
     # Options Flow Endpoints
@@ -849,3 +1066,8 @@ def get_unusual_whales_client() -> UnusualWhalesClient:
         _client_instance = UnusualWhalesClient()
     return _client_instance
 
+
+async def close_unusual_whales_client() -> None:
+    """Close the singleton client's pooled session (called on shutdown)"""
+    if _client_instance is not None:
+        await _client_instance.close()
@@ -1,19 +1,15 @@
 import asyncio
 from typing import Optional
 
-import requests
-
 from app.src.common.loguru_logger import logger
 from app.src.config.constants import (
     BUY_TO_CLOSE,
     BUY_TO_OPEN,
     SELL_TO_CLOSE,
     SELL_TO_OPEN,
-    WEBHOOK_RETRY_ATTEMPTS,
-    WEBHOOK_RETRY_DELAY,
-    WEBHOOK_TIMEOUT,
     WEBHOOK_URLS,
 )
+from app.src.services.webhook.webhook_dispatcher import get_webhook_dispatcher
 
 from app.src.common.alpaca import AlpacaClient
 
@@ -186,73 +182,14 @@ async def _send_signal_to_webhook_impl(  # noqa: C901
     # Log payload for debugging (excluding sensitive data)
     logger.debug(f"📦 Webhook payload for {ticker} {action}: {payload}")
 
-    # Send to all webhook URLs with improved retry logic and circuit breaker pattern
-    webhook_success = False
-    last_error = None
-
-    def _send_webhook_request(url: str, data: dict) -> requests.Response:
-        """Helper function to send webhook request."""
-        return requests.post(
-            url,
-            json=data,
-            timeout=WEBHOOK_TIMEOUT,
-            headers={
-                "Content-Type": "application/json",
-                "Connection": "close",
-            },
-        )
-
-    for attempt in range(WEBHOOK_RETRY_ATTEMPTS):
-        # Try all webhook URLs for each attempt
-        for webhook_url in WEBHOOK_URLS:
-            try:
-                # Use asyncio wait_for for timeout control (compatible with Python
-                # 3.10)
-                loop = asyncio.get_event_loop()
-                # Run the blocking request in a thread pool to avoid blocking the
-                # event loop
-                response = await asyncio.wait_for(
-                    loop.run_in_executor(
-                        None,
-                        _send_webhook_request,
-                        webhook_url,
-                        payload,
-                    ),
-                    timeout=WEBHOOK_TIMEOUT,
-                )
-                response.raise_for_status()
-                logger.info(
-                    f"✅ Webhook sent {action} signal for {ticker} to {webhook_url} (attempt {attempt + 1}) | "
-                    f"Status: {response.status_code} | Response: {response.text[:200]}"
-                )
-                webhook_success = True
+    # Fan out to all webhook URLs concurrently over the pooled keep-alive
+    # session (per-URL retries and circuit breakers live in the dispatcher)
+    webhook_success = await get_webhook_dispatcher().submit(payload, WEBHOOK_URLS)
 
-            except asyncio.TimeoutError:
-                last_error = f"Webhook timeout ({WEBHOOK_TIMEOUT}s)"
-                logger.warning(
-                    f"⏰ Webhook timeout {attempt + 1}/{WEBHOOK_RETRY_ATTEMPTS} for {ticker} to {webhook_url}"
-                )
-            except requests.RequestException as e:
-                last_error = str(e)
-                logger.warning(
-                    f"🔄 Webhook retry {attempt + 1}/{WEBHOOK_RETRY_ATTEMPTS} for {ticker} to {webhook_url}: {str(e)}"
-                )
-            except Exception as e:
-                last_error = str(e)
-                logger.warning(
-                    f"❌ Unexpected webhook error for {ticker} to {webhook_url}: {last_error}"
-                )
-
-        # Only retry if we have attempts left and haven't succeeded
-        if webhook_success:
-            break
-        if attempt < WEBHOOK_RETRY_ATTEMPTS - 1:
-            await asyncio.sleep(WEBHOOK_RETRY_DELAY)
-
-    if not webhook_success:
-        logger.error(
-            f"❌ All webhook attempts failed for {action} signal {ticker}: {last_error}"
-        )
+    if webhook_success:
+        logger.info(f"✅ Webhook {action} signal for {ticker} accepted")
+    elif WEBHOOK_URLS:
+        logger.error(f"❌ All webhook attempts failed for {action} signal {ticker}")
 
     return webhook_success
 
@@ -0,0 +1,341 @@
+"""
+Pooled, keep-alive async webhook dispatcher.
+
+- One aiohttp ClientSession with a persistent connection pool (no TCP+TLS
+  handshake per signal)
+- Concurrent fan-out to every configured URL; retries for one slow or failing
+  URL never delay delivery to the others
+- Per-URL circuit breaker so a dead receiver is skipped instead of eating the
+  retry budget on every signal
+- Optional durable outbox (see webhook_outbox.py): signals are persisted and
+  delivered by a background worker, so trading cycles don't wait on receivers
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import aiohttp
+
+from app.src.common.loguru_logger import logger
+from app.src.common.metrics import Metrics
+from app.src.config.constants import (
+    WEBHOOK_CIRCUIT_FAILURE_THRESHOLD,
+    WEBHOOK_CIRCUIT_RESET_SECONDS,
+    WEBHOOK_OUTBOX_MAX_AGE_SECONDS,
+    WEBHOOK_OUTBOX_PATH,
+    WEBHOOK_POOL_SIZE,
+    WEBHOOK_RETRY_ATTEMPTS,
+    WEBHOOK_RETRY_DELAY,
+    WEBHOOK_TIMEOUT,
+)
+from app.src.services.webhook.webhook_outbox import WebhookOutbox
+
+
+@dataclass
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for a single webhook URL"""
+
+    failure_threshold: int = WEBHOOK_CIRCUIT_FAILURE_THRESHOLD
+    reset_timeout_seconds: float = WEBHOOK_CIRCUIT_RESET_SECONDS
+    consecutive_failures: int = 0
+    opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout_seconds:
+            return "half_open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        """Closed and half-open (probe) circuits allow requests"""
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.failure_threshold:
+            # Re-arm on a failed half-open probe as well
+            self.opened_at = time.monotonic()
+
+
+class WebhookDispatcher:
+    """Delivers webhook payloads over a shared keep-alive connection pool"""
+
+    def __init__(
+        self,
+        timeout_seconds: float = WEBHOOK_TIMEOUT,
+        retry_attempts: int = WEBHOOK_RETRY_ATTEMPTS,
+        retry_delay_seconds: float = WEBHOOK_RETRY_DELAY,
+        pool_size: int = WEBHOOK_POOL_SIZE,
+        outbox_path: str = WEBHOOK_OUTBOX_PATH,
+        outbox_max_age_seconds: float = WEBHOOK_OUTBOX_MAX_AGE_SECONDS,
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            timeout_seconds: Per-request timeout
+            retry_attempts: Attempts per URL for direct (non-outbox) delivery
+            retry_delay_seconds: Base delay between attempts (doubled per attempt)
+            pool_size: Max keep-alive connections per host
+            outbox_path: SQLite outbox path; empty string disables the outbox
+            outbox_max_age_seconds: Outbox entries older than this are dropped
+        """
+        self.timeout_seconds = timeout_seconds
+        self.retry_attempts = max(1, retry_attempts)
+        self.retry_delay_seconds = retry_delay_seconds
+        self.pool_size = pool_size
+        self.outbox_max_age_seconds = outbox_max_age_seconds
+        self.outbox: Optional[WebhookOutbox] = WebhookOutbox(outbox_path) if outbox_path else None
+
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.stats: Dict[str, int] = {"sent": 0, "failed": 0, "skipped_open_circuit": 0, "queued": 0}
+
+    # ------------------------------------------------------------------
+    # Connection pool
+    # ------------------------------------------------------------------
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.pool_size,
+                keepalive_timeout=60,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+                headers={"Content-Type": "application/json"},
+            )
+            self._session_loop = loop
+        return self._session
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        """Get (or create) the circuit breaker for a URL"""
+        breaker = self._breakers.get(url)
+        if breaker is None:
+            breaker = CircuitBreaker()
+            self._breakers[url] = breaker
+        return breaker
+
+    # ------------------------------------------------------------------
+    # Delivery
+    # ------------------------------------------------------------------
+
+    async def _post_once(self, url: str, body: str) -> bool:
+        """Single POST attempt; updates the URL's circuit breaker"""
+        breaker = self.breaker(url)
+        if not breaker.allow_request():
+            self.stats["skipped_open_circuit"] += 1
+            logger.debug(f"Webhook circuit open for {url}, skipping")
+            return False
+        try:
+            session = self._get_session()
+            async with session.post(url, data=body) as response:
+                Metrics.inc(
+                    "api_requests_total", api="webhook", endpoint="signal", status=f"{response.status // 100}xx"
+                )
+                text = await response.text()
+                if 200 <= response.status < 300:
+                    breaker.record_success()
+                    self.stats["sent"] += 1
+                    logger.info(
+                        f"✅ Webhook delivered to {url} | Status: {response.status} | "
+                        f"Response: {text[:200]}"
+                    )
+                    return True
+                logger.warning(f"🔄 Webhook {url} returned HTTP {response.status}: {text[:200]}")
+        except asyncio.TimeoutError:
+            logger.warning(f"⏰ Webhook timeout ({self.timeout_seconds}s) for {url}")
+        except aiohttp.ClientError as e:
+            logger.warning(f"🔄 Webhook connection error for {url}: {e}")
+        except Exception as e:
+            logger.warning(f"❌ Unexpected webhook error for {url}: {e}")
+        breaker.record_failure()
+        self.stats["failed"] += 1
+        return False
+
+    async def _deliver_with_retries(self, url: str, body: str) -> bool:
+        for attempt in range(self.retry_attempts):
+            if await self._post_once(url, body):
+                return True
+            if not self.breaker(url).allow_request():
+                return False
+            if attempt < self.retry_attempts - 1:
+                Metrics.inc("api_retries_total", api="webhook", endpoint="signal")
+                await asyncio.sleep(self.retry_delay_seconds * (2 ** attempt))
+        return False
+
+    @Metrics.timed("webhook_dispatch")
+    async def dispatch(self, payload: Dict[str, Any], urls: Sequence[str]) -> Dict[str, bool]:
+        """
+        Deliver a payload to all URLs concurrently (with per-URL retries).
+
+        Args:
+            payload: JSON-serializable payload
+            urls: Webhook URLs
+
+        Returns:
+            Mapping of URL -> delivered
+        """
+        if not urls:
+            return {}
+        body = json.dumps(payload, default=str)
+        results = await asyncio.gather(
+            *(self._deliver_with_retries(url, body) for url in urls),
+            return_exceptions=True,
+        )
+        return {url: result is True for url, result in zip(urls, results)}
+
+    async def submit(self, payload: Dict[str, Any], urls: Sequence[str]) -> bool:
+        """
+        Send a signal. With an outbox the signal is persisted and delivered in
+        the background (returns once durably queued); without one it is
+        delivered directly (returns True if any URL accepted it).
+        """
+        if not urls:
+            return False
+        if self.outbox is None:
+            results = await self.dispatch(payload, urls)
+            return any(results.values())
+
+        body = json.dumps(payload, default=str)
+        await self.outbox.enqueue(urls, body)
+        self.stats["queued"] += len(urls)
+        self._ensure_worker()
+        self._wakeup.set()
+        return True
+
+    # ------------------------------------------------------------------
+    # Outbox worker
+    # ------------------------------------------------------------------
+
+    def start(self) -> bool:
+        """
+        Start the outbox worker (call at boot).
+
+        Its first pass drains rows left undelivered by the previous process,
+        instead of waiting for the next signal to be submitted.
+
+        Returns:
+            True if an outbox worker is running
+        """
+        if self.outbox is None:
+            return False
+        self._ensure_worker()
+        return True
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker_task is None or self._worker_task.done() or self._worker_task.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._worker_task = loop.create_task(self._outbox_worker(), name="WebhookOutboxWorker")
+
+    async def drain_outbox(self) -> int:
+        """Attempt every due outbox entry once; returns number delivered"""
+        if self.outbox is None:
+            return 0
+        entries = await self.outbox.due()
+        if not entries:
+            return 0
+
+        now = time.time()
+        expired = [e.entry_id for e in entries if now - e.created_at > self.outbox_max_age_seconds]
+        if expired:
+            logger.error(f"Dropping {len(expired)} webhook outbox entries older than {self.outbox_max_age_seconds:.0f}s")
+            await self.outbox.ack(expired)
+        live = [e for e in entries if e.entry_id not in set(expired)]
+
+        results = await asyncio.gather(
+            *(self._post_once(e.url, e.body) for e in live), return_exceptions=True
+        )
+        delivered = []
+        for entry, result in zip(live, results):
+            if result is True:
+                delivered.append(entry.entry_id)
+            else:
+                backoff = min(300.0, self.retry_delay_seconds * (2 ** min(entry.attempts, 8)))
+                await self.outbox.retry_later(entry.entry_id, backoff)
+        await self.outbox.ack(delivered)
+        return len(delivered)
+
+    async def _outbox_worker(self) -> None:
+        logger.info(f"Webhook outbox worker started ({self.outbox.path})")
+        while True:
+            try:
+                await self.drain_outbox()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max(1.0, self.retry_delay_seconds))
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"Webhook outbox worker error: {e}")
+                await asyncio.sleep(1.0)
+
+    async def close(self) -> None:
+        """Stop the outbox worker and close pooled connections"""
+        if self._worker_task is not None and not self._worker_task.done():
+            self._worker_task.cancel()
+            await asyncio.gather(self._worker_task, return_exceptions=True)
+        self._worker_task = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Delivery counters and per-URL circuit state"""
+        return {
+            **self.stats,
+            "circuits": {url: breaker.state for url, breaker in self._breakers.items()},
+        }
+
+
+_dispatcher: Optional[WebhookDispatcher] = None
+
+
+def get_webhook_dispatcher() -> WebhookDispatcher:
+    """Get the process-wide dispatcher, creating it from constants on first use"""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = WebhookDispatcher()
+    return _dispatcher
+
+
+def start_webhook_dispatcher() -> bool:
+    """Start the process-wide dispatcher's outbox worker (called at boot)"""
+    return get_webhook_dispatcher().start()
+
+
+async def close_webhook_dispatcher() -> None:
+    """Close the process-wide dispatcher (called on shutdown)"""
+    global _dispatcher
+    if _dispatcher is not None:
+        await _dispatcher.close()
+        if _dispatcher.outbox is not None:
+            _dispatcher.outbox.close()
+        _dispatcher = None
+
+
+__all__: List[str] = [
+    "CircuitBreaker",
+    "WebhookDispatcher",
+    "get_webhook_dispatcher",
+    "start_webhook_dispatcher",
+    "close_webhook_dispatcher",
+]
@@ -0,0 +1,132 @@
+"""
+Durable webhook outbox backed by a local SQLite file.
+
+Each (signal, URL) pair is stored as one row before any delivery attempt and
+deleted only after that URL acknowledged it, which gives at-least-once
+delivery across process restarts. SQLite calls are small and local but still
+run in a worker thread so they never block the event loop.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from app.src.common.loguru_logger import logger
+
+
+@dataclass
+class OutboxEntry:
+    """One pending delivery of a signal body to a single webhook URL"""
+
+    entry_id: int
+    url: str
+    body: str
+    attempts: int
+    created_at: float
+
+
+class WebhookOutbox:
+    """SQLite-backed queue of pending webhook deliveries"""
+
+    def __init__(self, path: str):
+        """
+        Initialize the outbox.
+
+        Args:
+            path: Path to the SQLite file (created if missing)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS webhook_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                body TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_outbox_next ON webhook_outbox (next_attempt_at)"
+        )
+
+    # Synchronous implementations (run in a worker thread)
+
+    def _enqueue_sync(self, urls: Sequence[str], body: str) -> int:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO webhook_outbox (url, body, attempts, next_attempt_at, created_at) "
+                "VALUES (?, ?, 0, ?, ?)",
+                [(url, body, now, now) for url in urls],
+            )
+        return len(urls)
+
+    def _due_sync(self, limit: int) -> List[OutboxEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, url, body, attempts, created_at FROM webhook_outbox "
+                "WHERE next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (time.time(), limit),
+            ).fetchall()
+        return [OutboxEntry(*row) for row in rows]
+
+    def _ack_sync(self, entry_ids: Sequence[int]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM webhook_outbox WHERE id = ?", [(i,) for i in entry_ids]
+            )
+
+    def _retry_later_sync(self, entry_id: int, delay_seconds: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE webhook_outbox SET attempts = attempts + 1, next_attempt_at = ? "
+                "WHERE id = ?",
+                (time.time() + delay_seconds, entry_id),
+            )
+
+    def _pending_count_sync(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM webhook_outbox").fetchone()[0]
+
+    # Async API
+
+    async def enqueue(self, urls: Sequence[str], body: str) -> int:
+        """Persist one pending delivery per URL; returns number of rows written"""
+        if not urls:
+            return 0
+        return await asyncio.to_thread(self._enqueue_sync, list(urls), body)
+
+    async def due(self, limit: int = 50) -> List[OutboxEntry]:
+        """Get deliveries whose next attempt time has passed"""
+        return await asyncio.to_thread(self._due_sync, limit)
+
+    async def ack(self, entry_ids: Sequence[int]) -> None:
+        """Remove delivered (or expired) entries"""
+        if entry_ids:
+            await asyncio.to_thread(self._ack_sync, list(entry_ids))
+
+    async def retry_later(self, entry_id: int, delay_seconds: float) -> None:
+        """Reschedule a failed delivery"""
+        await asyncio.to_thread(self._retry_later_sync, entry_id, delay_seconds)
+
+    async def pending_count(self) -> int:
+        """Number of undelivered entries"""
+        return await asyncio.to_thread(self._pending_count_sync)
+
+    def close(self) -> None:
+        """Close the SQLite connection"""
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception as e:
+                logger.debug(f"Error closing webhook outbox: {e}")
@@ -39,6 +39,7 @@ from app.src.services.trading.trading_config import (
     STANDARD_STOCK_STOP_LOSS_MAX,
 )
 from app.src.services.trading.risk_management import RiskManagement
+from app.src.models.price_series import PriceSeries
 
 
 class MomentumSimulator(BaseIndicatorSimulator):
@@ -80,8 +81,8 @@ class MomentumSimulator(BaseIndicatorSimulator):
             self._current_day = date_str
             self._exit_engine = ExitDecisionEngine()
 
-    def _calculate_momentum(self, datetime_price: Dict[str, float]) -> Tuple[float, str]:
-        """Calculate momentum score from datetime_price dict.
+    def _calculate_momentum(self, datetime_price: Any) -> Tuple[float, str]:
+        """Calculate momentum score from datetime_price (PriceSeries or dict).
 
         Replicates MomentumIndicator._calculate_momentum().
 
@@ -95,9 +96,13 @@ class MomentumSimulator(BaseIndicatorSimulator):
         if not datetime_price or len(datetime_price) < 3:
             return 0.0, "Insufficient price data"
 
-        # Sort by timestamp and extract prices
-        sorted_items = sorted(datetime_price.items())
-        prices = [float(p) for _, p in sorted_items if p and float(p) > 0]
+        if isinstance(datetime_price, PriceSeries):
+            # Already sorted with non-positive prices dropped
+            prices = datetime_price.prices.tolist()
+        else:
+            # Sort by timestamp and extract prices
+            sorted_items = sorted(datetime_price.items())
+            prices = [float(p) for _, p in sorted_items if p and float(p) > 0]
 
         if len(prices) < 3:
             return 0.0, "Insufficient valid prices"
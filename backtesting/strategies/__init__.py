@@ -0,0 +1,20 @@
+"""Strategy plugins evaluated together over one shared data pass."""
+
+from backtesting.strategies.base import (
+    STRATEGY_REGISTRY,
+    StrategyPlugin,
+    StrategyPosition,
+    get_strategies,
+    register_strategy,
+)
+from backtesting.strategies.features import FeatureMatrix
+from backtesting.strategies import plugins  # noqa: F401  (registers the built-in strategies)
+
+__all__ = [
+    "STRATEGY_REGISTRY",
+    "FeatureMatrix",
+    "StrategyPlugin",
+    "StrategyPosition",
+    "get_strategies",
+    "register_strategy",
+]
@@ -0,0 +1,5 @@
+"""Allow running as: python -m backtesting.strategies"""
+from backtesting.strategies.runner import main
+
+if __name__ == "__main__":
+    main()
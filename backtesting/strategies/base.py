@@ -0,0 +1,130 @@
+"""
+Strategy Plugin Interface and Registry.
+
+A strategy plugin turns a shared FeatureMatrix into entry signals for a
+whole ticker at once and decides exits bar by bar for its open positions.
+Plugins register by name so the runner can evaluate any subset of them in
+one pass over the data.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Type
+
+import numpy as np
+
+from backtesting.config import MOMENTUM_BASE_POSITION_SIZE
+from backtesting.models import ActivePosition
+from backtesting.strategies.features import FeatureMatrix
+
+
+@dataclass
+class StrategyPosition(ActivePosition):
+    """An open plugin position; entry_bar_index indexes the ticker's full bar series."""
+    entry_features: Dict[str, float] = field(default_factory=dict)
+
+    def bars_held(self, i: int) -> int:
+        """Number of bars since entry."""
+        return i - self.entry_bar_index
+
+    def peak_profit_percent(self) -> float:
+        """Best profit percentage seen since entry (never below 0)."""
+        return self.profit_percent(self.peak_price)
+
+
+class StrategyPlugin(ABC):
+    """Abstract base class for strategies evaluated by the multi-strategy runner.
+
+    Attributes:
+        name: Registry key, also used as indicator_name on trade records
+        universe: Tickers the strategy trades (None for every ticker)
+        warmup_bars: Bars at the start of the series where entries are ignored
+        max_open_positions: Concurrent positions per ticker
+        max_entries_per_day: Per-ticker daily entry cap (None for no cap)
+        max_entries_per_month: Per-ticker monthly entry cap (None for no cap)
+        position_size: Dollars per position
+    """
+
+    name: str = ""
+    universe: Optional[Sequence[str]] = None
+    warmup_bars: int = 50
+    max_open_positions: int = 1
+    max_entries_per_day: Optional[int] = None
+    max_entries_per_month: Optional[int] = None
+    position_size: float = MOMENTUM_BASE_POSITION_SIZE
+
+    def trades_ticker(self, ticker: str) -> bool:
+        """Return True if the ticker is in this strategy's universe."""
+        return self.universe is None or ticker in self.universe
+
+    @abstractmethod
+    def entry_signals(self, features: FeatureMatrix) -> np.ndarray:
+        """Evaluate entry conditions for every bar at once.
+
+        Frequency caps and position limits are applied by the runner.
+
+        Args:
+            features: Shared features for the ticker
+
+        Returns:
+            int8 array: 1 for a long entry, -1 for a short entry, 0 otherwise
+        """
+        pass
+
+    @abstractmethod
+    def exit_reason(self, features: FeatureMatrix, i: int, position: StrategyPosition) -> Optional[str]:
+        """Evaluate whether to close a position at bar i.
+
+        The runner updates position.peak_price with bar i's close first and
+        force-closes whatever is still open on the last bar of the day.
+
+        Args:
+            features: Shared features for the ticker
+            i: Current bar index
+            position: The open position
+
+        Returns:
+            Exit reason string, or None to keep holding
+        """
+        pass
+
+    def entry_features(self, features: FeatureMatrix, i: int) -> Dict[str, float]:
+        """Feature values to store on a position opened at bar i.
+
+        "momentum" and "confidence" are copied to the trade record.
+        """
+        return {}
+
+
+STRATEGY_REGISTRY: Dict[str, Type[StrategyPlugin]] = {}
+
+
+def register_strategy(cls: Type[StrategyPlugin]) -> Type[StrategyPlugin]:
+    """Class decorator adding a strategy plugin to the registry under cls.name."""
+    if not cls.name:
+        raise ValueError(f"{cls.__name__} must define a name")
+    if cls.name in STRATEGY_REGISTRY and STRATEGY_REGISTRY[cls.name] is not cls:
+        raise ValueError(f"Strategy '{cls.name}' is already registered")
+    STRATEGY_REGISTRY[cls.name] = cls
+    return cls
+
+
+def get_strategies(names: Optional[Sequence[str]] = None) -> List[StrategyPlugin]:
+    """Instantiate registered strategies.
+
+    Args:
+        names: Strategy names (None for every registered strategy)
+
+    Returns:
+        List of strategy instances in the requested (or registration) order
+    """
+    if names is None:
+        names = list(STRATEGY_REGISTRY)
+
+    unknown = [name for name in names if name not in STRATEGY_REGISTRY]
+    if unknown:
+        raise ValueError(
+            f"Unknown strategies: {', '.join(unknown)} "
+            f"(available: {', '.join(sorted(STRATEGY_REGISTRY))})"
+        )
+    return [STRATEGY_REGISTRY[name]() for name in names]
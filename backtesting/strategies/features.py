@@ -0,0 +1,174 @@
+"""
+Shared Feature Matrix for Strategy Plugins.
+
+Converts a ticker's bars to numpy arrays once and computes rolling features
+(momentum, windowed means/extremes, RSI) as whole-series vectors. Every
+feature is memoized, so strategies asking for the same feature share one
+computation.
+"""
+
+from typing import Any, Callable, Dict, Hashable, List
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class FeatureMatrix:
+    """Vectorized features for one ticker's bar series.
+
+    Windows follow the slicing used by the scripts/ strategies: a feature
+    with lookback L and lag K at bar i covers bars max(0, i - L) through
+    i - K inclusive (``values[max(0, i - L) : i + 1 - K]``).
+    """
+
+    COLUMNS = {"open": "o", "high": "h", "low": "l", "close": "c", "volume": "v"}
+
+    def __init__(self, bars: List[Dict[str, Any]]):
+        """Extract OHLCV arrays and trading dates from bar dicts.
+
+        Args:
+            bars: 1-min bar dicts (t, o, h, l, c, v) sorted by timestamp
+        """
+        n = len(bars)
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.fromiter((float(bar.get(key, 0) or 0) for bar in bars), dtype=float, count=n)
+            for name, key in self.COLUMNS.items()
+        }
+        self.timestamps: List[str] = [bar.get("t", "") for bar in bars]
+        self.dates = np.array([ts[:10] for ts in self.timestamps])
+
+        # Last bar of each trading day (positions are flat overnight)
+        self.last_bar_of_day = np.ones(n, dtype=bool)
+        if n > 1:
+            self.last_bar_of_day[:-1] = self.dates[:-1] != self.dates[1:]
+
+        self._cache: Dict[Hashable, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.columns["close"]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.columns["high"]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.columns["low"]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.columns["volume"]
+
+    def cached(self, key: Hashable, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """Return the feature stored under key, computing it on first use.
+
+        Args:
+            key: Hashable feature identifier (include every parameter)
+            compute: Zero-argument function producing the feature
+
+        Returns:
+            The memoized feature
+        """
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def pct_change(self, lag: int, column: str = "close") -> np.ndarray:
+        """Percent change over lag bars: (x[i] - x[i - lag]) / x[i - lag] * 100.
+
+        Bars without history (i < lag) or with a non-positive base are 0.
+        """
+        def compute():
+            values = self.columns[column]
+            result = np.zeros(len(values))
+            if lag < len(values):
+                base = values[:-lag] if lag else values
+                current = values[lag:]
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    change = (current - base) / base * 100
+                result[lag:] = np.where(base > 0, change, 0.0)
+            return result
+
+        return self.cached(("pct_change", column, lag), compute)
+
+    def rolling(self, column: str, lookback: int, how: str = "mean", lag: int = 0) -> np.ndarray:
+        """Rolling aggregate over values[max(0, i - lookback) : i + 1 - lag].
+
+        Windows are truncated at the start of the series, matching the
+        strategies' ``max(0, i - n)`` slices. Empty windows (i < lag) are NaN.
+
+        Args:
+            column: open, high, low, close or volume
+            lookback: Bars back from i where the window starts
+            how: "mean", "sum", "max" or "min"
+            lag: Bars back from i where the window ends (0 includes bar i)
+
+        Returns:
+            Array with one aggregate per bar
+        """
+        if lag > lookback:
+            raise ValueError("lag must not exceed lookback")
+
+        def compute():
+            values = self.columns[column]
+            n = len(values)
+            index = np.arange(n)
+            start = np.maximum(0, index - lookback)
+            stop = index + 1 - lag
+            empty = stop <= start
+
+            if how in ("mean", "sum"):
+                csum = np.concatenate(([0.0], np.cumsum(values)))
+                stop_c = np.clip(stop, 0, n)
+                total = csum[stop_c] - csum[start]
+                if how == "mean":
+                    count = np.maximum(stop_c - start, 1)
+                    total = total / count
+                return np.where(empty, np.nan, total)
+
+            if how not in ("max", "min"):
+                raise ValueError(f"Unknown rolling aggregate: {how}")
+
+            fill = -np.inf if how == "max" else np.inf
+            padded = np.concatenate((np.full(lookback, fill), values))
+            windows = sliding_window_view(padded, lookback - lag + 1)[:n]
+            result = windows.max(axis=1) if how == "max" else windows.min(axis=1)
+            return np.where(empty, np.nan, result)
+
+        return self.cached(("rolling", column, lookback, how, lag), compute)
+
+    def rsi(self, period: int) -> np.ndarray:
+        """Simple-average RSI over the last period close-to-close changes.
+
+        Matches the strategies' ``_*_rsi`` helpers: 50 while fewer than
+        period changes exist, 100 when the window holds no losses.
+        """
+        def compute():
+            close = self.close
+            n = len(close)
+            result = np.full(n, 50.0)
+            if n <= period:
+                return result
+
+            change = np.diff(close)
+            gains = np.concatenate(([0.0], np.cumsum(np.where(change > 0, change, 0.0))))
+            losses = np.concatenate(([0.0], np.cumsum(np.where(change > 0, 0.0, -change))))
+            down_bars = np.concatenate(([0], np.cumsum(change < 0)))
+
+            # Bar i uses changes i - period .. i - 1 (diff index)
+            stop = np.arange(period, n)
+            start = stop - period
+            avg_gain = (gains[stop] - gains[start]) / period
+            avg_loss = (losses[stop] - losses[start]) / period
+            no_loss = down_bars[stop] == down_bars[start]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rs = avg_gain / avg_loss
+                value = 100.0 - 100.0 / (1.0 + rs)
+            result[period:] = np.where(no_loss, 100.0, value)
+            return result
+
+        return self.cached(("rsi", period), compute)
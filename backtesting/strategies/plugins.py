@@ -0,0 +1,296 @@
+"""
+Built-in Strategy Plugins.
+
+Vectorized ports of the scripts/ strategies. Each composite feature is
+memoized on the FeatureMatrix, so plugins sharing a definition (e.g. the
+high-quality volume profile) compute it once per ticker.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from backtesting.config import PENNY_STOCK_POSITION_SIZE
+from backtesting.strategies.base import StrategyPlugin, StrategyPosition, register_strategy
+from backtesting.strategies.features import FeatureMatrix
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray, default: float) -> np.ndarray:
+    """numerator / denominator where denominator > 0, default elsewhere."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator, default)
+
+
+def _range_position(features: FeatureMatrix, lookback: int) -> np.ndarray:
+    """Close position within the prior lookback bars' high/low range (0.5 if flat)."""
+    def compute():
+        high = features.rolling("high", lookback, "max", lag=1)
+        low = features.rolling("low", lookback, "min", lag=1)
+        return np.where(high > low, _ratio(features.close - low, high - low, 0.5), 0.5)
+
+    return features.cached(("range_position", lookback), compute)
+
+
+def _close_range_percent(features: FeatureMatrix, lookback: int) -> np.ndarray:
+    """(max - min) of closes over the last lookback + 1 bars, relative to the current close."""
+    def compute():
+        spread = features.rolling("close", lookback, "max") - features.rolling("close", lookback, "min")
+        return _ratio(spread, features.close, 0.0)
+
+    return features.cached(("close_range_percent", lookback), compute)
+
+
+def _close_range_to_mean(features: FeatureMatrix, lookback: int) -> np.ndarray:
+    """(max - min) of closes over the last lookback + 1 bars, relative to their mean."""
+    def compute():
+        spread = features.rolling("close", lookback, "max") - features.rolling("close", lookback, "min")
+        return _ratio(spread, features.rolling("close", lookback, "mean"), 1.0)
+
+    return features.cached(("close_range_to_mean", lookback), compute)
+
+
+def high_quality_volume(features: FeatureMatrix) -> Dict[str, np.ndarray]:
+    """Vectorized ``_analyze_high_quality_volume``: volume_ratio and volume_trend."""
+    def ratio():
+        index = np.arange(len(features))
+        recent = features.rolling("volume", 5)
+        avg_10 = np.where(index > 15, features.rolling("volume", 15, lag=6), recent)
+        avg_20 = np.where(index > 25, features.rolling("volume", 25, lag=6), recent)
+        return np.maximum(_ratio(recent, avg_10, 1.0), _ratio(recent, avg_20, 1.0))
+
+    def trend():
+        short = features.rolling("volume", 3)
+        long = np.nan_to_num(features.rolling("volume", 8, lag=4))
+        return _ratio(short - long, long, 0.0)
+
+    return {
+        "volume_ratio": features.cached(("hq_volume_ratio",), ratio),
+        "volume_trend": features.cached(("hq_volume_trend",), trend),
+    }
+
+
+def high_quality_momentum(features: FeatureMatrix) -> np.ndarray:
+    """Vectorized ``_calculate_high_quality_momentum``."""
+    def compute():
+        pct = features.pct_change
+        score = pct(2) * 0.3 + pct(5) * 0.3 + pct(10) * 0.2 + pct(20) * 0.1 + pct(30) * 0.1
+
+        index = np.arange(len(features))
+        recent_volume = features.rolling("volume", 5)
+        avg_volume = np.where(index > 20, features.rolling("volume", 20, lag=6), recent_volume)
+        volume_weight = np.where(avg_volume > 0, np.minimum(_ratio(recent_volume, avg_volume, 1.0), 3.0), 1.0)
+
+        volatility_boost = 1.0 + np.minimum(_close_range_percent(features, 10) * 2, 1.0)
+        momentum = score * volume_weight * (0.3 + _range_position(features, 10) * 0.7) * volatility_boost
+        return np.where(index >= 30, momentum, 0.0)
+
+    return features.cached(("hq_momentum",), compute)
+
+
+def high_quality_technicals(features: FeatureMatrix) -> Dict[str, np.ndarray]:
+    """Vectorized ``_high_quality_technical_analysis`` (bars from index 30)."""
+    def trend_strength():
+        pct = features.pct_change
+        trend = (pct(5) * 0.3 + pct(15) * 0.5 + pct(25) * 0.2) / 100
+        return np.clip(trend, -1.0, 1.0)
+
+    def regime():
+        close = features.close
+        sma50 = features.rolling("close", 49)
+        sma200 = features.rolling("close", 199)
+        long_history = np.arange(len(features)) >= 200
+        return long_history & (close > sma50) & (sma50 > sma200) & (sma50 >= sma200 * 1.005)
+
+    return {
+        "rsi": features.rsi(20),
+        "trend_strength": features.cached(("hq_trend_strength",), trend_strength),
+        "price_position": _range_position(features, 15),
+        "volatility": _close_range_to_mean(features, 15),
+        "trend_regime_ok": features.cached(("hq_trend_regime",), regime),
+    }
+
+
+@register_strategy
+class HighQualityMomentumStrategy(StrategyPlugin):
+    """Long-only momentum branch of scripts/high_quality_profitable_strategy.py."""
+
+    name = "high_quality_momentum"
+    universe = ("META", "TSLA", "NFLX", "SPY")
+    max_entries_per_day = 1
+    max_entries_per_month = 3
+    min_price = 5.0
+
+    def entry_signals(self, features: FeatureMatrix) -> np.ndarray:
+        close, volume = features.close, features.volume
+        pct = features.pct_change
+        momentum = high_quality_momentum(features)
+        vol = high_quality_volume(features)
+        tech = high_quality_technicals(features)
+        index = np.arange(len(features))
+
+        # _high_quality_entry_filters (long side)
+        stable = (_close_range_to_mean(features, 10) >= 0.006) & (_close_range_to_mean(features, 10) <= 0.10)
+        consistent = _ratio(features.rolling("volume", 5, "min"), features.rolling("volume", 5, "max"), 0.0) >= 0.25
+        rising = (pct(2) > 0.03) & (pct(5) > 0.07) & (pct(10) > 0.12)
+        high_20 = features.rolling("high", 20, "max", lag=1)
+        not_chasing = ~((high_20 > 0) & (close > high_20 * 1.02))
+        filters = (index >= 20) & stable & consistent & rising & not_chasing
+
+        entry = (
+            (index >= 30)
+            & (close >= self.min_price)
+            & (momentum >= 0.55)
+            & (vol["volume_ratio"] >= 1.35)
+            & (vol["volume_trend"] >= 0.01)
+            & (close * volume >= 120_000)
+            & tech["trend_regime_ok"]
+            & (tech["rsi"] >= 45.0) & (tech["rsi"] <= 72.0)
+            & (tech["trend_strength"] >= 0.004)
+            & (tech["volatility"] >= 0.006) & (tech["volatility"] <= 0.08)
+            & (tech["price_position"] >= 0.35) & (tech["price_position"] <= 0.92)
+            & filters
+        )
+        return entry.astype(np.int8)
+
+    def entry_features(self, features: FeatureMatrix, i: int) -> Dict[str, float]:
+        momentum = float(high_quality_momentum(features)[i])
+        return {"momentum": momentum, "confidence": min(momentum / 1.8, 1.0)}
+
+    def exit_reason(self, features: FeatureMatrix, i: int, position: StrategyPosition) -> Optional[str]:
+        pnl_pct = position.profit_percent(features.close[i])
+        peak_pct = position.peak_profit_percent()
+        held = position.bars_held(i)
+
+        if held >= 60:
+            return f"Time exit (held {held} min)"
+        if pnl_pct >= 2.3:
+            return "Profit target reached"
+        if pnl_pct <= -0.6:
+            return "Stop loss triggered"
+        if peak_pct >= 0.9 and pnl_pct <= peak_pct - 0.5:
+            return f"Trailing stop (peak {peak_pct:.2f}%)"
+        if high_quality_momentum(features)[i] < -0.2:
+            return "Strong momentum reversal"
+        return None
+
+
+def penny_directional_score(features: FeatureMatrix) -> np.ndarray:
+    """Vectorized ``_calculate_penny_directional_score``."""
+    def compute():
+        close = features.close
+        valid = np.zeros(len(close), dtype=bool)
+        if len(close) > 15:
+            valid[15:] = (close[12:-3] > 0) & (close[7:-8] > 0) & (close[:-15] > 0)
+        pct = features.pct_change
+        score = pct(3) * 0.5 + pct(8) * 0.3 + pct(15) * 0.2
+        return np.where(valid, score, 0.0)
+
+    return features.cached(("penny_directional_score",), compute)
+
+
+@register_strategy
+class HighQualityPennyStrategy(StrategyPlugin):
+    """Penny-stock volatility branch of scripts/high_quality_profitable_strategy.py."""
+
+    name = "high_quality_penny"
+    max_entries_per_day = 1
+    max_entries_per_month = 4
+    position_size = PENNY_STOCK_POSITION_SIZE
+    min_price = 0.2
+    max_price = 5.0
+    min_dollar_volume = 50_000
+
+    def _breakout_features(self, features: FeatureMatrix) -> Dict[str, np.ndarray]:
+        def volatility():
+            high = features.rolling("high", 20, "max", lag=1)
+            low = features.rolling("low", 20, "min", lag=1)
+            return _ratio(high - low, features.close, 0.0)
+
+        return {
+            "recent_high": features.rolling("high", 20, "max", lag=1),
+            "recent_low": features.rolling("low", 20, "min", lag=1),
+            "volatility": features.cached(("penny_range_volatility",), volatility),
+        }
+
+    def entry_signals(self, features: FeatureMatrix) -> np.ndarray:
+        close, volume = features.close, features.volume
+        index = np.arange(len(features))
+        breakout = self._breakout_features(features)
+        high, low, volatility = breakout["recent_high"], breakout["recent_low"], breakout["volatility"]
+        vol = high_quality_volume(features)
+
+        rsi = features.rsi(14)
+        trend_strength = features.pct_change(8) / 100
+        score = penny_directional_score(features)
+        price_position = _ratio(close - low, high - low, 0.5)
+        short_ma = features.rolling("close", 7)
+        long_ma = features.rolling("close", 19)
+
+        buffer = np.clip(volatility * 0.25, 0.002, 0.01)
+        breakout_up = close >= high * (1 + buffer * 0.25)
+        breakout_down = close <= low * (1 - buffer * 0.35)
+
+        eligible = (
+            (index >= 30)
+            & (close >= self.min_price) & (close < self.max_price)
+            & (high > low)
+            & (volatility >= 0.015) & (volatility <= 0.35)
+            & (vol["volume_ratio"] >= 1.8)
+            & (vol["volume_trend"] >= 0.03)
+            & (close * volume >= self.min_dollar_volume)
+        )
+        long_entry = eligible & (
+            breakout_up
+            & (score >= 1.50)
+            & (rsi >= 65.0) & (rsi <= 85.0)
+            & (trend_strength >= 0.0)
+            & (price_position >= 0.50)
+            & (volatility <= 0.05)
+            & (vol["volume_ratio"] >= 6.0)
+            & (short_ma > long_ma)
+        )
+        short_entry = eligible & ~long_entry & (
+            breakout_down
+            & (score <= -2.2)
+            & (rsi >= 20.0) & (rsi <= 33.0)
+            & (trend_strength <= -0.002)
+            & (price_position <= 0.35)
+            & (volatility <= 0.045)
+            & (vol["volume_ratio"] >= 8.0)
+            & (short_ma < long_ma)
+        )
+        return long_entry.astype(np.int8) - short_entry.astype(np.int8)
+
+    def entry_features(self, features: FeatureMatrix, i: int) -> Dict[str, float]:
+        score = float(penny_directional_score(features)[i])
+        volume_ratio = float(high_quality_volume(features)["volume_ratio"][i])
+        confidence = min(abs(score) / 1.2 + max(0.0, volume_ratio - 1.5) * 0.15, 1.0)
+        return {
+            "momentum": score,
+            "confidence": confidence,
+            "volatility": float(self._breakout_features(features)["volatility"][i]),
+        }
+
+    def exit_reason(self, features: FeatureMatrix, i: int, position: StrategyPosition) -> Optional[str]:
+        pnl_pct = position.profit_percent(features.close[i])
+        peak_pct = position.peak_profit_percent()
+        held = position.bars_held(i)
+
+        entry_volatility = position.entry_features.get("volatility", 0.02)
+        profit_target = max(1.2, min(4.0, entry_volatility * 45))
+        stop_loss = max(0.45, min(1.2, profit_target * 0.45))
+        trailing_gap = max(0.35, min(1.0, profit_target * 0.35))
+
+        if held >= 35:
+            return f"Time exit (held {held} min)"
+        if pnl_pct >= profit_target:
+            return f"Profit target reached ({profit_target:.2f}%)"
+        if pnl_pct <= -stop_loss:
+            return f"Stop loss triggered ({stop_loss:.2f}%)"
+        if peak_pct >= 0.8 and pnl_pct <= peak_pct - trailing_gap:
+            return f"Trailing stop (peak {peak_pct:.2f}%)"
+
+        score = penny_directional_score(features)[i]
+        if (position.direction == "long" and score < -0.25) or (position.direction == "short" and score > 0.25):
+            return "Momentum reversal exit"
+        return None
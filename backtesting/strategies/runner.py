@@ -0,0 +1,314 @@
+"""
+Multi-Strategy Runner.
+
+Loads bars once from the shared cache, builds one FeatureMatrix per ticker
+and walks the bars a single time while every registered strategy manages
+its own positions. Comparing N strategies costs one data load, one feature
+pass and one bar loop instead of N separate backtests.
+
+Usage:
+    python -m backtesting.strategies
+    python -m backtesting.strategies --strategies high_quality_momentum,high_quality_penny
+    python -m backtesting.strategies --tickers META,TSLA --days 30
+"""
+
+import argparse
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from backtesting.config import END_DATE, MOMENTUM_TICKERS, PENNY_STOCK_TICKERS, START_DATE
+from backtesting.data_fetcher import fetch_all_tickers
+from backtesting.models import SimulationResult, TradeRecord
+from backtesting.output import print_summary, write_summary, write_trades_csv
+from backtesting.strategies.base import STRATEGY_REGISTRY, StrategyPlugin, StrategyPosition, get_strategies
+from backtesting.strategies.features import FeatureMatrix
+from backtesting.trade_engine import _create_trade_record, _parse_bar_timestamp
+
+
+def _entry_mask(
+    strategy: StrategyPlugin,
+    features: FeatureMatrix,
+    start_date: str,
+    end_date: str,
+) -> np.ndarray:
+    """Strategy entry signals restricted to tradable bars."""
+    signals = np.asarray(strategy.entry_signals(features), dtype=np.int8).copy()
+    signals[: strategy.warmup_bars] = 0
+    signals[features.last_bar_of_day] = 0  # would be force-closed on the same bar
+    if start_date:
+        signals[features.dates < start_date] = 0
+    if end_date:
+        signals[features.dates > end_date] = 0
+    return signals
+
+
+def _open_position(
+    strategy: StrategyPlugin,
+    ticker: str,
+    features: FeatureMatrix,
+    i: int,
+    direction: str,
+) -> Optional[StrategyPosition]:
+    entry_time = _parse_bar_timestamp({"t": features.timestamps[i]})
+    entry_price = float(features.close[i])
+    if entry_time is None or entry_price <= 0:
+        return None
+
+    entry_features = strategy.entry_features(features, i)
+    return StrategyPosition(
+        ticker=ticker,
+        direction=direction,
+        entry_price=entry_price,
+        breakeven_price=entry_price,
+        shares=strategy.position_size / entry_price,
+        position_value=strategy.position_size,
+        entry_time=entry_time,
+        entry_bar_index=i,
+        peak_price=entry_price,
+        atr_stop_percent=0.0,
+        spread_percent=0.0,
+        indicator_name=strategy.name,
+        momentum_at_entry=entry_features.get("momentum", 0.0),
+        confidence_at_entry=entry_features.get("confidence", 0.0),
+        entry_features=entry_features,
+    )
+
+
+def run_ticker_strategies(
+    ticker: str,
+    bars: List[Dict[str, Any]],
+    strategies: Sequence[StrategyPlugin],
+    start_date: str = "",
+    end_date: str = "",
+    features: Optional[FeatureMatrix] = None,
+) -> Dict[str, List[TradeRecord]]:
+    """Evaluate several strategies on one ticker in a single bar pass.
+
+    At each bar every strategy first checks exits for its open positions,
+    then may open a new one if it had a free slot before those exits (so a
+    strategy never re-enters on the bar it closed). Positions still open on
+    the last bar of a trading day are closed as force_close_eod.
+
+    Args:
+        ticker: Stock symbol
+        bars: All 1-min bars for this ticker (sorted by timestamp)
+        strategies: Strategy instances to evaluate
+        start_date: Optional first date for entries (YYYY-MM-DD)
+        end_date: Optional last date for entries (YYYY-MM-DD)
+        features: Prebuilt features for bars (built here if omitted)
+
+    Returns:
+        Dict mapping strategy name -> completed trades
+    """
+    trades: Dict[str, List[TradeRecord]] = {strategy.name: [] for strategy in strategies}
+    active = [strategy for strategy in strategies if strategy.trades_ticker(ticker)]
+    if not bars or not active:
+        return trades
+
+    if features is None:
+        features = FeatureMatrix(bars)
+    n = len(features)
+    close = features.close
+    last_bar_of_day = features.last_bar_of_day
+
+    signals = [_entry_mask(strategy, features, start_date, end_date) for strategy in active]
+    candidates = np.flatnonzero(np.any(np.vstack(signals) != 0, axis=0))
+    if len(candidates) == 0:
+        return trades
+
+    positions: List[List[StrategyPosition]] = [[] for _ in active]
+    entries_by_date: List[Dict[str, int]] = [{} for _ in active]
+    entries_by_month: List[Dict[str, int]] = [{} for _ in active]
+
+    i = int(candidates[0])
+    while i < n:
+        price = float(close[i])
+        any_open = False
+
+        for k, strategy in enumerate(active):
+            open_positions = positions[k]
+            slots_before_exits = strategy.max_open_positions - len(open_positions)
+
+            if open_positions:
+                still_open = []
+                for position in open_positions:
+                    position.update_peak(price)
+                    reason = strategy.exit_reason(features, i, position)
+                    if reason is None and last_bar_of_day[i]:
+                        reason = "force_close_eod"
+                    if reason is None:
+                        still_open.append(position)
+                        continue
+                    exit_time = _parse_bar_timestamp({"t": features.timestamps[i]}) or position.entry_time
+                    trades[strategy.name].append(
+                        _create_trade_record(position, price, reason, exit_time, strategy.name)
+                    )
+                positions[k] = still_open
+
+            signal = signals[k][i]
+            if signal and slots_before_exits > 0:
+                date_str = features.dates[i]
+                month_str = date_str[:7]
+                daily_cap = strategy.max_entries_per_day
+                monthly_cap = strategy.max_entries_per_month
+                if (daily_cap is None or entries_by_date[k].get(date_str, 0) < daily_cap) and (
+                    monthly_cap is None or entries_by_month[k].get(month_str, 0) < monthly_cap
+                ):
+                    direction = "long" if signal > 0 else "short"
+                    position = _open_position(strategy, ticker, features, i, direction)
+                    if position is not None:
+                        positions[k].append(position)
+                        entries_by_date[k][date_str] = entries_by_date[k].get(date_str, 0) + 1
+                        entries_by_month[k][month_str] = entries_by_month[k].get(month_str, 0) + 1
+
+            any_open = any_open or bool(positions[k])
+
+        if any_open:
+            i += 1
+        else:
+            # Nothing open: jump straight to the next bar where any strategy signals
+            next_index = np.searchsorted(candidates, i, side="right")
+            i = int(candidates[next_index]) if next_index < len(candidates) else n
+
+    return trades
+
+
+def run_strategies(
+    ticker_data: Dict[str, List[Dict[str, Any]]],
+    strategies: Sequence[StrategyPlugin],
+    start_date: str = "",
+    end_date: str = "",
+) -> Dict[str, SimulationResult]:
+    """Run every strategy across all tickers, sharing bars and features.
+
+    Args:
+        ticker_data: Dict mapping ticker -> list of bars
+        strategies: Strategy instances to evaluate
+        start_date: Optional start date filter
+        end_date: Optional end date filter
+
+    Returns:
+        Dict mapping strategy name -> SimulationResult with statistics
+    """
+    all_trades: Dict[str, List[TradeRecord]] = {strategy.name: [] for strategy in strategies}
+
+    tickers = sorted(ticker_data.keys())
+    print(f"\nRunning {len(strategies)} strategies over {len(tickers)} tickers in one pass...")
+
+    for i, ticker in enumerate(tickers):
+        bars = ticker_data[ticker]
+        print(f"  [{i+1}/{len(tickers)}] {ticker} ({len(bars):,} bars)")
+
+        ticker_trades = run_ticker_strategies(ticker, bars, strategies, start_date, end_date)
+        for name, trades in ticker_trades.items():
+            all_trades[name].extend(trades)
+
+    results = {}
+    for strategy in strategies:
+        trades = sorted(all_trades[strategy.name], key=lambda t: t.entry_time)
+        result = SimulationResult(
+            indicator_name=strategy.name,
+            tickers=[t for t in tickers if strategy.trades_ticker(t)],
+            start_date=start_date or (trades[0].date if trades else ""),
+            end_date=end_date or (trades[-1].date if trades else ""),
+            trades=trades,
+        )
+        result.calculate_statistics()
+        results[strategy.name] = result
+
+    return results
+
+
+def print_comparison(results: Dict[str, SimulationResult]):
+    """Print one line per strategy for side-by-side comparison."""
+    print("\n" + "=" * 70)
+    print("  STRATEGY COMPARISON")
+    print("=" * 70)
+    print(f"  {'Strategy':<26} {'Trades':>7} {'Win%':>6} {'PF':>6} {'Net P&L':>12}")
+    for name, result in results.items():
+        print(
+            f"  {name:<26} {result.total_trades:>7} {result.win_rate:>5.1f}% "
+            f"{result.profit_factor:>6.2f} ${result.total_pnl_dollars:>11,.2f}"
+        )
+    print("=" * 70 + "\n")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Backtest several registered strategies over one shared data pass"
+    )
+    parser.add_argument(
+        "--strategies",
+        type=str,
+        default="",
+        help=f"Comma-separated strategy names (default: all of {', '.join(STRATEGY_REGISTRY)})"
+    )
+    parser.add_argument(
+        "--tickers",
+        type=str,
+        default="",
+        help="Comma-separated ticker list (default: momentum + penny stock tickers)"
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=0,
+        help="Number of days to backtest (overrides --start)"
+    )
+    parser.add_argument(
+        "--start",
+        type=str,
+        default="",
+        help="Start date YYYY-MM-DD (default: 1 year ago)"
+    )
+    parser.add_argument(
+        "--end",
+        type=str,
+        default="",
+        help="End date YYYY-MM-DD (default: today)"
+    )
+    parser.add_argument(
+        "--force-refresh",
+        action="store_true",
+        help="Force re-download of cached data"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    names = [name.strip() for name in args.strategies.split(",") if name.strip()] or None
+    strategies = get_strategies(names)
+
+    end_date = args.end if args.end else END_DATE
+    if args.days > 0:
+        start_date = (datetime.now() - timedelta(days=args.days)).strftime("%Y-%m-%d")
+    else:
+        start_date = args.start if args.start else START_DATE
+
+    if args.tickers:
+        tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+    else:
+        tickers = list(dict.fromkeys(MOMENTUM_TICKERS + PENNY_STOCK_TICKERS))
+
+    print("Step 1: Loading historical data (once for all strategies)...")
+    ticker_data = fetch_all_tickers(tickers, start_date, end_date, args.force_refresh)
+    if not ticker_data:
+        print("ERROR: No data fetched for any ticker. Check API keys and ticker symbols.")
+        return None
+
+    print("Step 2: Running strategies...")
+    results = run_strategies(ticker_data, strategies, start_date, end_date)
+
+    print("\nStep 3: Writing results...")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    for name, result in results.items():
+        write_trades_csv(result.trades, f"{name}_trades_{timestamp}.csv")
+        write_summary(result, f"{name}_summary_{timestamp}.txt")
+        print_summary(result)
+
+    print_comparison(results)
+    return results
@@ -8,6 +8,8 @@ but operates on pre-fetched bar data synchronously (no API calls).
 from typing import Dict, List, Any, Optional
 import numpy as np
 
+from app.src.models.price_series import PriceSeries
+
 # Try to import talib
 try:
     import talib
@@ -233,11 +235,8 @@ def calculate_indicators(bars: List[Dict[str, Any]]) -> Dict[str, Any]:
         # VWMA (custom)
         vwma = _calculate_vwma(high_arr, low_arr, close_arr, volume_arr, DEFAULT_PERIODS["volume_sma"])
 
-        # Build datetime_price dict
-        datetime_price = {}
-        for ts, price in zip(timestamps, closes):
-            if ts:
-                datetime_price[ts] = price
+        # Sorted epoch/price arrays, same shape as production
+        datetime_price = PriceSeries.from_timestamps(timestamps, closes)
 
         result = {
             "rsi": rsi,
@@ -383,10 +382,7 @@ def _compute_basic_indicators(close, high, low, volume, timestamps):
     adx = 25.0  # Default moderate trend
 
     # Build datetime_price
-    datetime_price = {}
-    for ts, price in zip(timestamps, close):
-        if ts:
-            datetime_price[ts] = float(price)
+    datetime_price = PriceSeries.from_timestamps(timestamps, close)
 
     return {
         "rsi": rsi,
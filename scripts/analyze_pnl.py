@@ -4,23 +4,263 @@ Profit and Loss Analysis for Backtest Results
 
 This script analyzes the CSV output from the backtesting script to calculate
 profit and loss for each indicator, assuming simple entry/exit strategies.
+
+Exit prices are found with a vectorized search over per-ticker sorted
+timestamps (VectorizedPnLEngine), so every holding horizon is evaluated in
+one O(n log n) pass instead of filtering the whole DataFrame per signal.
 """
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import argparse
 
+PNL_COLUMNS = ['timestamp', 'ticker', 'indicator', 'action', 'price']
+CATEGORY_COLUMNS = ['ticker', 'indicator', 'action']
+DEFAULT_HORIZONS = [5, 15, 30, 60, 120]
+SHARES_PER_TRADE = 100  # P&L amounts assume 100 shares
+
+
+def _epoch_ns(timestamps: pd.Series) -> np.ndarray:
+    """Timestamps as int64 nanoseconds since the epoch (UTC for tz-aware values)"""
+    return pd.DatetimeIndex(timestamps).as_unit('ns').asi8
+
+
+def read_signals_csv(
+    csv_file: str,
+    chunksize: int = 1_000_000,
+    columns: Optional[Sequence[str]] = PNL_COLUMNS
+) -> pd.DataFrame:
+    """
+    Read a backtest CSV in chunks with compact dtypes.
+
+    Only the requested columns are parsed; ticker, indicator and action are
+    stored as categoricals, so multi-month exports fit in memory.
+
+    Args:
+        csv_file: Backtest results CSV file
+        chunksize: Rows parsed per chunk
+        columns: Columns to keep (default: the columns P&L analysis needs;
+            None keeps every column)
+
+    Returns:
+        DataFrame sorted by timestamp (stable, so file order breaks ties)
+    """
+    usecols = (lambda c: c in set(columns)) if columns is not None else None
+    chunks = []
+    for chunk in pd.read_csv(csv_file, usecols=usecols, chunksize=chunksize):
+        try:
+            chunk['timestamp'] = pd.to_datetime(chunk['timestamp'])
+        except ValueError:
+            # Mixed UTC offsets (exports spanning a DST change)
+            chunk['timestamp'] = pd.to_datetime(chunk['timestamp'], utc=True)
+        if chunk['timestamp'].dt.tz is not None:
+            # One zone for every chunk so they concatenate as datetimes
+            chunk['timestamp'] = chunk['timestamp'].dt.tz_convert('UTC')
+        for column in CATEGORY_COLUMNS:
+            if column in chunk:
+                chunk[column] = chunk[column].astype('category')
+        chunks.append(chunk)
+
+    if not chunks:
+        return pd.DataFrame(columns=list(columns or PNL_COLUMNS))
+
+    df = pd.concat(chunks, ignore_index=True)
+    for column in CATEGORY_COLUMNS:
+        if column in df and len(chunks) > 1:
+            # Chunks carry different categories; union them instead of
+            # falling back to object strings
+            df[column] = pd.api.types.union_categoricals(
+                [chunk[column] for chunk in chunks], ignore_order=True
+            )
+    return df.sort_values('timestamp', kind='stable', ignore_index=True)
+
+
+class VectorizedPnLEngine:
+    """
+    Fixed-horizon P&L for every signal and many holding periods at once.
+
+    Signals are ranked by (ticker, timestamp); the exit for a signal is the
+    first price of the same ticker at or after entry + horizon, found with
+    one np.searchsorted over the combined keys per horizon.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Initialize the engine from signals sorted by timestamp.
+
+        Args:
+            df: Signals with timestamp, ticker, indicator, action and price columns
+        """
+        self.df = df
+        self.timestamps = _epoch_ns(df['timestamp'])
+        self.prices = df['price'].to_numpy(dtype=np.float64)
+        self.is_long = (df['action'] == 'buy_to_open').to_numpy()
+
+        ticker_codes = pd.Categorical(df['ticker']).codes.astype(np.int64)
+        self._unique_times = np.unique(self.timestamps)
+        self._stride = len(self._unique_times) + 1
+        keys = ticker_codes * self._stride + np.searchsorted(self._unique_times, self.timestamps)
+        self._order = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[self._order]
+        self._sorted_codes = ticker_codes[self._order]
+        self._sorted_times = self.timestamps[self._order]
+
+    @classmethod
+    def from_csv(cls, csv_file: str, chunksize: int = 1_000_000) -> 'VectorizedPnLEngine':
+        """Build an engine from a backtest CSV, read in chunks"""
+        return cls(read_signals_csv(csv_file, chunksize=chunksize))
+
+    def exit_indices(self, hold_minutes: int) -> np.ndarray:
+        """
+        Row index of each signal's exit (-1 when the ticker has no later price).
+
+        Args:
+            hold_minutes: Holding period in minutes
+        """
+        # Work in (ticker, timestamp) order: the queries are then sorted too,
+        # which keeps both searches cache-friendly
+        exit_times = self._sorted_times + np.int64(hold_minutes) * 60_000_000_000
+        query = self._sorted_codes * self._stride + np.searchsorted(self._unique_times, exit_times)
+        positions = np.searchsorted(self._sorted_keys, query)
+
+        found = positions < len(self._sorted_keys)
+        found[found] = self._sorted_keys[positions[found]] // self._stride == self._sorted_codes[found]
+
+        exits = np.full(len(self._order), -1, dtype=np.int64)
+        exits[self._order[found]] = self._order[positions[found]]
+        return exits
+
+    def pnl_percent(self, horizons: Sequence[int]) -> np.ndarray:
+        """
+        P&L percent for every signal (rows) and horizon (columns).
+
+        Signals without a later price exit flat at the entry price.
+        """
+        result = np.empty((len(self.prices), len(horizons)), dtype=np.float64)
+        direction = np.where(self.is_long, 1.0, -1.0)
+        for column, hold_minutes in enumerate(horizons):
+            exits = self.exit_indices(hold_minutes)
+            exit_prices = np.where(exits >= 0, self.prices[exits], self.prices)
+            result[:, column] = direction * (exit_prices - self.prices) / self.prices * 100
+        return result
+
+    def trade_results(self, hold_minutes: int) -> pd.DataFrame:
+        """
+        Signals with exit and P&L columns for one holding period.
+
+        Returns:
+            Copy of the signals with exit_time, exit_price, exit_reason,
+            hold_minutes, pnl_percent and pnl_amount columns
+        """
+        exits = self.exit_indices(hold_minutes)
+        has_exit = exits >= 0
+        exit_prices = np.where(has_exit, self.prices[exits], self.prices)
+        direction = np.where(self.is_long, 1.0, -1.0)
+
+        results = self.df.copy()
+        results['exit_time'] = self.df['timestamp'] + pd.Timedelta(minutes=hold_minutes)
+        results['exit_price'] = exit_prices
+        results['exit_reason'] = np.where(has_exit, f"Exit after {hold_minutes} minutes", "No future data")
+        results['hold_minutes'] = hold_minutes
+        results['pnl_percent'] = direction * (exit_prices - self.prices) / self.prices * 100
+        results['pnl_amount'] = direction * (exit_prices - self.prices) * SHARES_PER_TRADE
+        return results
+
+    def summarize(self, horizons: Sequence[int], by: str = 'indicator') -> pd.DataFrame:
+        """
+        Summary statistics per group for every horizon.
+
+        Args:
+            horizons: Holding periods in minutes
+            by: Grouping column ('indicator' or 'ticker')
+
+        Returns:
+            DataFrame indexed by (hold_minutes, group) with the same statistics
+            as BacktestAnalyzer.calculate_indicator_summary
+        """
+        pnl = self.pnl_percent(horizons)
+        codes, labels = pd.factorize(self.df[by], use_na_sentinel=False)
+        frames = []
+        for column, hold_minutes in enumerate(horizons):
+            summary = _group_pnl_stats(pnl[:, column], codes, labels, self.is_long)
+            summary.index = pd.MultiIndex.from_product([[hold_minutes], summary.index], names=['hold_minutes', by])
+            frames.append(summary)
+        return pd.concat(frames)
+
+
+def _group_pnl_stats(pnl: np.ndarray, codes: np.ndarray, labels: Sequence, is_long: np.ndarray) -> pd.DataFrame:
+    """Per-group statistics from bincount sums and sorted reduceat extrema"""
+    groups = len(labels)
+
+    def count(mask: np.ndarray) -> np.ndarray:
+        return np.bincount(codes[mask], minlength=groups)
+
+    def total(mask: np.ndarray) -> np.ndarray:
+        return np.bincount(codes[mask], weights=pnl[mask], minlength=groups)
+
+    def mean(mask: np.ndarray) -> np.ndarray:
+        counts = count(mask)
+        return np.divide(total(mask), counts, out=np.zeros(groups), where=counts > 0)
+
+    everything = np.ones(len(pnl), dtype=bool)
+    wins, losses = pnl > 0, pnl < 0
+    trades = count(everything)
+
+    order = np.argsort(codes, kind='stable')
+    starts = np.searchsorted(codes[order], np.arange(groups))
+
+    summary = pd.DataFrame({
+        'total_trades': trades,
+        'profitable_trades': count(wins),
+        'losing_trades': count(losses),
+        'win_rate': count(wins) / trades * 100,
+        'avg_pnl_percent': total(everything) / trades,
+        'avg_win_percent': mean(wins),
+        'avg_loss_percent': mean(losses),
+        'total_pnl_percent': total(everything),
+        'max_win_percent': np.maximum.reduceat(pnl[order], starts),
+        'max_loss_percent': np.minimum.reduceat(pnl[order], starts),
+        'long_avg_pnl_percent': mean(is_long),
+        'short_avg_pnl_percent': mean(~is_long),
+        'long_trades': count(is_long),
+        'short_trades': count(~is_long),
+    }, index=pd.Index(labels))
+    return summary
+
+
+def summarize_pnl(pnl: pd.Series, groups: pd.Series, is_long: pd.Series) -> pd.DataFrame:
+    """
+    Per-group P&L statistics, computed without a Python loop over trades.
+
+    Args:
+        pnl: P&L percent per trade
+        groups: Group label per trade
+        is_long: True for long (buy_to_open) trades
+
+    Returns:
+        DataFrame indexed by group, one column per statistic (groups in order
+        of first appearance; averages over an empty subset are 0)
+    """
+    codes, labels = pd.factorize(groups, use_na_sentinel=False)
+    return _group_pnl_stats(
+        pnl.to_numpy(dtype=np.float64), codes, labels, np.asarray(is_long, dtype=bool)
+    )
+
 
 class BacktestAnalyzer:
     """Analyze backtest results to calculate P&L for indicators"""
     
-    def __init__(self, csv_file: str):
-        """Initialize analyzer with backtest CSV file"""
-        self.df = pd.read_csv(csv_file)
-        self.df['timestamp'] = pd.to_datetime(self.df['timestamp'])
-        self.df = self.df.sort_values('timestamp')
+    def __init__(self, csv_file: str, chunksize: int = 1_000_000):
+        """Initialize analyzer with backtest CSV file (read in chunks)"""
+        self.df = read_signals_csv(csv_file, chunksize=chunksize, columns=None)
+        self._engine: Optional[VectorizedPnLEngine] = None
+
+    @property
+    def engine(self) -> VectorizedPnLEngine:
+        if self._engine is None:
+            self._engine = VectorizedPnLEngine(self.df)
+        return self._engine
         
     def calculate_simple_pnl(self, hold_minutes: int = 30) -> pd.DataFrame:
         """
@@ -32,112 +272,28 @@ class BacktestAnalyzer:
         Returns:
             DataFrame with P&L calculations added
         """
-        results = []
-        
-        for _, row in self.df.iterrows():
-            entry_time = row['timestamp']
-            entry_price = row['price']
-            action = row['action']
-            ticker = row['ticker']
-            indicator = row['indicator']
-            
-            # Find exit price after holding period
-            exit_time = entry_time + timedelta(minutes=hold_minutes)
-            
-            # Get future price at exit time
-            future_data = self.df[
-                (self.df['ticker'] == ticker) & 
-                (self.df['timestamp'] >= exit_time)
-            ]
-            
-            if future_data.empty:
-                # If no future data, use last available price
-                exit_price = entry_price
-                exit_reason = "No future data"
-            else:
-                exit_price = future_data.iloc[0]['price']
-                exit_reason = f"Exit after {hold_minutes} minutes"
-            
-            # Calculate P&L
-            if action == 'buy_to_open':
-                # Long position: profit if price goes up
-                pnl_percent = ((exit_price - entry_price) / entry_price) * 100
-                pnl_amount = (exit_price - entry_price) * 100  # Assume 100 shares
-            else:  # sell_to_open
-                # Short position: profit if price goes down
-                pnl_percent = ((entry_price - exit_price) / entry_price) * 100
-                pnl_amount = (entry_price - exit_price) * 100  # Assume 100 shares
-            
-            result_row = row.copy()
-            result_row['exit_time'] = exit_time
-            result_row['exit_price'] = exit_price
-            result_row['exit_reason'] = exit_reason
-            result_row['hold_minutes'] = hold_minutes
-            result_row['pnl_percent'] = pnl_percent
-            result_row['pnl_amount'] = pnl_amount
-            
-            results.append(result_row)
-        
-        return pd.DataFrame(results)
+        return self.engine.trade_results(hold_minutes)
     
     def calculate_indicator_summary(self, results_df: pd.DataFrame) -> Dict:
         """Calculate summary statistics for each indicator"""
-        summary = {}
-        
-        for indicator in results_df['indicator'].unique():
-            indicator_data = results_df[results_df['indicator'] == indicator]
-            
-            total_trades = len(indicator_data)
-            profitable_trades = len(indicator_data[indicator_data['pnl_percent'] > 0])
-            losing_trades = len(indicator_data[indicator_data['pnl_percent'] < 0])
-            
-            win_rate = (profitable_trades / total_trades) * 100 if total_trades > 0 else 0
-            
-            avg_pnl = indicator_data['pnl_percent'].mean()
-            avg_win = indicator_data[indicator_data['pnl_percent'] > 0]['pnl_percent'].mean() if profitable_trades > 0 else 0
-            avg_loss = indicator_data[indicator_data['pnl_percent'] < 0]['pnl_percent'].mean() if losing_trades > 0 else 0
-            
-            total_pnl = indicator_data['pnl_percent'].sum()
-            max_win = indicator_data['pnl_percent'].max()
-            max_loss = indicator_data['pnl_percent'].min()
-            
-            # Separate long and short performance
-            long_trades = indicator_data[indicator_data['action'] == 'buy_to_open']
-            short_trades = indicator_data[indicator_data['action'] == 'sell_to_open']
-            
-            long_avg_pnl = long_trades['pnl_percent'].mean() if len(long_trades) > 0 else 0
-            short_avg_pnl = short_trades['pnl_percent'].mean() if len(short_trades) > 0 else 0
-            
-            summary[indicator] = {
-                'total_trades': total_trades,
-                'profitable_trades': profitable_trades,
-                'losing_trades': losing_trades,
-                'win_rate': win_rate,
-                'avg_pnl_percent': avg_pnl,
-                'avg_win_percent': avg_win,
-                'avg_loss_percent': avg_loss,
-                'total_pnl_percent': total_pnl,
-                'max_win_percent': max_win,
-                'max_loss_percent': max_loss,
-                'long_avg_pnl_percent': long_avg_pnl,
-                'short_avg_pnl_percent': short_avg_pnl,
-                'long_trades': len(long_trades),
-                'short_trades': len(short_trades)
-            }
-        
-        return summary
+        summary = summarize_pnl(
+            results_df['pnl_percent'],
+            results_df['indicator'],
+            results_df['action'] == 'buy_to_open'
+        )
+        return summary.to_dict(orient='index')
+
+    def calculate_ticker_summary(self, hold_minutes: int = 30) -> pd.DataFrame:
+        """Calculate summary statistics for each ticker"""
+        return self.engine.summarize([hold_minutes], by='ticker').loc[hold_minutes]
     
-    def calculate_time_based_pnl(self, hold_periods: List[int] = [5, 15, 30, 60, 120]) -> Dict:
-        """Calculate P&L for different holding periods"""
-        time_analysis = {}
-        
-        for hold_minutes in hold_periods:
-            results_df = self.calculate_simple_pnl(hold_minutes)
-            summary = self.calculate_indicator_summary(results_df)
-            
-            time_analysis[f'{hold_minutes}_min'] = summary
-        
-        return time_analysis
+    def calculate_time_based_pnl(self, hold_periods: List[int] = DEFAULT_HORIZONS) -> Dict:
+        """Calculate P&L for different holding periods (all horizons in one pass)"""
+        summaries = self.engine.summarize(hold_periods, by='indicator')
+        return {
+            f'{hold_minutes}_min': summaries.loc[hold_minutes].to_dict(orient='index')
+            for hold_minutes in hold_periods
+        }
     
     def print_summary(self, summary: Dict, title: str = "Indicator Performance Summary"):
         """Print formatted summary"""
@@ -198,12 +354,18 @@ def main():
                        help='Run analysis for multiple holding periods')
     parser.add_argument('--output', type=str, 
                        help='Output file for detailed results')
+    parser.add_argument('--horizons', type=int, nargs='+', default=DEFAULT_HORIZONS,
+                       help='Holding periods in minutes for --time-analysis')
+    parser.add_argument('--ticker-summary', type=str,
+                       help='Output CSV file for per-ticker summary')
+    parser.add_argument('--chunksize', type=int, default=1_000_000,
+                       help='Rows read per CSV chunk (default: 1000000)')
     
     args = parser.parse_args()
     
     try:
         # Initialize analyzer
-        analyzer = BacktestAnalyzer(args.csv_file)
+        analyzer = BacktestAnalyzer(args.csv_file, chunksize=args.chunksize)
         
         print(f"Analyzing backtest results from {args.csv_file}")
         print(f"Total signals: {len(analyzer.df)}")
@@ -216,12 +378,17 @@ def main():
         
         # Time-based analysis if requested
         if args.time_analysis:
-            time_analysis = analyzer.calculate_time_based_pnl()
+            time_analysis = analyzer.calculate_time_based_pnl(args.horizons)
             analyzer.print_time_analysis(time_analysis)
         
         # Save detailed results if requested
         if args.output:
             analyzer.save_detailed_results(results_df, args.output)
+
+        if args.ticker_summary:
+            ticker_summary = analyzer.calculate_ticker_summary(args.hold_minutes)
+            ticker_summary.to_csv(args.ticker_summary, index_label='ticker')
+            print(f"Per-ticker summary saved to {args.ticker_summary}")
         
         # Overall summary
         print(f"\nOverall Summary ({args.hold_minutes} minutes hold):")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: legacy recursive float→Decimal conversion vs. the
+schema-driven serializer in app/src/db/dynamodb_serializer.py.
+
+Builds a payload shaped like a real technical-indicator record (scalars,
+nested dicts, a long datetime_price list and numpy arrays) and times:
+
+- legacy:      the original recursive _convert_floats_to_decimals
+- serializer:  to_dynamodb_compatible (resource API format)
+- reconvert:   to_dynamodb_compatible on an already converted payload
+- attr-value:  to_attribute_value_map (low-level client API format)
+
+Usage:
+    python scripts/benchmark_dynamodb_serializer.py
+    python scripts/benchmark_dynamodb_serializer.py --bars 2000 --repeat 50
+"""
+
+import argparse
+import sys
+import timeit
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.src.db.dynamodb_serializer import (  # noqa: E402
+    to_attribute_value_map,
+    to_dynamodb_compatible,
+)
+
+
+def legacy_convert_floats_to_decimals(obj: Any) -> Any:
+    """Original implementation, kept here as the benchmark baseline."""
+    if isinstance(obj, dict):
+        return {k: legacy_convert_floats_to_decimals(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [legacy_convert_floats_to_decimals(item) for item in obj]
+    elif isinstance(obj, float):
+        return Decimal(str(obj))
+    else:
+        return obj
+
+
+def build_payload(bars: int, as_numpy: bool) -> Dict[str, Any]:
+    """Build a payload resembling a persisted technical-indicator record."""
+    rng = np.random.default_rng(42)
+    closes = 5.0 + rng.standard_normal(bars).cumsum() * 0.01
+    volumes = rng.integers(1_000, 100_000, size=bars)
+    payload: Dict[str, Any] = {
+        "ticker": "TEST",
+        "indicator": "Penny Stocks",
+        "rsi": 61.2345,
+        "macd": [0.0123, 0.0101, 0.0022],
+        "bollinger": [5.31, 5.12, 4.93],
+        "adx": 24.5,
+        "atr": 0.0712,
+        "volume": 1_234_567,
+        "close_price": float(closes[-1]),
+        "nested": {"a": {"b": {"c": [1.5, 2.5, {"d": 3.5}]}}},
+    }
+    if as_numpy:
+        payload["closes"] = closes
+        payload["volumes"] = volumes
+    else:
+        payload["closes"] = closes.tolist()
+        payload["volumes"] = volumes.tolist()
+        payload["datetime_price"] = [
+            [f"2026-01-02T09:{i % 60:02d}:00", p] for i, p in enumerate(closes.tolist())
+        ]
+    return payload
+
+
+def run(bars: int, repeat: int) -> None:
+    list_payload = build_payload(bars, as_numpy=False)
+    numpy_payload = build_payload(bars, as_numpy=True)
+    converted = to_dynamodb_compatible(list_payload)
+
+    # Sanity check: both paths must produce identical values
+    assert converted == legacy_convert_floats_to_decimals(list_payload)
+
+    cases = [
+        ("legacy (lists)", lambda: legacy_convert_floats_to_decimals(list_payload)),
+        ("serializer (lists)", lambda: to_dynamodb_compatible(list_payload)),
+        ("serializer (numpy)", lambda: to_dynamodb_compatible(numpy_payload)),
+        ("reconvert (already converted)", lambda: to_dynamodb_compatible(converted)),
+        ("attr-value map (numpy)", lambda: to_attribute_value_map(numpy_payload)),
+    ]
+
+    print(f"\nPayload: {bars} bars, {repeat} repetitions (best of 5)")
+    print(f"{'-' * 60}")
+    baseline = None
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=repeat, repeat=5)) / repeat
+        if baseline is None:
+            baseline = best
+        print(f"{name:<32} {best * 1e3:9.3f} ms   {baseline / best:6.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark DynamoDB float→Decimal serialization")
+    parser.add_argument("--bars", type=int, nargs="+", default=[200, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for bars in args.bars:
+        run(bars, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
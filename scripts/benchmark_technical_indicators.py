@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: pure-Python TechnicalIndicatorCalculator vs. the numpy
+implementation in app/src/services/trading/technical_indicator_calculator.py.
+
+Builds random OHLCV bars for N tickers and times:
+
+- legacy:       the original list-loop calculator, one ticker at a time
+- numpy:        TechnicalIndicatorCalculator.calculate_indicators per ticker
+- numpy batch:  calculate_indicators_for_tickers (one matrix for all tickers)
+- matrix only:  calculate_batch on a prebuilt (tickers x bars) matrix
+
+Usage:
+    python scripts/benchmark_technical_indicators.py
+    python scripts/benchmark_technical_indicators.py --tickers 20 200 2000 --bars 200
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.src.models.momentum_validation import TechnicalIndicators  # noqa: E402
+from app.src.services.trading.technical_indicator_calculator import (  # noqa: E402
+    TechnicalIndicatorCalculator,
+)
+
+
+class LegacyTechnicalIndicatorCalculator:
+    """Original pure-Python implementation, kept here as the benchmark baseline."""
+
+    @staticmethod
+    def calculate_indicators(
+        bars: List[Dict],
+        period_rsi: int = 14,
+        period_ema_fast: int = 12,
+        period_ema_slow: int = 26,
+        period_signal: int = 9,
+        period_bollinger: int = 20,
+        period_atr: int = 14,
+        period_adx: int = 14
+    ) -> TechnicalIndicators:
+        """
+        Calculate all technical indicators from price and volume data.
+
+        Args:
+            bars: List of price bar dictionaries with OHLCV data
+            period_rsi: RSI period (default: 14)
+            period_ema_fast: Fast EMA period (default: 12)
+            period_ema_slow: Slow EMA period (default: 26)
+            period_signal: MACD signal period (default: 9)
+            period_bollinger: Bollinger Bands period (default: 20)
+            period_atr: ATR period (default: 14)
+            period_adx: ADX period (default: 14)
+
+        Returns:
+            TechnicalIndicators with all calculated values
+        """
+        # Extract price and volume data
+        closes = [bar.get('c', 0.0) for bar in bars if bar.get('c') is not None and bar.get('c') > 0]
+        highs = [bar.get('h', 0.0) for bar in bars if bar.get('h') is not None and bar.get('h') > 0]
+        lows = [bar.get('l', 0.0) for bar in bars if bar.get('l') is not None and bar.get('l') > 0]
+        opens = [bar.get('o', 0.0) for bar in bars if bar.get('o') is not None and bar.get('o') > 0]
+        volumes = [bar.get('v', 0) for bar in bars if bar.get('v') is not None]
+        timestamps = [bar.get('t', '') for bar in bars if bar.get('t')]
+
+        # Handle insufficient data
+        if not closes:
+            return LegacyTechnicalIndicatorCalculator._create_default_indicators()
+
+        current_close = closes[-1]
+        current_volume = volumes[-1] if volumes else 0
+
+        # Calculate indicators
+        rsi = LegacyTechnicalIndicatorCalculator._calculate_rsi(closes, period_rsi)
+        macd_values = LegacyTechnicalIndicatorCalculator._calculate_macd(
+            closes, period_ema_fast, period_ema_slow, period_signal
+        )
+        bollinger_values = LegacyTechnicalIndicatorCalculator._calculate_bollinger(
+            closes, period_bollinger
+        )
+        adx = LegacyTechnicalIndicatorCalculator._calculate_adx(highs, lows, closes, period_adx)
+        ema_fast = LegacyTechnicalIndicatorCalculator._calculate_ema(closes, period_ema_fast)
+        ema_slow = LegacyTechnicalIndicatorCalculator._calculate_ema(closes, period_ema_slow)
+
+        # Volume indicators
+        volume_sma = LegacyTechnicalIndicatorCalculator._calculate_sma(volumes, min(20, len(volumes))) if volumes else 0.0
+        obv = LegacyTechnicalIndicatorCalculator._calculate_obv(closes, volumes)
+        mfi = LegacyTechnicalIndicatorCalculator._calculate_mfi(highs, lows, closes, volumes, 14)
+        ad = LegacyTechnicalIndicatorCalculator._calculate_ad(highs, lows, closes, volumes)
+
+        # Momentum indicators
+        stoch_values = LegacyTechnicalIndicatorCalculator._calculate_stochastic(highs, lows, closes, 14, 3)
+        cci = LegacyTechnicalIndicatorCalculator._calculate_cci(highs, lows, closes, 20)
+        atr = LegacyTechnicalIndicatorCalculator._calculate_atr(highs, lows, closes, period_atr)
+        willr = LegacyTechnicalIndicatorCalculator._calculate_williams_r(highs, lows, closes, 14)
+        roc = LegacyTechnicalIndicatorCalculator._calculate_roc(closes, 12)
+
+        # Price averages
+        vwap = LegacyTechnicalIndicatorCalculator._calculate_vwap(closes, volumes)
+        vwma = LegacyTechnicalIndicatorCalculator._calculate_vwma(closes, volumes, 20)
+        wma = LegacyTechnicalIndicatorCalculator._calculate_wma(closes, 20)
+
+        # Time series data
+        datetime_price = list(zip(timestamps[-20:], closes[-20:])) if timestamps else []
+
+        return TechnicalIndicators(
+            rsi=rsi,
+            macd=macd_values,
+            stoch=stoch_values,
+            cci=cci,
+            willr=willr,
+            roc=roc,
+            adx=adx,
+            ema_fast=ema_fast,
+            ema_slow=ema_slow,
+            bollinger=bollinger_values,
+            atr=atr,
+            volume=current_volume,
+            volume_sma=volume_sma,
+            obv=obv,
+            mfi=mfi,
+            ad=ad,
+            vwap=vwap,
+            vwma=vwma,
+            wma=wma,
+            close_price=current_close,
+            datetime_price=datetime_price
+        )
+
+    @staticmethod
+    def _create_default_indicators() -> TechnicalIndicators:
+        """Create default indicators when data is insufficient."""
+        return TechnicalIndicators(
+            rsi=50.0,
+            macd=[0.0, 0.0, 0.0],
+            stoch=[50.0, 50.0],
+            cci=0.0,
+            willr=-50.0,
+            roc=0.0,
+            adx=0.0,
+            ema_fast=0.0,
+            ema_slow=0.0,
+            bollinger=[0.0, 0.0, 0.0],
+            atr=0.0,
+            volume=0,
+            volume_sma=0.0,
+            obv=0.0,
+            mfi=50.0,
+            ad=0.0,
+            vwap=0.0,
+            vwma=0.0,
+            wma=0.0,
+            close_price=0.0,
+            datetime_price=[]
+        )
+
+    @staticmethod
+    def _calculate_sma(values: List[float], period: int) -> float:
+        """Calculate Simple Moving Average."""
+        if not values or len(values) < period:
+            return 0.0
+        return sum(values[-period:]) / period
+
+    @staticmethod
+    def _calculate_ema(values: List[float], period: int) -> float:
+        """Calculate Exponential Moving Average."""
+        if not values or len(values) < period:
+            return values[-1] if values else 0.0
+
+        multiplier = 2 / (period + 1)
+        ema = sum(values[:period]) / period  # Start with SMA
+
+        for price in values[period:]:
+            ema = (price * multiplier) + (ema * (1 - multiplier))
+
+        return ema
+
+    @staticmethod
+    def _calculate_rsi(closes: List[float], period: int = 14) -> float:
+        """Calculate Relative Strength Index."""
+        if len(closes) < period + 1:
+            return 50.0
+
+        gains = []
+        losses = []
+
+        for i in range(1, len(closes)):
+            change = closes[i] - closes[i-1]
+            if change > 0:
+                gains.append(change)
+                losses.append(0)
+            else:
+                gains.append(0)
+                losses.append(abs(change))
+
+        if len(gains) < period:
+            return 50.0
+
+        avg_gain = sum(gains[-period:]) / period
+        avg_loss = sum(losses[-period:]) / period
+
+        if avg_loss == 0:
+            return 100.0
+
+        rs = avg_gain / avg_loss
+        rsi = 100 - (100 / (1 + rs))
+
+        return rsi
+
+    @staticmethod
+    def _calculate_macd(
+        closes: List[float],
+        fast_period: int = 12,
+        slow_period: int = 26,
+        signal_period: int = 9
+    ) -> List[float]:
+        """Calculate MACD (Moving Average Convergence Divergence)."""
+        if len(closes) < slow_period:
+            return [0.0, 0.0, 0.0]
+
+        ema_fast = LegacyTechnicalIndicatorCalculator._calculate_ema(closes, fast_period)
+        ema_slow = LegacyTechnicalIndicatorCalculator._calculate_ema(closes, slow_period)
+        macd_line = ema_fast - ema_slow
+
+        # Calculate signal line (EMA of MACD)
+        # Simplified: use current MACD as signal
+        signal_line = macd_line * 0.9  # Approximation
+        histogram = macd_line - signal_line
+
+        return [macd_line, signal_line, histogram]
+
+    @staticmethod
+    def _calculate_bollinger(closes: List[float], period: int = 20) -> List[float]:
+        """Calculate Bollinger Bands."""
+        if len(closes) < period:
+            current = closes[-1] if closes else 0.0
+            return [current, current, current]
+
+        sma = sum(closes[-period:]) / period
+        variance = sum((x - sma) ** 2 for x in closes[-period:]) / period
+        std_dev = variance ** 0.5
+
+        upper = sma + (2 * std_dev)
+        lower = sma - (2 * std_dev)
+
+        return [upper, sma, lower]
+
+    @staticmethod
+    def _calculate_atr(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> float:
+        """Calculate Average True Range."""
+        if len(closes) < 2 or len(highs) < 2 or len(lows) < 2:
+            return 0.0
+
+        true_ranges = []
+        for i in range(1, len(closes)):
+            high_low = highs[i] - lows[i]
+            high_close = abs(highs[i] - closes[i-1])
+            low_close = abs(lows[i] - closes[i-1])
+            true_range = max(high_low, high_close, low_close)
+            true_ranges.append(true_range)
+
+        if len(true_ranges) < period:
+            return sum(true_ranges) / len(true_ranges) if true_ranges else 0.0
+
+        return sum(true_ranges[-period:]) / period
+
+    @staticmethod
+    def _calculate_adx(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> float:
+        """Calculate Average Directional Index (simplified)."""
+        if len(closes) < period + 1:
+            return 0.0
+
+        # Simplified ADX calculation
+        up_moves = []
+        down_moves = []
+
+        for i in range(1, len(highs)):
+            up_move = highs[i] - highs[i-1]
+            down_move = lows[i-1] - lows[i]
+            up_moves.append(max(up_move, 0))
+            down_moves.append(max(down_move, 0))
+
+        if not up_moves or not down_moves:
+            return 0.0
+
+        avg_up = sum(up_moves[-period:]) / period
+        avg_down = sum(down_moves[-period:]) / period
+
+        if avg_up + avg_down == 0:
+            return 0.0
+
+        dx = abs(avg_up - avg_down) / (avg_up + avg_down) * 100
+        return dx
+
+    @staticmethod
+    def _calculate_obv(closes: List[float], volumes: List[int]) -> float:
+        """Calculate On-Balance Volume."""
+        if len(closes) < 2 or len(volumes) < 2:
+            return 0.0
+
+        obv = 0.0
+        for i in range(1, len(closes)):
+            if closes[i] > closes[i-1]:
+                obv += volumes[i]
+            elif closes[i] < closes[i-1]:
+                obv -= volumes[i]
+
+        return obv
+
+    @staticmethod
+    def _calculate_mfi(
+        highs: List[float],
+        lows: List[float],
+        closes: List[float],
+        volumes: List[int],
+        period: int = 14
+    ) -> float:
+        """Calculate Money Flow Index."""
+        if len(closes) < period + 1 or not volumes:
+            return 50.0
+
+        typical_prices = [(h + l + c) / 3 for h, l, c in zip(highs, lows, closes)]
+        money_flows = [tp * v for tp, v in zip(typical_prices, volumes)]
+
+        positive_flow = 0.0
+        negative_flow = 0.0
+
+        for i in range(1, len(typical_prices)):
+            if typical_prices[i] > typical_prices[i-1]:
+                positive_flow += money_flows[i]
+            elif typical_prices[i] < typical_prices[i-1]:
+                negative_flow += money_flows[i]
+
+        if negative_flow == 0:
+            return 100.0
+
+        money_ratio = positive_flow / negative_flow
+        mfi = 100 - (100 / (1 + money_ratio))
+
+        return mfi
+
+    @staticmethod
+    def _calculate_ad(highs: List[float], lows: List[float], closes: List[float], volumes: List[int]) -> float:
+        """Calculate Accumulation/Distribution."""
+        if not highs or not lows or not closes or not volumes:
+            return 0.0
+
+        ad = 0.0
+        for h, l, c, v in zip(highs, lows, closes, volumes):
+            if h == l:
+                continue
+            clv = ((c - l) - (h - c)) / (h - l)
+            ad += clv * v
+
+        return ad
+
+    @staticmethod
+    def _calculate_stochastic(
+        highs: List[float],
+        lows: List[float],
+        closes: List[float],
+        period: int = 14,
+        smooth: int = 3
+    ) -> List[float]:
+        """Calculate Stochastic Oscillator."""
+        if len(closes) < period:
+            return [50.0, 50.0]
+
+        highest_high = max(highs[-period:])
+        lowest_low = min(lows[-period:])
+
+        if highest_high == lowest_low:
+            return [50.0, 50.0]
+
+        k = ((closes[-1] - lowest_low) / (highest_high - lowest_low)) * 100
+        d = k  # Simplified: use K as D
+
+        return [k, d]
+
+    @staticmethod
+    def _calculate_cci(highs: List[float], lows: List[float], closes: List[float], period: int = 20) -> float:
+        """Calculate Commodity Channel Index."""
+        if len(closes) < period:
+            return 0.0
+
+        typical_prices = [(h + l + c) / 3 for h, l, c in zip(highs[-period:], lows[-period:], closes[-period:])]
+        sma_tp = sum(typical_prices) / len(typical_prices)
+        mean_deviation = sum(abs(tp - sma_tp) for tp in typical_prices) / len(typical_prices)
+
+        if mean_deviation == 0:
+            return 0.0
+
+        cci = (typical_prices[-1] - sma_tp) / (0.015 * mean_deviation)
+        return cci
+
+    @staticmethod
+    def _calculate_williams_r(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> float:
+        """Calculate Williams %R."""
+        if len(closes) < period:
+            return -50.0
+
+        highest_high = max(highs[-period:])
+        lowest_low = min(lows[-period:])
+
+        if highest_high == lowest_low:
+            return -50.0
+
+        willr = ((highest_high - closes[-1]) / (highest_high - lowest_low)) * -100
+        return willr
+
+    @staticmethod
+    def _calculate_roc(closes: List[float], period: int = 12) -> float:
+        """Calculate Rate of Change."""
+        if len(closes) < period + 1:
+            return 0.0
+
+        old_close = closes[-period-1]
+        if old_close == 0:
+            return 0.0
+
+        roc = ((closes[-1] - old_close) / old_close) * 100
+        return roc
+
+    @staticmethod
+    def _calculate_vwap(closes: List[float], volumes: List[int]) -> float:
+        """Calculate Volume Weighted Average Price."""
+        if not closes or not volumes or len(closes) != len(volumes):
+            return closes[-1] if closes else 0.0
+
+        total_pv = sum(p * v for p, v in zip(closes, volumes))
+        total_v = sum(volumes)
+
+        if total_v == 0:
+            return closes[-1]
+
+        return total_pv / total_v
+
+    @staticmethod
+    def _calculate_vwma(closes: List[float], volumes: List[int], period: int = 20) -> float:
+        """Calculate Volume Weighted Moving Average."""
+        if not closes or not volumes or len(closes) < period:
+            return closes[-1] if closes else 0.0
+
+        recent_closes = closes[-period:]
+        recent_volumes = volumes[-period:]
+
+        total_pv = sum(p * v for p, v in zip(recent_closes, recent_volumes))
+        total_v = sum(recent_volumes)
+
+        if total_v == 0:
+            return recent_closes[-1]
+
+        return total_pv / total_v
+
+    @staticmethod
+    def _calculate_wma(closes: List[float], period: int = 20) -> float:
+        """Calculate Weighted Moving Average."""
+        if not closes or len(closes) < period:
+            return closes[-1] if closes else 0.0
+
+        recent_closes = closes[-period:]
+        weights = list(range(1, period + 1))
+
+        weighted_sum = sum(p * w for p, w in zip(recent_closes, weights))
+        weight_sum = sum(weights)
+
+        return weighted_sum / weight_sum
+
+
+def build_bars(tickers: int, bars: int) -> Dict[str, List[Dict]]:
+    """Random-walk OHLCV bars per ticker."""
+    rng = np.random.default_rng(42)
+    universe = {}
+    for index in range(tickers):
+        closes = np.abs(5.0 + rng.standard_normal(bars).cumsum() * 0.02) + 0.5
+        spread = np.abs(rng.standard_normal(bars)) * 0.01
+        volumes = rng.integers(1_000, 100_000, size=bars)
+        universe[f"T{index:04d}"] = [
+            {
+                "o": float(c), "h": float(c + s), "l": float(c - s), "c": float(c),
+                "v": int(v), "t": f"2026-01-02T{9 + i // 60 % 7:02d}:{i % 60:02d}:00Z",
+            }
+            for i, (c, s, v) in enumerate(zip(closes, spread, volumes))
+        ]
+    return universe
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(tickers: int, bars: int, repeat: int) -> None:
+    universe = build_bars(tickers, bars)
+    matrices = [
+        np.array([[bar[key] for bar in ticker_bars] for ticker_bars in universe.values()], dtype=np.float64)
+        for key in ("c", "h", "l", "v")
+    ]
+
+    # Sanity check: everything except the (previously approximated) MACD signal matches
+    sample = next(iter(universe.values()))
+    legacy = LegacyTechnicalIndicatorCalculator.calculate_indicators(sample)
+    current = TechnicalIndicatorCalculator.calculate_indicators(sample)
+    for field in ("rsi", "adx", "atr", "mfi", "cci", "vwap", "wma", "ema_fast", "ema_slow"):
+        assert np.isclose(getattr(legacy, field), getattr(current, field)), field
+    assert np.isclose(legacy.macd[0], current.macd[0])
+
+    cases = [
+        ("legacy (per ticker)", lambda: [LegacyTechnicalIndicatorCalculator.calculate_indicators(b) for b in universe.values()]),
+        ("numpy (per ticker)", lambda: [TechnicalIndicatorCalculator.calculate_indicators(b) for b in universe.values()]),
+        ("numpy batch (bars -> models)", lambda: TechnicalIndicatorCalculator.calculate_indicators_for_tickers(universe)),
+        ("matrix only (calculate_batch)", lambda: TechnicalIndicatorCalculator.calculate_batch(*matrices)),
+    ]
+
+    print(f"\n{tickers} tickers x {bars} bars, best of {repeat}")
+    print(f"{'-' * 64}")
+    baseline = None
+    for name, func in cases:
+        best = best_of(func, repeat)
+        if baseline is None:
+            baseline = best
+        print(f"{name:<32} {best * 1e3:10.2f} ms   {baseline / best:7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark technical indicator calculation")
+    parser.add_argument("--tickers", type=int, nargs="+", default=[20, 200, 2000])
+    parser.add_argument("--bars", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for tickers in args.tickers:
+        run(tickers, args.bars, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-ticker ValidationRule chain vs. the columnar
+BatchValidationEvaluator in app/src/services/trading/validation/batch_evaluator.py.
+
+Builds random bars/quotes for N tickers and times:
+
+- per ticker:    TrendAnalyzer.calculate_trend_metrics + rule.validate() loop
+- batch:         CandidateTable.from_market_data + BatchValidationEvaluator.evaluate
+- evaluate only: BatchValidationEvaluator.evaluate on a prebuilt table
+- batch+persist: batch, then rendering reasons for every rejected ticker
+
+Usage:
+    python scripts/benchmark_validation_rules.py
+    python scripts/benchmark_validation_rules.py --tickers 100 500 5000 --bars 60
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.src.services.trading.validation import (  # noqa: E402
+    BatchValidationEvaluator,
+    CandidateTable,
+    ContinuationRule,
+    DataQualityRule,
+    LiquidityRule,
+    MomentumThresholdRule,
+    PriceExtremeRule,
+    QuoteData,
+    TrendAnalyzer,
+    TrendDirectionRule,
+)
+
+RULES = [
+    DataQualityRule(required_bars=5),
+    LiquidityRule(max_spread_percent=2.0),
+    ContinuationRule(min_continuation=0.7),
+    PriceExtremeRule(extreme_threshold_percent=1.0),
+    MomentumThresholdRule(min_momentum=3.0, max_momentum=10.0),
+    TrendDirectionRule(),
+]
+
+
+def build_universe(tickers: int, bars: int) -> Tuple[Dict[str, List[Dict]], Dict[str, QuoteData]]:
+    rng = np.random.default_rng(42)
+    bars_by_ticker, quotes = {}, {}
+    for index in range(tickers):
+        ticker = f"T{index:04d}"
+        closes = np.abs(2.0 + rng.standard_normal(bars).cumsum() * 0.05) + 0.1
+        bars_by_ticker[ticker] = [{"c": float(c), "v": 1000} for c in closes]
+        spread = float(rng.choice([0.001, 0.01, 0.05]))
+        quotes[ticker] = QuoteData.from_bid_ask(ticker, float(closes[-1]), float(closes[-1]) + spread)
+    return bars_by_ticker, quotes
+
+
+def per_ticker(bars_by_ticker: Dict[str, List[Dict]], quotes: Dict[str, QuoteData]) -> List[str]:
+    passed = []
+    for ticker, bars in bars_by_ticker.items():
+        metrics = TrendAnalyzer.calculate_trend_metrics(bars)
+        for rule in RULES:
+            if not rule.validate(ticker, metrics, quotes[ticker], bars).passed:
+                break
+        else:
+            passed.append(ticker)
+    return passed
+
+
+def batch_and_render(bars_by_ticker: Dict[str, List[Dict]], quotes: Dict[str, QuoteData]) -> None:
+    result = BatchValidationEvaluator(RULES).evaluate(CandidateTable.from_market_data(bars_by_ticker, quotes))
+    for row in result.rejected_rows():
+        result.render_reasons(row)
+        result.table.trend_metrics(row)
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(tickers: int, bars: int, repeat: int) -> None:
+    bars_by_ticker, quotes = build_universe(tickers, bars)
+    evaluator = BatchValidationEvaluator(RULES)
+    table = CandidateTable.from_market_data(bars_by_ticker, quotes)
+
+    # Sanity check: both paths accept the same tickers
+    assert evaluator.evaluate(table).passed_tickers() == per_ticker(bars_by_ticker, quotes)
+
+    cases = [
+        ("per ticker (rules loop)", lambda: per_ticker(bars_by_ticker, quotes)),
+        ("batch (bars -> codes)", lambda: evaluator.evaluate(CandidateTable.from_market_data(bars_by_ticker, quotes))),
+        ("evaluate only", lambda: evaluator.evaluate(table)),
+        ("batch + render rejected", lambda: batch_and_render(bars_by_ticker, quotes)),
+    ]
+
+    print(f"\n{tickers} tickers x {bars} bars, best of {repeat}")
+    print(f"{'-' * 64}")
+    baseline = None
+    for name, func in cases:
+        best = best_of(func, repeat)
+        if baseline is None:
+            baseline = best
+        print(f"{name:<32} {best * 1e3:10.2f} ms   {baseline / best:7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark validation rule evaluation")
+    parser.add_argument("--tickers", type=int, nargs="+", default=[100, 500, 5000])
+    parser.add_argument("--bars", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for tickers in args.tickers:
+        run(tickers, args.bars, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -23,22 +23,58 @@ dynamodb = boto3.client(
     region_name=aws_region
 )
 
-def create_table_if_not_exists(table_name, key_schema, attribute_definitions):
-    """Create a DynamoDB table if it doesn't already exist"""
+# GSI for time-window reads of inactive tickers (see INACTIVE_TICKERS_TIME_INDEX_NAME)
+INACTIVE_TICKERS_TIME_INDEX_NAME = os.getenv(
+    "INACTIVE_TICKERS_TIME_INDEX_NAME", "indicator-timestamp-index"
+)
+
+
+def ensure_global_secondary_indexes(table_name, existing_indexes, global_secondary_indexes, attribute_definitions):
+    """Add any missing GSIs to an existing table (one per update, as DynamoDB requires)"""
+    existing_names = {index['IndexName'] for index in existing_indexes}
+    for index in global_secondary_indexes:
+        if index['IndexName'] in existing_names:
+            print(f"✅ Index '{index['IndexName']}' already exists on '{table_name}'")
+            continue
+        try:
+            dynamodb.update_table(
+                TableName=table_name,
+                AttributeDefinitions=attribute_definitions,
+                GlobalSecondaryIndexUpdates=[{'Create': index}]
+            )
+            print(f"✅ Creating index '{index['IndexName']}' on '{table_name}' (backfills in the background)")
+        except Exception as e:
+            print(f"❌ Error creating index '{index['IndexName']}' on '{table_name}': {str(e)}")
+            return False
+    return True
+
+
+def create_table_if_not_exists(table_name, key_schema, attribute_definitions, global_secondary_indexes=None):
+    """Create a DynamoDB table if it doesn't already exist (and add missing GSIs if it does)"""
     try:
         # Check if table exists
-        dynamodb.describe_table(TableName=table_name)
+        description = dynamodb.describe_table(TableName=table_name)
         print(f"✅ Table '{table_name}' already exists")
+        if global_secondary_indexes:
+            return ensure_global_secondary_indexes(
+                table_name,
+                description['Table'].get('GlobalSecondaryIndexes', []),
+                global_secondary_indexes,
+                attribute_definitions
+            )
         return True
     except dynamodb.exceptions.ResourceNotFoundException:
         # Table doesn't exist, create it
         try:
-            response = dynamodb.create_table(
-                TableName=table_name,
-                KeySchema=key_schema,
-                AttributeDefinitions=attribute_definitions,
-                BillingMode='PAY_PER_REQUEST'  # On-demand billing
-            )
+            create_params = {
+                'TableName': table_name,
+                'KeySchema': key_schema,
+                'AttributeDefinitions': attribute_definitions,
+                'BillingMode': 'PAY_PER_REQUEST'  # On-demand billing
+            }
+            if global_secondary_indexes:
+                create_params['GlobalSecondaryIndexes'] = global_secondary_indexes
+            dynamodb.create_table(**create_params)
             print(f"✅ Created table '{table_name}'")
             return True
         except Exception as e:
@@ -87,6 +123,8 @@ def main():
         tables_failed += 1
     
     # 3. InactiveTickersForDayTrading
+    # GSI (indicator, timestamp) serves "records for indicator X since T" as a
+    # query whose cost scales with the window instead of the table size
     if create_table_if_not_exists(
         table_name='InactiveTickersForDayTrading',
         key_schema=[
@@ -95,7 +133,18 @@ def main():
         ],
         attribute_definitions=[
             {'AttributeName': 'ticker', 'AttributeType': 'S'},
-            {'AttributeName': 'indicator', 'AttributeType': 'S'}
+            {'AttributeName': 'indicator', 'AttributeType': 'S'},
+            {'AttributeName': 'timestamp', 'AttributeType': 'S'}
+        ],
+        global_secondary_indexes=[
+            {
+                'IndexName': INACTIVE_TICKERS_TIME_INDEX_NAME,
+                'KeySchema': [
+                    {'AttributeName': 'indicator', 'KeyType': 'HASH'},
+                    {'AttributeName': 'timestamp', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'}
+            }
         ]
     ):
         tables_created += 1
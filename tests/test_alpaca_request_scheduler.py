@@ -0,0 +1,100 @@
+"""
+Tests for AlpacaRequestScheduler (token bucket with priority lanes)
+"""
+
+import asyncio
+import time
+import pytest
+from app.src.common.alpaca_request_scheduler import AlpacaRequestScheduler, RequestLane
+
+
+@pytest.fixture
+def scheduler():
+    """Small, fast-refilling bucket for tests"""
+    AlpacaRequestScheduler.configure(requests_per_minute=600, burst=4, exit_reserve=1)
+    yield AlpacaRequestScheduler
+    AlpacaRequestScheduler.configure()
+
+
+class TestAlpacaRequestScheduler:
+    """Test suite for AlpacaRequestScheduler"""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_granted_immediately(self, scheduler):
+        """Test requests within the burst (minus exit reserve) don't wait"""
+        start = time.monotonic()
+        for _ in range(3):
+            await scheduler.acquire(RequestLane.BARS)
+        assert time.monotonic() - start < 0.05
+        assert scheduler.get_stats()["lanes"]["bars"]["granted"] == 3
+
+    @pytest.mark.asyncio
+    async def test_exit_reserve_is_not_used_by_other_lanes(self, scheduler):
+        """Test lower lanes wait while exits can still use the reserved token"""
+        for _ in range(3):
+            await scheduler.acquire(RequestLane.ENTRY_QUOTE)
+
+        entry = asyncio.create_task(scheduler.acquire(RequestLane.ENTRY_QUOTE))
+        await asyncio.sleep(0)
+        assert not entry.done()
+        assert scheduler.get_stats()["lanes"]["entry_quote"]["queue_depth"] == 1
+
+        start = time.monotonic()
+        await scheduler.acquire(RequestLane.EXIT)
+        assert time.monotonic() - start < 0.05
+
+        await asyncio.wait_for(entry, timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_served_in_lane_order(self, scheduler):
+        """Test queued exits jump ahead of queued entry/bars/screener requests"""
+        scheduler.configure(requests_per_minute=600, burst=1, exit_reserve=0)
+        await scheduler.acquire(RequestLane.BARS)
+
+        order = []
+
+        async def request(lane):
+            await scheduler.acquire(lane)
+            order.append(lane)
+
+        tasks = [
+            asyncio.create_task(request(lane))
+            for lane in (RequestLane.SCREENER, RequestLane.BARS, RequestLane.ENTRY_QUOTE, RequestLane.EXIT)
+        ]
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=2.0)
+        assert order == [RequestLane.EXIT, RequestLane.ENTRY_QUOTE, RequestLane.BARS, RequestLane.SCREENER]
+
+    @pytest.mark.asyncio
+    async def test_exit_context_promotes_requests(self, scheduler):
+        """Test requests made inside exit_priority() use the exit lane"""
+        with scheduler.exit_priority():
+            await scheduler.acquire(RequestLane.BARS)
+        await scheduler.acquire(RequestLane.BARS)
+
+        lanes = scheduler.get_stats()["lanes"]
+        assert lanes["exit"]["granted"] == 1
+        assert lanes["bars"]["granted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_all_lanes(self, scheduler):
+        """Test a 429 with Retry-After holds requests until the window resets"""
+        scheduler.observe_response(429, {"Retry-After": "0.2"})
+        assert scheduler.get_stats()["throttled_responses"] == 1
+
+        start = time.monotonic()
+        await scheduler.acquire(RequestLane.EXIT)
+        assert time.monotonic() - start >= 0.15
+
+    def test_rate_limit_headers_adjust_bucket(self, scheduler):
+        """Test X-RateLimit-* headers update the limit and available tokens"""
+        scheduler.observe_response(
+            200, {"X-RateLimit-Limit": "1000", "X-RateLimit-Remaining": "2"}
+        )
+        stats = scheduler.get_stats()
+        assert stats["requests_per_minute"] == 1000
+        assert stats["tokens"] <= 2
+
+    def test_malformed_headers_are_ignored(self, scheduler):
+        """Test non-numeric header values don't raise"""
+        scheduler.observe_response(200, {"X-RateLimit-Limit": "n/a", "Retry-After": None})
+        assert scheduler.get_stats()["requests_per_minute"] == 600
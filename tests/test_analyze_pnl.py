@@ -0,0 +1,114 @@
+"""
+Tests for the vectorized P&L engine in scripts/analyze_pnl.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.analyze_pnl import BacktestAnalyzer, VectorizedPnLEngine, read_signals_csv
+
+
+def _signals(count=400, tickers=("AAA", "BBB", "CCC"), seed=3):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "timestamp": pd.Timestamp("2025-01-02 09:30", tz="America/New_York")
+        + pd.to_timedelta(rng.integers(0, 2000, count), unit="min"),
+        "ticker": rng.choice(list(tickers), count),
+    }).drop_duplicates(["timestamp", "ticker"])
+    df["indicator"] = rng.choice(["RSI", "MACD"], len(df))
+    df["action"] = rng.choice(["buy_to_open", "sell_to_open"], len(df))
+    df["price"] = rng.uniform(5, 50, len(df)).round(2)
+    return df.sort_values("timestamp", kind="stable", ignore_index=True)
+
+
+def _reference_pnl(df, hold_minutes):
+    """Row-by-row exit lookup (the former iterrows implementation)"""
+    pnl = []
+    for _, row in df.iterrows():
+        future = df[(df["ticker"] == row["ticker"])
+                    & (df["timestamp"] >= row["timestamp"] + pd.Timedelta(minutes=hold_minutes))]
+        exit_price = row["price"] if future.empty else future.iloc[0]["price"]
+        sign = 1 if row["action"] == "buy_to_open" else -1
+        pnl.append(sign * (exit_price - row["price"]) / row["price"] * 100)
+    return np.array(pnl)
+
+
+class TestVectorizedPnLEngine:
+    """Test suite for VectorizedPnLEngine"""
+
+    def test_matches_row_by_row_lookup_for_every_horizon(self):
+        """Test vectorized exits equal the per-signal DataFrame filter"""
+        df = _signals()
+        engine = VectorizedPnLEngine(df)
+
+        pnl = engine.pnl_percent([5, 30, 240])
+
+        for column, hold_minutes in enumerate([5, 30, 240]):
+            np.testing.assert_allclose(pnl[:, column], _reference_pnl(df, hold_minutes))
+
+    def test_exit_is_first_later_price_of_same_ticker(self):
+        """Test exits skip other tickers and fall back to entry without future data"""
+        df = pd.DataFrame({
+            "timestamp": pd.to_datetime([
+                "2025-01-02 09:30", "2025-01-02 09:40", "2025-01-02 10:05", "2025-01-02 10:10",
+            ]),
+            "ticker": ["AAA", "BBB", "AAA", "BBB"],
+            "indicator": "RSI",
+            "action": ["buy_to_open", "sell_to_open", "buy_to_open", "buy_to_open"],
+            "price": [10.0, 20.0, 11.0, 19.0],
+        })
+
+        results = VectorizedPnLEngine(df).trade_results(30)
+
+        assert list(results["exit_price"]) == [11.0, 19.0, 11.0, 19.0]
+        assert list(results["exit_reason"]) == [
+            "Exit after 30 minutes", "Exit after 30 minutes", "No future data", "No future data",
+        ]
+        assert results["pnl_percent"].tolist() == pytest.approx([10.0, 5.0, 0.0, 0.0])
+        assert results["pnl_amount"].tolist() == pytest.approx([100.0, 100.0, 0.0, 0.0])
+
+    def test_summaries_by_indicator_and_ticker(self):
+        """Test grouped statistics match a direct pandas computation"""
+        df = _signals()
+        engine = VectorizedPnLEngine(df)
+        pnl = pd.Series(engine.pnl_percent([30])[:, 0])
+
+        by_indicator = engine.summarize([15, 30]).loc[30]
+        by_ticker = engine.summarize([30], by="ticker").loc[30]
+
+        for indicator, group in pnl.groupby(df["indicator"].to_numpy()):
+            stats = by_indicator.loc[indicator]
+            assert stats["total_trades"] == len(group)
+            assert stats["win_rate"] == pytest.approx((group > 0).mean() * 100)
+            assert stats["avg_win_percent"] == pytest.approx(group[group > 0].mean())
+            assert stats["max_loss_percent"] == pytest.approx(group.min())
+        assert by_ticker["total_trades"].sum() == len(df)
+        assert set(by_ticker.index) == {"AAA", "BBB", "CCC"}
+
+    def test_chunked_csv_read_keeps_categories(self, tmp_path):
+        """Test chunked reads union categoricals and only keep needed columns"""
+        df = _signals(count=300, tickers=("AAA", "BBB", "CCC", "DDD"))
+        df["notes"] = "ignored"
+        path = tmp_path / "signals.csv"
+        df.to_csv(path, index=False)
+
+        loaded = read_signals_csv(str(path), chunksize=37)
+
+        assert "notes" not in loaded
+        assert isinstance(loaded["ticker"].dtype, pd.CategoricalDtype)
+        assert sorted(loaded["ticker"].unique()) == ["AAA", "BBB", "CCC", "DDD"]
+        assert len(loaded) == len(df)
+
+    def test_analyzer_keeps_summary_format(self, tmp_path):
+        """Test BacktestAnalyzer summaries keep their dictionary shape"""
+        path = tmp_path / "signals.csv"
+        _signals().to_csv(path, index=False)
+        analyzer = BacktestAnalyzer(str(path), chunksize=50)
+
+        summary = analyzer.calculate_indicator_summary(analyzer.calculate_simple_pnl(30))
+        time_analysis = analyzer.calculate_time_based_pnl([5, 30])
+
+        assert set(summary) == {"RSI", "MACD"}
+        assert time_analysis["30_min"]["RSI"]["total_trades"] == summary["RSI"]["total_trades"]
+        assert time_analysis["30_min"]["RSI"]["avg_pnl_percent"] == pytest.approx(summary["RSI"]["avg_pnl_percent"])
@@ -0,0 +1,212 @@
+"""
+Tests for AssetDirectory (bulk asset list replacing per-ticker lookups)
+"""
+
+import asyncio
+import json
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.src.common.alpaca import AlpacaClient
+from app.src.common.alpaca_request_scheduler import AlpacaRequestScheduler, RequestLane
+from app.src.common.asset_directory import AssetDirectory, AssetInfo
+from app.src.services.market_data.market_data_service import MarketDataService
+from app.src.services.trading.momentum_indicator import MomentumIndicator
+
+
+def _asset(symbol, name="Example Corp Common Stock", shortable=True, tradable=True, easy_to_borrow=True):
+    return {
+        "symbol": symbol,
+        "name": name,
+        "exchange": "NASDAQ",
+        "class": "us_equity",
+        "tradable": tradable,
+        "shortable": shortable,
+        "easy_to_borrow": easy_to_borrow,
+        "fractionable": False,
+    }
+
+
+ASSETS = [
+    _asset("AAPL", "Apple Inc. Common Stock"),
+    _asset("HTB", shortable=False, easy_to_borrow=False),
+    _asset("HALT", tradable=False),
+    _asset("ACAHW", "Atlantic Coastal Acquisition Corp. - Warrants"),
+    _asset("ACAHU", "Atlantic Coastal Acquisition Corp. - Units, each consisting of one share"),
+    _asset("SNOW", "Snowflake Inc. Class A Common Stock"),
+    _asset("ACAHR", "Atlantic Coastal Acquisition Corp. - Rights"),
+]
+
+# Ordinary equities whose names contain "unit(s)" or "right(s)"
+EQUITY_NAMES = [
+    "Energy Transfer LP Common Units",
+    "Enterprise Products Partners L.P. Common Units",
+    "Sabine Royalty Trust Units of Beneficial Interest",
+    "Unit Corporation Common Stock",
+    "First Rights Bancorp Common Stock",
+]
+
+
+@pytest.fixture
+def directory(tmp_path):
+    AssetDirectory.reset()
+    with patch.object(AssetDirectory, "snapshot_path", str(tmp_path / "assets.json")), patch.object(
+        AssetDirectory, "enabled", True
+    ):
+        yield AssetDirectory
+    AssetDirectory.reset()
+
+
+class TestAssetDirectory:
+    """Test suite for AssetDirectory"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_load_answers_lookups_in_memory(self, directory):
+        """Test one list download serves shortability and security-type lookups"""
+        with patch.object(AlpacaClient, "list_assets", new=AsyncMock(return_value=ASSETS)) as mock_list, patch.object(
+            AlpacaClient, "is_shortable", new=AsyncMock(return_value=True)
+        ) as mock_single:
+            assert await directory.ensure_loaded() is True
+            assert await directory.check_shortable("aapl") is True
+            assert await directory.check_shortable("HTB") is False
+            assert await directory.check_shortable("HALT") is False
+            await directory.ensure_loaded()
+
+        mock_list.assert_awaited_once()
+        mock_single.assert_not_awaited()
+        assert directory.is_special_security("ACAHW") is True
+        assert directory.get("ACAHU").security_type == "unit"
+        assert directory.is_special_security("SNOW") is False
+        assert directory.is_special_security("UNKNOWN") is None
+
+    @pytest.mark.asyncio
+    async def test_unknown_symbol_falls_back_to_single_lookup(self, directory):
+        """Test symbols missing from the directory use AlpacaClient.is_shortable"""
+        with patch.object(AlpacaClient, "list_assets", new=AsyncMock(return_value=ASSETS)), patch.object(
+            AlpacaClient, "is_shortable", new=AsyncMock(return_value=True)
+        ) as mock_single:
+            assert await directory.check_shortable("NEWIPO") is True
+
+        mock_single.assert_awaited_once_with("NEWIPO")
+
+    @pytest.mark.asyncio
+    async def test_snapshot_skips_download_after_restart(self, directory):
+        """Test a same-day snapshot is used instead of re-downloading"""
+        with patch.object(AlpacaClient, "list_assets", new=AsyncMock(return_value=ASSETS)):
+            await directory.ensure_loaded()
+
+        directory.reset()  # simulate a restart
+        with patch.object(AlpacaClient, "list_assets", new=AsyncMock(return_value=[])) as mock_list:
+            assert await directory.ensure_loaded() is True
+
+        mock_list.assert_not_awaited()
+        assert directory.is_shortable("AAPL") is True
+        assert directory.is_special_security("ACAHW") is True
+
+    @pytest.mark.asyncio
+    async def test_intraday_refresh_applies_only_deltas(self, directory):
+        """Test a refresh updates changed symbols and removes delisted ones"""
+        with patch.object(AlpacaClient, "list_assets", new=AsyncMock(return_value=ASSETS)):
+            await directory.ensure_loaded()
+        unchanged = directory.get("AAPL")
+
+        updated = [a for a in ASSETS if a["symbol"] != "HALT"]
+        updated[1] = _asset("HTB", shortable=True)
+        with patch.object(AlpacaClient, "list_assets", new=AsyncMock(return_value=updated)):
+            changed = await directory.refresh()
+
+        assert changed == 2
+        assert directory.get("AAPL") is unchanged
+        assert directory.is_shortable("HTB") is True
+        assert directory.get("HALT") is None
+        with open(directory.snapshot_path) as f:
+            assert len(json.load(f)["assets"]) == len(updated)
+
+    @pytest.mark.asyncio
+    async def test_failed_download_is_retried_later(self, directory):
+        """Test a failed list download does not hammer the API every cycle"""
+        with patch.object(AlpacaClient, "list_assets", new=AsyncMock(return_value=None)) as mock_list:
+            assert await directory.ensure_loaded() is False
+            assert await directory.ensure_loaded() is False
+
+        mock_list.assert_awaited_once()
+
+    def test_security_type_uses_trailing_descriptor(self):
+        """Test only a trailing warrant/unit/right descriptor marks a special security"""
+        for name in EQUITY_NAMES:
+            info = AssetInfo.from_api(_asset("EQTY", name))
+            assert (name, info.security_type) == (name, "common")
+            assert info.is_special_security is False
+
+        types = {a["symbol"]: AssetInfo.from_api(a).security_type for a in ASSETS}
+        assert (types["ACAHW"], types["ACAHU"], types["ACAHR"]) == ("warrant", "unit", "right")
+        assert AssetInfo.from_api(_asset("ABCD", "ABC Corp Warrant (Expiring 2028)")).security_type == "warrant"
+
+    @pytest.mark.asyncio
+    async def test_background_task_loads_directory(self, directory):
+        """Test start() loads the directory off the trading cycles and lookups never wait for it"""
+        release = asyncio.Event()
+
+        async def slow_list():
+            await release.wait()
+            return ASSETS
+
+        with patch.object(AlpacaClient, "list_assets", new=AsyncMock(side_effect=slow_list)), patch.object(
+            AlpacaClient, "is_shortable", new=AsyncMock(return_value=True)
+        ) as mock_single:
+            assert directory.start() is True
+            try:
+                # Download still in flight: the per-ticker fallback answers immediately
+                assert await asyncio.wait_for(directory.check_shortable("HTB"), timeout=1) is True
+                release.set()
+                for _ in range(50):
+                    if directory.is_loaded():
+                        break
+                    await asyncio.sleep(0.01)
+                assert await directory.check_shortable("HTB") is False
+            finally:
+                await directory.stop()
+
+        mock_single.assert_awaited_once_with("HTB")
+        assert directory.is_running() is False
+
+    @pytest.mark.asyncio
+    async def test_consumers_use_directory(self, directory):
+        """Test the shortability chain and warrant filter consult the directory first"""
+        with patch.object(AlpacaClient, "list_assets", new=AsyncMock(return_value=ASSETS)):
+            await directory.ensure_loaded()
+            is_shortable, reason = await MarketDataService._check_ticker_shortable("HTB")
+
+        assert (is_shortable, reason) == (False, "HTB is not shortable")
+        # Suffix heuristic would flag SNOW (ends with W); the directory knows better
+        assert MomentumIndicator._is_warrant_or_option("SNOW") is False
+        assert MomentumIndicator._is_warrant_or_option("ACAHW") is True
+
+    @pytest.mark.asyncio
+    async def test_unknown_ticker_fallback_uses_scheduler(self, directory):
+        """Test the per-ticker API fallback waits on the ASSETS lane and feeds back the response"""
+        response = AsyncMock()
+        response.status = 429
+        response.headers = {}
+        request = AsyncMock()
+        request.__aenter__.return_value = response
+        session = AsyncMock()
+        session.get = lambda *args, **kwargs: request
+
+        MarketDataService._is_shortable_local_cache.pop("ZZZZ", None)
+        MarketDataService._shortability_cache.pop("ZZZZ", None)
+        with patch.object(AlpacaClient, "API_KEY_ID", "key"), patch.object(
+            AlpacaClient, "API_SECRET_KEY", "secret"
+        ), patch.object(AlpacaClient, "_get_session", new=AsyncMock(return_value=session)), patch.object(
+            AlpacaRequestScheduler, "acquire", new=AsyncMock()
+        ) as mock_acquire, patch.object(AlpacaRequestScheduler, "observe_response") as mock_observe:
+            is_shortable, _ = await MarketDataService._check_ticker_shortable("ZZZZ")
+
+        # Retries come from the scheduler, not a private backoff
+        assert is_shortable is True
+        assert [c.args for c in mock_acquire.await_args_list] == [(RequestLane.ASSETS,)] * 3
+        assert [c.kwargs["retry"] for c in mock_acquire.await_args_list] == [False, True, True]
+        assert mock_observe.call_count == 3
+        MarketDataService._is_shortable_local_cache.pop("ZZZZ", None)
+        MarketDataService._shortability_cache.pop("ZZZZ", None)
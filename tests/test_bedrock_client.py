@@ -0,0 +1,90 @@
+"""
+Tests for BedrockClient (async invocation, response cache, timeout, stub backend)
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from app.src.services.bedrock.bedrock_client import BedrockClient, StubBedrockModel
+
+
+@pytest.fixture
+def stub_model():
+    model = StubBedrockModel(responder=lambda prompt: f"echo: {prompt}")
+    BedrockClient.set_model(model)
+    BedrockClient.clear_cache()
+    yield model
+    BedrockClient.set_model(None)
+    BedrockClient.clear_cache()
+
+
+class TestBedrockClient:
+    """Test suite for BedrockClient"""
+
+    @pytest.mark.asyncio
+    async def test_invoke_model_returns_text_from_backend(self, stub_model):
+        """Test the prompt is sent as a Claude messages body and the text returned"""
+        text = await BedrockClient.invoke_model("hello", max_tokens=100, temperature=0.2)
+
+        assert text == "echo: hello"
+        body = stub_model.calls[0]
+        assert body["max_tokens"] == 100
+        assert body["temperature"] == 0.2
+        assert body["messages"] == [{"role": "user", "content": "hello"}]
+
+    @pytest.mark.asyncio
+    async def test_identical_prompt_is_served_from_cache(self, stub_model):
+        """Test a repeated request within the TTL does not reach the backend"""
+        first = await BedrockClient.invoke_model("same prompt")
+        second = await BedrockClient.invoke_model("same prompt")
+        await BedrockClient.invoke_model("other prompt")
+
+        assert first == second
+        assert len(stub_model.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_expires_and_can_be_bypassed(self, stub_model):
+        """Test use_cache=False and an expired entry both call the backend"""
+        await BedrockClient.invoke_model("prompt")
+        await BedrockClient.invoke_model("prompt", use_cache=False)
+        with patch.object(BedrockClient, "cache_ttl_seconds", 0):
+            await BedrockClient.invoke_model("prompt")
+
+        assert len(stub_model.calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_none_without_caching(self):
+        """Test a slow backend is cut off at timeout_seconds"""
+        model = StubBedrockModel(latency_seconds=1.0)
+        BedrockClient.set_model(model)
+        BedrockClient.clear_cache()
+        try:
+            with patch.object(BedrockClient, "timeout_seconds", 0.01):
+                assert await BedrockClient.invoke_model("slow") is None
+            assert BedrockClient._cache == {}
+        finally:
+            BedrockClient.set_model(None)
+
+    @pytest.mark.asyncio
+    async def test_backend_error_returns_none(self, stub_model):
+        """Test backend exceptions are logged and reported as no response"""
+
+        def fail(prompt):
+            raise RuntimeError("throttled")
+
+        stub_model.responder = fail
+        assert await BedrockClient.invoke_model("prompt") is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_do_not_block_the_loop(self, stub_model):
+        """Test invocations run concurrently on the event loop"""
+        stub_model.latency_seconds = 0.05
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        results = await asyncio.gather(*(BedrockClient.invoke_model(f"p{i}") for i in range(5)))
+
+        assert results == [f"echo: p{i}" for i in range(5)]
+        assert loop.time() - started < 0.2
@@ -0,0 +1,125 @@
+"""
+Tests for lazy loading of the trading stack and the startup timer
+
+Import checks run in a fresh interpreter so modules already imported by
+other tests don't hide a regression.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+from app.src.common.startup_timer import StartupTimer
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# In-process `import app.src.app` time (interpreter startup excluded). Loading
+# the full trading stack at import took about three times this.
+COLD_IMPORT_BUDGET_SECONDS = float(os.getenv("COLD_IMPORT_BUDGET_SECONDS", "1.0"))
+
+HEAVY_MODULES = [
+    "pandas",
+    "talib",
+    "aioboto3",
+    "boto3",
+    "app.src.db.dynamodb_client",
+    "app.src.services.technical_analysis.technical_analysis_lib",
+    "app.src.services.trading.base_trading_indicator",
+    "app.src.services.trading.momentum_indicator",
+    "app.src.services.trading.penny_stocks_indicator",
+    "app.src.services.trading.deep_analyzer_indicator",
+    "app.src.services.trading.uw_enhanced_momentum_indicator",
+]
+
+
+def _run_python(code: str, env: dict = None) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        env={**os.environ, "PYTHONPATH": str(REPO_ROOT), **(env or {})},
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestColdStart:
+    """Test suite for the import-time budget and flag-driven indicator loading"""
+
+    def test_app_import_defers_trading_stack(self):
+        """Test importing the app entry point loads no indicator or heavy dependency"""
+        code = (
+            "import json, sys, time\n"
+            "start = time.perf_counter()\n"
+            "import app.src.app\n"
+            "elapsed = time.perf_counter() - start\n"
+            f"print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))"
+        )
+
+        runs = [_run_python(code) for _ in range(3)]
+
+        assert runs[0]["loaded"] == []
+        best = min(run["seconds"] for run in runs)
+        assert best < COLD_IMPORT_BUDGET_SECONDS, (
+            f"cold import took {best:.2f}s (budget {COLD_IMPORT_BUDGET_SECONDS:.2f}s)"
+        )
+
+    def test_configure_imports_only_enabled_indicators(self):
+        """Test the coordinator imports indicator modules only for enabled flags"""
+        code = (
+            "import json, sys\n"
+            "from app.src.services.trading.trading_service import TradingServiceCoordinator\n"
+            "TradingServiceCoordinator.configure()\n"
+            "print(json.dumps({'enabled': TradingServiceCoordinator._enabled_indicators,"
+            " 'loaded': sorted(m for m in sys.modules if m.endswith('_indicator')"
+            " and m.startswith('app.src.services.trading.'))}))"
+        )
+        env = {
+            "ENABLE_MOMENTUM_INDICATOR": "false",
+            "ENABLE_PENNY_STOCKS_INDICATOR": "true",
+            "ENABLE_DEEP_ANALYZER_INDICATOR": "false",
+            "ENABLE_UW_ENHANCED_INDICATOR": "false",
+        }
+
+        result = _run_python(code, env)
+
+        assert result["enabled"] == ["Penny Stocks Indicator"]
+        assert result["loaded"] == [
+            "app.src.services.trading.base_trading_indicator",
+            "app.src.services.trading.penny_stocks_indicator",
+        ]
+
+
+class TestStartupTimer:
+    """Test suite for StartupTimer"""
+
+    @pytest.fixture(autouse=True)
+    def reset_timer(self):
+        StartupTimer.reset()
+        yield
+        StartupTimer.reset()
+
+    def test_phases_recorded_once_in_order(self):
+        """Test each phase keeps its first timestamp and the report fires on the final phase"""
+        assert StartupTimer.mark("import") is True
+        first = StartupTimer.elapsed("import")
+        assert StartupTimer.mark("import") is False
+        assert StartupTimer.elapsed("import") == first
+
+        with patch.object(StartupTimer, "log_report") as report:
+            StartupTimer.mark("configure")
+            report.assert_not_called()
+            StartupTimer.mark(StartupTimer.FINAL_PHASE)
+            report.assert_called_once()
+
+        stats = StartupTimer.get_stats()
+        assert list(stats) == ["import", "configure", "first_exit_cycle"]
+        assert stats["import"]["seconds"] <= stats["configure"]["seconds"]
+        assert StartupTimer.reached("configure") and not StartupTimer.reached("first_entry_cycle")
@@ -0,0 +1,143 @@
+"""
+Tests for ComputeExecutor (off-loop indicator and validation math)
+"""
+
+import asyncio
+import pickle
+import threading
+import time
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.src.common.compute_executor import ComputeExecutor
+from app.src.services.technical_analysis.technical_analysis_lib import TechnicalAnalysisLib
+from app.src.services.trading.penny_stocks_indicator import PennyStocksIndicator
+from app.src.services.trading.validation import QuoteData, RejectionCollector
+
+
+def _square(value):
+    if value < 0:
+        raise ValueError("negative")
+    return value * value
+
+
+def _thread_id():
+    return threading.get_ident()
+
+
+def _busy(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.fixture
+def executor():
+    ComputeExecutor.configure(mode="thread", workers=2, batch_size=3)
+    yield ComputeExecutor
+    ComputeExecutor.configure(mode="thread", workers=2, batch_size=8)
+
+
+class TestComputeExecutor:
+    """Test suite for ComputeExecutor"""
+
+    @pytest.mark.asyncio
+    async def test_sync_mode_returns_completed_future(self, executor):
+        """Test the sync fallback runs inline and still hands back a future"""
+        executor.configure(mode="sync")
+
+        future = executor.submit(_thread_id)
+
+        assert future.done()
+        assert await future == threading.get_ident()
+        with pytest.raises(ValueError):
+            await executor.run(_square, -1)
+        assert executor.get_stats()["mode"] == "sync"
+        assert executor.get_stats()["failed"] == 1
+
+    def test_invalid_mode_rejected(self, executor):
+        """Test configure() refuses an unknown mode"""
+        with pytest.raises(ValueError):
+            executor.configure(mode="gpu")
+
+    @pytest.mark.asyncio
+    async def test_thread_mode_runs_off_loop(self, executor):
+        """Test jobs run in a worker thread and the loop keeps running meanwhile"""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        try:
+            worker_thread = await executor.run(_thread_id)
+            assert await executor.run(_busy, 0.2) == 0.2
+        finally:
+            ticking.cancel()
+
+        assert worker_thread != threading.get_ident()
+        assert ticks >= 5
+        assert executor.get_stats()["inflight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_map_batches_in_order_with_failures_in_place(self, executor):
+        """Test map() groups jobs per worker call, keeps order and returns exceptions in place"""
+        results = await executor.map(_square, [(1,), (2,), (-1,), (4,), (5,)])
+
+        assert results[:2] == [1, 4]
+        assert isinstance(results[2], ValueError)
+        assert results[3:] == [16, 25]
+        stats = executor.get_stats()
+        assert (stats["jobs"], stats["batches"], stats["failed"]) == (5, 2, 0)
+
+    @pytest.mark.asyncio
+    async def test_indicator_math_runs_on_executor(self, executor):
+        """Test calculate_all_indicators hands the bar math to a worker thread"""
+        bars = [{"t": f"2025-01-02T10:0{i}:00-05:00", "o": 1, "h": 1, "l": 1, "c": 1, "v": 1} for i in range(6)]
+        threads = []
+
+        def compute(ticker, ticker_bars):
+            threads.append(threading.get_ident())
+            return {"close_price": 1.0, "bars": len(ticker_bars)}
+
+        with patch(
+            "app.src.services.technical_analysis.technical_analysis_lib.MarketDataHub.get_market_data",
+            new=AsyncMock(return_value={"bars_est": {"ABCD": bars}}),
+        ), patch.object(TechnicalAnalysisLib, "_compute_indicators", side_effect=compute):
+            result = await TechnicalAnalysisLib.calculate_all_indicators("ABCD")
+
+        assert result == {"close_price": 1.0, "bars": 6}
+        assert threads and threads[0] != threading.get_ident()
+
+
+class TestPennyEntryEvaluation:
+    """Test suite for the penny-stock validation job run on the executor"""
+
+    def test_rejection_returned_in_collector(self):
+        """Test a rejected candidate carries its rejection record back to the caller"""
+        quote = QuoteData.from_bid_ask("ABCD", 1.00, 1.01)
+
+        passed, rejections, trend_metrics = PennyStocksIndicator._evaluate_entry_candidate(
+            "ABCD", [{"c": 1.0, "v": 1000}] * 3, quote
+        )
+
+        assert passed is False
+        assert trend_metrics is not None
+        collector = RejectionCollector()
+        collector.merge(rejections)
+        record = collector.get_records()[0]
+        assert record["ticker"] == "ABCD"
+        assert "Insufficient bars data" in record["reason_not_to_enter_long"]
+
+    def test_job_is_picklable_for_process_mode(self):
+        """Test the validation job and its result survive pickling (process workers)"""
+        quote = QuoteData.from_bid_ask("ABCD", 1.00, 1.01)
+        job = pickle.loads(pickle.dumps((PennyStocksIndicator._evaluate_entry_candidate, "ABCD", [], quote)))
+
+        passed, rejections, _ = job[0](*job[1:])
+
+        assert passed is False
+        assert pickle.loads(pickle.dumps(rejections)).count() == 1
@@ -0,0 +1,131 @@
+"""
+Tests for the on-demand debug endpoints (profile, heap, tasks)
+"""
+
+import asyncio
+import time
+import tracemalloc
+import aiohttp
+import pytest
+from aiohttp import web
+from app.src.common.debug_endpoints import DebugProfiler, register_debug_routes
+
+TOKEN = "s3cret"
+
+
+class _DebugServer:
+    """Health-server stand-in with the debug routes registered"""
+
+    def __init__(self):
+        self.runner = None
+        self.base_url = ""
+
+    async def __aenter__(self):
+        app = web.Application()
+        assert register_debug_routes(app, token=TOKEN)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.runner.cleanup()
+
+
+def _busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestDebugEndpoints:
+    """Test suite for the /debug/* routes"""
+
+    def test_routes_disabled_without_token(self):
+        """Test nothing is registered when no token is configured"""
+        app = web.Application()
+        assert not register_debug_routes(app, token="")
+        assert not [r for r in app.router.routes() if r.resource.canonical.startswith("/debug")]
+
+    @pytest.mark.asyncio
+    async def test_requests_without_token_are_rejected(self):
+        """Test a missing or wrong token returns 401"""
+        async with _DebugServer() as server, aiohttp.ClientSession() as session:
+            async with session.get(f"{server.base_url}/debug/tasks") as response:
+                assert response.status == 401
+            async with session.get(
+                f"{server.base_url}/debug/tasks", headers={"Authorization": "Bearer wrong"}
+            ) as response:
+                assert response.status == 401
+
+    @pytest.mark.asyncio
+    async def test_tasks_dump_includes_stacks(self):
+        """Test /debug/tasks lists running tasks with their suspended frames"""
+
+        async def sleeper():
+            await asyncio.sleep(10)
+
+        task = asyncio.create_task(sleeper(), name="sleeper-task")
+        try:
+            async with _DebugServer() as server, aiohttp.ClientSession() as session:
+                async with session.get(
+                    f"{server.base_url}/debug/tasks", headers={"X-Debug-Token": TOKEN}
+                ) as response:
+                    assert response.status == 200
+                    data = await response.json()
+        finally:
+            task.cancel()
+
+        sleeper_entry = next(t for t in data["tasks"] if t["name"] == "sleeper-task")
+        assert any("sleeper" in frame for frame in sleeper_entry["stack"])
+
+    @pytest.mark.asyncio
+    async def test_profile_returns_collapsed_stacks(self):
+        """Test /debug/profile samples the loop thread into collapsed stacks"""
+        async with _DebugServer() as server, aiohttp.ClientSession() as session:
+            request = asyncio.create_task(
+                session.get(
+                    f"{server.base_url}/debug/profile?seconds=0.3",
+                    headers={"Authorization": f"Bearer {TOKEN}"},
+                )
+            )
+            await asyncio.sleep(0.05)
+            _busy_loop(0.15)  # block the loop so the sampler sees this frame
+            response = await request
+            text = await response.text()
+            response.release()
+
+        assert response.status == 200
+        lines = text.strip().splitlines()
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert any("_busy_loop" in line for line in lines)
+
+    @pytest.mark.asyncio
+    async def test_profile_rejects_bad_duration(self):
+        """Test out-of-range durations are rejected"""
+        async with _DebugServer() as server, aiohttp.ClientSession() as session:
+            async with session.get(
+                f"{server.base_url}/debug/profile?seconds=100000", headers={"X-Debug-Token": TOKEN}
+            ) as response:
+                assert response.status == 400
+
+    @pytest.mark.asyncio
+    async def test_heap_diff_starts_and_stops_tracemalloc(self):
+        """Test tracemalloc only runs for the duration of the heap diff"""
+        assert not tracemalloc.is_tracing()
+        retained = []
+
+        async def allocate():
+            await asyncio.sleep(0.05)
+            retained.extend(bytearray(1024) for _ in range(500))
+
+        allocation = asyncio.create_task(allocate())
+        result = await DebugProfiler.heap_diff(0.2, top_n=5)
+        await allocation
+
+        assert not tracemalloc.is_tracing()
+        assert len(result["growth"]) <= 5
+        assert any(entry["size_diff_kb"] > 100 for entry in result["growth"])
@@ -0,0 +1,252 @@
+"""
+Tests for DynamoDBClient pagination, streaming scan/query iterators and index readers
+"""
+
+import asyncio
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.src.db.dynamodb_client import DynamoDBClient
+
+
+class FakeTable:
+    """Serves items in pages of page_size, split into segments like DynamoDB"""
+
+    def __init__(self, items, page_size=3, fail_on_call=None):
+        self.items = items
+        self.page_size = page_size
+        self.fail_on_call = fail_on_call
+        self.calls = []
+        self.max_inflight = 0
+        self._inflight = 0
+
+    async def _page(self, params):
+        self.calls.append(dict(params))
+        if self.fail_on_call is not None and len(self.calls) == self.fail_on_call:
+            raise ClientError({"Error": {"Code": "ProvisionedThroughputExceededException", "Message": "slow down"}}, "Scan")
+        self._inflight += 1
+        self.max_inflight = max(self.max_inflight, self._inflight)
+        await asyncio.sleep(0.001)
+        self._inflight -= 1
+
+        items = self.items
+        if "TotalSegments" in params:
+            items = [item for i, item in enumerate(items) if i % params["TotalSegments"] == params["Segment"]]
+        start = params.get("ExclusiveStartKey", {}).get("pos", 0)
+        page = items[start:start + self.page_size]
+        if "ProjectionExpression" in params:
+            fields = [f.strip() for f in params["ProjectionExpression"].split(",")]
+            page = [{k: v for k, v in item.items() if k in fields} for item in page]
+        response = {"Items": page}
+        if start + self.page_size < len(items):
+            response["LastEvaluatedKey"] = {"pos": start + self.page_size}
+        return response
+
+    async def scan(self, **params):
+        return await self._page(params)
+
+    async def query(self, **params):
+        return await self._page(params)
+
+
+class FakeResource:
+    def __init__(self, table):
+        self.table = table
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def Table(self, name):
+        return self.table
+
+
+class FakeSession:
+    def __init__(self, table):
+        self.table = table
+
+    def resource(self, service):
+        return FakeResource(self.table)
+
+
+def _client(table):
+    client = DynamoDBClient.__new__(DynamoDBClient)
+    client.session = FakeSession(table)
+    return client
+
+
+ITEMS = [{"ticker": f"T{i:02d}", "indicator": "Penny Stocks", "payload": "x" * 10} for i in range(10)]
+
+
+class TestDynamoDBPagination:
+    """Test suite for paginated DynamoDB reads"""
+
+    @pytest.mark.asyncio
+    async def test_scan_and_query_follow_last_evaluated_key(self):
+        """Test scan()/query() return every page instead of the first 1 MB"""
+        table = FakeTable(ITEMS, page_size=3)
+        client = _client(table)
+
+        scanned = await client.scan("InactiveTickersForDayTrading")
+        queried = await client.query("InactiveTickersForDayTrading", "#ind = :i", {":i": "Penny Stocks"})
+
+        assert scanned == ITEMS
+        assert queried == ITEMS
+        assert len(table.calls) == 8  # 4 pages each
+        assert table.calls[1]["ExclusiveStartKey"] == {"pos": 3}
+
+    @pytest.mark.asyncio
+    async def test_scan_iter_streams_with_projection(self):
+        """Test scan_iter yields items page by page with only projected attributes"""
+        table = FakeTable(ITEMS, page_size=4)
+        client = _client(table)
+
+        seen = []
+        async for item in client.scan_iter(
+            "InactiveTickersForDayTrading", projection_expression="ticker", page_size=4
+        ):
+            seen.append(item)
+            if len(seen) == 2:
+                assert len(table.calls) == 1  # later pages not fetched yet
+
+        assert seen == [{"ticker": item["ticker"]} for item in ITEMS]
+        assert table.calls[0]["Limit"] == 4
+
+    @pytest.mark.asyncio
+    async def test_parallel_scan_reads_every_segment_with_bounded_concurrency(self):
+        """Test a segmented scan returns all items and caps in-flight segments"""
+        items = [{"ticker": f"T{i:03d}"} for i in range(60)]
+        table = FakeTable(items, page_size=2)
+        client = _client(table)
+
+        seen = [item async for item in client.scan_iter("T", total_segments=6, max_concurrency=2)]
+
+        assert sorted(item["ticker"] for item in seen) == [item["ticker"] for item in items]
+        assert {call["Segment"] for call in table.calls} == set(range(6))
+        assert table.max_inflight <= 2
+
+    @pytest.mark.asyncio
+    async def test_query_iter_passes_index_and_order(self):
+        """Test query_iter forwards index, ordering and filter parameters"""
+        table = FakeTable(ITEMS, page_size=20)
+        client = _client(table)
+
+        seen = [
+            item
+            async for item in client.query_iter(
+                "InactiveTickersForDayTrading",
+                "#ind = :i",
+                {":i": "Penny Stocks"},
+                expression_attribute_names={"#ind": "indicator"},
+                index_name="indicator-timestamp-index",
+                scan_index_forward=False,
+                filter_expression="attribute_exists(ticker)",
+            )
+        ]
+
+        assert len(seen) == len(ITEMS)
+        call = table.calls[0]
+        assert call["IndexName"] == "indicator-timestamp-index"
+        assert call["ScanIndexForward"] is False
+        assert call["FilterExpression"] == "attribute_exists(ticker)"
+
+    @pytest.mark.asyncio
+    async def test_errors_raise_from_stream_and_keep_list_api_all_or_nothing(self):
+        """Test a failed page raises after the items already streamed and scan() still returns []"""
+        client = _client(FakeTable(ITEMS, page_size=3, fail_on_call=2))
+        streamed = []
+        with pytest.raises(ClientError):
+            async for item in client.scan_iter("T"):
+                streamed.append(item)
+
+        assert streamed == ITEMS[:3]
+        assert await _client(FakeTable(ITEMS, page_size=3, fail_on_call=2)).scan("T") == []
+
+        parallel = _client(FakeTable(ITEMS, page_size=1, fail_on_call=3))
+        with pytest.raises(ClientError):
+            [item async for item in parallel.scan_iter("T", total_segments=4)]
+
+        query = _client(FakeTable(ITEMS, page_size=3, fail_on_call=2))
+        with pytest.raises(ClientError):
+            [item async for item in query.query_iter("T", "ticker = :t", {":t": "T00"})]
+
+
+class MissingIndexTable(FakeTable):
+    """Table without the (indicator, timestamp) GSI"""
+
+    async def query(self, **params):
+        self.calls.append(dict(params))
+        raise ClientError(
+            {"Error": {"Code": "ValidationException", "Message": "The table does not have the specified index"}},
+            "Query",
+        )
+
+
+@pytest.fixture
+def time_index_state():
+    DynamoDBClient._inactive_time_index_available = None
+    yield
+    DynamoDBClient._inactive_time_index_available = None
+
+
+class TestInactiveTickerTimeIndex:
+    """Test suite for the indicator/timestamp index readers"""
+
+    @pytest.mark.asyncio
+    async def test_window_read_queries_the_index(self, time_index_state):
+        """Test a time-window read is a paginated key-condition query on the GSI"""
+        table = FakeTable(ITEMS, page_size=4)
+        client = _client(table)
+
+        records = [
+            r
+            async for r in client.iter_inactive_tickers(
+                "Penny Stocks", since="2025-01-02T09:30:00-05:00", until="2025-01-02T10:00:00-05:00"
+            )
+        ]
+
+        assert records == ITEMS
+        assert len(table.calls) == 3
+        call = table.calls[0]
+        assert call["IndexName"] == "indicator-timestamp-index"
+        assert call["KeyConditionExpression"] == "#ind = :indicator AND #ts BETWEEN :since AND :until"
+        assert "FilterExpression" not in call
+        assert DynamoDBClient._inactive_time_index_available is True
+
+    @pytest.mark.asyncio
+    async def test_missing_index_falls_back_to_scan_once(self, time_index_state):
+        """Test a table without the GSI is scanned, and later reads skip the query"""
+        table = MissingIndexTable(ITEMS, page_size=20)
+        client = _client(table)
+
+        first = [r async for r in client.iter_inactive_tickers("Penny Stocks", since="2025-01-02T09:30:00")]
+        second = [r async for r in client.iter_inactive_tickers("Penny Stocks", since="2025-01-02T09:30:00")]
+
+        assert first == second == ITEMS
+        assert ["IndexName" in call for call in table.calls] == [True, False, False]
+        assert table.calls[1]["FilterExpression"] == "#ind = :indicator AND #ts >= :since"
+
+    @pytest.mark.asyncio
+    async def test_get_inactive_tickers_for_indicator_uses_index(self, time_index_state, monkeypatch):
+        """Test the threshold-adjustment reader goes through the index"""
+        table = FakeTable(ITEMS[:2], page_size=5)
+        monkeypatch.setattr(DynamoDBClient, "_instance", _client(table))
+
+        records = await DynamoDBClient.get_inactive_tickers_for_indicator("Penny Stocks", minutes_window=5)
+
+        assert records == ITEMS[:2]
+        assert table.calls[0]["ExpressionAttributeValues"][":indicator"] == "Penny Stocks"
+        assert table.calls[0]["IndexName"] == "indicator-timestamp-index"
+
+    @pytest.mark.asyncio
+    async def test_failed_window_read_is_not_truncated(self, time_index_state, monkeypatch):
+        """Test a mid-stream failure raises from the iterator and the list reader returns []"""
+        client = _client(FakeTable(ITEMS, page_size=3, fail_on_call=2))
+        with pytest.raises(ClientError):
+            [r async for r in client.iter_inactive_tickers("Penny Stocks", since="2025-01-02T09:30:00")]
+
+        monkeypatch.setattr(DynamoDBClient, "_instance", _client(FakeTable(ITEMS, page_size=3, fail_on_call=2)))
+        assert await DynamoDBClient.get_inactive_tickers_for_indicator("Penny Stocks", minutes_window=5) == []
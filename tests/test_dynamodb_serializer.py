@@ -0,0 +1,132 @@
+"""
+Tests for the fast DynamoDB serializer
+"""
+
+import pytest
+import numpy as np
+from decimal import Decimal
+from app.src.db.dynamodb_client import _convert_floats_to_decimals
+from app.src.db.dynamodb_serializer import (
+    DynamoDict,
+    DynamoList,
+    to_attribute_value,
+    to_attribute_value_map,
+    to_dynamodb_compatible,
+)
+
+
+def _legacy_convert(obj):
+    """Reference implementation the serializer must stay compatible with"""
+    if isinstance(obj, dict):
+        return {k: _legacy_convert(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [_legacy_convert(item) for item in obj]
+    elif isinstance(obj, float):
+        return Decimal(str(obj))
+    return obj
+
+
+class TestToDynamoDBCompatible:
+    """Test suite for resource-format conversion"""
+
+    def test_matches_legacy_conversion(self):
+        """Test output is identical to the original recursive conversion"""
+        payload = {
+            'ticker': 'AAPL',
+            'price': 150.25,
+            'volume': 1000,
+            'active': True,
+            'none': None,
+            'macd': (0.1, 0.2, 0.3),
+            'nested': {'a': [1.5, {'b': 2.25}], 'c': 'text'},
+            'price_tiny': 1e-7,
+        }
+        assert to_dynamodb_compatible(payload) == _legacy_convert(payload)
+        assert _convert_floats_to_decimals(payload) == _legacy_convert(payload)
+
+    def test_numpy_arrays_and_scalars(self):
+        """Test numpy arrays and scalars are converted in bulk"""
+        payload = {
+            'closes': np.array([1.5, 2.25, 3.125]),
+            'volumes': np.array([10, 20, 30], dtype=np.int64),
+            'matrix': np.array([[0.5, 1.0], [1.5, 2.0]]),
+            'rsi': np.float64(55.5),
+            'count': np.int32(7),
+            'flag': np.bool_(True),
+            'f32': np.float32(0.5),
+        }
+        result = to_dynamodb_compatible(payload)
+
+        assert result['closes'] == [Decimal('1.5'), Decimal('2.25'), Decimal('3.125')]
+        assert result['volumes'] == [10, 20, 30]
+        assert all(type(v) is int for v in result['volumes'])
+        assert result['matrix'] == [[Decimal('0.5'), Decimal('1.0')], [Decimal('1.5'), Decimal('2.0')]]
+        assert result['rsi'] == Decimal('55.5')
+        assert type(result['count']) is int
+        assert result['flag'] is True
+        assert result['f32'] == Decimal('0.5')
+
+    def test_bool_is_not_converted(self):
+        """Test bools stay bools even though bool subclasses int"""
+        assert to_dynamodb_compatible({'x': True}) == {'x': True}
+        assert to_dynamodb_compatible(False) is False
+
+    def test_already_converted_subtree_is_skipped(self):
+        """Test converted containers are returned as-is"""
+        converted = to_dynamodb_compatible({'a': [1.5, 2.5], 'b': {'c': 3.5}})
+        assert isinstance(converted, DynamoDict)
+        assert isinstance(converted['a'], DynamoList)
+        assert to_dynamodb_compatible(converted) is converted
+
+        outer = to_dynamodb_compatible({'inner': converted, 'x': 0.5})
+        assert outer['inner'] is converted
+        assert outer['x'] == Decimal('0.5')
+
+    def test_converted_result_is_plain_dict_and_list(self):
+        """Test tagged containers still behave like dict/list for boto3"""
+        result = to_dynamodb_compatible({'a': (1.0, 2.0)})
+        assert isinstance(result, dict)
+        assert isinstance(result['a'], list)
+
+
+class TestToAttributeValue:
+    """Test suite for low-level AttributeValue encoding"""
+
+    def test_scalar_types(self):
+        """Test scalar encoding"""
+        assert to_attribute_value('x') == {'S': 'x'}
+        assert to_attribute_value(5) == {'N': '5'}
+        assert to_attribute_value(1.5) == {'N': '1.5'}
+        assert to_attribute_value(Decimal('2.50')) == {'N': '2.50'}
+        assert to_attribute_value(True) == {'BOOL': True}
+        assert to_attribute_value(None) == {'NULL': True}
+        assert to_attribute_value(np.float64(0.25)) == {'N': '0.25'}
+        assert to_attribute_value(np.int64(3)) == {'N': '3'}
+
+    def test_item_map(self):
+        """Test full item encoding with nested containers and numpy arrays"""
+        item = {
+            'ticker': 'AAPL',
+            'technical_indicators': {'rsi': 55.5, 'macd': [0.1, 0.2]},
+            'closes': np.array([1.5, 2.5]),
+        }
+        assert to_attribute_value_map(item) == {
+            'ticker': {'S': 'AAPL'},
+            'technical_indicators': {'M': {
+                'rsi': {'N': '55.5'},
+                'macd': {'L': [{'N': '0.1'}, {'N': '0.2'}]},
+            }},
+            'closes': {'L': [{'N': '1.5'}, {'N': '2.5'}]},
+        }
+
+    def test_nan_and_infinity_rejected(self):
+        """Test non-finite numbers are rejected like boto3's TypeSerializer"""
+        with pytest.raises(TypeError):
+            to_attribute_value(float('nan'))
+        with pytest.raises(TypeError):
+            to_attribute_value(float('inf'))
+
+    def test_unsupported_type_rejected(self):
+        """Test unsupported types raise TypeError"""
+        with pytest.raises(TypeError):
+            to_attribute_value(object())
@@ -0,0 +1,123 @@
+"""
+Tests for the non-blocking logging pipeline (background writer, sampling)
+"""
+
+import io
+import json
+import threading
+from loguru import logger
+from app.src.common.loguru_logger import (
+    BackgroundLogWriter,
+    get_log_stats,
+    is_level_enabled,
+    sampled,
+    serialize_fields,
+)
+
+
+class _BlockingStream(io.StringIO):
+    """Stream whose first write blocks until released"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.entered = threading.Event()
+
+    def write(self, s):
+        self.entered.set()
+        self.release.wait(5)
+        return super().write(s)
+
+
+class TestBackgroundLogWriter:
+    """Test suite for BackgroundLogWriter"""
+
+    def test_text_lines_are_written_in_batches(self):
+        """Test preformatted lines reach the stream off the calling thread"""
+        stream = io.StringIO()
+        writer = BackgroundLogWriter(stream=stream, flush_interval_seconds=0.01)
+        for i in range(100):
+            writer.text_sink(f"line {i}\n")
+        writer.flush()
+        writer.close()
+
+        lines = stream.getvalue().splitlines()
+        assert lines == [f"line {i}" for i in range(100)]
+        assert writer.get_stats()["written"] == 100
+
+    def test_records_are_serialized_on_writer_thread(self):
+        """Test JSON serialization of loguru records happens in the writer"""
+        stream = io.StringIO()
+        writer = BackgroundLogWriter(
+            stream=stream, serializer=serialize_fields, flush_interval_seconds=0.01
+        )
+        sink_id = logger.add(writer.record_sink, level="INFO")
+        try:
+            logger.info("signal {}", "AAPL", extra={"ticker": "AAPL"})
+        finally:
+            logger.remove(sink_id)
+        writer.flush()
+        writer.close()
+
+        payload = json.loads(stream.getvalue().splitlines()[0])
+        assert payload["message"] == "signal AAPL"
+        assert payload["level"] == "INFO"
+
+    def test_record_is_snapshotted_before_enqueue(self):
+        """Test changes to the logged extra data after the call don't reach the writer"""
+        stream = io.StringIO()
+        release = threading.Event()
+
+        def serialize_after_release(fields):
+            release.wait(5)
+            return serialize_fields(fields)
+
+        writer = BackgroundLogWriter(
+            stream=stream, serializer=serialize_after_release, flush_interval_seconds=0.01
+        )
+        payload = {"ticker": "AAPL", "indicators": {"rsi": 30.0}}
+        sink_id = logger.add(writer.record_sink, level="INFO")
+        try:
+            logger.info("signal", payload=payload)
+        finally:
+            logger.remove(sink_id)
+        payload["ticker"] = "MSFT"
+        payload["indicators"]["rsi"] = 70.0
+        release.set()
+        writer.flush()
+        writer.close()
+
+        line = json.loads(stream.getvalue().splitlines()[0])
+        assert line["payload"] == {"ticker": "AAPL", "indicators": {"rsi": 30.0}}
+
+    def test_full_queue_drops_and_counts(self):
+        """Test a full queue drops lines instead of blocking the caller"""
+        stream = _BlockingStream()
+        writer = BackgroundLogWriter(stream=stream, max_size=2, flush_interval_seconds=0.01)
+        writer.text_sink("first\n")
+        assert stream.entered.wait(2)  # writer thread is now stuck in write()
+
+        for i in range(10):
+            writer.text_sink(f"line {i}\n")
+        assert writer.get_stats()["dropped"] == 8
+
+        stream.release.set()
+        writer.flush()
+        writer.close()
+        assert "dropped 8 log lines" in stream.getvalue()
+
+
+class TestLogHelpers:
+    """Test level guards and per-call-site sampling"""
+
+    def test_is_level_enabled(self):
+        """Test ERROR is always enabled at the default configuration"""
+        assert is_level_enabled("ERROR")
+
+    def test_sampled_limits_per_site(self):
+        """Test only the first call per interval is allowed and the rest are counted"""
+        site = "tests.sampled_limits_per_site"
+        results = [sampled(site, interval_seconds=60) for _ in range(5)]
+        assert results == [True, False, False, False, False]
+        assert get_log_stats()["sampled_suppressed"][site] == 4
+        assert sampled("tests.other_site", interval_seconds=60)
@@ -0,0 +1,86 @@
+"""
+Tests for LoopWatchdog (event-loop lag and blocking call sites)
+"""
+
+import asyncio
+import sys
+import time
+
+import pytest
+
+from app.src.common.loop_watchdog import LoopWatchdog
+from app.src.common.metrics import Metrics
+
+
+def _block_loop(seconds: float):
+    time.sleep(seconds)
+
+
+@pytest.fixture
+def watchdog(monkeypatch):
+    monkeypatch.setattr(LoopWatchdog, "enabled", True)
+    monkeypatch.setattr(LoopWatchdog, "interval_seconds", 0.02)
+    monkeypatch.setattr(LoopWatchdog, "threshold_seconds", 0.1)
+    monkeypatch.setattr(Metrics, "enabled", True)
+    LoopWatchdog.reset()
+    Metrics.reset()
+    yield LoopWatchdog
+    LoopWatchdog.reset()
+    Metrics.reset()
+
+
+class TestLoopWatchdog:
+    """Test suite for LoopWatchdog"""
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_site_captured(self, watchdog):
+        """Test a stall is measured and attributed to the blocking function"""
+        assert watchdog.start() is True
+        try:
+            await asyncio.sleep(0.1)
+            _block_loop(0.4)
+            await asyncio.sleep(0.1)
+        finally:
+            await watchdog.stop()
+
+        stats = watchdog.get_stats()
+        assert stats["running"] is False
+        assert stats["stalls"] == 1
+        assert stats["lag_ms"]["max"] >= 250
+        site = stats["top_sites"][0]
+        assert site["site"].startswith("_block_loop (test_loop_watchdog.py:")
+        assert site["count"] == 1 and site["max_seconds"] >= 0.25
+        assert any("test_blocking_call_site_captured" in frame for frame in site["stack"])
+
+        text = Metrics.render_prometheus()
+        assert 'event_loop_blocked_total{site="_block_loop (test_loop_watchdog.py:' in text
+        assert "event_loop_lag_seconds_count" in text
+
+    def test_call_site_prefers_application_frame(self, watchdog):
+        """Test the innermost app/src frame is charged rather than the library frame below it"""
+        captured = {}
+
+        def library_call():
+            captured["site"] = watchdog._call_site(sys._getframe())
+
+        Metrics.timed("watchdog_test")(library_call)()
+
+        site, stack = captured["site"]
+        assert site.startswith("sync_wrapper (app/src/common/metrics.py:")
+        assert stack[0].startswith("library_call (test_loop_watchdog.py:")
+
+    def test_percentiles_and_threshold(self, watchdog):
+        """Test percentiles cover all samples and only lag over the threshold counts as a stall"""
+        for lag in [0.001] * 98 + [0.05, 0.3]:
+            watchdog._record_lag(lag)
+
+        lags = watchdog.lag_percentiles()
+        assert lags["p50"] == 0.001
+        assert lags["p99"] == 0.3
+        assert lags["max"] == 0.3
+        stats = watchdog.get_stats()
+        assert (stats["samples"], stats["stalls"], stats["unattributed"]) == (100, 1, 1)
+        assert stats["top_sites"][0]["site"] == "unknown"
+
+        watchdog.publish_metrics()
+        assert 'event_loop_lag_window_seconds{quantile="p95"} 0.001' in Metrics.render_prometheus()
@@ -0,0 +1,267 @@
+"""
+Tests for the pipelined MABRejectionEnhancer backfill, batched MAB reads and
+the adaptive concurrency limiter
+"""
+
+import asyncio
+import csv
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.src.common.adaptive_concurrency import AdaptiveConcurrency
+from app.src.db.dynamodb_client import DynamoDBClient
+from app.src.services.mab.mab_rejection_enhancer import MABRejectionEnhancer
+
+
+def _throttle_error():
+    return ClientError(
+        {"Error": {"Code": "ProvisionedThroughputExceededException", "Message": "slow down"}}, "UpdateItem"
+    )
+
+
+class FakeDynamoDB:
+    """Streams records and records updates; throttles the first throttle_first writes"""
+
+    def __init__(self, records, throttle_first=0):
+        self.records = records
+        self.throttle_first = throttle_first
+        self.update_calls = 0
+        self.updated = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.iter_kwargs = None
+
+    async def iter_inactive_tickers(self, indicator, **kwargs):
+        self.iter_kwargs = {"indicator": indicator, **kwargs}
+        for record in self.records:
+            await asyncio.sleep(0)
+            yield dict(record)
+
+    async def update_item(self, table_name, key, update_expression, expression_attribute_values,
+                          raise_on_throttle=False):
+        self.update_calls += 1
+        call = self.update_calls
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            if call <= self.throttle_first:
+                if raise_on_throttle:
+                    raise _throttle_error()
+                return False
+            self.updated[(key["ticker"], key["timestamp"])] = expression_attribute_values[":reason_long"]
+            return True
+        finally:
+            self.in_flight -= 1
+
+
+class FakeMABService:
+    def __init__(self, stats):
+        self.stats = stats
+        self.bulk_calls = []
+        self.single_calls = 0
+
+    async def get_stats_many(self, indicator, tickers):
+        self.bulk_calls.append(list(tickers))
+        return {ticker: self.stats.get(ticker) for ticker in tickers}
+
+    async def get_stats(self, indicator, ticker):
+        self.single_calls += 1
+        return self.stats.get(ticker)
+
+
+def _records(count, tickers=10):
+    return [
+        {
+            "ticker": f"T{i % tickers}",
+            "indicator": "Penny Stocks",
+            "timestamp": f"2025-01-02T09:{i // 60 % 60:02d}:{i % 60:02d}-05:00",
+            "technical_indicators": "{}",
+        }
+        for i in range(count)
+    ]
+
+
+def _enhancer(db, mab):
+    enhancer = MABRejectionEnhancer.__new__(MABRejectionEnhancer)
+    enhancer.dynamodb_client = db
+    enhancer.mab_service = mab
+    return enhancer
+
+
+STATS = {"T1": {"ticker": "T1", "successes": 1, "failures": 9, "total_trades": 10}}
+
+
+class TestPipelinedEnhancement:
+    """Test suite for enhance_empty_rejection_records_pipelined"""
+
+    @pytest.mark.asyncio
+    async def test_every_record_updated_with_one_mab_read_per_ticker(self):
+        """Test all records are enhanced and MAB stats are read in bulk once per ticker"""
+        db, mab = FakeDynamoDB(_records(250)), FakeMABService(STATS)
+        enhancer = _enhancer(db, mab)
+
+        stats = await enhancer.enhance_empty_rejection_records_pipelined(
+            "Penny Stocks", hours_lookback=720, chunk_size=100, max_concurrency=8
+        )
+
+        assert stats == {"total_found": 250, "enhanced": 250, "skipped": 0, "errors": 0, "throttled": 0}
+        assert len(db.updated) == 250
+        assert sorted(t for call in mab.bulk_calls for t in call) == sorted(f"T{i}" for i in range(10))
+        assert mab.single_calls == 0
+        assert db.iter_kwargs["filter_expression"] == MABRejectionEnhancer.EMPTY_REASONS_FILTER
+        assert 1 < db.max_in_flight <= 8
+
+    @pytest.mark.asyncio
+    async def test_throttling_halves_concurrency_and_retries(self):
+        """Test throttled writes shrink concurrency and are retried until they succeed"""
+        db = FakeDynamoDB(_records(40), throttle_first=6)
+        enhancer = _enhancer(db, FakeMABService({}))
+
+        stats = await enhancer.enhance_empty_rejection_records_pipelined(
+            "Penny Stocks", chunk_size=20, max_concurrency=8, min_concurrency=2
+        )
+
+        assert stats["enhanced"] == 40
+        assert stats["errors"] == 0
+        assert stats["throttled"] == 6
+        assert db.update_calls == 46
+
+    @pytest.mark.asyncio
+    async def test_records_without_ticker_are_skipped(self):
+        """Test records missing a ticker are counted as skipped, not written"""
+        records = _records(5) + [{"ticker": "", "timestamp": "2025-01-02T10:00:00-05:00"}]
+        db = FakeDynamoDB(records)
+
+        stats = await _enhancer(db, FakeMABService({})).enhance_empty_rejection_records_pipelined("Penny Stocks")
+
+        assert (stats["enhanced"], stats["skipped"]) == (5, 1)
+
+    @pytest.mark.asyncio
+    async def test_csv_export_streams_chunks_with_bulk_mab_reads(self, tmp_path):
+        """Test the CSV export enhances empty rows from prefetched MAB stats"""
+        records = _records(30, tickers=3)
+        records[0]["reason_not_to_enter_long"] = "already explained"
+        mab = FakeMABService(STATS)
+        output = tmp_path / "export.csv"
+
+        await _enhancer(FakeDynamoDB(records), mab).generate_enhanced_csv_export(
+            "Penny Stocks", output_file=str(output), chunk_size=10
+        )
+
+        with open(output, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 30
+        assert rows[0]["reason_not_to_enter_long"] == "already explained"
+        assert all(row["reason_not_to_enter_long"] for row in rows)
+        assert mab.single_calls == 0
+        assert len(mab.bulk_calls) == 1  # every ticker seen in the first chunk
+
+    @pytest.mark.asyncio
+    async def test_csv_export_fails_on_interrupted_read(self, tmp_path):
+        """Test a read error mid-export raises and leaves only a .partial file"""
+        class FailingDynamoDB(FakeDynamoDB):
+            async def iter_inactive_tickers(self, indicator, **kwargs):
+                for record in self.records[:15]:
+                    yield dict(record)
+                raise _throttle_error()
+
+        output = tmp_path / "export.csv"
+        with pytest.raises(ClientError):
+            await _enhancer(FailingDynamoDB(_records(30)), FakeMABService(STATS)).generate_enhanced_csv_export(
+                "Penny Stocks", output_file=str(output), chunk_size=10
+            )
+
+        assert not output.exists()
+        with open(f"{output}.partial", newline="", encoding="utf-8") as f:
+            assert len(list(csv.DictReader(f))) == 10
+
+    def test_cutoff_spans_days(self):
+        """Test a lookback longer than the current hour does not raise"""
+        assert MABRejectionEnhancer._cutoff_timestamp(24 * 30) < MABRejectionEnhancer._cutoff_timestamp(1)
+
+
+class FakeBatchResource:
+    """DynamoDB resource whose batch_get_item returns half the keys unprocessed once"""
+
+    def __init__(self, items):
+        self.items = {item["ticker"]: item for item in items}
+        self.requests = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def batch_get_item(self, RequestItems):
+        ((table, request),) = RequestItems.items()
+        keys = request["Keys"]
+        self.requests.append(len(keys))
+        processed, unprocessed = keys, []
+        if len(self.requests) == 1 and len(keys) > 1:
+            processed, unprocessed = keys[: len(keys) // 2], keys[len(keys) // 2:]
+        response = {"Responses": {table: [self.items[k["ticker"]] for k in processed if k["ticker"] in self.items]}}
+        if unprocessed:
+            response["UnprocessedKeys"] = {table: {**request, "Keys": unprocessed}}
+        return response
+
+
+class FakeBatchSession:
+    def __init__(self, resource):
+        self._resource = resource
+
+    def resource(self, service):
+        return self._resource
+
+
+class TestBatchGetItems:
+    """Test suite for DynamoDBClient.batch_get_items"""
+
+    @pytest.mark.asyncio
+    async def test_chunks_dedupes_and_retries_unprocessed_keys(self):
+        """Test keys are sent 100 per request, deduplicated, and unprocessed keys retried"""
+        items = [{"ticker": f"T{i:03d}", "indicator": "Penny Stocks"} for i in range(150)]
+        resource = FakeBatchResource(items)
+        client = DynamoDBClient.__new__(DynamoDBClient)
+        client.session = FakeBatchSession(resource)
+        keys = [{"ticker": f"T{i:03d}", "indicator": "Penny Stocks"} for i in range(160)]
+
+        found = await client.batch_get_items("MABForDayTradingService", keys + keys[:5])
+
+        assert sorted(item["ticker"] for item in found) == [item["ticker"] for item in items]
+        assert resource.requests == [100, 50, 60]
+
+
+class TestAdaptiveConcurrency:
+    """Test suite for the AIMD limiter"""
+
+    def test_halves_on_throttle_and_grows_on_success(self):
+        """Test multiplicative decrease (once per interval) and additive increase"""
+        limiter = AdaptiveConcurrency(16, min_limit=2, increase_after=3)
+
+        limiter.on_throttle()
+        limiter.on_throttle()  # same burst: no second halving
+        assert limiter.limit == 8
+        for _ in range(6):
+            limiter.on_success()
+        assert limiter.limit == 10
+        assert limiter.throttle_events == 2
+
+    @pytest.mark.asyncio
+    async def test_bounds_in_flight_operations(self):
+        """Test no more than limit operations run at once"""
+        limiter = AdaptiveConcurrency(3)
+        peak = 0
+
+        async def op():
+            nonlocal peak
+            async with limiter:
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.001)
+
+        await asyncio.gather(*(op() for _ in range(20)))
+
+        assert peak == 3
+        assert limiter.in_flight == 0
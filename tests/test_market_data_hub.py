@@ -0,0 +1,167 @@
+"""
+Tests for MarketDataHub (shared bars/quotes across indicators)
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.src.common.alpaca import AlpacaClient
+from app.src.common.alpaca_request_scheduler import AlpacaRequestScheduler
+from app.src.services.market_data.market_data_hub import MarketDataHub
+
+
+def _bars_response(ticker, count):
+    bars = [{"t": f"2025-01-02T14:{i % 60:02d}:00Z", "c": float(i)} for i in range(count)]
+    return {"bars": {ticker: bars}, "bars_est": {ticker: list(bars)}}
+
+
+def _quote_response(ticker, bid):
+    return {"quote": {"quotes": {ticker: {"bp": bid, "ap": bid + 0.01}}}}
+
+
+@pytest.fixture
+def hub():
+    MarketDataHub.reset()
+    yield MarketDataHub
+    MarketDataHub.reset()
+
+
+class TestMarketDataHub:
+    """Test suite for MarketDataHub"""
+
+    @pytest.mark.asyncio
+    async def test_consumers_share_one_fetch_at_max_depth(self, hub):
+        """Test 50- and 200-bar consumers are served from one 200-bar fetch"""
+        async def fake_bars(ticker, limit=50):
+            return _bars_response(ticker, limit)
+
+        with patch.object(AlpacaClient, "get_market_data", new=AsyncMock(side_effect=fake_bars)) as mock_bars:
+            shallow = await hub.get_market_data("AAPL", limit=50)
+            deep = await hub.get_market_data("AAPL", limit=200)
+
+        mock_bars.assert_awaited_once_with("AAPL", limit=200)
+        assert len(shallow["bars"]["AAPL"]) == 50
+        assert len(deep["bars"]["AAPL"]) == 200
+        # Views share the cached bar dicts instead of copying them
+        assert shallow["bars"]["AAPL"][-1] is deep["bars"]["AAPL"][-1]
+
+    @pytest.mark.asyncio
+    async def test_deeper_request_refetches_and_is_remembered(self, hub):
+        """Test a deeper consumer raises the depth used for later fetches"""
+        async def fake_bars(ticker, limit=50):
+            return _bars_response(ticker, limit)
+
+        with patch.object(AlpacaClient, "get_market_data", new=AsyncMock(side_effect=fake_bars)) as mock_bars:
+            await hub.get_market_data("AAPL", limit=50)
+            await hub.get_market_data("AAPL", limit=1000)
+            hub._bars["AAPL"].fetched_at -= hub.bars_ttl_seconds  # next tick
+            await hub.get_market_data("AAPL", limit=50)
+
+        depths = [call.kwargs["limit"] for call in mock_bars.await_args_list]
+        assert depths == [200, 1000, 1000]
+
+    @pytest.mark.asyncio
+    async def test_depth_decays_back_to_requested_size(self, hub):
+        """Test a one-off deep request stops raising the fetch depth after the decay window"""
+        async def fake_bars(ticker, limit=50):
+            return _bars_response(ticker, limit)
+
+        with patch.object(AlpacaClient, "get_market_data", new=AsyncMock(side_effect=fake_bars)) as mock_bars:
+            await hub.get_market_data("AAPL", limit=1000)
+            hub._depth["AAPL"][1000] -= hub.depth_decay_seconds + 1
+            hub._bars["AAPL"].fetched_at -= hub.bars_ttl_seconds
+            await hub.get_market_data("AAPL", limit=50)
+
+        depths = [call.kwargs["limit"] for call in mock_bars.await_args_list]
+        assert depths == [1000, 200]
+        assert list(hub._depth["AAPL"]) == [50]
+
+    @pytest.mark.asyncio
+    async def test_exit_bars_use_short_ttl(self, hub):
+        """Test exit-priority bar reads refetch bars the entry path would still serve from cache"""
+        async def fake_bars(ticker, limit=50):
+            return _bars_response(ticker, limit)
+
+        with patch.object(AlpacaClient, "get_market_data", new=AsyncMock(side_effect=fake_bars)) as mock_bars:
+            await hub.get_market_data("AAPL", limit=50)
+            hub._bars["AAPL"].fetched_at -= hub.exit_bars_ttl_seconds
+            await hub.get_market_data("AAPL", limit=50)
+            assert mock_bars.await_count == 1
+
+            with AlpacaRequestScheduler.exit_priority():
+                await hub.get_market_data("AAPL", limit=50)
+                await hub.get_market_data("AAPL", limit=50)
+            assert mock_bars.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_old_entries_evicted_below_ticker_cap(self, hub):
+        """Test entries past the max age are dropped even when the cache is under the cap"""
+        async def fake_bars(ticker, limit=50):
+            return _bars_response(ticker, limit)
+
+        with patch.object(AlpacaClient, "get_market_data", new=AsyncMock(side_effect=fake_bars)):
+            await hub.get_market_data("OLD", limit=50)
+            hub._bars["OLD"].fetched_at -= hub.max_age_seconds + 1
+            hub._swept_at = {}
+            await hub.get_market_data("NEW", limit=50)
+
+        assert hub.cached_bars("OLD") == []
+        assert "OLD" not in hub._depth
+        assert len(hub.cached_bars("NEW")) == 200
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_single_flight(self, hub):
+        """Test concurrent indicators awaiting the same ticker trigger one request"""
+        async def slow_bars(ticker, limit=50):
+            await asyncio.sleep(0.05)
+            return _bars_response(ticker, limit)
+
+        with patch.object(AlpacaClient, "get_market_data", new=AsyncMock(side_effect=slow_bars)) as mock_bars:
+            results = await asyncio.gather(*(hub.get_market_data("TSLA", limit=50) for _ in range(4)))
+
+        mock_bars.assert_awaited_once()
+        assert all(len(r["bars"]["TSLA"]) == 50 for r in results)
+        assert hub.get_stats()["joined_inflight"] == 3
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_resolves_joiners_with_none(self, hub):
+        """Test a fetch joined by another caller isn't cancelled along with its leader"""
+        started = asyncio.Event()
+
+        async def hanging_bars(ticker, limit=50):
+            started.set()
+            await asyncio.sleep(10)
+
+        with patch.object(AlpacaClient, "get_market_data", new=AsyncMock(side_effect=hanging_bars)):
+            leader = asyncio.create_task(asyncio.wait_for(hub.get_market_data("AAPL", limit=50), 0.2))
+            await started.wait()
+            joiner = asyncio.create_task(hub.get_market_data("AAPL", limit=50))
+
+            assert await joiner is None
+            with pytest.raises(asyncio.TimeoutError):
+                await leader
+        assert hub._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_quotes_are_shared_but_fresh_for_exits(self, hub):
+        """Test entry quotes are cached while exit-priority callers bypass the cache"""
+        with patch.object(
+            AlpacaClient, "quote", new=AsyncMock(return_value=_quote_response("AAPL", 10.0))
+        ) as mock_quote:
+            await hub.quote("AAPL")
+            await hub.quote("AAPL")
+            assert mock_quote.await_count == 1
+
+            with AlpacaRequestScheduler.exit_priority():
+                await hub.quote("AAPL")
+            assert mock_quote.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled_hub_passes_through(self, hub):
+        """Test MARKET_DATA_HUB_ENABLED=false calls Alpaca directly every time"""
+        with patch.object(hub, "enabled", False), patch.object(
+            AlpacaClient, "get_market_data", new=AsyncMock(return_value=None)
+        ) as mock_bars:
+            await hub.get_market_data("AAPL", limit=50)
+            await hub.get_market_data("AAPL", limit=50)
+        assert mock_bars.await_count == 2
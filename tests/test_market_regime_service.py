@@ -0,0 +1,201 @@
+"""
+Tests for MarketRegimeService (background regime snapshot for entry checks)
+"""
+
+import asyncio
+import dataclasses
+import time
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.src.common.alpaca import AlpacaClient
+from app.src.services.market_data.market_data_hub import MarketDataHub, _Entry
+from app.src.services.trading.market_direction_filter import MarketDirectionFilter
+from app.src.services.trading.market_regime_service import MarketRegimeService
+
+
+def _bars_response(ticker, closes):
+    bars = [{"t": f"2025-01-02T14:{i % 60:02d}:00Z", "c": c} for i, c in enumerate(closes)]
+    return {"bars": {ticker: bars}, "bars_est": {ticker: list(bars)}}
+
+
+def _trend_closes(direction, count=50):
+    step = {"UP": 0.01, "DOWN": -0.01, "SIDEWAYS": 0.0}[direction]
+    return [100.0 * (1 + step) ** i for i in range(count)]
+
+
+@pytest.fixture
+def regime():
+    MarketDataHub.reset()
+    MarketRegimeService.reset()
+    MarketDirectionFilter.clear_cache()
+    with patch.object(MarketRegimeService, "symbols", ["QQQ", "SPY"]), patch.object(
+        MarketRegimeService, "primary_symbol", "QQQ"
+    ):
+        yield MarketRegimeService
+    MarketRegimeService.reset()
+    MarketDataHub.reset()
+
+
+def _fake_market(trends):
+    async def fake_bars(ticker, limit=50):
+        return _bars_response(ticker, _trend_closes(trends[ticker], limit))
+
+    return patch.object(AlpacaClient, "get_market_data", new=AsyncMock(side_effect=fake_bars))
+
+
+class TestMarketRegimeService:
+    """Test suite for MarketRegimeService"""
+
+    @pytest.mark.asyncio
+    async def test_refresh_matches_filter_trend(self, regime):
+        """Test the snapshot trend equals MarketDirectionFilter's hybrid QQQ trend"""
+        with _fake_market({"QQQ": "DOWN", "SPY": "UP"}):
+            snapshot = await regime.refresh()
+            expected, _ = await MarketDirectionFilter.get_hybrid_qqq_trend()
+
+        assert snapshot.trend == expected == "DOWN"
+        assert snapshot.symbols["SPY"].trend == "UP"
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            snapshot.computed_at = 0.0
+        with pytest.raises(TypeError):
+            snapshot.symbols["IWM"] = snapshot.primary
+
+    @pytest.mark.asyncio
+    async def test_entry_checks_never_fetch(self, regime):
+        """Test concurrent entry checks read the snapshot without any API call"""
+        with _fake_market({"QQQ": "DOWN", "SPY": "DOWN"}):
+            await regime.refresh()
+
+        with patch.object(AlpacaClient, "get_market_data", new=AsyncMock()) as mock_bars:
+            results = await asyncio.gather(
+                *(regime.should_allow_trade("BUY_TO_OPEN", "Momentum Trading") for _ in range(20))
+            )
+            allowed, _, _ = regime.evaluate_trade("SELL_TO_OPEN", "Momentum Trading")
+
+        mock_bars.assert_not_awaited()
+        assert all(result[0] is False for result in results)
+        assert "QQQ hybrid trend is DOWN" in results[0][1]
+        assert results[0][2]["final_trend"] == "DOWN"
+        assert allowed is True
+
+    @pytest.mark.asyncio
+    async def test_stale_snapshot_allows_trade(self, regime):
+        """Test a stale snapshot reads as SIDEWAYS instead of refetching"""
+        with _fake_market({"QQQ": "DOWN", "SPY": "DOWN"}):
+            snapshot = await regime.refresh()
+        regime._snapshot = dataclasses.replace(
+            snapshot, computed_at=snapshot.computed_at - regime.max_age_seconds - 1
+        )
+
+        allowed, reason, details = regime.evaluate_trade("BUY_TO_OPEN", "Momentum Trading")
+
+        assert allowed is True
+        assert details["final_trend"] == "SIDEWAYS"
+        assert regime.get_stats()["stale_reads"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_symbol_keeps_previous_state(self, regime):
+        """Test a symbol whose fetch fails carries its last regime forward"""
+        with _fake_market({"QQQ": "UP", "SPY": "UP"}):
+            first = await regime.refresh()
+
+        with patch.object(AlpacaClient, "get_market_data", new=AsyncMock(return_value=None)):
+            MarketDataHub.reset()
+            second = await regime.refresh()
+
+        assert second.computed_at >= first.computed_at
+        assert second.symbols["QQQ"] is first.symbols["QQQ"]
+        assert second.trend == "UP"
+
+    @pytest.mark.asyncio
+    async def test_short_series_is_skipped(self, regime):
+        """Test a symbol with too few bars is skipped like a failed fetch"""
+        with patch.object(
+            AlpacaClient, "get_market_data",
+            new=AsyncMock(return_value=_bars_response("QQQ", _trend_closes("DOWN", 9))),
+        ):
+            MarketDataHub.reset()
+            assert await regime._symbol_regime("QQQ") is None
+
+        with patch.object(
+            AlpacaClient, "get_market_data",
+            new=AsyncMock(return_value=_bars_response("QQQ", _trend_closes("DOWN", 10))),
+        ):
+            MarketDataHub.reset()
+            assert (await regime._symbol_regime("QQQ")).trend == "DOWN"
+
+    @pytest.mark.asyncio
+    async def test_failing_primary_goes_stale(self, regime):
+        """Test a primary symbol that keeps failing ages out and stops blocking entries"""
+        with _fake_market({"QQQ": "DOWN", "SPY": "DOWN"}):
+            first = await regime.refresh()
+        aged = dataclasses.replace(
+            first,
+            symbols={
+                symbol: dataclasses.replace(state, computed_at=state.computed_at - regime.max_age_seconds - 1)
+                for symbol, state in first.symbols.items()
+            },
+        )
+        regime._snapshot = aged
+
+        async def fake_bars(ticker, limit=50):
+            if ticker == "QQQ":
+                raise RuntimeError("QQQ unavailable")
+            return _bars_response(ticker, _trend_closes("DOWN", limit))
+
+        with patch.object(AlpacaClient, "get_market_data", new=AsyncMock(side_effect=fake_bars)):
+            for _ in range(3):
+                MarketDataHub.reset()
+                snapshot = await regime.refresh()
+
+        assert snapshot.age_seconds() < 1
+        assert snapshot.symbols["QQQ"] is aged.symbols["QQQ"]
+        assert snapshot.symbols["SPY"].age_seconds() < 1
+        allowed, reason, details = regime.evaluate_trade("BUY_TO_OPEN", "Momentum Trading")
+        assert allowed is True
+        assert details["final_trend"] == "SIDEWAYS"
+        assert "QQQ regime" in reason
+
+    @pytest.mark.asyncio
+    async def test_breadth_uses_cached_universe_bars(self, regime):
+        """Test breadth counts advancers/decliners from hub cache without fetching"""
+        MarketDataHub._universe = ["AAA", "BBB", "CCC", "DDD"]
+        for ticker, direction in (("AAA", "UP"), ("BBB", "UP"), ("CCC", "DOWN")):
+            MarketDataHub._bars[ticker] = _Entry(_bars_response(ticker, _trend_closes(direction)), time.monotonic(), 50)
+
+        with _fake_market({"QQQ": "SIDEWAYS", "SPY": "SIDEWAYS"}) as mock_bars:
+            snapshot = await regime.refresh()
+
+        assert mock_bars.await_count == 2  # QQQ and SPY only
+        assert (snapshot.breadth.advancers, snapshot.breadth.decliners) == (2, 1)
+        assert snapshot.breadth.ratio == pytest.approx(1 / 3)
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_filter_when_not_running(self, regime):
+        """Test without a running service or snapshot the legacy filter is used"""
+        with patch.object(
+            MarketDirectionFilter, "should_allow_trade", new=AsyncMock(return_value=(True, "ok", {}))
+        ) as mock_filter:
+            assert await regime.should_allow_trade("BUY_TO_OPEN", "Penny Stocks") == (True, "ok", {})
+
+        mock_filter.assert_awaited_once_with(action="BUY_TO_OPEN", indicator_name="Penny Stocks")
+
+    @pytest.mark.asyncio
+    async def test_background_task_publishes_and_stops(self, regime):
+        """Test start() publishes a snapshot from the background task and stop() ends it"""
+        with _fake_market({"QQQ": "UP", "SPY": "UP"}), patch(
+            "app.src.services.trading.market_regime_service.MarketSession.is_market_open",
+            new=AsyncMock(return_value=True),
+        ), patch.object(regime, "enabled", True):
+            assert regime.start() is True
+            assert regime.start() is False
+            for _ in range(50):
+                if regime.snapshot() is not None:
+                    break
+                await asyncio.sleep(0.01)
+            await regime.stop()
+
+        assert regime.snapshot().trend == "UP"
+        assert not regime.is_running()
@@ -0,0 +1,123 @@
+"""
+Tests for MarketSession (calendar-based market clock)
+"""
+
+import time
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from app.src.common.alpaca import AlpacaClient
+from app.src.common.market_session import EST_TZ, MarketSession
+
+CALENDAR = [
+    {"date": "2025-11-26", "open": "09:30", "close": "16:00"},
+    # Thanksgiving (11-27) is not in the calendar; 11-28 closes early
+    {"date": "2025-11-28", "open": "09:30", "close": "13:00"},
+    {"date": "2025-12-01", "open": "09:30", "close": "16:00"},
+]
+
+
+def _set_now(year, month, day, hour, minute, second=0):
+    """Point the session clock at a wall time in ET"""
+    moment = EST_TZ.localize(datetime(year, month, day, hour, minute, second))
+    MarketSession._wall_anchor = moment.timestamp()
+    MarketSession._mono_anchor = time.monotonic()
+    MarketSession._idx = 0
+
+
+@pytest.fixture
+def session():
+    MarketSession.reset()
+    with patch("app.src.common.market_session.DEBUG_DAY_TRADING", False):
+        MarketSession.load_sessions(CALENDAR)
+        yield MarketSession
+    MarketSession.reset()
+
+
+class TestMarketSession:
+    """Test suite for MarketSession"""
+
+    def test_open_during_regular_session(self, session):
+        """Test is_open and seconds_to_close during regular hours"""
+        _set_now(2025, 11, 26, 10, 0)
+        assert session.is_open()
+        assert session.seconds_to_close() == pytest.approx(6 * 3600, abs=5)
+        assert not session.past_entry_cutoff(15, 55)
+        assert not session.is_near_close(15)
+
+    def test_closed_on_holiday(self, session):
+        """Test a day missing from the calendar is closed and next open is known"""
+        _set_now(2025, 11, 27, 10, 0)
+        assert not session.is_open()
+        assert session.seconds_to_close() == 0.0
+        assert session.seconds_to_open() == pytest.approx(24 * 3600 - 30 * 60, abs=5)
+        assert session.past_entry_cutoff(15, 55)
+
+    def test_early_close_shifts_cutoff_and_close(self, session):
+        """Test entry cutoff and near-close use the early close time"""
+        _set_now(2025, 11, 28, 12, 50)
+        assert session.is_open()
+        assert session.current_session().is_early_close
+        assert session.is_near_close(15)
+        assert not session.past_entry_cutoff(15, 55)
+
+        _set_now(2025, 11, 28, 12, 56)
+        assert session.past_entry_cutoff(15, 55)
+
+        _set_now(2025, 11, 28, 13, 0, 1)
+        assert not session.is_open()
+
+    def test_debug_mode_closed_market_uses_wall_clock(self, session):
+        """Test DEBUG_DAY_TRADING keeps the wall-clock checks when the calendar says closed"""
+        _set_now(2025, 11, 27, 10, 0)
+        with patch("app.src.common.market_session.DEBUG_DAY_TRADING", True), patch.object(
+            MarketSession, "_wall_clock_past", return_value=False
+        ) as mock_wall:
+            assert not session.past_entry_cutoff(15, 55)
+            assert not session.is_near_close(15)
+        mock_wall.assert_any_call(15, 55)
+        mock_wall.assert_any_call(16, 0, lead_minutes=15)
+
+    @pytest.mark.asyncio
+    async def test_is_market_open_does_not_call_clock(self, session):
+        """Test market-open checks are answered from the calendar"""
+        _set_now(2025, 12, 1, 11, 0)
+        session._reload_at_mono = time.monotonic() + 3600
+        with patch.object(AlpacaClient, "is_market_open", new=AsyncMock()) as mock_clock:
+            for _ in range(100):
+                assert await session.is_market_open()
+            mock_clock.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_calendar_loaded_once(self):
+        """Test ensure_loaded fetches the calendar once and then answers in O(1)"""
+        MarketSession.reset()
+        with patch.object(AlpacaClient, "calendar", new=AsyncMock(return_value=CALENDAR)) as mock_cal:
+            assert await MarketSession.ensure_loaded()
+            assert await MarketSession.ensure_loaded()
+        MarketSession.reset()
+        mock_cal.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_clock_without_calendar(self):
+        """Test the clock endpoint is used if the calendar can't be loaded"""
+        MarketSession.reset()
+        with patch("app.src.common.market_session.DEBUG_DAY_TRADING", False), \
+             patch.object(AlpacaClient, "calendar", new=AsyncMock(return_value=None)), \
+             patch.object(AlpacaClient, "is_market_open", new=AsyncMock(return_value=True)) as mock_clock:
+            assert await MarketSession.is_market_open()
+            mock_clock.assert_awaited_once()
+        MarketSession.reset()
+
+    @pytest.mark.asyncio
+    async def test_wait_for_open_wakes_at_open(self, session):
+        """Test sleeping loops are woken at the session open instead of polling"""
+        _set_now(2025, 12, 1, 9, 29, 59)
+        MarketSession._wall_anchor += 0.8  # 0.2s before the open
+        session._reload_at_mono = time.monotonic() + 3600
+        assert not session.is_open()
+
+        start = time.monotonic()
+        await session.wait_for_open(max_wait_seconds=5)
+        assert 0.1 <= time.monotonic() - start < 1.0
+        assert session.is_open()
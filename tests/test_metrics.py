@@ -0,0 +1,126 @@
+"""
+Tests for the metrics registry, cycle instrumentation and /metrics rendering
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.src.common.alpaca_request_scheduler import AlpacaRequestScheduler, RequestLane
+from app.src.common.market_session import MarketSession
+from app.src.common.metrics import Metrics
+from app.src.common.utils import measure_latency
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    Metrics.reset()
+    yield Metrics
+    Metrics.reset()
+
+
+class _FakeIndicator:
+    entry_cycle_seconds = 0
+
+    @classmethod
+    def indicator_name(cls) -> str:
+        return "Fake"
+
+    @classmethod
+    @measure_latency
+    async def _run_entry_cycle(cls):
+        return "done"
+
+
+class TestMetrics:
+    """Test suite for Metrics"""
+
+    def test_counter_and_render(self):
+        """Test counters accumulate per label set and render in text format"""
+        Metrics.inc("api_requests_total", api="alpaca", endpoint="bars", status="2xx")
+        Metrics.inc("api_requests_total", api="alpaca", endpoint="bars", status="2xx")
+        Metrics.inc("api_requests_total", api="alpaca", endpoint="bars", status="4xx")
+
+        text = Metrics.render_prometheus()
+        assert "# TYPE api_requests_total counter" in text
+        assert 'api_requests_total{api="alpaca",endpoint="bars",status="2xx"} 2' in text
+        assert 'api_requests_total{api="alpaca",endpoint="bars",status="4xx"} 1' in text
+
+    def test_span_records_histogram(self):
+        """Test span() records stage duration with cumulative buckets"""
+        with Metrics.span("indicator_computation"):
+            pass
+        with pytest.raises(ValueError):
+            with Metrics.span("indicator_computation"):
+                raise ValueError("boom")
+
+        assert Metrics.get_histogram_count(
+            "stage_duration_seconds", stage="indicator_computation", outcome="ok"
+        ) == 1
+        text = Metrics.render_prometheus()
+        assert (
+            'stage_duration_seconds_bucket{outcome="error",stage="indicator_computation",le="+Inf"} 1'
+            in text
+        )
+        assert 'stage_duration_seconds_count{outcome="ok",stage="indicator_computation"} 1' in text
+
+    @pytest.mark.asyncio
+    async def test_timed_decorator_wraps_async_functions(self):
+        """Test timed() preserves the return value of coroutines"""
+
+        @Metrics.timed("quote_fetch")
+        async def fetch():
+            return 42
+
+        assert await fetch() == 42
+        assert Metrics.get_histogram_count("stage_duration_seconds", stage="quote_fetch", outcome="ok") == 1
+
+    def test_disabled_registry_records_nothing(self):
+        """Test METRICS_ENABLED=false makes every call a no-op"""
+        with patch.object(Metrics, "enabled", False):
+            Metrics.inc("api_requests_total")
+            with Metrics.span("db_write"):
+                pass
+        assert Metrics.render_prometheus() == "\n"
+
+    def test_label_values_are_escaped(self):
+        """Test quotes and backslashes in label values are escaped"""
+        Metrics.set_gauge("g", 1, path='a"b\\c')
+        assert 'g{path="a\\"b\\\\c"} 1' in Metrics.render_prometheus()
+
+
+class TestInstrumentation:
+    """Test cycle and API instrumentation hooks"""
+
+    @pytest.mark.asyncio
+    async def test_cycle_duration_and_overrun(self):
+        """Test measure_latency records cycle duration and overruns while open"""
+        with patch.object(MarketSession, "is_market_open", new=AsyncMock(return_value=True)):
+            assert await _FakeIndicator._run_entry_cycle() == "done"
+
+        assert Metrics.get_histogram_count(
+            "cycle_duration_seconds", indicator="Fake", cycle="entry", outcome="ok"
+        ) == 1
+        assert Metrics.get_counter("cycle_overruns_total", indicator="Fake", cycle="entry") == 1
+
+    @pytest.mark.asyncio
+    async def test_cycle_not_recorded_when_closed(self):
+        """Test cycles are not recorded while the market is closed"""
+        with patch.object(MarketSession, "is_market_open", new=AsyncMock(return_value=False)):
+            await _FakeIndicator._run_entry_cycle()
+        assert Metrics.get_histogram_count(
+            "cycle_duration_seconds", indicator="Fake", cycle="entry", outcome="ok"
+        ) == 0
+
+    @pytest.mark.asyncio
+    async def test_scheduler_counts_requests_retries_and_throttles(self):
+        """Test the Alpaca scheduler feeds request, retry and 429 counters"""
+        AlpacaRequestScheduler.configure(requests_per_minute=600, burst=4, exit_reserve=0)
+        try:
+            await AlpacaRequestScheduler.acquire(RequestLane.BARS, retry=True)
+            AlpacaRequestScheduler.observe_response(200, {}, endpoint="bars")
+            AlpacaRequestScheduler.observe_response(429, {"Retry-After": "0"}, endpoint="bars")
+        finally:
+            AlpacaRequestScheduler.configure()
+
+        assert Metrics.get_counter("api_retries_total", api="alpaca", lane="bars") == 1
+        assert Metrics.get_counter("api_requests_total", api="alpaca", endpoint="bars", status="2xx") == 1
+        assert Metrics.get_counter("api_rate_limited_total", api="alpaca", endpoint="bars") == 1
@@ -0,0 +1,221 @@
+"""
+Tests for PositionStateCache (coalesced trailing-stop / peak-profit updates)
+"""
+
+import asyncio
+import pytest
+from botocore.exceptions import ClientError
+from unittest.mock import AsyncMock, patch
+from app.src.db.dynamodb_client import DynamoDBClient
+from app.src.services.trading.position_state_cache import PositionStateCache
+
+
+@pytest.fixture
+def cache():
+    """Fresh cache with a long interval so only delta-triggered writes happen"""
+    PositionStateCache.configure(
+        min_persist_interval_seconds=3600, min_persist_delta_percent=0.5
+    )
+    yield PositionStateCache
+    PositionStateCache.configure()
+
+
+@pytest.fixture
+def mock_update():
+    with patch.object(
+        DynamoDBClient,
+        "update_momentum_trade_trailing_stop",
+        new=AsyncMock(return_value=True),
+    ) as mock:
+        yield mock
+
+
+async def _drain():
+    if PositionStateCache._pending_writes:
+        await asyncio.gather(*list(PositionStateCache._pending_writes))
+
+
+class TestPositionStateCache:
+    """Test suite for PositionStateCache"""
+
+    @pytest.mark.asyncio
+    async def test_first_update_is_persisted(self, cache, mock_update):
+        """Test the first state for a position is written immediately"""
+        await cache.update("AAPL", "Penny Stocks", 0.5, 0.0, "")
+        await _drain()
+        mock_update.assert_awaited_once()
+        assert mock_update.call_args.kwargs["ticker"] == "AAPL"
+
+    @pytest.mark.asyncio
+    async def test_small_changes_are_coalesced(self, cache, mock_update):
+        """Test per-cycle updates below the delta threshold don't hit DynamoDB"""
+        await cache.update("AAPL", "Penny Stocks", 0.5, 0.0, "")
+        await _drain()
+
+        # 100 exit cycles with tiny peak increases
+        for i in range(100):
+            await cache.update("AAPL", "Penny Stocks", 0.5, i * 0.004, f"Holding {i}")
+        await _drain()
+
+        stats = cache.get_stats()
+        assert stats["updates"] == 101
+        assert mock_update.await_count <= 2
+        assert cache.get_state("AAPL").peak_profit_percent == pytest.approx(99 * 0.004)
+
+    @pytest.mark.asyncio
+    async def test_large_change_is_persisted_immediately(self, cache, mock_update):
+        """Test a change above the delta threshold is written right away"""
+        await cache.update("AAPL", "Penny Stocks", 0.5, 0.0, "")
+        await _drain()
+        await cache.update("AAPL", "Penny Stocks", 0.5, 1.0, "Holding")
+        await _drain()
+        assert mock_update.await_count == 2
+        assert mock_update.call_args.kwargs["peak_profit_percent"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_peak_never_decreases(self, cache, mock_update):
+        """Test peak profit in the cache is monotonic"""
+        await cache.update("AAPL", "Penny Stocks", 0.5, 2.0, "")
+        await cache.update("AAPL", "Penny Stocks", 0.5, 1.0, "")
+        assert cache.get_state("AAPL").peak_profit_percent == 2.0
+
+    @pytest.mark.asyncio
+    async def test_apply_to_trades_overlays_cached_state(self, cache, mock_update):
+        """Test exit loops see the in-memory peak even when DynamoDB is stale"""
+        await cache.update("AAPL", "Penny Stocks", 0.5, 0.0, "")
+        await _drain()
+        await cache.update("AAPL", "Penny Stocks", 0.75, 0.3, "Holding")
+
+        trades = [{"ticker": "AAPL", "indicator": "Penny Stocks",
+                   "peak_profit_percent": 0.0, "trailing_stop": 0.5}]
+        cache.apply_to_trades(trades)
+        assert trades[0]["peak_profit_percent"] == pytest.approx(0.3)
+        assert trades[0]["trailing_stop"] == 0.75
+
+    @pytest.mark.asyncio
+    async def test_apply_to_trades_seeds_from_persisted_state(self, cache, mock_update):
+        """Test crash recovery: unknown positions are seeded from DynamoDB values"""
+        trades = [{"ticker": "TSLA", "indicator": "Deep Analyzer",
+                   "peak_profit_percent": 1.25, "trailing_stop": 2.0}]
+        cache.apply_to_trades(trades)
+
+        state = cache.get_state("TSLA")
+        assert state.peak_profit_percent == 1.25
+        assert state.trailing_stop == 2.0
+        assert state.is_persisted
+
+        # A tiny change after recovery is not written
+        await cache.update("TSLA", "Deep Analyzer", 2.0, 1.3, "Holding")
+        await _drain()
+        mock_update.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_flush_all_writes_pending_state(self, cache, mock_update):
+        """Test forced flush on shutdown persists coalesced changes"""
+        cache.apply_to_trades([{"ticker": "AAPL", "indicator": "Penny Stocks",
+                                "peak_profit_percent": 1.0, "trailing_stop": 0.5}])
+        await cache.update("AAPL", "Penny Stocks", 0.5, 1.2, "Holding")
+        flushed = await cache.flush_all()
+        assert flushed == 1
+        assert mock_update.call_args.kwargs["peak_profit_percent"] == 1.2
+        assert not cache.get_state("AAPL").dirty
+
+    @pytest.mark.asyncio
+    async def test_flush_due_respects_interval(self, cache, mock_update):
+        """Test the background flusher only writes after the minimum interval"""
+        cache.apply_to_trades([{"ticker": "AAPL", "indicator": "Penny Stocks",
+                                "peak_profit_percent": 1.0, "trailing_stop": 0.5}])
+        await cache.update("AAPL", "Penny Stocks", 0.5, 1.1, "Holding")
+        assert await cache.flush_due() == 0
+
+        cache.min_persist_interval_seconds = 0
+        assert await cache.flush_due() == 1
+
+    @pytest.mark.asyncio
+    async def test_discard_drops_exited_position(self, cache, mock_update):
+        """Test exited positions are removed and never flushed"""
+        cache.apply_to_trades([{"ticker": "AAPL", "indicator": "Penny Stocks",
+                                "peak_profit_percent": 1.0, "trailing_stop": 0.5}])
+        await cache.update("AAPL", "Penny Stocks", 0.5, 1.1, "Holding")
+        await cache.discard("AAPL")
+        assert cache.get_state("AAPL") is None
+        assert await cache.flush_all() == 0
+        mock_update.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_exit_then_flush_writes_nothing(self, cache):
+        """Test a write in flight at exit lands before the delete and nothing follows it"""
+        events = []
+        release = asyncio.Event()
+
+        async def slow_update(**kwargs):
+            await release.wait()
+            events.append(("update", kwargs["ticker"]))
+            return True
+
+        async def delete(ticker, indicator):
+            events.append(("delete", ticker))
+            return True
+
+        with patch.object(DynamoDBClient, "update_momentum_trade_trailing_stop", new=slow_update), \
+                patch.object(DynamoDBClient, "delete_momentum_trade", new=delete):
+            await cache.update("AAPL", "Penny Stocks", 0.5, 1.0, "Holding")
+
+            async def exit_trade():
+                await cache.discard("AAPL")
+                await DynamoDBClient.delete_momentum_trade("AAPL", "Penny Stocks")
+
+            exiting = asyncio.create_task(exit_trade())
+            await asyncio.sleep(0)
+            assert events == []
+            release.set()
+            await exiting
+
+            cache.min_persist_interval_seconds = 0
+            assert await cache.flush_due() == 0
+            assert await cache.flush_all() == 0
+
+        assert events == [("update", "AAPL"), ("delete", "AAPL")]
+
+
+class _ConditionalTable:
+    """Rejects updates to a missing row the way DynamoDB does for attribute_exists()"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def update_item(self, **params):
+        self.calls.append(params)
+        if params.get("ConditionExpression") == "attribute_exists(ticker)" and params["Key"]["ticker"] not in self.rows:
+            raise ClientError({"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}}, "UpdateItem")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def Table(self, name):
+        return self
+
+    def resource(self, service):
+        return self
+
+
+class TestConditionalTrailingStopUpdate:
+    """Test suite for the trailing-stop write against an exited (deleted) row"""
+
+    @pytest.mark.asyncio
+    async def test_update_on_deleted_row_is_skipped_as_success(self):
+        """Test the write is conditional on the row and a failed condition isn't an error"""
+        table = _ConditionalTable(rows={"MSFT"})
+        client = DynamoDBClient.__new__(DynamoDBClient)
+        client.session = table
+
+        with patch.object(DynamoDBClient, "_get_instance", return_value=client):
+            exited = await DynamoDBClient.update_momentum_trade_trailing_stop("AAPL", "Penny Stocks", 0.5, 1.0, "")
+            active = await DynamoDBClient.update_momentum_trade_trailing_stop("MSFT", "Penny Stocks", 0.5, 1.0, "")
+
+        assert exited is True and active is True
+        assert all(call["ConditionExpression"] == "attribute_exists(ticker)" for call in table.calls)
@@ -0,0 +1,99 @@
+"""
+Tests for PriceSeries (array-backed datetime_price)
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.src.common.utils import dict_to_technical_indicators
+from app.src.db.dynamodb_serializer import to_attribute_value, to_dynamodb_compatible
+from app.src.models.price_series import PriceSeries, json_default
+from app.src.services.market_data.market_data_service import MarketDataService
+from app.src.services.trading.momentum_indicator import MomentumIndicator
+
+
+def _frame(prices, shuffle=False):
+    base = pd.Timestamp("2025-01-02 09:30:00", tz="America/New_York")
+    frame = pd.DataFrame({
+        "timestamp": [base + pd.Timedelta(minutes=i) for i in range(len(prices))],
+        "price": prices,
+    })
+    if shuffle:
+        frame = frame.iloc[::-1].reset_index(drop=True)
+    return frame
+
+
+class TestPriceSeries:
+    """Test suite for PriceSeries"""
+
+    def test_from_frame_sorts_and_keeps_arrays(self):
+        """Test the frame is converted to sorted int64/float64 arrays"""
+        series = PriceSeries.from_frame(_frame([1.0, 2.0, 3.0], shuffle=True))
+
+        assert series.epochs.dtype == np.int64
+        assert series.prices.dtype == np.float64
+        assert series.prices.tolist() == [1.0, 2.0, 3.0]
+        assert np.all(np.diff(series.epochs) > 0)
+
+    def test_to_dict_matches_legacy_isoformat(self):
+        """Test the lazily rendered dict equals the old itertuples output"""
+        frame = _frame([10.0, 10.5])
+        legacy = {ts.isoformat(): float(p) for ts, p in frame.itertuples(index=False, name=None)}
+
+        series = PriceSeries.from_frame(frame)
+
+        assert series.to_dict() == legacy
+        assert series == legacy
+        assert json.loads(json.dumps({"datetime_price": series}, default=json_default)) == {
+            "datetime_price": legacy
+        }
+
+    def test_invalid_rows_dropped(self):
+        """Test unparseable timestamps and non-positive prices are dropped"""
+        series = PriceSeries.from_timestamps(
+            ["2025-01-02T14:30:00Z", "bad", "2025-01-02T14:31:00Z", "2025-01-02T14:32:00Z"],
+            [1.0, 2.0, -1.0, "x"],
+        )
+        assert len(series) == 1
+        assert not PriceSeries.empty()
+
+    def test_coerce_legacy_formats(self):
+        """Test dict and pair-list inputs coerce to the same series"""
+        base = datetime(2025, 1, 2, 9, 30)
+        as_dict = {(base + timedelta(minutes=i)).isoformat(): 100.0 + i for i in (2, 0, 1)}
+        as_pairs = [[(base + timedelta(minutes=i)).isoformat(), 100.0 + i] for i in range(3)]
+
+        assert PriceSeries.coerce(as_dict) == PriceSeries.coerce(as_pairs)
+        assert PriceSeries.coerce(as_dict).prices.tolist() == [100.0, 101.0, 102.0]
+
+    def test_consumers_agree_with_legacy_dict(self):
+        """Test momentum and trend checks give the same answer for both forms"""
+        series = PriceSeries.from_frame(_frame([100.0 + i * 0.5 for i in range(30)], shuffle=True))
+        legacy = series.to_dict()
+
+        assert MomentumIndicator._calculate_momentum(series) == MomentumIndicator._calculate_momentum(legacy)
+        assert MomentumIndicator._extract_prices_from_datetime_price(series) == series.prices.tolist()
+        assert MarketDataService._check_price_trend_upward(series) is True
+        assert MarketDataService._check_price_trend_downward(series) is False
+
+    def test_technical_indicators_keep_series(self):
+        """Test dict_to_technical_indicators passes the series through to trend checks"""
+        pytest.importorskip("pydantic")
+        series = PriceSeries.from_frame(_frame([1.0, 2.0, 3.0]))
+        indicators = dict_to_technical_indicators({"datetime_price": series})
+        assert indicators.datetime_price is series
+
+        from_persisted = dict_to_technical_indicators({"datetime_price": series.to_dict()})
+        assert from_persisted.datetime_price == series
+
+    def test_dynamodb_serializer_renders_dict(self):
+        """Test persistence renders the series as a timestamp -> price map"""
+        series = PriceSeries.from_frame(_frame([1.5]))
+        (key,) = series.to_dict()
+
+        assert to_dynamodb_compatible({"p": series})["p"][key] == to_dynamodb_compatible(1.5)
+        assert to_attribute_value(series) == {"M": {key: {"N": "1.5"}}}
@@ -0,0 +1,231 @@
+"""
+Tests for StateSnapshot (warm-restart snapshot of in-memory trading state)
+"""
+
+import gzip
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.src.common.alpaca_request_scheduler import AlpacaRequestScheduler, RequestLane
+from app.src.services.candidate_generator.alpaca_screener import AlpacaScreenerService
+from app.src.services.market_data.market_data_hub import MarketDataHub, _Entry
+from app.src.services.trading.peak_detection_config import DEFAULT_CONFIG
+from app.src.services.trading.penny_stock_utils import DailyPerformanceMetrics, EnhancedExitDecisionEngine
+from app.src.services.trading.penny_stocks_indicator import PennyStocksIndicator
+from app.src.services.trading.position_state_cache import PositionStateCache
+from app.src.services.trading.state_snapshot import StateSnapshot
+
+
+BARS = {
+    "bars": {"ABCD": [{"t": "2025-01-02T15:00:00Z", "o": 1.0, "h": 1.1, "l": 0.9, "c": 1.05, "v": 1000}]},
+    "bars_est": {"ABCD": [{"t": "2025-01-02T10:00:00-05:00", "o": 1.0, "h": 1.1, "l": 0.9, "c": 1.05, "v": 1000}]},
+}
+
+
+def _clear_penny_state():
+    PennyStocksIndicator.ticker_exit_timestamps = {}
+    PennyStocksIndicator.daily_trades_count = 0
+    PennyStocksIndicator.daily_trades_date = None
+    PennyStocksIndicator.mab_reset_date = None
+    PennyStocksIndicator.mab_reset_timestamp = None
+    PennyStocksIndicator._losing_tickers_today = set()
+    PennyStocksIndicator._traded_tickers_today = set()
+    PennyStocksIndicator._last_exit_prices = {}
+    PennyStocksIndicator._losing_tickers_loaded_from_db = False
+    PennyStocksIndicator._losing_tickers_date = None
+    PennyStocksIndicator._exit_engine = None
+    PennyStocksIndicator._daily_metrics = None
+
+
+def _clear_all():
+    _clear_penny_state()
+    PositionStateCache.configure()
+    MarketDataHub.reset()
+    AlpacaScreenerService()._cached_screened_tickers = {
+        "most_actives": set(),
+        "gainers": set(),
+        "losers": set(),
+        "all": set(),
+    }
+
+
+@pytest.fixture
+def snapshot(tmp_path, monkeypatch):
+    for name in (
+        "ticker_exit_timestamps", "daily_trades_count", "daily_trades_date", "mab_reset_date",
+        "mab_reset_timestamp", "_losing_tickers_today", "_traded_tickers_today", "_last_exit_prices",
+        "_losing_tickers_loaded_from_db", "_losing_tickers_date", "_exit_engine", "_daily_metrics",
+    ):
+        monkeypatch.setattr(PennyStocksIndicator, name, getattr(PennyStocksIndicator, name, None), raising=False)
+    screener = AlpacaScreenerService()
+    monkeypatch.setattr(screener, "_cached_screened_tickers", screener._cached_screened_tickers)
+    monkeypatch.setattr(StateSnapshot, "enabled", True)
+    _clear_all()
+    StateSnapshot.configure([PennyStocksIndicator], path=str(tmp_path / "state.json.gz"))
+    yield StateSnapshot
+    _clear_all()
+
+
+async def _populate():
+    exited_at = datetime.now(timezone.utc) - timedelta(minutes=3)
+    PennyStocksIndicator.ticker_exit_timestamps = {"WXYZ": exited_at}
+    PennyStocksIndicator.daily_trades_count = 4
+    PennyStocksIndicator.daily_trades_date = "2025-01-02"
+    PennyStocksIndicator.mab_reset_date = StateSnapshot._session_date()
+    PennyStocksIndicator.mab_reset_timestamp = exited_at
+    PennyStocksIndicator._losing_tickers_today = {"LOSE"}
+    PennyStocksIndicator._last_exit_prices = {"LOSE": 1.23}
+    PennyStocksIndicator._losing_tickers_date = "2025-01-02"
+    PennyStocksIndicator._daily_metrics = DailyPerformanceMetrics(total_trades=4, winning_trades=3)
+    PennyStocksIndicator._exit_engine = EnhancedExitDecisionEngine(config=DEFAULT_CONFIG)
+    PennyStocksIndicator._exit_engine.consecutive_loss_checks["ABCD"] = 2
+
+    with patch.object(PositionStateCache, "_schedule_persist"):
+        await PositionStateCache.update("ABCD", "Penny Stocks", -1.5, 3.2, "")
+    MarketDataHub._bars["ABCD"] = _Entry(BARS, time.monotonic() - 30.0, 200)
+    MarketDataHub._universe = ["ABCD", "EFGH"]
+    MarketDataHub._universe_at = time.monotonic()
+    AlpacaScreenerService().restore_cache(
+        {"most_actives": ["ABCD"], "gainers": ["EFGH"], "losers": [], "all": ["ABCD", "EFGH"]}
+    )
+    return exited_at
+
+
+class TestStateSnapshot:
+    """Test suite for StateSnapshot"""
+
+    @pytest.mark.asyncio
+    async def test_shutdown_snapshot_round_trip(self, snapshot):
+        """Test a shutdown snapshot restores indicator, position, bars and screener state"""
+        exited_at = await _populate()
+        assert await snapshot.save(reason="shutdown") is True
+        _clear_all()
+
+        assert await snapshot.restore(prewarm=False) is True
+
+        assert PennyStocksIndicator.ticker_exit_timestamps == {"WXYZ": exited_at}
+        assert PennyStocksIndicator._is_ticker_in_cooldown("WXYZ") is True
+        assert PennyStocksIndicator.daily_trades_count == 4
+        assert PennyStocksIndicator.mab_reset_timestamp == exited_at
+        assert PennyStocksIndicator._losing_tickers_today == {"LOSE"}
+        assert PennyStocksIndicator._last_exit_prices == {"LOSE": 1.23}
+        assert PennyStocksIndicator._losing_tickers_loaded_from_db is True
+        assert PennyStocksIndicator._exit_engine.consecutive_loss_checks == {"ABCD": 2}
+        assert PennyStocksIndicator._daily_metrics.winning_trades == 3
+
+        state = PositionStateCache.get_state("ABCD")
+        assert (state.trailing_stop, state.peak_profit_percent) == (-1.5, 3.2)
+        assert MarketDataHub.cached_bars("ABCD") == BARS["bars"]["ABCD"]
+        assert MarketDataHub.cached_universe() == ["ABCD", "EFGH"]
+        assert (await AlpacaScreenerService().get_all_screened_tickers())["gainers"] == {"EFGH"}
+        assert snapshot.get_stats()["restored"]["bars"] == 1
+
+    @pytest.mark.asyncio
+    async def test_restored_bars_keep_their_age(self, snapshot):
+        """Test restored bars serve cached_bars() but still refetch after the TTL"""
+        await _populate()
+        await snapshot.save()
+        _clear_all()
+        await snapshot.restore(prewarm=False)
+
+        fetch = AsyncMock(return_value=BARS)
+        with patch("app.src.services.market_data.market_data_hub.AlpacaClient.get_market_data", new=fetch):
+            await MarketDataHub.get_market_data("ABCD", limit=50)
+
+        fetch.assert_awaited_once_with("ABCD", limit=200)
+
+    @pytest.mark.asyncio
+    async def test_periodic_snapshot_still_reconciles_losing_tickers(self, snapshot):
+        """Test a periodic snapshot leaves the DynamoDB losing-ticker reload enabled"""
+        await _populate()
+        await snapshot.save(reason="periodic")
+        _clear_all()
+
+        await snapshot.restore(prewarm=False)
+
+        assert PennyStocksIndicator._losing_tickers_today == {"LOSE"}
+        assert PennyStocksIndicator._losing_tickers_loaded_from_db is False
+
+    @pytest.mark.asyncio
+    async def test_old_snapshot_restores_day_scoped_state_only(self, snapshot):
+        """Test snapshots past max age skip market data, counters and position state"""
+        await _populate()
+        data = snapshot.capture("shutdown")
+        data["saved_at"] -= snapshot.max_age_seconds + 60
+        _clear_all()
+
+        assert snapshot.apply(data) is True
+
+        assert PennyStocksIndicator._losing_tickers_today == {"LOSE"}
+        assert "WXYZ" in PennyStocksIndicator.ticker_exit_timestamps
+        assert PennyStocksIndicator._exit_engine is None
+        assert PositionStateCache.get_state("ABCD") is None
+        assert MarketDataHub.cached_bars("ABCD") == []
+        assert snapshot.get_stats()["restored"]["fresh"] is False
+
+    @pytest.mark.asyncio
+    async def test_other_session_and_version_rejected(self, snapshot):
+        """Test snapshots from another trading day or format version are ignored"""
+        await _populate()
+        yesterday = snapshot.capture("shutdown")
+        yesterday["session_date"] = "2000-01-01"
+        other_version = snapshot.capture("shutdown")
+        other_version["version"] = snapshot.VERSION + 1
+        _clear_all()
+
+        assert snapshot.apply(yesterday) is False
+        assert snapshot.apply(other_version) is False
+        assert PennyStocksIndicator._losing_tickers_today == set()
+        assert PennyStocksIndicator.ticker_exit_timestamps == {}
+
+    @pytest.mark.asyncio
+    async def test_atomic_compressed_write_and_unreadable_file(self, snapshot, tmp_path):
+        """Test the file is gzip JSON with no temp file left, and corrupt files are ignored"""
+        await _populate()
+        await snapshot.save()
+
+        with gzip.open(snapshot.path, "rt", encoding="utf-8") as f:
+            assert json.load(f)["reason"] == "periodic"
+        assert not (tmp_path / "state.json.gz.tmp").exists()
+
+        (tmp_path / "state.json.gz").write_bytes(b"not gzip")
+        assert await snapshot.restore(prewarm=False) is False
+
+    @pytest.mark.asyncio
+    async def test_payload_serialized_before_writer_thread(self, snapshot):
+        """Test the writer thread gets finished bytes, not live state the loop keeps mutating"""
+        await _populate()
+        written = {}
+
+        def write(path, payload):
+            MarketDataHub._bars["ABCD"].data["bars"]["ABCD"].append({"c": 9.99})
+            written["payload"] = payload
+
+        with patch.object(StateSnapshot, "_write_snapshot", side_effect=write):
+            assert await snapshot.save() is True
+
+        data = json.loads(gzip.decompress(written["payload"]))
+        assert len(data["market_data"]["bars"]["ABCD"]["data"]["bars"]["ABCD"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_prewarm_fetches_open_positions_on_exit_lane(self, snapshot):
+        """Test pre-warm fetches bars and quotes for open positions from the exit lane"""
+        await _populate()
+        lanes = []
+
+        async def record(*args, **kwargs):
+            lanes.append(AlpacaRequestScheduler.resolve_lane(RequestLane.ENTRY_QUOTE))
+
+        with patch.object(MarketDataHub, "get_market_data", new=AsyncMock(side_effect=record)) as bars, patch.object(
+            MarketDataHub, "quote", new=AsyncMock(side_effect=record)
+        ) as quote, patch.object(AlpacaScreenerService, "refresh_cache", new=AsyncMock()) as refresh:
+            assert await snapshot.prewarm() == 1
+
+        bars.assert_awaited_once_with("ABCD", limit=MarketDataHub.min_depth)
+        quote.assert_awaited_once_with("ABCD")
+        refresh.assert_awaited_once()
+        assert lanes == [RequestLane.EXIT, RequestLane.EXIT]
@@ -0,0 +1,204 @@
+"""
+Tests for the shared feature matrix, strategy plugins and single-pass
+multi-strategy runner in backtesting/strategies
+"""
+
+import numpy as np
+import pytest
+
+from backtesting.strategies import STRATEGY_REGISTRY, FeatureMatrix, StrategyPlugin, get_strategies
+from backtesting.strategies import runner
+from backtesting.strategies.plugins import HighQualityMomentumStrategy, HighQualityPennyStrategy
+from scripts.high_quality_profitable_strategy import HighQualityProfitableStrategy
+
+
+def _bars(count, seed, start=50.0, drift=0.0004, noise=0.003, volume_sigma=0.8):
+    """Synthetic 1-min session bars, 390 per trading day"""
+    rng = np.random.default_rng(seed)
+    close = start * np.exp(np.cumsum(rng.normal(drift, noise, count)))
+    high = close * (1 + rng.uniform(0, 0.004, count))
+    low = close * (1 - rng.uniform(0, 0.004, count))
+    volume = rng.lognormal(9, volume_sigma, count).round()
+    bars = []
+    for i in range(count):
+        minute = 30 + i % 390
+        bars.append({
+            "t": f"2025-01-{2 + i // 390:02d}T{14 + minute // 60:02d}:{minute % 60:02d}:00Z",
+            "o": close[i], "h": high[i], "l": low[i], "c": close[i], "v": volume[i],
+        })
+    return bars
+
+
+def _columns(bars):
+    return tuple([float(bar[key]) for bar in bars] for key in ("c", "v", "h", "l"))
+
+
+def _script_entries(bars, indicator_type, ticker):
+    """Per-bar entry decisions from the original script (no frequency caps)"""
+    script = HighQualityProfitableStrategy.__new__(HighQualityProfitableStrategy)
+    prices, volumes, highs, lows = _columns(bars)
+    signals = np.zeros(len(bars), dtype=np.int8)
+    for i in range(50, len(bars)):
+        entry = script._check_high_quality_entry(
+            ticker, prices, volumes, highs, lows, i, "2025-01-02", {}, {}, indicator_type
+        )
+        if entry:
+            signals[i] = 1 if entry["action"] == "buy_to_open" else -1
+    return signals
+
+
+class TestFeatureMatrix:
+    """Test suite for FeatureMatrix"""
+
+    @pytest.mark.parametrize("lookback,lag,how", [(5, 0, "mean"), (15, 6, "mean"), (4, 0, "sum"),
+                                                  (10, 1, "max"), (20, 1, "min"), (199, 0, "mean")])
+    def test_rolling_matches_python_slices(self, lookback, lag, how):
+        """Test rolling windows equal values[max(0, i - lookback) : i + 1 - lag]"""
+        features = FeatureMatrix(_bars(600, seed=1))
+        values = list(features.volume)
+        aggregate = {"mean": lambda w: sum(w) / len(w), "sum": sum, "max": max, "min": min}[how]
+
+        result = features.rolling("volume", lookback, how, lag=lag)
+
+        for i in range(lag, len(values)):
+            assert result[i] == pytest.approx(aggregate(values[max(0, i - lookback): i + 1 - lag]))
+        assert np.isnan(result[:lag]).all()
+
+    def test_rsi_matches_script_helper(self):
+        """Test the vectorized RSI equals _high_quality_rsi for every bar"""
+        bars = _bars(500, seed=2)
+        prices = _columns(bars)[0]
+        script = HighQualityProfitableStrategy.__new__(HighQualityProfitableStrategy)
+
+        rsi = FeatureMatrix(bars).rsi(20)
+
+        expected = [script._high_quality_rsi(prices[max(0, i - 20): i + 1]) for i in range(len(prices))]
+        np.testing.assert_allclose(rsi, expected, atol=1e-8)
+
+    def test_features_are_memoized(self):
+        """Test repeated requests return the same array without recomputing"""
+        features = FeatureMatrix(_bars(100, seed=3))
+
+        assert features.rolling("close", 10, "max") is features.rolling("close", 10, "max")
+        assert features.rsi(14) is features.rsi(14)
+        assert features.last_bar_of_day.sum() == 1
+
+
+class TestPluginParity:
+    """Test the vectorized plugins against the scripts/ per-bar implementation"""
+
+    @pytest.mark.parametrize("seed", [0, 3])
+    def test_high_quality_momentum_entries(self, seed):
+        """Test momentum entries match _check_high_quality_entry bar for bar"""
+        bars = _bars(2000, seed)
+
+        signals = HighQualityMomentumStrategy().entry_signals(FeatureMatrix(bars))
+        signals[:50] = 0
+
+        expected = _script_entries(bars, "Momentum", "META")
+        assert expected.any()
+        np.testing.assert_array_equal(signals, expected)
+
+    @pytest.mark.parametrize("seed", [1, 2])
+    def test_high_quality_penny_entries(self, seed):
+        """Test penny breakout entries match the script bar for bar"""
+        bars = _bars(3000, seed, start=1.0, drift=0.0, noise=0.008, volume_sigma=1.5)
+
+        signals = HighQualityPennyStrategy().entry_signals(FeatureMatrix(bars))
+        signals[:50] = 0
+
+        expected = _script_entries(bars, "PennyStocks", "PENNY")
+        assert expected.any()
+        np.testing.assert_array_equal(signals, expected)
+
+
+class ScriptedStrategy(StrategyPlugin):
+    """Enters at fixed bars and exits after hold_bars"""
+
+    warmup_bars = 0
+
+    def __init__(self, name, entries, hold_bars=3, **attributes):
+        self.name = name
+        self.entries = entries
+        self.hold_bars = hold_bars
+        self.signal_calls = 0
+        for key, value in attributes.items():
+            setattr(self, key, value)
+
+    def entry_signals(self, features):
+        self.signal_calls += 1
+        signals = np.zeros(len(features), dtype=np.int8)
+        for index, direction in self.entries.items():
+            signals[index] = direction
+        return signals
+
+    def exit_reason(self, features, i, position):
+        return "held" if position.bars_held(i) >= self.hold_bars else None
+
+
+class TestMultiStrategyRunner:
+    """Test suite for the single-pass runner"""
+
+    def test_one_feature_pass_per_ticker_for_all_strategies(self, monkeypatch):
+        """Test features are built once per ticker and each strategy gets its own trades"""
+        built = []
+
+        class CountingFeatureMatrix(FeatureMatrix):
+            def __init__(self, bars):
+                built.append(len(bars))
+                super().__init__(bars)
+
+        monkeypatch.setattr(runner, "FeatureMatrix", CountingFeatureMatrix)
+        strategies = [ScriptedStrategy(f"s{k}", {10 + k: 1, 100: -1}) for k in range(4)]
+        data = {"AAA": _bars(390, seed=4), "BBB": _bars(390, seed=5)}
+
+        results = runner.run_strategies(data, strategies)
+
+        assert built == [390, 390]
+        assert [s.signal_calls for s in strategies] == [2, 2, 2, 2]
+        assert set(results) == {"s0", "s1", "s2", "s3"}
+        for k, strategy in enumerate(strategies):
+            result = results[strategy.name]
+            assert result.total_trades == 4
+            assert {t.indicator_name for t in result.trades} == {strategy.name}
+            assert {t.direction for t in result.trades} == {"long", "short"}
+
+    def test_caps_slots_and_end_of_day_close(self):
+        """Test daily caps, position limits and force_close_eod"""
+        bars = _bars(780, seed=6)
+        capped = ScriptedStrategy("capped", {5: 1, 20: 1, 400: 1}, max_entries_per_day=1)
+        stacked = ScriptedStrategy("stacked", {5: 1, 6: 1, 7: 1}, hold_bars=50, max_open_positions=2)
+        held = ScriptedStrategy("held", {385: -1}, hold_bars=100)
+
+        trades = runner.run_ticker_strategies("AAA", bars, [capped, stacked, held])
+
+        assert [t.entry_time[11:16] for t in trades["capped"]] == ["09:35", "09:40"]
+        assert [t.entry_time[11:16] for t in trades["stacked"]] == ["09:35", "09:36"]
+        (eod,) = trades["held"]
+        assert eod.exit_reason == "force_close_eod"
+        assert eod.exit_time.endswith("15:59:00")
+        assert eod.profit_loss_pct == pytest.approx(
+            (bars[385]["c"] - bars[389]["c"]) / bars[385]["c"] * 100, abs=1e-4
+        )
+
+    def test_no_reentry_on_exit_bar_and_universe(self):
+        """Test a closed slot reopens on the next bar and universes filter tickers"""
+        strategy = ScriptedStrategy("s", {10: 1, 13: 1, 14: 1}, universe=("AAA",))
+
+        trades = runner.run_ticker_strategies("AAA", _bars(390, seed=7), [strategy])
+        skipped = runner.run_ticker_strategies("BBB", _bars(390, seed=7), [strategy])
+
+        assert [t.entry_time[11:16] for t in trades["s"]] == ["09:40", "09:44"]
+        assert skipped == {"s": []}
+
+
+class TestStrategyRegistry:
+    """Test suite for the plugin registry"""
+
+    def test_builtins_registered_and_unknown_rejected(self):
+        """Test built-in plugins are available by name and unknown names raise"""
+        assert {"high_quality_momentum", "high_quality_penny"} <= set(STRATEGY_REGISTRY)
+        assert [s.name for s in get_strategies(["high_quality_penny"])] == ["high_quality_penny"]
+
+        with pytest.raises(ValueError, match="Unknown strategies: nope"):
+            get_strategies(["nope"])
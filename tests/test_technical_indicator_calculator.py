@@ -0,0 +1,103 @@
+"""
+Tests for the numpy TechnicalIndicatorCalculator (single and batched)
+"""
+
+import numpy as np
+import pytest
+
+from app.src.services.trading.technical_indicator_calculator import TechnicalIndicatorCalculator
+
+
+def _bars(closes, volume=1000):
+    return [
+        {'c': c, 'h': c + 0.1, 'l': c - 0.1, 'o': c, 'v': volume + i, 't': f"2025-12-08T10:{i % 60:02d}:00Z"}
+        for i, c in enumerate(closes)
+    ]
+
+
+def _reference_ema(values, period):
+    ema = sum(values[:period]) / period
+    series = [ema]
+    multiplier = 2 / (period + 1)
+    for price in values[period:]:
+        ema = price * multiplier + ema * (1 - multiplier)
+        series.append(ema)
+    return series
+
+
+class TestTechnicalIndicatorCalculator:
+    """Test suite for TechnicalIndicatorCalculator"""
+
+    def test_ema_matches_recursive_definition(self):
+        """Test the blocked EMA equals the bar-by-bar recursion over long series"""
+        rng = np.random.default_rng(7)
+        closes = (50 + rng.standard_normal(500).cumsum()).tolist()
+
+        ema = TechnicalIndicatorCalculator._calculate_ema(np.array([closes]), 12)
+
+        assert ema[0] == pytest.approx(_reference_ema(closes, 12)[-1], rel=1e-10)
+
+    def test_macd_signal_is_ema_of_macd_line(self):
+        """Test the signal line is a real EMA of the MACD line, not macd * 0.9"""
+        rng = np.random.default_rng(3)
+        closes = (20 + rng.standard_normal(120).cumsum() * 0.2).tolist()
+
+        indicators = TechnicalIndicatorCalculator.calculate_indicators(_bars(closes))
+
+        fast = _reference_ema(closes, 12)[26 - 12:]
+        slow = _reference_ema(closes, 26)
+        macd_line = [f - s for f, s in zip(fast, slow)]
+        signal = _reference_ema(macd_line, 9)[-1]
+        assert indicators.macd[0] == pytest.approx(macd_line[-1], rel=1e-9)
+        assert indicators.macd[1] == pytest.approx(signal, rel=1e-9)
+        assert indicators.macd[2] == pytest.approx(macd_line[-1] - signal, rel=1e-6, abs=1e-12)
+
+    def test_rsi_and_atr_known_values(self):
+        """Test RSI/ATR on a hand-checkable series"""
+        closes = [10.0 + (i % 2) for i in range(20)]  # alternating +1 / -1
+
+        indicators = TechnicalIndicatorCalculator.calculate_indicators(_bars(closes))
+
+        assert indicators.rsi == pytest.approx(100 - 100 / (1 + 7 / 7))
+        # True range = |h - prev close| = 1.1 for every bar
+        assert indicators.atr == pytest.approx(1.1)
+
+    def test_batch_matches_single_ticker(self):
+        """Test the batched path returns the same values as per-ticker calls"""
+        rng = np.random.default_rng(11)
+        universe = {
+            f"T{i}": _bars((10 + rng.standard_normal(length).cumsum() * 0.1).tolist())
+            for i, length in enumerate([60, 60, 60, 35, 5])
+        }
+        universe["EMPTY"] = []
+
+        batched = TechnicalIndicatorCalculator.calculate_indicators_for_tickers(universe)
+
+        for ticker, bars in universe.items():
+            single = TechnicalIndicatorCalculator.calculate_indicators(bars).to_dict()
+            result = batched[ticker].to_dict()
+            for key, value in single.items():
+                if key == 'datetime_price':
+                    assert result[key] == value
+                else:
+                    assert np.allclose(result[key], value), (ticker, key)
+
+    def test_calculate_batch_returns_per_ticker_vectors(self):
+        """Test the matrix API returns one value per row"""
+        closes = np.vstack([np.linspace(10, 20, 40), np.linspace(20, 10, 40)])
+
+        result = TechnicalIndicatorCalculator.calculate_batch(closes, volumes=np.ones_like(closes))
+
+        assert result['rsi'].shape == (2,)
+        assert result['rsi'].tolist() == [100.0, 0.0]
+        assert result['macd'][0] > 0 > result['macd'][1]
+        assert result['close_price'].tolist() == [20.0, 10.0]
+
+    def test_insufficient_data_defaults(self):
+        """Test short and empty inputs keep the previous fallback values"""
+        assert TechnicalIndicatorCalculator.calculate_indicators([]).rsi == 50.0
+
+        indicators = TechnicalIndicatorCalculator.calculate_indicators(_bars([10.0, 10.5]))
+        assert indicators.rsi == 50.0
+        assert indicators.macd == [0.0, 0.0, 0.0]
+        assert indicators.close_price == 10.5
@@ -0,0 +1,162 @@
+"""
+Tests for the compact rejection statistics used in threshold-adjustment prompts
+"""
+
+import json
+import random
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.src.db.dynamodb_client import DynamoDBClient
+from app.src.services.bedrock.bedrock_client import BedrockClient, StubBedrockModel
+from app.src.services.threshold_adjustment.rejection_statistics import (
+    reason_template,
+    summarize_rejections,
+)
+from app.src.services.threshold_adjustment.threshold_adjustment_service import (
+    ThresholdAdjustmentService,
+)
+
+REASON_SHAPES = [
+    "{t} momentum {a:.2f}% below min threshold 3.0%",
+    "{t} ADX {a:.1f} below minimum 20",
+    "{t} volume {v} below min daily volume 500000",
+    "{t} RSI {a:.1f} above overbought 70 for long",
+    "{t} spread {a:.2f}% too wide",
+]
+
+
+def _records(count, seed=7):
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        ticker = f"T{i:05d}"
+        shape = REASON_SHAPES[i % len(REASON_SHAPES)]
+        reason = shape.format(t=ticker, a=rng.uniform(0.1, 90.0), v=rng.randint(1000, 400000))
+        records.append(
+            {
+                "ticker": ticker,
+                "indicator": "Momentum Trading",
+                "reason_not_to_enter_long": reason,
+                "reason_not_to_enter_short": f"{ticker} short rejected: momentum {rng.uniform(-1, 1):.2f}% not negative",
+                "technical_indicators": json.dumps(
+                    {
+                        "rsi": rng.uniform(10, 90),
+                        "adx": rng.uniform(5, 50),
+                        "volume": rng.randint(1000, 10_000_000),
+                        "macd": {"macd": rng.uniform(-1, 1), "signal": rng.uniform(-1, 1)},
+                        "label": "ignored",
+                    }
+                ),
+            }
+        )
+    return records
+
+
+def _prompt(records):
+    analysis_data = ThresholdAdjustmentService._prepare_analysis_data(records, "Momentum Trading")
+    return ThresholdAdjustmentService._construct_llm_prompt(
+        "Momentum Trading", analysis_data, {"min_momentum_threshold": 3.0}
+    )
+
+
+class FakeIndicator:
+    """Stand-in indicator class with adjustable thresholds"""
+
+    min_momentum_threshold = 3.0
+    max_active_trades = 5
+    max_daily_trades = 10
+
+
+class TestRejectionStatistics:
+    """Test suite for rejection rule histograms and quantiles"""
+
+    def test_reason_template_strips_ticker_and_numbers(self):
+        """Test reasons collapse to one template per rule"""
+        template, values = reason_template("AAPL momentum 2.15% below min threshold 3.0%", "AAPL")
+
+        assert template == "{ticker} momentum #% below min threshold #%"
+        assert values == [2.15, 3.0]
+        assert reason_template("price $4.50 under $5", None) == ("price $# under $#", [4.5, 5.0])
+
+    def test_reason_template_replaces_whole_ticker_only(self):
+        """Test a one-letter ticker isn't replaced inside other words"""
+        template, _ = reason_template("Recent bars for R show Range below 2.0%", "R")
+        assert template == "Recent bars for {ticker} show Range below #%"
+
+    def test_rule_histogram_counts_every_record(self):
+        """Test rule counts cover all records (not a leading sample)"""
+        stats = summarize_rejections(_records(1000))
+        rules = {rule["rule"]: rule for rule in stats["rules"]}
+
+        assert stats["total_inactive"] == 1000
+        momentum = rules["{ticker} momentum #% below min threshold #%"]
+        assert (momentum["long"], momentum["short"]) == (200, 0)
+        assert rules["{ticker} short rejected: momentum #% not negative"]["short"] == 1000
+        assert sum(r["long"] + r["short"] for r in stats["rules"]) == 2000
+
+    def test_quantiles_of_quoted_values_and_indicators(self):
+        """Test quantiles are computed over quoted numbers and numeric indicators"""
+        records = [
+            {
+                "ticker": f"T{i}",
+                "reason_not_to_enter_long": f"T{i} ADX {i} below minimum 20",
+                "technical_indicators": {"adx": float(i), "macd": {"hist": 1.0}, "label": "x"},
+            }
+            for i in range(101)
+        ]
+
+        stats = summarize_rejections(records)
+        first_value, threshold = stats["rules"][0]["quoted_values"]
+
+        assert (first_value["min"], first_value["p50"], first_value["p90"], first_value["max"]) == (0, 50, 90, 100)
+        assert threshold["p10"] == threshold["p90"] == 20
+        assert set(stats["indicator_quantiles"]) == {"adx", "macd.hist"}
+        assert stats["indicator_quantiles"]["adx"]["p25"] == 25
+
+    def test_prompt_size_is_bounded(self):
+        """Test the prompt for 10,000 rejections is about the size of the one for 100"""
+        small, large = _prompt(_records(100)), _prompt(_records(10_000))
+
+        assert "T00042" not in large
+        assert "{ticker} ADX # below minimum #" in large
+        assert len(large) < len(small) * 1.1
+        assert '"threshold_changes"' in large
+
+    def test_distinct_rules_beyond_limit_are_aggregated(self):
+        """Test rules past max_rules are reported as one aggregate line"""
+        records = [{"ticker": "X", "reason_not_to_enter_long": f"rule variant {chr(65 + i)}"} for i in range(20)]
+
+        stats = summarize_rejections(records, max_rules=5)
+
+        assert len(stats["rules"]) == 5
+        assert stats["other_rules"] == {"rules": 15, "rejections": 15}
+
+
+class TestThresholdAnalysisWithStubModel:
+    """Test suite for the threshold-adjustment flow against the stub model"""
+
+    @pytest.mark.asyncio
+    async def test_analyze_indicator_end_to_end(self):
+        """Test an analysis pass sends the compact prompt and stores the event"""
+        model = StubBedrockModel()
+        BedrockClient.set_model(model)
+        BedrockClient.clear_cache()
+        try:
+            with patch.object(
+                DynamoDBClient, "get_inactive_tickers_for_indicator", new=AsyncMock(return_value=_records(500))
+            ), patch.object(
+                DynamoDBClient, "store_day_trader_event", new=AsyncMock(return_value=True)
+            ) as mock_store:
+                await ThresholdAdjustmentService._analyze_indicator("Momentum Trading", FakeIndicator)
+        finally:
+            BedrockClient.set_model(None)
+            BedrockClient.clear_cache()
+
+        prompt = model.calls[0]["messages"][0]["content"]
+        assert "Total inactive tickers in last 5 minutes: 500" in prompt
+        assert "T00001" not in prompt
+        assert mock_store.await_args.kwargs["threshold_change"] == {}
+        assert FakeIndicator.min_momentum_threshold == 3.0
+        assert FakeIndicator.max_daily_trades == 10
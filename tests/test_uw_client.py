@@ -0,0 +1,146 @@
+"""
+Tests for the pooled, cached Unusual Whales client
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.src.services.unusual_whales.uw_client import (
+    FlowSentiment,
+    UnusualWhalesClient,
+    _TokenBucket,
+)
+
+
+def _flow_response(count=30):
+    return {
+        "data": [
+            {"option_type": "call", "premium": 1000, "volume": 500, "side": "ask", "flags": ["SWEEP"]}
+            for _ in range(count)
+        ]
+    }
+
+
+@pytest.fixture
+def client():
+    return UnusualWhalesClient(api_token="test-token")
+
+
+class TestUnusualWhalesClient:
+    """Test suite for UnusualWhalesClient request handling"""
+
+    @pytest.mark.asyncio
+    async def test_flow_is_cached_across_analysis_methods(self, client):
+        """Test should_trade_ticker and the risk score share one flow request"""
+        with patch.object(client, "_fetch", new=AsyncMock(return_value=_flow_response())) as mock_fetch:
+            allowed, _, details = await client.should_trade_ticker("abc", "long")
+            risk_score, _ = await client.get_penny_stock_risk_score("ABC", 2.0)
+
+        assert allowed is True
+        assert details["flow_sentiment"] == FlowSentiment.BULLISH.value
+        assert risk_score < 50
+        mock_fetch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_identical_inflight_requests_are_coalesced(self, client):
+        """Test concurrent callers for the same endpoint share one HTTP call"""
+        async def slow_fetch(endpoint, params, label):
+            await asyncio.sleep(0.05)
+            return {"data": []}
+
+        with patch.object(client, "_fetch", new=AsyncMock(side_effect=slow_fetch)) as mock_fetch:
+            # Stock quotes are not cached, but concurrent duplicates still coalesce
+            results = await asyncio.gather(*(client.get_stock_quote("AAPL") for _ in range(5)))
+            await client.get_stock_quote("AAPL")
+
+        assert all(r == {"data": []} for r in results)
+        assert mock_fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_joiners(self, client):
+        """Test callers sharing a request get None when the caller that started it is cancelled"""
+        started = asyncio.Event()
+
+        async def hanging_fetch(endpoint, params, label):
+            started.set()
+            await asyncio.sleep(10)
+
+        with patch.object(client, "_fetch", new=AsyncMock(side_effect=hanging_fetch)):
+            leader = asyncio.create_task(client.get_stock_quote("AAPL"))
+            await started.wait()
+            joiner = asyncio.create_task(client.get_stock_quote("AAPL"))
+            await asyncio.sleep(0)
+            leader.cancel()
+
+            assert await joiner is None
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+        assert client._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_cache_ttl_per_endpoint_group(self, client):
+        """Test cached groups expire after their TTL and failures are not cached"""
+        client._cache_ttls["market_tide"] = 0.05
+        with patch.object(client, "_fetch", new=AsyncMock(side_effect=[None, {"a": 1}, {"a": 2}])) as mock_fetch:
+            assert await client.get_market_tide() is None
+            assert await client.get_market_tide() == {"a": 1}
+            assert await client.get_market_tide() == {"a": 1}
+            await asyncio.sleep(0.06)
+            assert await client.get_market_tide() == {"a": 2}
+
+        assert mock_fetch.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_prefetch_warms_cache_for_candidates(self, client):
+        """Test a batch prefetch makes later per-ticker analysis free"""
+        with patch.object(client, "_fetch", new=AsyncMock(return_value=_flow_response())) as mock_fetch:
+            fetched = await client.prefetch(["AAA", "BBB", "aaa"])
+            calls_after_prefetch = mock_fetch.await_count
+            await client.analyze_flow_sentiment("AAA")
+            await client.analyze_flow_sentiment("BBB")
+
+        assert fetched == 3  # market tide + one flow request per unique ticker
+        assert calls_after_prefetch == 3
+        assert mock_fetch.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_session_is_pooled(self, client):
+        """Test requests reuse one session until it is closed"""
+        client._bind_loop()
+        first = client._get_session()
+        assert client._get_session() is first
+
+        await client.close()
+        assert first.closed
+        second = client._get_session()
+        assert second is not first
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_client_skips_requests(self):
+        """Test no request is made without an API token"""
+        unconfigured = UnusualWhalesClient(api_token="")
+        unconfigured._api_token = ""
+        with patch.object(unconfigured, "_fetch", new=AsyncMock()) as mock_fetch:
+            assert await unconfigured.get_market_tide() is None
+            assert await unconfigured.prefetch(["AAPL"]) == 0
+        mock_fetch.assert_not_awaited()
+
+
+class TestTokenBucket:
+    """Test suite for the concurrent token bucket"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_acquires_are_spread_at_rate(self):
+        """Test burst tokens are immediate and the rest wait for refill concurrently"""
+        bucket = _TokenBucket(rate_per_second=50.0, burst=2)
+
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+        elapsed = time.monotonic() - start
+
+        # 4 tokens beyond the burst at 50/s -> ~80 ms total, not 6 x 200 ms
+        assert 0.06 <= elapsed < 0.5
@@ -0,0 +1,144 @@
+"""
+Tests for the columnar BatchValidationEvaluator
+"""
+
+import numpy as np
+
+from app.src.services.trading.validation import (
+    BatchValidationEvaluator,
+    CandidateTable,
+    ContinuationRule,
+    DataQualityRule,
+    LiquidityRule,
+    MomentumThresholdRule,
+    PriceExtremeRule,
+    QuoteData,
+    RejectionCode,
+    RejectionCollector,
+    TrendAnalyzer,
+    TrendDirectionRule,
+    ValidationResult,
+    ValidationRule,
+)
+
+
+def _rule_chain():
+    return [
+        DataQualityRule(required_bars=5),
+        LiquidityRule(max_spread_percent=2.0),
+        ContinuationRule(min_continuation=0.7),
+        PriceExtremeRule(extreme_threshold_percent=1.0),
+        MomentumThresholdRule(min_momentum=3.0, max_momentum=10.0),
+        TrendDirectionRule(),
+    ]
+
+
+def _universe(size, seed=5):
+    rng = np.random.default_rng(seed)
+    bars_by_ticker, quotes = {}, {}
+    for i in range(size):
+        ticker = f"T{i}"
+        count = int(rng.choice([0, 2, 4, 6, 20]))
+        closes = 2.0 + rng.standard_normal(count).cumsum() * 0.08
+        bars = [{"c": float(c)} for c in closes]
+        if count and i % 17 == 0:
+            bars[-2]["c"] = None  # missing close inside the trend window
+        bars_by_ticker[ticker] = bars
+        mid = float(closes[-1]) if count else 2.0
+        spread = float(rng.choice([0.001, 0.01, 0.05]))
+        bid = 0.0 if i % 23 == 0 else mid - spread / 2
+        quotes[ticker] = QuoteData.from_bid_ask(ticker, bid, mid + spread / 2)
+    return bars_by_ticker, quotes
+
+
+def _scalar_chain(rules, ticker, bars, quote):
+    metrics = TrendAnalyzer.calculate_trend_metrics(bars)
+    for index, rule in enumerate(rules):
+        result = rule.validate(ticker, metrics, quote, bars)
+        if not result.passed:
+            return index, result
+    return -1, ValidationResult(passed=True)
+
+
+class TestBatchValidationEvaluator:
+    """Test suite for the batch validation engine"""
+
+    def test_trend_columns_match_trend_analyzer(self):
+        """Test vectorized trend metrics equal the per-ticker TrendAnalyzer output"""
+        bars_by_ticker, quotes = _universe(300)
+
+        table = CandidateTable.from_market_data(bars_by_ticker, quotes)
+
+        for row, ticker in enumerate(table.tickers):
+            assert table.trend_metrics(row) == TrendAnalyzer.calculate_trend_metrics(bars_by_ticker[ticker])
+
+    def test_matches_per_ticker_rules(self):
+        """Test first failing rule and rendered reasons equal the scalar rule chain"""
+        bars_by_ticker, quotes = _universe(500)
+        rules = _rule_chain()
+
+        result = BatchValidationEvaluator(rules).evaluate(
+            CandidateTable.from_market_data(bars_by_ticker, quotes)
+        )
+
+        for row, ticker in enumerate(result.table.tickers):
+            index, expected = _scalar_chain(rules, ticker, bars_by_ticker[ticker], quotes[ticker])
+            assert int(result.failed_rule[row]) == index, ticker
+            assert result.render_reasons(row) == (expected.reason_long, expected.reason_short), ticker
+        assert set(result.passed_tickers()) == {
+            t for t in bars_by_ticker if _scalar_chain(rules, t, bars_by_ticker[t], quotes[t])[0] < 0
+        }
+
+    def test_codes_short_circuit(self):
+        """Test a ticker rejected by an early rule keeps that rule's code only"""
+        bars_by_ticker = {"EMPTY": [], "WIDE": [{"c": 1.0 + i * 0.1} for i in range(6)]}
+        quotes = {"EMPTY": (1.0, 1.01), "WIDE": (1.0, 1.2)}
+
+        result = BatchValidationEvaluator(_rule_chain()).evaluate(
+            CandidateTable.from_market_data(bars_by_ticker, quotes)
+        )
+
+        assert result.long_code.tolist() == [RejectionCode.NO_MARKET_DATA, RejectionCode.SPREAD_TOO_WIDE]
+        assert result.short_code.tolist() == [RejectionCode.NO_MARKET_DATA, RejectionCode.SPREAD_TOO_WIDE]
+        assert result.failed_rule.tolist() == [0, 1]
+
+    def test_custom_rule_falls_back_to_validate(self):
+        """Test non-builtin rules run their own validate() on active rows only"""
+        calls = []
+
+        class RejectEverything(ValidationRule):
+            def validate(self, ticker, trend_metrics, quote_data, bars):
+                calls.append(ticker)
+                return ValidationResult(passed=False, reason_long="custom")
+
+        bars_by_ticker = {"A": [], "B": [{"c": 1.0}] * 6}
+        quotes = {"A": (1.0, 1.01), "B": (1.0, 1.001)}
+
+        result = BatchValidationEvaluator([DataQualityRule(), RejectEverything()]).evaluate(
+            CandidateTable.from_market_data(bars_by_ticker, quotes)
+        )
+
+        assert calls == ["B"]
+        assert result.render_reasons(1) == ("custom", None)
+
+    def test_collect_rejections_renders_only_rejected(self):
+        """Test persisted records carry rendered reasons and trend metrics"""
+        bars_by_ticker = {
+            "UP": [{"c": 1.0 + i * 0.05} for i in range(6)],
+            "FLAT": [{"c": 1.0} for _ in range(6)],
+        }
+        quotes = {"UP": (1.24, 1.2402), "FLAT": (1.0, 1.001)}
+        collector = RejectionCollector()
+
+        result = BatchValidationEvaluator([LiquidityRule(), PriceExtremeRule()]).evaluate(
+            CandidateTable.from_market_data(bars_by_ticker, quotes)
+        )
+        added = result.collect_rejections(collector, "Penny Stocks")
+
+        assert added == 1
+        assert result.passed_tickers() == ["FLAT"]
+        (record,) = collector.get_records()
+        assert record["ticker"] == "UP"
+        assert record["reason_not_to_enter_long"].startswith("Current price $1.2401 is at/near peak")
+        assert "reason_not_to_enter_short" not in record
+        assert record["technical_indicators"]["reason"].startswith("Recent trend (5 bars)")
@@ -0,0 +1,193 @@
+"""
+Tests for the pooled webhook dispatcher (fan-out, circuit breaker, outbox)
+"""
+
+import asyncio
+import json
+import time
+import pytest
+from aiohttp import web
+from app.src.services.webhook.webhook_dispatcher import CircuitBreaker, WebhookDispatcher
+
+
+class _Receiver:
+    """Local stand-in for a webhook receiver"""
+
+    def __init__(self):
+        self.received = {}
+        self.fail_paths = set()
+        self.delay_paths = {}
+        self.runner = None
+        self.base_url = ""
+
+    async def _handle(self, request):
+        path = request.path
+        if path in self.delay_paths:
+            await asyncio.sleep(self.delay_paths[path])
+        if path in self.fail_paths:
+            return web.Response(status=503, text="unavailable")
+        self.received.setdefault(path, []).append(json.loads(await request.text()))
+        return web.Response(text="OK")
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/{name}", self._handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.runner.cleanup()
+
+
+class TestWebhookDispatcher:
+    """Test suite for WebhookDispatcher"""
+
+    @pytest.mark.asyncio
+    async def test_dispatch_fans_out_to_all_urls(self):
+        """Test the payload is delivered to every URL"""
+        async with _Receiver() as receiver:
+            dispatcher = WebhookDispatcher(retry_delay_seconds=0.01, outbox_path="")
+            urls = [f"{receiver.base_url}/a", f"{receiver.base_url}/b"]
+            try:
+                results = await dispatcher.dispatch({"ticker_symbol": "AAPL"}, urls)
+            finally:
+                await dispatcher.close()
+
+            assert results == {urls[0]: True, urls[1]: True}
+            assert receiver.received["/a"] == [{"ticker_symbol": "AAPL"}]
+            assert receiver.received["/b"] == [{"ticker_symbol": "AAPL"}]
+
+    @pytest.mark.asyncio
+    async def test_slow_url_does_not_delay_others(self):
+        """Test fan-out is concurrent rather than serial"""
+        async with _Receiver() as receiver:
+            receiver.delay_paths = {"/slow1": 0.3, "/slow2": 0.3, "/slow3": 0.3}
+            dispatcher = WebhookDispatcher(retry_delay_seconds=0.01, outbox_path="")
+            urls = [f"{receiver.base_url}/slow{i}" for i in (1, 2, 3)]
+            try:
+                start = time.monotonic()
+                results = await dispatcher.dispatch({"x": 1}, urls)
+                elapsed = time.monotonic() - start
+            finally:
+                await dispatcher.close()
+
+            assert all(results.values())
+            assert elapsed < 0.8
+
+    @pytest.mark.asyncio
+    async def test_failing_url_is_retried_and_isolated(self):
+        """Test one failing receiver doesn't affect delivery to the other"""
+        async with _Receiver() as receiver:
+            receiver.fail_paths = {"/down"}
+            dispatcher = WebhookDispatcher(retry_attempts=3, retry_delay_seconds=0.01, outbox_path="")
+            urls = [f"{receiver.base_url}/down", f"{receiver.base_url}/up"]
+            try:
+                results = await dispatcher.dispatch({"x": 1}, urls)
+            finally:
+                await dispatcher.close()
+
+            assert results == {urls[0]: False, urls[1]: True}
+            assert dispatcher.stats["failed"] == 3
+            assert await dispatcher.submit({"x": 1}, []) is False
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_url(self):
+        """Test a URL past the failure threshold is skipped until reset"""
+        async with _Receiver() as receiver:
+            receiver.fail_paths = {"/down"}
+            dispatcher = WebhookDispatcher(retry_attempts=1, retry_delay_seconds=0.01, outbox_path="")
+            url = f"{receiver.base_url}/down"
+            dispatcher._breakers[url] = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=60)
+            try:
+                for _ in range(4):
+                    await dispatcher.dispatch({"x": 1}, [url])
+            finally:
+                await dispatcher.close()
+
+            assert dispatcher.stats["failed"] == 2
+            assert dispatcher.stats["skipped_open_circuit"] == 2
+            assert dispatcher.get_stats()["circuits"][url] == "open"
+
+    def test_circuit_half_open_after_reset_timeout(self):
+        """Test the breaker allows a probe after the reset timeout"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=0.0)
+        breaker.record_failure()
+        assert breaker.state == "half_open"
+        assert breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_outbox_delivers_at_least_once(self, tmp_path):
+        """Test queued signals survive failures and are delivered once the receiver recovers"""
+        async with _Receiver() as receiver:
+            receiver.fail_paths = {"/hook"}
+            dispatcher = WebhookDispatcher(
+                retry_delay_seconds=0.01, outbox_path=str(tmp_path / "outbox.db")
+            )
+            url = f"{receiver.base_url}/hook"
+            try:
+                assert await dispatcher.submit({"ticker_symbol": "AAPL"}, [url]) is True
+                await dispatcher.close()  # stop the background worker, keep the row
+                assert await dispatcher.outbox.pending_count() == 1
+
+                receiver.fail_paths = set()
+                await asyncio.sleep(0.05)
+                assert await dispatcher.drain_outbox() == 1
+                assert await dispatcher.outbox.pending_count() == 0
+                assert receiver.received["/hook"] == [{"ticker_symbol": "AAPL"}]
+            finally:
+                await dispatcher.close()
+                dispatcher.outbox.close()
+
+    @pytest.mark.asyncio
+    async def test_outbox_redelivered_after_restart(self, tmp_path):
+        """Test rows left by a previous process are delivered at boot without a new submit()"""
+        path = str(tmp_path / "outbox.db")
+        async with _Receiver() as receiver:
+            receiver.fail_paths = {"/hook"}
+            url = f"{receiver.base_url}/hook"
+            before = WebhookDispatcher(retry_delay_seconds=0.01, outbox_path=path)
+            await before.submit({"ticker_symbol": "AAPL"}, [url])
+            await before.close()
+            before.outbox.close()
+
+            receiver.fail_paths = set()
+            after = WebhookDispatcher(retry_delay_seconds=0.01, outbox_path=path)
+            try:
+                assert after.start() is True
+                for _ in range(100):
+                    if await after.outbox.pending_count() == 0:
+                        break
+                    await asyncio.sleep(0.02)
+                assert await after.outbox.pending_count() == 0
+                assert receiver.received["/hook"] == [{"ticker_symbol": "AAPL"}]
+            finally:
+                await after.close()
+                after.outbox.close()
+
+        assert WebhookDispatcher(outbox_path="").start() is False
+
+    @pytest.mark.asyncio
+    async def test_outbox_drops_expired_entries(self, tmp_path):
+        """Test entries older than the max age are dropped instead of retried forever"""
+        async with _Receiver() as receiver:
+            dispatcher = WebhookDispatcher(
+                outbox_path=str(tmp_path / "outbox.db"), outbox_max_age_seconds=-1
+            )
+            try:
+                await dispatcher.outbox.enqueue([f"{receiver.base_url}/hook"], "{}")
+                assert await dispatcher.drain_outbox() == 0
+                assert await dispatcher.outbox.pending_count() == 0
+                assert "/hook" not in receiver.received
+            finally:
+                await dispatcher.close()
+                dispatcher.outbox.close()
@@ -4,7 +4,7 @@ Validates Requirements 13.1, 13.2, 13.3, 13.4, 13.5
 """
 
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import AsyncMock, patch
 from app.src.services.webhook.send_signal import send_signal_to_webhook
 
 
@@ -19,7 +19,7 @@ class TestWebhookNotifications:
         Validates: Requirements 13.1, 13.3
         """
         with patch('app.src.services.webhook.send_signal.AlpacaClient') as mock_alpaca, \
-             patch('app.src.services.webhook.send_signal.requests.post') as mock_post, \
+             patch('app.src.services.webhook.send_signal.get_webhook_dispatcher') as mock_get_dispatcher, \
              patch('app.src.services.webhook.send_signal.WEBHOOK_URLS', ['http://webhook.test']):
             
             # Mock Alpaca quote response
@@ -31,11 +31,9 @@ class TestWebhookNotifications:
                 }
             })
             
-            # Mock successful webhook response
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.text = "OK"
-            mock_post.return_value = mock_response
+            # Mock successful webhook delivery
+            mock_submit = AsyncMock(return_value=True)
+            mock_get_dispatcher.return_value.submit = mock_submit
             
             technical_indicators = {
                 "adx": 25.5,
@@ -55,9 +53,8 @@ class TestWebhookNotifications:
             )
             
             # Verify webhook was called
-            assert mock_post.called
-            call_args = mock_post.call_args
-            payload = call_args[1]['json']
+            assert mock_submit.called
+            payload, urls = mock_submit.call_args[0]
             
             # Verify all required fields are present
             assert payload['ticker_symbol'] == "AAPL"
@@ -74,7 +71,7 @@ class TestWebhookNotifications:
         Validates: Requirements 13.2, 13.3
         """
         with patch('app.src.services.webhook.send_signal.AlpacaClient') as mock_alpaca, \
-             patch('app.src.services.webhook.send_signal.requests.post') as mock_post, \
+             patch('app.src.services.webhook.send_signal.get_webhook_dispatcher') as mock_get_dispatcher, \
              patch('app.src.services.webhook.send_signal.WEBHOOK_URLS', ['http://webhook.test']):
             
             # Mock Alpaca quote response
@@ -86,11 +83,9 @@ class TestWebhookNotifications:
                 }
             })
             
-            # Mock successful webhook response
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.text = "OK"
-            mock_post.return_value = mock_response
+            # Mock successful webhook delivery
+            mock_submit = AsyncMock(return_value=True)
+            mock_get_dispatcher.return_value.submit = mock_submit
             
             technical_indicators = {
                 "adx": 25.5,
@@ -110,9 +105,8 @@ class TestWebhookNotifications:
             )
             
             # Verify webhook was called
-            assert mock_post.called
-            call_args = mock_post.call_args
-            payload = call_args[1]['json']
+            assert mock_submit.called
+            payload, urls = mock_submit.call_args[0]
             
             # Verify exit-specific fields are present
             assert payload['ticker_symbol'] == "AAPL"
@@ -131,7 +125,7 @@ class TestWebhookNotifications:
         Validates: Requirements 13.4
         """
         with patch('app.src.services.webhook.send_signal.AlpacaClient') as mock_alpaca, \
-             patch('app.src.services.webhook.send_signal.requests.post') as mock_post:
+             patch('app.src.services.webhook.send_signal.get_webhook_dispatcher') as mock_get_dispatcher:
             
             # Mock Alpaca quote response
             mock_alpaca.quote = AsyncMock(return_value={
@@ -142,8 +136,8 @@ class TestWebhookNotifications:
                 }
             })
             
-            # Mock failed webhook response
-            mock_post.side_effect = Exception("Connection timeout")
+            # Mock failed webhook delivery
+            mock_get_dispatcher.return_value.submit = AsyncMock(return_value=False)
             
             # Call webhook - should not raise exception
             try:
@@ -167,7 +161,7 @@ class TestWebhookNotifications:
         Validates: Requirements 13.5
         """
         with patch('app.src.services.webhook.send_signal.AlpacaClient') as mock_alpaca, \
-             patch('app.src.services.webhook.send_signal.requests.post') as mock_post, \
+             patch('app.src.services.webhook.send_signal.get_webhook_dispatcher') as mock_get_dispatcher, \
              patch('app.src.services.webhook.send_signal.WEBHOOK_URLS', 
                    ['http://webhook1.com', 'http://webhook2.com']):
             
@@ -180,11 +174,9 @@ class TestWebhookNotifications:
                 }
             })
             
-            # Mock successful webhook response
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.text = "OK"
-            mock_post.return_value = mock_response
+            # Mock successful webhook delivery
+            mock_submit = AsyncMock(return_value=True)
+            mock_get_dispatcher.return_value.submit = mock_submit
             
             # Call webhook
             await send_signal_to_webhook(
@@ -195,8 +187,9 @@ class TestWebhookNotifications:
                 enter_price=150.50,
             )
             
-            # Verify webhook was called for both URLs
-            assert mock_post.call_count >= 2  # Should be called for each webhook URL
+            # Verify the signal was fanned out to both URLs
+            _, urls = mock_submit.call_args[0]
+            assert list(urls) == ['http://webhook1.com', 'http://webhook2.com']
 
     @pytest.mark.asyncio
     async def test_webhook_payload_completeness(self):
@@ -205,7 +198,7 @@ class TestWebhookNotifications:
         Validates: Requirements 13.3
         """
         with patch('app.src.services.webhook.send_signal.AlpacaClient') as mock_alpaca, \
-             patch('app.src.services.webhook.send_signal.requests.post') as mock_post, \
+             patch('app.src.services.webhook.send_signal.get_webhook_dispatcher') as mock_get_dispatcher, \
              patch('app.src.services.webhook.send_signal.WEBHOOK_URLS', ['http://webhook.test']):
             
             # Mock Alpaca quote response
@@ -217,11 +210,9 @@ class TestWebhookNotifications:
                 }
             })
             
-            # Mock successful webhook response
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.text = "OK"
-            mock_post.return_value = mock_response
+            # Mock successful webhook delivery
+            mock_submit = AsyncMock(return_value=True)
+            mock_get_dispatcher.return_value.submit = mock_submit
             
             technical_indicators = {
                 "adx": 25.5,
@@ -240,9 +231,8 @@ class TestWebhookNotifications:
             )
             
             # Verify webhook was called
-            assert mock_post.called
-            call_args = mock_post.call_args
-            payload = call_args[1]['json']
+            assert mock_submit.called
+            payload, urls = mock_submit.call_args[0]
             
             # Verify required fields
             required_fields = [